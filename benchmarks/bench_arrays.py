@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Benchmark of the trajectories stored as a list of objects, against the same trajectories stored in a
+:class:`~pyniryo.api.objects.PoseArray` or a :class:`~pyniryo.api.objects.JointsArray`.
+
+Usage: ::
+
+    python -m benchmarks.bench_arrays
+"""
+
+import timeit
+
+import numpy as np
+
+from pyniryo.api.objects import JointsArray, JointsPosition, PoseArray, PoseObject
+
+NB_POINTS = 20000
+NB_ROUNDS = 5
+
+
+def best_time(function):
+    return min(timeit.repeat(function, number=1, repeat=NB_ROUNDS))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    values = rng.uniform(-1.0, 1.0, (NB_POINTS, 6))
+
+    poses = [PoseObject(*row) for row in values.tolist()]
+    pose_array = PoseArray(values)
+    joints = [JointsPosition(*row) for row in values.tolist()]
+    joints_array = JointsArray(values)
+    pose_dicts = pose_array.to_dict()
+    joints_dicts = joints_array.to_dict()
+
+    cases = (
+        ("poses to_dict", lambda: [pose.to_dict() for pose in poses], pose_array.to_dict),
+        ("poses from_dict", lambda: [PoseObject.from_dict(d) for d in pose_dicts],
+         lambda: PoseArray.from_dict(pose_dicts)),
+        ("poses iteration", lambda: [pose.z for pose in poses], lambda: [pose.z for pose in pose_array]),
+        ("z column", lambda: np.array([pose.z for pose in poses]), lambda: pose_array.data[:, 2].copy()),
+        ("joints to_dict", lambda: [joint.to_dict() for joint in joints], joints_array.to_dict),
+        ("joints from_dict", lambda: [JointsPosition.from_dict(d) for d in joints_dicts],
+         lambda: JointsArray.from_dict(joints_dicts)),
+        ("build from rows", lambda: [PoseObject(*row) for row in values.tolist()], lambda: PoseArray(values)),
+    )
+
+    print("{} points".format(NB_POINTS))
+    print("{:>18} | {:>12} | {:>11} | {:>7}".format("operation", "objects (ms)", "array (ms)", "speedup"))
+    for name, objects_function, array_function in cases:
+        objects_time, array_time = best_time(objects_function), best_time(array_function)
+        print("{:>18} | {:>12.2f} | {:>11.2f} | {:>6.1f}x".format(name, objects_time * 1e3, array_time * 1e3,
+                                                                   objects_time / array_time))
+
+
+if __name__ == '__main__':
+    main()
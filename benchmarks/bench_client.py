@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Benchmark of the client against the mock robot server, without hardware.
+
+Measures the latency of single requests, the throughput of batches and the time to fetch a camera frame,
+with the JSON protocol and with the negotiated binary encoding. The server adds no latency,
+so the numbers are the cost of the client, the server and the loopback interface.
+
+Usage: ::
+
+    python -m benchmarks.bench_client
+"""
+
+import time
+
+import numpy as np
+
+from pyniryo.api.mock_server import MockRobotServer
+from pyniryo.api.objects import JointsPosition
+from pyniryo.api.tcp_client import NiryoRobot
+
+
+def latencies(function, nb_iterations):
+    durations = []
+    for _ in range(nb_iterations):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return np.array(durations)
+
+
+def batch_of_queries(robot, nb_queries):
+
+    def function():
+        with robot.batch() as batch:
+            for _ in range(nb_queries):
+                batch.get_joints()
+
+    return function
+
+
+def main():
+    trajectory = [JointsPosition(0.1, 0.0, 0.0, 0.0, 0.0, 0.0)] * 500
+    print("{:>22} | {:>8} | {:>10} | {:>10} | {:>12}".format("request", "protocol", "p50 (us)", "p99 (us)",
+                                                              "per second"))
+    for protocol, binary_encoding in (("json", False), ("binary", True)):
+        with MockRobotServer(time_scale=0.0, binary_encoding=binary_encoding, large_framing=True, verbose=False):
+            robot = NiryoRobot("127.0.0.1", verbose=False)
+            for name, function, nb_iterations, nb_requests in (
+                ("get_joints", robot.get_joints, 2000, 1),
+                ("batch of 10 get_joints", batch_of_queries(robot, 10), 500, 10),
+                ("execute_trajectory 500", lambda: robot.execute_trajectory(trajectory), 50, 1),
+                ("get_img_compressed", robot.get_img_compressed, 200, 1),
+            ):
+                durations = latencies(function, nb_iterations)
+                print("{:>22} | {:>8} | {:>10.0f} | {:>10.0f} | {:>12.0f}".format(
+                    name, protocol, np.percentile(durations, 50) * 1e6, np.percentile(durations, 99) * 1e6,
+                    nb_requests * nb_iterations / durations.sum()))
+            robot.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of the binary encoding against the JSON encoding of the packets.
+
+For typical messages, compares the size of the packets and the time to encode and decode them.
+
+Usage: ::
+
+    python -m benchmarks.bench_encoding
+"""
+
+import random
+import timeit
+
+from pyniryo.api.communication_functions import (build_command_dict,
+                                                 content_to_dict,
+                                                 dict_to_binary_packet,
+                                                 dict_to_packet)
+from pyniryo.api.enums_communication import Command
+
+
+def random_joints():
+    return [random.uniform(-3.0, 3.0) for _ in range(6)]
+
+
+def messages():
+    # The JSON packets are limited to 65535 bytes, hence the size of the trajectory
+    return [
+        ("GET_JOINTS answer", {
+            "command": "GET_JOINTS", "status": "OK", "message": "", "list_ret_param": random_joints()
+        }),
+        ("MOVE request", build_command_dict(Command.MOVE, random_joints(), "JOINTS")),
+        ("EXECUTE_TRAJECTORY 500 pts", build_command_dict(Command.EXECUTE_TRAJECTORY,
+                                                          [random_joints() for _ in range(500)],
+                                                          "JOINTS")),
+    ]
+
+
+def bench(function, nb_iterations):
+    return min(timeit.repeat(function, number=nb_iterations, repeat=5)) / nb_iterations
+
+
+def main():
+    random.seed(0)
+    print("{:>27} | {:>8} | {:>14} | {:>14} | {:>14}".format("message",
+                                                             "encoding",
+                                                             "size (bytes)",
+                                                             "encode (us)",
+                                                             "decode (us)"))
+    for name, message in messages():
+        nb_iterations = 20 if "TRAJECTORY" in name else 5000
+        for encoding, to_packet in (("json", dict_to_packet), ("binary", dict_to_binary_packet)):
+            packet = bytes(to_packet(message))
+            content = packet[2:]
+            assert content_to_dict(content) == message
+            encode_time = bench(lambda: to_packet(message), nb_iterations)
+            decode_time = bench(lambda: content_to_dict(content), nb_iterations)
+            print("{:>27} | {:>8} | {:>14} | {:>14.1f} | {:>14.1f}".format(name,
+                                                                          encoding,
+                                                                          len(packet),
+                                                                          encode_time * 1e6,
+                                                                          decode_time * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""
+Benchmark of the import of pyniryo: time and resident memory of a fresh interpreter importing the TCP API only,
+and importing the vision functions too, which loads OpenCV.
+
+Usage: ::
+
+    python -m benchmarks.bench_import
+"""
+
+import subprocess
+import sys
+
+import numpy as np
+
+STATEMENTS = (
+    ("import numpy", "import numpy"),
+    ("from pyniryo import NiryoRobot", "from pyniryo import NiryoRobot"),
+    ("+ pyniryo.uncompress_image", "from pyniryo import NiryoRobot, uncompress_image"),
+    ("from pyniryo import *", "from pyniryo import *"),
+)
+
+CHILD_CODE = """
+import resource, sys, time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, 'cv2' in sys.modules)
+"""
+
+
+def measure(statement, nb_runs):
+    durations, memories = [], []
+    for _ in range(nb_runs):
+        output = subprocess.check_output([sys.executable, "-c", CHILD_CODE.format(statement)])
+        duration, memory, cv2_imported = output.split()
+        durations.append(float(duration))
+        memories.append(int(memory))
+    return np.median(durations), np.median(memories), cv2_imported == b"True"
+
+
+def main(nb_runs=10):
+    print("{:>32} | {:>12} | {:>12} | {:>5}".format("statement", "time (ms)", "max RSS (MB)", "cv2"))
+    for name, statement in STATEMENTS:
+        duration, memory, cv2_imported = measure(statement, nb_runs)
+        print("{:>32} | {:>12.1f} | {:>12.1f} | {:>5}".format(name, duration * 1e3, memory / 1024, str(cv2_imported)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Benchmark of the forward kinematics of a trajectory: one ``FORWARD_KINEMATICS`` request per waypoint to the
+mock server, against the local forward kinematics of :mod:`pyniryo.api.kinematics`.
+
+No chain of the real arms is bundled: the local computation runs on an arbitrary chain of six joints,
+which costs the same time.
+
+The mock server answers on the loopback without latency: against a robot, each request costs a network round trip
+and the robot's own computation on top.
+
+Usage: ::
+
+    python -m benchmarks.bench_kinematics
+"""
+
+import time
+
+import numpy as np
+
+from pyniryo.api.kinematics import KinematicChain
+from pyniryo.api.mock_server import MockRobotServer
+from pyniryo.api.tcp_client import NiryoRobot
+
+NB_WAYPOINTS = 2000
+
+CHAIN = KinematicChain("arbitrary",
+                       joint_origins=[
+                           [0.0, 0.0, 0.1, 0.0, 0.0, 0.0],
+                           [0.0, 0.0, 0.07, np.pi / 2, -np.pi / 2, 0.0],
+                           [0.2, 0.0, 0.0, 0.0, 0.0, -np.pi / 2],
+                           [0.03, 0.0, 0.0, 0.0, np.pi / 2, 0.0],
+                           [0.0, 0.0, 0.2, 0.0, -np.pi / 2, 0.0],
+                           [0.0, -0.02, 0.0, 0.0, np.pi / 2, 0.0],
+                       ],
+                       tool_origin=[0.0, 0.0, 0.02, -np.pi / 2, -np.pi / 2, 0.0])
+
+
+def main():
+    joints = np.random.default_rng(0).uniform(-1.0, 1.0, (NB_WAYPOINTS, 6))
+
+    with MockRobotServer(time_scale=0.0, verbose=False):
+        robot = NiryoRobot("127.0.0.1", verbose=False)
+
+        start = time.perf_counter()
+        for joints_position in joints.tolist():
+            robot.forward_kinematics(joints_position)
+        requests_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        CHAIN.forward_kinematics(joints)
+        local_time = time.perf_counter() - start
+        robot.close_connection()
+
+    print("{} waypoints".format(NB_WAYPOINTS))
+    print("{:>22} | {:>10.1f} ms".format("requests", requests_time * 1e3))
+    print("{:>22} | {:>10.1f} ms".format("local", local_time * 1e3))
+    print("{:>22} | {:>10.0f}x".format("speedup", requests_time / local_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Benchmark of a palletizing loop computing the inverse kinematics of the slots of a grid at each pass,
+with and without a :class:`~pyniryo.api.caches.KinematicsCache`, against a mock server with a 2 ms latency.
+
+Usage: ::
+
+    python -m benchmarks.bench_kinematics_cache
+"""
+
+import time
+
+from pyniryo.api.caches import KinematicsCache
+from pyniryo.api.mock_server import MockRobotServer
+from pyniryo.api.objects import PoseObject
+from pyniryo.api.tcp_client import NiryoRobot
+
+NB_PASSES = 10
+GRID = [PoseObject(0.2 + 0.03 * row, -0.1 + 0.03 * column, 0.1, 0.0, 1.57, 0.0) for row in range(5)
+        for column in range(8)]
+
+
+def run_passes(robot):
+    start = time.perf_counter()
+    for _ in range(NB_PASSES):
+        for slot_pose in GRID:
+            robot.inverse_kinematics(slot_pose)
+    return time.perf_counter() - start
+
+
+def main():
+    with MockRobotServer(latency=0.002, time_scale=0.0, verbose=False):
+        robot = NiryoRobot("127.0.0.1", verbose=False)
+        without_cache = run_passes(robot)
+        robot.kinematics_cache = KinematicsCache()
+        with_cache = run_passes(robot)
+        stats = robot.kinematics_cache.stats()
+        robot.close_connection()
+
+    print("{} passes over {} slots".format(NB_PASSES, len(GRID)))
+    print("{:>14} | {:>8.1f} ms".format("without cache", without_cache * 1e3))
+    print("{:>14} | {:>8.1f} ms ({} hits, {} misses)".format("with cache", with_cache * 1e3, stats["hits"],
+                                                             stats["misses"]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Regression check and benchmark of the markers detection on the workspace images of the repository.
+
+Compares ``find_markers_from_img_thresh`` with the former implementation, which handled each contour
+as a Python object and merged the circles with a nested loop.
+Both must find exactly the same markers. Cluttered versions of the images which have markers, with thousands of
+contours drawn around the markers, show the cost of the detection when the scene is full of objects.
+The markers must still be found on them.
+
+Usage: ::
+
+    python -m benchmarks.bench_markers
+"""
+
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+from pyniryo.vision.markers_detection import (Marker,
+                                              PotentialMarker,
+                                              find_markers_from_img_thresh,
+                                              threshold_markers)
+from pyniryo.vision.math_functions import euclidean_dist_2_pts
+
+ROOT_DIRECTORY = os.path.join(os.path.dirname(__file__), '..')
+IMAGES_PATTERNS = [
+    os.path.join(ROOT_DIRECTORY, 'docs', 'vision', 'images', '*.jpg'),
+    os.path.join(ROOT_DIRECTORY, 'examples', 'vision_demonstrators', 'img', '*.jpg'),
+]
+
+
+def legacy_find_markers_from_img_thresh(img_thresh,
+                                        max_dist_between_centers=3,
+                                        min_radius_circle=4,
+                                        max_radius_circle=35,
+                                        min_radius_marker=7):
+    """
+    Markers detection as it was before the vectorization
+    """
+    contours = cv2.findContours(img_thresh, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)[-2]
+    list_potential_markers = []
+    for cnt in contours:
+        (x, y), radius = cv2.minEnclosingCircle(cnt)
+        if not min_radius_circle < radius < max_radius_circle:
+            continue
+        center = (int(round(x)), int(round(y)))
+        radius = int(radius)
+        list_potential_markers.append(PotentialMarker(center, radius, cnt))
+
+    list_potential_markers = sorted(list_potential_markers, key=lambda m: m.x)
+    list_good_candidates = []
+
+    for i, potential_marker in enumerate(list_potential_markers):
+        if potential_marker.is_merged:
+            continue
+        marker1 = Marker(potential_marker)
+        center_marker = marker1.get_center()
+
+        for potential_marker2 in list_potential_markers[i + 1:]:
+            if potential_marker.is_merged:
+                continue
+            center_potential = potential_marker2.get_center()
+            if center_potential[0] - center_marker[0] > max_dist_between_centers:
+                break
+            dist = euclidean_dist_2_pts(center_marker, center_potential)
+            if dist <= max_dist_between_centers:
+                marker1.add_circle(potential_marker2)
+                center_marker = marker1.get_center()
+
+        if marker1.nb_circles() > 2 and marker1.radius >= min_radius_marker:
+            list_good_candidates.append(marker1)
+            marker1.get_id_from_slice(img_thresh)
+
+    return list_good_candidates
+
+
+# Largest size of the shapes drawn by add_clutter, in pixels
+CLUTTER_SHAPE_SIZE = 15
+
+
+def add_clutter(img, markers, nb_shapes=1500, seed=0):
+    """
+    Draw small random shapes all over the image, as objects and textures would do, but away from the markers
+    so that they are still detected
+    """
+    random_state = np.random.RandomState(seed)
+    cluttered_img = img.copy()
+    height, width = img.shape[:2]
+    markers_centers = np.array([marker.get_center() for marker in markers], dtype=np.float64).reshape(-1, 2)
+    markers_clearances = np.array([marker.radius for marker in markers], dtype=np.float64) + 2 * CLUTTER_SHAPE_SIZE
+    nb_drawn = 0
+    while nb_drawn < nb_shapes:
+        center = (int(random_state.randint(width)), int(random_state.randint(height)))
+        if np.any(np.hypot(*(markers_centers - center).T) < markers_clearances):
+            continue
+        nb_drawn += 1
+        color = tuple(int(c) for c in random_state.randint(0, 256, 3))
+        if random_state.rand() < 0.5:
+            cv2.circle(cluttered_img, center, int(random_state.randint(1, CLUTTER_SHAPE_SIZE - 3)), color, -1)
+        else:
+            size = random_state.randint(1, CLUTTER_SHAPE_SIZE, 2)
+            cv2.rectangle(cluttered_img, center, (center[0] + int(size[0]), center[1] + int(size[1])), color, -1)
+    return cluttered_img
+
+
+def markers_signature(markers):
+    return [(marker.get_center(), marker.radius, marker.identifiant, marker.list_centers) for marker in markers]
+
+
+def bench(function, img_thresh, nb_iterations):
+    start = time.perf_counter()
+    for _ in range(nb_iterations):
+        function(img_thresh)
+    return (time.perf_counter() - start) / nb_iterations
+
+
+def main(nb_iterations=20):
+    images_paths = sorted(path for pattern in IMAGES_PATTERNS for path in glob.glob(pattern))
+    cases = []
+    for path in images_paths:
+        img = cv2.imread(path)
+        markers = find_markers_from_img_thresh(threshold_markers(img))
+        cases.append((os.path.basename(path), img, len(markers)))
+        if markers:
+            cases.append((os.path.basename(path) + " +clutter", add_clutter(img, markers), len(markers)))
+
+    print("{:>38} | {:>8} | {:>7} | {:>11} | {:>11} | {:>7}".format("image", "contours", "markers", "legacy (ms)",
+                                                                     "current (ms)", "speedup"))
+    total_legacy = total_current = 0
+    for name, img, nb_markers in cases:
+        img_thresh = threshold_markers(img)
+        nb_contours = len(cv2.findContours(img_thresh, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)[-2])
+        markers = find_markers_from_img_thresh(img_thresh)
+        if len(markers) != nb_markers:
+            raise AssertionError("{} markers found on {} instead of {}".format(len(markers), name, nb_markers))
+        if markers_signature(markers) != markers_signature(legacy_find_markers_from_img_thresh(img_thresh)):
+            raise AssertionError("Different markers found on {}".format(name))
+
+        legacy = bench(legacy_find_markers_from_img_thresh, img_thresh, nb_iterations)
+        current = bench(find_markers_from_img_thresh, img_thresh, nb_iterations)
+        total_legacy += legacy
+        total_current += current
+        print("{:>38} | {:>8} | {:>7} | {:>11.2f} | {:>12.2f} | {:>6.1f}x".format(name, nb_contours, len(markers),
+                                                                                  legacy * 1e3, current * 1e3,
+                                                                                  legacy / current))
+    print("All the markers are identical. Total: {:.1f}ms -> {:.1f}ms ({:.1f}x)".format(
+        total_legacy * 1e3, total_current * 1e3, total_legacy / total_current))
+
+
+if __name__ == '__main__':
+    main()
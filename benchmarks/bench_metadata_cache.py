@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+Benchmark of a loop playing a sound and reading a workspace's ratio at each pass, with and without the metadata cache,
+against a mock server with a 2 ms latency.
+
+Usage: ::
+
+    python -m benchmarks.bench_metadata_cache
+"""
+
+import time
+
+from pyniryo.api.mock_server import MockRobotServer
+from pyniryo.api.tcp_client import NiryoRobot
+
+NB_PASSES = 200
+WORKSPACE_POINTS = [[0.3, 0.1, 0.0], [0.3, -0.1, 0.0], [0.1, -0.1, 0.0], [0.1, 0.1, 0.0]]
+
+
+def run_passes(robot, sound_name):
+    start = time.perf_counter()
+    for _ in range(NB_PASSES):
+        robot.play_sound(sound_name, wait_end=False)
+        robot.get_workspace_ratio("bench_workspace")
+    return time.perf_counter() - start
+
+
+def main():
+    with MockRobotServer(latency=0.002, time_scale=0.0, verbose=False):
+        robot = NiryoRobot("127.0.0.1", verbose=False)
+        robot.save_workspace_from_points("bench_workspace", *WORKSPACE_POINTS)
+        sound_name = robot.get_sounds()[0]
+        robot.metadata_cache.enabled = False
+        without_cache = run_passes(robot, sound_name)
+        robot.metadata_cache.enabled = True
+        with_cache = run_passes(robot, sound_name)
+        robot.close_connection()
+
+    print("{} passes of play_sound and get_workspace_ratio".format(NB_PASSES))
+    print("{:>14} | {:>8.1f} ms".format("without cache", without_cache * 1e3))
+    print("{:>14} | {:>8.1f} ms".format("with cache", with_cache * 1e3))
+
+
+if __name__ == '__main__':
+    main()
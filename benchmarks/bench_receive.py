@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of the reception path of ``communication_functions``.
+
+Compares the preallocated ``recv_into`` engine used by ``receive_dict_w_payload``
+with the former implementation which concatenated bytes chunk by chunk.
+
+Usage: ::
+
+    python -m benchmarks.bench_receive
+"""
+
+import socket
+import threading
+import time
+
+from pyniryo.api.communication_functions import dict_to_packet, receive_dict, receive_dict_w_payload
+from pyniryo.api.enums_communication import READ_SIZE
+
+PAYLOAD_SIZES = [1024, 100 * 1024, 1024 * 1024]
+
+
+def legacy_receive_dict_w_payload(sckt, buffer_size=READ_SIZE):
+    """
+    Reception path as it was before the preallocated buffer
+    """
+    dict_data = receive_dict(sckt, buffer_size=buffer_size)
+    payload_size = dict_data["payload_size"]
+    received_payload = b""
+    while len(received_payload) < payload_size:
+        received_payload += sckt.recv(buffer_size)
+    return dict_data, received_payload
+
+
+def server(sckt, packet, payload, nb_iterations):
+    # Answer one request at a time, as the robot's TCP server does
+    for _ in range(nb_iterations):
+        sckt.recv(1)
+        sckt.sendall(packet)
+        sckt.sendall(payload)
+
+
+def bench(receive_function, payload_size, nb_iterations):
+    payload = b'\xff' * payload_size
+    packet = dict_to_packet({"status": "OK", "payload_size": payload_size})
+    client_socket, server_socket = socket.socketpair()
+    thread = threading.Thread(target=server, args=(server_socket, packet, payload, nb_iterations))
+    thread.start()
+
+    start = time.perf_counter()
+    for _ in range(nb_iterations):
+        client_socket.sendall(b'?')
+        _, received_payload = receive_function(client_socket)
+        assert len(received_payload) == payload_size
+    duration = time.perf_counter() - start
+
+    thread.join()
+    client_socket.close()
+    server_socket.close()
+    return duration / nb_iterations
+
+
+def main():
+    print("{:>10} | {:>14} | {:>14} | {:>8}".format("payload", "legacy (ms)", "recv_into (ms)", "speedup"))
+    for payload_size in PAYLOAD_SIZES:
+        nb_iterations = max(5, min(2000, 20 * 1024 * 1024 // payload_size))
+        legacy = bench(legacy_receive_dict_w_payload, payload_size, nb_iterations)
+        current = bench(receive_dict_w_payload, payload_size, nb_iterations)
+        print("{:>8}KB | {:>14.3f} | {:>14.3f} | {:>7.1f}x".format(payload_size // 1024,
+                                                                   legacy * 1e3,
+                                                                   current * 1e3,
+                                                                   legacy / current))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Benchmark of the client-side processing of the answers, by replaying a session recorded against the mock server.
+
+The replayed answers are served from memory, so the numbers exclude the server and the network:
+they are the cost of encoding the requests, decoding the answers and building the returned objects.
+
+Usage: ::
+
+    python -m benchmarks.bench_replay
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from pyniryo.api.mock_server import MockRobotServer
+from pyniryo.api.recording import SessionRecorder, SessionReplayer
+from pyniryo.api.tcp_client import NiryoRobot
+
+CALLS = (
+    ("get_joints", 2000),
+    ("get_pose", 2000),
+    ("get_hardware_status", 1000),
+    ("get_img_compressed", 200),
+)
+
+
+def run_calls(robot):
+    durations = {}
+    for name, nb_iterations in CALLS:
+        function = getattr(robot, name)
+        durations[name] = []
+        for _ in range(nb_iterations):
+            start = time.perf_counter()
+            function()
+            durations[name].append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "session.rec")
+    with MockRobotServer(time_scale=0.0, verbose=False):
+        with SessionRecorder(path) as recorder:
+            robot = NiryoRobot("127.0.0.1", verbose=False, recorder=recorder)
+            live_durations = run_calls(robot)
+            robot.close_connection()
+
+    robot = NiryoRobot("127.0.0.1", verbose=False, connector=SessionReplayer(path).create_connection)
+    replay_durations = run_calls(robot)
+    robot.close_connection()
+    os.remove(path)
+
+    print("{:>20} | {:>15} | {:>17}".format("call", "live p50 (us)", "replay p50 (us)"))
+    for name, _ in CALLS:
+        print("{:>20} | {:>15.1f} | {:>17.1f}".format(name, np.percentile(live_durations[name], 50) * 1e6,
+                                                      np.percentile(replay_durations[name], 50) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Benchmark of the client CPU time per call.
+
+The calls are first made against the mock robot server while the session is recorded, then the session is replayed
+without the server, so that the measured time is the one of the client only: the parameters checking,
+the request encoding, the answer decoding and the building of the returned object.
+The lowest time of several rounds is kept, as the machine's load only makes the calls slower.
+
+Usage: ::
+
+    python -m benchmarks.bench_schemas
+"""
+
+import os
+import tempfile
+import time
+import timeit
+
+from pyniryo.api.communication_functions import build_command_dict, dict_to_packet, request_to_packet
+from pyniryo.api.enums_communication import Command, PinID
+from pyniryo.api.mock_server import MockRobotServer
+from pyniryo.api.recording import SessionRecorder, SessionReplayer
+from pyniryo.api.schemas import SCHEMAS
+from pyniryo.api.tcp_client import NiryoRobot
+
+NB_CALLS = 10000
+NB_ROUNDS = 20
+CALLS = (
+    ("digital_read", lambda robot: robot.digital_read(PinID.DI1)),
+    ("get_joints", lambda robot: robot.get_joints()),
+    ("get_pose", lambda robot: robot.get_pose()),
+    ("get_digital_io_state", lambda robot: robot.get_digital_io_state()),
+)
+
+
+def run_calls(robot):
+    """
+    :return: the lowest CPU time per call of each function, over rounds of calls
+    """
+    durations = {}
+    for name, function in CALLS:
+        durations[name] = float("inf")
+        for _ in range(NB_ROUNDS):
+            start = time.thread_time()
+            for _ in range(NB_CALLS // NB_ROUNDS):
+                function(robot)
+            durations[name] = min(durations[name], (time.thread_time() - start) / (NB_CALLS // NB_ROUNDS))
+    return durations
+
+
+def encoding_times():
+    """
+    :return: time to build and encode a request, with the generic functions and with the compiled schemas
+    """
+    times = {}
+    for name, command, parameters in (("digital_read", Command.DIGITAL_READ, (PinID.DI1, )),
+                                      ("get_joints", Command.GET_JOINTS, ())):
+        schema = SCHEMAS[command]
+        generic = timeit.repeat(lambda: dict_to_packet(build_command_dict(command, *parameters)), number=10000)
+        compiled = timeit.repeat(lambda: request_to_packet(schema.build(*parameters)), number=10000)
+        times[name] = min(generic) / 10000, min(compiled) / 10000
+    return times
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "session.rec")
+    with MockRobotServer(time_scale=0.0, verbose=False):
+        with SessionRecorder(path) as recorder:
+            robot = NiryoRobot("127.0.0.1", verbose=False, recorder=recorder)
+            run_calls(robot)
+            robot.close_connection()
+
+    robot = NiryoRobot("127.0.0.1", verbose=False, connector=SessionReplayer(path).create_connection)
+    durations = run_calls(robot)
+    robot.close_connection()
+    os.remove(path)
+
+    print("{:>22} | {:>17}".format("call", "client CPU (us)"))
+    for name, _ in CALLS:
+        print("{:>22} | {:>17.2f}".format(name, durations[name] * 1e6))
+
+    print("\n{:>22} | {:>12} | {:>13}".format("request encoding", "generic (us)", "compiled (us)"))
+    for name, (generic, compiled) in encoding_times().items():
+        print("{:>22} | {:>12.2f} | {:>13.2f}".format(name, generic * 1e6, compiled * 1e6))
+
+
+if __name__ == '__main__':
+    main()
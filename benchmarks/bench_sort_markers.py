@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark of the selection of the workspace's markers among several candidates.
+
+Scenes are generated with the 4 markers of a workspace seen in perspective, plus distractor markers.
+``complicated_sort_markers`` is compared with the former implementation, which computed one perspective transform
+per combination in Python. The former implementation only looked at the combinations of the first origin marker
+candidate, and only handled up to 6 candidates.
+
+Usage: ::
+
+    python -m benchmarks.bench_sort_markers
+"""
+
+import itertools
+import time
+
+import cv2
+import numpy as np
+
+from pyniryo.vision.markers_detection import complicated_sort_markers, sort_markers_detection
+
+
+class FakeMarker(object):
+
+    def __init__(self, cx, cy, identifiant):
+        self.cx, self.cy = int(cx), int(cy)
+        self.identifiant = identifiant
+
+    def __repr__(self):
+        return "{}({}, {})".format(self.identifiant, self.cx, self.cy)
+
+
+def legacy_complicated_sort_markers(list_markers, workspace_ratio):
+    """
+    Markers selection as it was before the vectorization
+    """
+    if workspace_ratio >= 1.0:
+        target_w_area = int(round(workspace_ratio * 200))
+        target_h_area = 200
+    else:
+        ratio_w_h = 1.0 / workspace_ratio
+        target_h_area = int(round(ratio_w_h * 200))
+        target_w_area = 200
+    list_id = [marker.identifiant for marker in list_markers]
+    count_type_a = list_id.count("A")
+    count_type_b = list_id.count("B")
+    if count_type_a < 3 > count_type_b:
+        return None
+    if count_type_a < count_type_b:
+        id_first_marker = "A"
+        id_second_marker = "B"
+    else:
+        id_first_marker = "B"
+        id_second_marker = "A"
+    list_combinaisons = []
+    list_marker_1 = [marker for marker in list_markers if marker.identifiant == id_first_marker]
+    list_marker_2 = [marker for marker in list_markers if marker.identifiant == id_second_marker]
+    if list_marker_1:
+        list_combinaisons_marker_2 = itertools.combinations(list_marker_2, 3)
+        for marker1 in list_marker_1:
+            for combi_markers2 in list_combinaisons_marker_2:
+                combin = [marker1] + list(combi_markers2)
+
+                list_combinaisons.append(sort_markers_detection(combin))
+    else:
+        for combinaison in itertools.combinations(list_marker_2, 4):
+            list_combinaisons.append(combinaison)
+    if not list_combinaisons:
+        return None
+
+    final_pts = np.array([[0, 0], [target_w_area - 1, 0], [target_w_area - 1, target_h_area - 1],
+                          [0, target_h_area - 1]],
+                         dtype=np.float32)
+    list_det_transfo_matrix = []
+    for combin in list_combinaisons:
+        points_grid = np.array([[mark.cx, mark.cy] for mark in combin], dtype=np.float32)
+
+        transfo_matrix = cv2.getPerspectiveTransform(points_grid, final_pts)
+        list_det_transfo_matrix.append(np.linalg.det(transfo_matrix))
+
+    best_combin_ind = np.argmin(abs(np.array(list_det_transfo_matrix) - 1))
+    best_markers = list_combinaisons[best_combin_ind]
+    return best_markers
+
+
+def make_scene(nb_distractors, random_state):
+    """
+    :return: markers of the scene, and the 4 markers of the workspace in order
+    """
+    # Workspace of about 200x200 pixels seen with a slight perspective, origin marker "A" and 3 "B"
+    center = random_state.uniform(250, 390, 2)
+    half_size = random_state.uniform(90, 110)
+    skew = random_state.uniform(-10, 10, (4, 2))
+    corners = center + np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]]) * half_size + skew
+    rotation = random_state.randint(4)
+    corners = np.roll(corners, -rotation, axis=0)
+    workspace = [FakeMarker(x, y, "A" if i == 0 else "B") for i, (x, y) in enumerate(corners)]
+
+    distractors = []
+    while len(distractors) < nb_distractors:
+        x, y = random_state.uniform(0, 640), random_state.uniform(0, 480)
+        if min(np.hypot(x - marker.cx, y - marker.cy) for marker in workspace) > 30:
+            distractors.append(FakeMarker(x, y, "A" if random_state.rand() < 0.3 else "B"))
+
+    markers = workspace + distractors
+    random_state.shuffle(markers)
+    return markers, workspace
+
+
+def bench(function, scenes, nb_iterations=5):
+    nb_found = 0
+    start = time.perf_counter()
+    for _ in range(nb_iterations):
+        for markers, workspace in scenes:
+            result = function(markers, 1.0)
+            nb_found += result is not None and list(result) == workspace
+    duration = (time.perf_counter() - start) / (nb_iterations * len(scenes))
+    return duration, nb_found / (nb_iterations * len(scenes))
+
+
+def main(nb_scenes=100):
+    random_state = np.random.RandomState(0)
+    print("{:>10} | {:>11} | {:>10} | {:>12} | {:>10} | {:>7}".format("candidates", "legacy (ms)", "legacy ok",
+                                                                      "current (ms)", "current ok", "speedup"))
+    for nb_distractors in range(1, 9):
+        scenes = [make_scene(nb_distractors, random_state) for _ in range(nb_scenes)]
+        legacy, legacy_success = bench(legacy_complicated_sort_markers, scenes)
+        current, current_success = bench(complicated_sort_markers, scenes)
+        print("{:>10} | {:>11.3f} | {:>9.0%} | {:>12.3f} | {:>9.0%} | {:>6.1f}x".format(
+            4 + nb_distractors, legacy * 1e3, legacy_success, current * 1e3, current_success, legacy / current))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Benchmark of the vectorized rotation conversions of :mod:`pyniryo.api.transforms`,
+against the same work done pose by pose.
+
+Usage: ::
+
+    python -m benchmarks.bench_transforms
+"""
+
+import timeit
+
+import numpy as np
+
+from pyniryo.api import transforms
+from pyniryo.api.objects import PoseArray, PoseObject
+
+NB_POSES = 10000
+NB_ROUNDS = 5
+
+
+def best_time(function):
+    return min(timeit.repeat(function, number=1, repeat=NB_ROUNDS))
+
+
+def compare_one_by_one(poses_a, poses_b, decimal=2):
+    # What tests/src/base_test.py did for each pair of poses
+    threshold = 1 - 10**-decimal
+    return [
+        np.allclose(a.to_list()[:3], b.to_list()[:3], atol=10**-decimal)
+        and abs(np.dot(a.quaternion(), b.quaternion())) > threshold for a, b in zip(poses_a, poses_b)
+    ]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    values = rng.uniform(-1.0, 1.0, (NB_POSES, 6))
+    noisy_values = values + rng.normal(0.0, 1e-3, values.shape)
+    poses, noisy_poses = [PoseObject(*row) for row in values], [PoseObject(*row) for row in noisy_values]
+    pose_array, noisy_pose_array = PoseArray(values), PoseArray(noisy_values)
+
+    cases = (
+        ("euler to quaternion", lambda: [pose.quaternion() for pose in poses], pose_array.quaternions),
+        ("compare poses", lambda: compare_one_by_one(poses, noisy_poses),
+         lambda: transforms.poses_almost_equal(pose_array, noisy_pose_array, 1e-2, 2 * np.arccos(1 - 1e-2))),
+    )
+
+    print("{} poses".format(NB_POSES))
+    print("{:>20} | {:>15} | {:>15} | {:>7}".format("operation", "one by one (ms)", "vectorized (ms)", "speedup"))
+    for name, loop_function, vectorized_function in cases:
+        loop_time, vectorized_time = best_time(loop_function), best_time(vectorized_function)
+        print("{:>20} | {:>15.2f} | {:>15.2f} | {:>6.0f}x".format(name, loop_time * 1e3, vectorized_time * 1e3,
+                                                                  loop_time / vectorized_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of the undistortion of the camera images.
+
+Compares ``cv2.undistort``, which computes the undistortion map for each image,
+with :class:`~pyniryo.vision.image_functions.Undistorter`, which computes it once and only remaps the images.
+
+Usage: ::
+
+    python -m benchmarks.bench_undistort
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from pyniryo.vision.image_functions import Undistorter, undistort_image
+
+WIDTH, HEIGHT = 640, 480
+# Typical intrinsics of the robot's camera
+MTX = np.array([[520.0, 0.0, 320.0], [0.0, 520.0, 240.0], [0.0, 0.0, 1.0]])
+DIST = np.array([[0.12, -0.25, 0.001, -0.002, 0.08]])
+
+
+def bench(undistort_function, img, nb_iterations):
+    undistort_function(img)
+    start = time.perf_counter()
+    for _ in range(nb_iterations):
+        undistort_function(img)
+    return (time.perf_counter() - start) / nb_iterations
+
+
+def main(nb_iterations=200):
+    img = (np.random.RandomState(0).rand(HEIGHT, WIDTH, 3) * 255).astype(np.uint8)
+    undistorter = Undistorter(MTX, DIST)
+
+    reference = cv2.undistort(img, MTX, DIST)
+    max_difference = np.abs(reference.astype(int) - undistorter.undistort(img).astype(int)).max()
+
+    legacy = bench(lambda image: cv2.undistort(src=image, cameraMatrix=MTX, distCoeffs=DIST), img, nb_iterations)
+    cached = bench(lambda image: undistort_image(image, MTX, DIST), img, nb_iterations)
+    remap = bench(undistorter.undistort, img, nb_iterations)
+
+    print("Undistortion of a {}x{} image, max difference with cv2.undistort: {}".format(WIDTH, HEIGHT, max_difference))
+    print("{:>16} | {:>10} | {:>8}".format("method", "time (ms)", "speedup"))
+    for name, duration in (("cv2.undistort", legacy), ("undistort_image", cached), ("Undistorter", remap)):
+        print("{:>16} | {:>10.3f} | {:>7.1f}x".format(name, duration * 1e3, legacy / duration))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,32 @@
+import importlib
+
 from .api import *
-from .vision import *
+
+# Names of the vision package, which is imported on first access as it loads OpenCV
+_VISION_NAMES = frozenset([
+    'BLACK', 'BLUE', 'ColorHSV', 'ColorHSVPrime', 'Frame', 'FrameStream', 'GREEN', 'KernelType', 'MorphoType',
+    'ORANGE', 'ObjectType', 'PURPLE', 'RED', 'Undistorter', 'WHITE', 'WorkspaceTracker', 'add_annotation_to_image',
+    'biggest_contour_finder', 'biggest_contours_finder', 'compress_image', 'concat_imgs', 'cv2', 'debug_markers',
+    'debug_threshold_color', 'draw_angle', 'draw_barycenter', 'draw_contours', 'enums', 'extract_img_from_ros_msg',
+    'extract_img_workspace', 'font', 'font_scale_big', 'font_scale_normal', 'frame_stream', 'get_contour_angle',
+    'get_contour_barycenter', 'image_functions', 'markers_detection', 'morphological_transformations',
+    'relative_pos_from_pixels', 'resize_img', 'show_img', 'show_img_and_check_close', 'show_img_and_wait_close',
+    'thickness_big', 'thickness_small', 'threshold_hsv', 'uncompress_image', 'undistort_image'
+])
+
+# A wildcard import still imports the vision package
+__all__ = sorted(
+    {name for name in globals() if not name.startswith('_') and name != 'importlib'} | _VISION_NAMES | {'vision'})
+
+
+def __getattr__(name):
+    if name == 'vision' or name in _VISION_NAMES:
+        vision = importlib.import_module('.vision', __name__)
+        value = vision if name == 'vision' else getattr(vision, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return __all__
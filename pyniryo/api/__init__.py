@@ -1,3 +1,5 @@
 from .tcp_client import NiryoRobot, NiryoRobotException, TcpCommandException
+from .async_tcp_client import AsyncNiryoRobot
+from .fleet import NiryoFleet
 from .objects import *
 from .enums_communication import *
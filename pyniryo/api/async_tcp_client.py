@@ -0,0 +1,330 @@
+import asyncio
+import functools
+import logging
+import struct
+from contextlib import asynccontextmanager
+
+from .binary_encoding import binary_encoding_selection, server_supports_binary, BINARY_COMMANDS
+from .communication_functions import (build_command_dict,
+                                      content_to_dict,
+                                      parse_answer,
+                                      request_to_packet_chunks,
+                                      server_supports_large_framing)
+from .enums_communication import (Command,
+                                  DEFAULT_PACKET_SIZE_INFOS,
+                                  LARGE_FRAMING,
+                                  LARGE_PACKET_SIZE_INFOS,
+                                  TCP_PORT,
+                                  TCP_TIMEOUT)
+from .exceptions import ClientNotConnectedException, HostNotReachableException, NiryoRobotException
+from .tcp_client import NiryoRobot
+from ..utils.logging import get_logger
+from ..version import __version__
+
+
+class AsyncNiryoRobot(object):
+    """
+    asyncio version of :class:`~pyniryo.api.tcp_client.NiryoRobot`.
+
+    Every public method of :class:`~pyniryo.api.tcp_client.NiryoRobot` which only exchanges requests with the robot
+    is available as a coroutine, with the same parameters and the same returned objects. Properties are not available,
+    use the corresponding ``get_*`` coroutine or :func:`call` instead. The methods which run a thread, like
+    :func:`~pyniryo.api.tcp_client.NiryoRobot.start_state_streaming`, or which don't send requests,
+    like :func:`~pyniryo.api.tcp_client.NiryoRobot.profile`, are not available.
+    The parameters checking, the requests encoding and the answers validation are the ones of the blocking client,
+    only the I/O is done on an asyncio stream. Hence, a single event loop can drive several robots.
+
+    Example: ::
+
+        async def main():
+            async with AsyncNiryoRobot() as robot:
+                await robot.connect("10.10.10.10")
+                await robot.calibrate_auto()
+                joints = await robot.get_joints()
+                await robot.move(JointsPosition(0.2, 0.0, 0.0, 0.0, 0.0, 0.0))
+
+        asyncio.run(main())
+
+    Concurrent coroutines on the same instance are executed one after the other,
+    as the robot handles the requests of a connection sequentially.
+    """
+
+    def __init__(self, verbose=True, logger=None):
+        """
+        :param verbose: Enable or disable the information logs
+        :type verbose: bool
+        :param logger: A custom logger for the AsyncNiryoRobot's instance.
+        :type logger: logging.Logger
+        """
+        self.__ip_address = None
+        self.__port = TCP_PORT
+        self.__timeout = TCP_TIMEOUT
+
+        self.__reader = None
+        self.__writer = None
+        self.__lock = None
+        self.__binary_commands = frozenset()
+        self.__packet_size_infos = DEFAULT_PACKET_SIZE_INFOS
+
+        if logger is None:
+            self.__logger = get_logger(self.__class__.__name__)
+        else:
+            self.__logger = logger
+        if not verbose:
+            self.__logger.setLevel(logging.WARNING)
+
+        # Offline client used to check the parameters and to build the returned objects
+        self.__codec = NiryoRobot(verbose=verbose, logger=self.__logger)
+
+    def __str__(self):
+        if self.__writer is not None:
+            msg = "\nConnected to server ({}) on port: {}\n".format(self.__ip_address, self.__port)
+        else:
+            msg = "Not Connected"
+
+        return msg
+
+    def __repr__(self):
+        return self.__str__()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close_connection()
+
+    # -- Connection
+    async def connect(self, ip_address):
+        """
+        Connect to the TCP Server
+
+        :param ip_address: IP Address
+        :type ip_address: str
+        :rtype: None
+        """
+        try:
+            self.__reader, self.__writer = await asyncio.wait_for(asyncio.open_connection(ip_address, self.__port),
+                                                                  self.__timeout)
+        except (asyncio.TimeoutError, OSError) as e:
+            raise ClientNotConnectedException("Unable to connect to the robot : {}".format(e))
+
+        self.__lock = asyncio.Lock()
+        self.__binary_commands = frozenset()
+        self.__packet_size_infos = DEFAULT_PACKET_SIZE_INFOS
+        self.__ip_address = ip_address
+        self.__logger.info("Connected to server ({}) on port {}".format(ip_address, self.__port))
+        await self.__handshake()
+
+    def __close_stream(self):
+        if self.__writer is None:
+            return None
+        writer, self.__reader, self.__writer = self.__writer, None, None
+        writer.close()
+        self.__logger.info("Disconnected from robot")
+        return writer
+
+    async def close_connection(self):
+        """
+        Close connection with robot
+
+        :rtype: None
+        """
+        writer = self.__close_stream()
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    # -- SEND & RECEIVE
+    async def __receive_dict(self):
+        packet_size_infos = self.__packet_size_infos
+        header = await self.__reader.readexactly(packet_size_infos["nbr_bytes"])
+        size_packet = struct.unpack(packet_size_infos["type"], header)[0]
+        return content_to_dict(await self.__reader.readexactly(size_packet))
+
+    async def __exchange(self, request, with_payload):
+        """
+        Send a request and wait for its raw answer
+
+        :return: received dict, payload
+        """
+        if self.__writer is None:
+            raise ClientNotConnectedException()
+        async with self.__lock:
+            try:
+                for chunk in request_to_packet_chunks(request, self.__binary_commands, self.__packet_size_infos):
+                    self.__writer.write(chunk)
+                    await self.__writer.drain()
+                received_dict = await self.__receive_dict()
+                payload = None
+                if with_payload:
+                    payload = await self.__reader.readexactly(received_dict["payload_size"])
+            except asyncio.CancelledError:
+                # The answer may still come, the stream cannot be used anymore
+                self.__close_stream()
+                raise
+            except (asyncio.IncompleteReadError, OSError) as e:
+                self.__logger.error(e)
+                raise HostNotReachableException()
+        return received_dict, payload
+
+    async def __send_n_receive(self, command_type, *parameter_list, **kwargs):
+        with_payload = kwargs.get("with_payload", False)
+
+        received_dict, payload = await self.__exchange(build_command_dict(command_type, *parameter_list),
+                                                       with_payload)
+        return parse_answer(received_dict, payload, with_payload)
+
+    async def __handshake(self):
+        try:
+            server_info = await self.__send_n_receive(Command.HANDSHAKE, __version__)
+        except NiryoRobotException as exception:
+            if 'Unknown command' in str(exception):
+                self.__logger.info(
+                    "This PyNiryo version is meant to be used on a more recent version of the Robot's system. "
+                    "To fully benefit from the server features it's advised to upgrade your Robot System.")
+                return
+            else:
+                raise exception from None
+        if 'message' in server_info:
+            self.__logger.info(server_info['message'])
+            self.__logger.info('To disable the MOTD, use verbose=False')
+        await self.__negotiate_protocol(server_info)
+
+    async def __negotiate_protocol(self, server_info):
+        selection = {}
+        if server_supports_binary(server_info):
+            selection.update(binary_encoding_selection())
+        if server_supports_large_framing(server_info):
+            selection["framing"] = LARGE_FRAMING
+        if not selection:
+            return
+        try:
+            await self.__send_n_receive(Command.HANDSHAKE, __version__, selection)
+        except NiryoRobotException as exception:
+            self.__logger.info("Protocol selection refused by the robot, the default one is used : {}".format(
+                exception))
+            return
+        if "encoding" in selection:
+            self.__binary_commands = frozenset(command.name for command in BINARY_COMMANDS)
+        if "framing" in selection:
+            self.__packet_size_infos = LARGE_PACKET_SIZE_INFOS
+
+    async def call(self, method_name, *args, **kwargs):
+        """
+        Run a method or read a property of :class:`~pyniryo.api.tcp_client.NiryoRobot` as a coroutine
+
+        Example: ::
+
+            hardware_status = await robot.call("get_hardware_status")
+            collision_detected = await robot.call("collision_detected")
+
+        :param method_name: name of the method or of the property
+        :type method_name: str
+        :return: what the blocking method returns
+        """
+        if isinstance(getattr(NiryoRobot, method_name), property):
+            method = functools.partial(getattr, self.__codec, method_name)
+        else:
+            method = getattr(self.__codec, method_name)
+
+        deferred_call = self.__codec._deferred_call(method, *args, **kwargs)
+        try:
+            request, with_payload = next(deferred_call)
+            while True:
+                answer = await self.__exchange(request, with_payload)
+                request, with_payload = deferred_call.send(answer)
+        except StopIteration as stop:
+            return stop.value
+
+    # -- Methods which cannot be run as is in an event loop
+    async def get_collision_detected(self):
+        """
+        True if a collision has been detected during a previous movement
+
+        :rtype: bool
+        """
+        return await self.call("collision_detected")
+
+    @staticmethod
+    async def wait(duration):
+        """
+        Wait for a certain time without blocking the event loop
+
+        :param duration: duration in seconds
+        :type duration: float
+        :rtype: None
+        """
+        await asyncio.sleep(duration)
+
+    @asynccontextmanager
+    async def jog_control(self):
+        """
+        Asynchronous context manager to enable jog control mode during a block of code
+
+        Example: ::
+
+            async with robot.jog_control():
+                await robot.jog(JointsPosition(0.1, 0.0, 0.0, 0.0, 0.0, 0.0))
+        """
+        await self.set_jog_control(True)
+        try:
+            yield
+        finally:
+            await self.set_jog_control(False)
+
+
+def _make_coroutine(name, method):
+
+    @functools.wraps(method)
+    async def coroutine(self, *args, **kwargs):
+        return await self.call(name, *args, **kwargs)
+
+    coroutine.__qualname__ = '{}.{}'.format(AsyncNiryoRobot.__name__, name)
+    return coroutine
+
+
+# Methods of the blocking client which only exchange requests with the robot, run as coroutines.
+# The other ones drive the socket or a thread themselves, or don't send requests
+_COROUTINE_METHODS = (
+    # Main purpose
+    'calibrate', 'calibrate_auto', 'need_calibration', 'get_learning_mode', 'set_learning_mode',
+    'set_arm_max_velocity', 'set_jog_control', 'clear_collision_detected',
+    # Move
+    'get_joints', 'get_pose', 'get_pose_quat', 'move', 'shift_pose', 'jog', 'move_to_home_pose', 'get_home_pose',
+    'set_home_pose', 'reset_home_pose', 'go_to_sleep', 'forward_kinematics', 'inverse_kinematics',
+    # Saved poses, pick and place, trajectories
+    'get_pose_saved', 'save_pose', 'delete_pose', 'get_saved_pose_list', 'pick', 'place', 'pick_and_place',
+    'get_trajectory_saved', 'get_saved_trajectory_list', 'execute_registered_trajectory', 'execute_trajectory',
+    'save_trajectory', 'save_last_learned_trajectory', 'update_trajectory_infos', 'delete_trajectory',
+    'clean_trajectory_memory',
+    # Tools
+    'get_current_tool_id', 'get_current_tool_position', 'update_tool', 'grasp_with_tool', 'release_with_tool',
+    'open_gripper', 'close_gripper', 'control_gripper', 'get_gripper_specs', 'pull_air_vacuum_pump',
+    'push_air_vacuum_pump', 'setup_electromagnet', 'activate_electromagnet', 'deactivate_electromagnet',
+    'enable_tcp', 'set_tcp', 'reset_tcp', 'tool_reboot', 'get_tcp',
+    # Hardware
+    'set_pin_mode', 'get_digital_io_state', 'digital_write', 'digital_read', 'get_analog_io_state', 'analog_write',
+    'analog_read', 'get_custom_button_state', 'get_hardware_status',
+    # Conveyors
+    'set_conveyor', 'unset_conveyor', 'run_conveyor', 'stop_conveyor', 'control_conveyor',
+    'get_connected_conveyors_id', 'get_conveyors_feedback',
+    # Vision
+    'get_img_compressed', 'set_brightness', 'set_contrast', 'set_saturation', 'get_image_parameters',
+    'get_target_pose_from_rel', 'get_target_pose_from_cam', 'vision_pick', 'move_to_object', 'detect_object',
+    'get_camera_intrinsics', 'save_workspace_from_robot_poses', 'save_workspace_from_points', 'delete_workspace',
+    'get_workspace_ratio', 'get_workspace_list',
+    # Dynamic frames
+    'get_saved_dynamic_frame_list', 'get_saved_dynamic_frame', 'save_dynamic_frame_from_poses',
+    'save_dynamic_frame_from_points', 'edit_dynamic_frame', 'delete_dynamic_frame',
+    # Sound
+    'get_sounds', 'play_sound', 'set_volume', 'stop_sound', 'get_sound_duration', 'say',
+    # Led ring
+    'set_led_color', 'led_ring_solid', 'led_ring_turn_off', 'led_ring_flashing', 'led_ring_alternate',
+    'led_ring_chase', 'led_ring_wipe', 'led_ring_rainbow', 'led_ring_rainbow_cycle', 'led_ring_rainbow_chase',
+    'led_ring_go_up', 'led_ring_go_up_down', 'led_ring_breath', 'led_ring_snake', 'led_ring_custom',
+)
+
+for _name in _COROUTINE_METHODS:
+    setattr(AsyncNiryoRobot, _name, _make_coroutine(_name, getattr(NiryoRobot, _name)))
@@ -0,0 +1,118 @@
+from .exceptions import NiryoRobotException
+
+
+class BatchResult(object):
+    """
+    Handle on the result of a command queued in a batch.
+    It is resolved when the batch is executed, at the end of the ``with robot.batch()`` block.
+    """
+
+    def __init__(self, name):
+        self.__name = name
+        self.__done = False
+        self.__result = None
+        self.__exception = None
+
+    def __repr__(self):
+        if not self.__done:
+            state = "pending"
+        elif self.__exception is not None:
+            state = "raised {!r}".format(self.__exception)
+        else:
+            state = "returned {!r}".format(self.__result)
+        return "<{} {} {}>".format(self.__class__.__name__, self.__name, state)
+
+    def done(self):
+        """
+        :return: ``True`` if the batch has been executed
+        :rtype: bool
+        """
+        return self.__done
+
+    def result(self):
+        """
+        :return: What the command returned. Raise the exception raised by the command if any
+        """
+        if self.exception() is not None:
+            raise self.__exception
+        return self.__result
+
+    def exception(self):
+        """
+        :return: The exception raised by the command, or None
+        :rtype: Exception
+        """
+        if not self.__done:
+            raise NiryoRobotException("The batch containing `{}` has not been executed yet".format(self.__name))
+        return self.__exception
+
+    def _set_result(self, result):
+        self.__result = result
+        self.__done = True
+
+    def _set_exception(self, exception):
+        self.__exception = exception
+        self.__done = True
+
+
+class CommandBatch(object):
+    """
+    Queue of commands sent to the robot all at once. Use it through :func:`NiryoRobot.batch`.
+
+    Each method or property of :class:`~pyniryo.api.tcp_client.NiryoRobot` can be queued in the batch.
+    The parameters are checked as soon as the command is queued, and a :class:`BatchResult` is returned.
+    """
+
+    def __init__(self, robot):
+        self.__robot = robot
+        self.__calls = []
+
+    def __len__(self):
+        return len(self.__calls)
+
+    def __getattr__(self, name):
+        attribute = getattr(type(self.__robot), name, None)
+        if name.startswith('_') or attribute is None:
+            raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+        if isinstance(attribute, property):
+            return self.call(name)
+
+        def queue_method(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        queue_method.__name__ = name
+        queue_method.__doc__ = attribute.__doc__
+        return queue_method
+
+    def call(self, name, *args, **kwargs):
+        """
+        Queue a method call or a property read
+
+        :param name: name of the NiryoRobot's method or property
+        :type name: str
+        :return: handle on the result of the command
+        :rtype: BatchResult
+        """
+        if isinstance(getattr(type(self.__robot), name), property):
+            deferred_call = self.__robot._deferred_call(getattr, self.__robot, name)
+        else:
+            deferred_call = self.__robot._deferred_call(getattr(self.__robot, name), *args, **kwargs)
+
+        batch_result = BatchResult(name)
+        try:
+            request, with_payload = next(deferred_call)
+        except StopIteration as stop:
+            # The method doesn't need to talk to the robot
+            batch_result._set_result(stop.value)
+            return batch_result
+
+        self.__calls.append((deferred_call, request, with_payload, batch_result))
+        return batch_result
+
+    def _pop_calls(self):
+        """
+        :return: The queued calls as (deferred call, first request, with payload, batch result) tuples
+        :rtype: list[tuple]
+        """
+        calls, self.__calls = self.__calls, []
+        return calls
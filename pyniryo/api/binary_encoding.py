@@ -0,0 +1,191 @@
+"""
+Compact binary encoding of the TCP packets, negotiated during the handshake.
+
+A binary packet is framed like a JSON packet, but its content starts with :data:`BINARY_MAGIC`,
+which cannot be the first byte of a JSON object. The content is a single tagged value:
+
+- ``0x00`` None, ``0x01`` False, ``0x02`` True
+- ``0x03`` int: little endian signed 64 bits
+- ``0x04`` float: little endian double
+- ``0x05`` str: unsigned 32 bits length, then the UTF-8 bytes
+- ``0x06`` list: unsigned 32 bits count, then the tagged items
+- ``0x07`` dict: unsigned 32 bits count, then the tagged str keys and tagged values
+- ``0x08`` list of floats: unsigned 32 bits count, then the packed doubles
+
+Joints, poses and trajectories are lists of floats, which are sent as packed doubles
+instead of their text representation.
+"""
+
+import struct
+
+from .enums_communication import Command
+
+BINARY_ENCODING = "binary-v1"
+BINARY_MAGIC = b'\xb1'
+
+# Commands whose requests and answers are binary encoded when the server supports it
+BINARY_COMMANDS = frozenset([
+    Command.MOVE,
+    Command.EXECUTE_TRAJECTORY,
+    Command.GET_JOINTS,
+    Command.GET_POSE,
+    Command.GET_DIGITAL_IO_STATE,
+    Command.GET_ANALOG_IO_STATE,
+])
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _FLOAT_LIST = range(9)
+
+_UINT32 = struct.Struct('<I')
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+_TAGGED_UINT32 = struct.Struct('<BI')
+_TAGGED_INT64 = struct.Struct('<Bq')
+_TAGGED_FLOAT64 = struct.Struct('<Bd')
+
+_float_list_structs = {}
+
+
+def _float_list_struct(count):
+    float_list_struct = _float_list_structs.get(count)
+    if float_list_struct is None:
+        float_list_struct = struct.Struct('<{}d'.format(count))
+        if len(_float_list_structs) < 256:
+            _float_list_structs[count] = float_list_struct
+    return float_list_struct
+
+
+# --- ENCODING --- #
+def _encode_value(value, output):
+    value_type = type(value)
+    if value_type is float:
+        output += _TAGGED_FLOAT64.pack(_FLOAT, value)
+    elif value_type is str:
+        data = value.encode('utf-8')
+        output += _TAGGED_UINT32.pack(_STR, len(data))
+        output += data
+    elif value_type is list or value_type is tuple:
+        if value and all(type(item) is float for item in value):
+            output += _TAGGED_UINT32.pack(_FLOAT_LIST, len(value))
+            output += _float_list_struct(len(value)).pack(*value)
+        else:
+            output += _TAGGED_UINT32.pack(_LIST, len(value))
+            for item in value:
+                _encode_value(item, output)
+    elif value_type is dict:
+        output += _TAGGED_UINT32.pack(_DICT, len(value))
+        for key, item in value.items():
+            if type(key) is not str:
+                raise TypeError("Only str keys can be binary encoded, got {!r}".format(key))
+            _encode_value(key, output)
+            _encode_value(item, output)
+    elif value is None:
+        output.append(_NONE)
+    elif value is True:
+        output.append(_TRUE)
+    elif value is False:
+        output.append(_FALSE)
+    elif isinstance(value, int):
+        output += _TAGGED_INT64.pack(_INT, value)
+    elif isinstance(value, float):
+        output += _TAGGED_FLOAT64.pack(_FLOAT, value)
+    elif hasattr(value, 'tolist'):
+        # numpy arrays and scalars
+        _encode_value(value.tolist(), output)
+    else:
+        raise TypeError("Object of type {} cannot be binary encoded".format(value_type.__name__))
+
+
+def encode(value):
+    """
+    Encode a value in the binary format, starting with the magic byte
+
+    :param value: None, bool, int, float, str, list, tuple or dict of these types
+    :rtype: bytearray
+    """
+    output = bytearray(BINARY_MAGIC)
+    _encode_value(value, output)
+    return output
+
+
+# --- DECODING --- #
+def _decode_value(data, offset):
+    tag = data[offset]
+    offset += 1
+    if tag == _FLOAT_LIST:
+        count = _UINT32.unpack_from(data, offset)[0]
+        offset += 4
+        return list(_float_list_struct(count).unpack_from(data, offset)), offset + 8 * count
+    if tag == _STR:
+        length = _UINT32.unpack_from(data, offset)[0]
+        offset += 4
+        return str(data[offset:offset + length], 'utf-8'), offset + length
+    if tag == _FLOAT:
+        return _FLOAT64.unpack_from(data, offset)[0], offset + 8
+    if tag == _DICT:
+        count = _UINT32.unpack_from(data, offset)[0]
+        offset += 4
+        value = {}
+        for _ in range(count):
+            key, offset = _decode_value(data, offset)
+            value[key], offset = _decode_value(data, offset)
+        return value, offset
+    if tag == _LIST:
+        count = _UINT32.unpack_from(data, offset)[0]
+        offset += 4
+        value = []
+        for _ in range(count):
+            item, offset = _decode_value(data, offset)
+            value.append(item)
+        return value, offset
+    if tag == _INT:
+        return _INT64.unpack_from(data, offset)[0], offset + 8
+    if tag == _NONE:
+        return None, offset
+    if tag == _TRUE:
+        return True, offset
+    if tag == _FALSE:
+        return False, offset
+    raise ValueError("Unknown binary tag {} at offset {}".format(tag, offset - 1))
+
+
+def decode(data):
+    """
+    Decode a binary encoded value
+
+    :param data: encoded value, starting with the magic byte
+    :type data: bytes or any object supporting the buffer protocol
+    :return: the decoded value
+    """
+    if data[:1] != BINARY_MAGIC:
+        raise ValueError("The data isn't binary encoded")
+    value, offset = _decode_value(data, 1)
+    if offset != len(data):
+        raise ValueError("{} trailing bytes after the binary encoded value".format(len(data) - offset))
+    return value
+
+
+def is_binary(data):
+    """
+    :param data: content of a packet
+    :return: ``True`` if the content is binary encoded, ``False`` if it is JSON
+    :rtype: bool
+    """
+    return data[:1] == BINARY_MAGIC
+
+
+# --- NEGOTIATION --- #
+def server_supports_binary(server_info):
+    """
+    :param server_info: answer of the server to the handshake
+    :return: ``True`` if the server advertises the binary encoding
+    :rtype: bool
+    """
+    return isinstance(server_info, dict) and BINARY_ENCODING in server_info.get("encodings", [])
+
+
+def binary_encoding_selection():
+    """
+    :return: the parameter sent in a second handshake to enable the binary encoding
+    :rtype: dict
+    """
+    return {"encoding": BINARY_ENCODING, "binary_commands": sorted(command.name for command in BINARY_COMMANDS)}
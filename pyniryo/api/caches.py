@@ -0,0 +1,284 @@
+"""
+Caches of the answers of the robot, to save the requests whose answer is already known.
+
+A :class:`MetadataCache` keeps the lists of saved poses, trajectories, workspaces, dynamic frames and sounds,
+the workspaces' ratios and the camera intrinsics during a connection. Each :class:`~pyniryo.api.tcp_client.NiryoRobot`
+has one, see :attr:`~pyniryo.api.tcp_client.NiryoRobot.metadata_cache`.
+
+A :class:`KinematicsCache` memoizes the answers of the forward and inverse kinematics requests.
+Give it to :class:`~pyniryo.api.tcp_client.NiryoRobot` through its ``kinematics_cache`` parameter,
+or set :attr:`~pyniryo.api.tcp_client.NiryoRobot.kinematics_cache`.
+
+Example: ::
+
+    cache = KinematicsCache.load("kinematics.json") if os.path.exists("kinematics.json") else KinematicsCache()
+    robot = NiryoRobot("10.10.10.10", kinematics_cache=cache)
+    for slot_pose in grid_poses:
+        robot.move(robot.inverse_kinematics(slot_pose))
+    print(cache.stats())
+    cache.save("kinematics.json")
+"""
+
+import json
+import numbers
+import threading
+from collections import OrderedDict
+
+# Version of the files written by KinematicsCache.save
+KINEMATICS_CACHE_VERSION = 2
+
+
+class KinematicsCache(object):
+    """
+    Thread safe LRU cache of the kinematics answers. The requests are keyed on their command, the hardware version
+    of the robot, their values quantized to ``resolution``, the frame and the length unit of the pose, and the TCP of
+    the robot: close enough poses or joints share the same answer. The hardware version keeps the answers of
+    another arm apart when a saved cache is loaded for another robot. The client refreshes the TCP after
+    ``set_tcp``, ``reset_tcp``, ``enable_tcp`` and ``update_tool``, so that the answers computed with another
+    TCP aren't used. The poses relative to a dynamic frame are keyed on the frame's name: the client clears the cache
+    when it saves, edits or deletes a dynamic frame or a workspace. :func:`clear` it when a frame is changed
+    by another client
+    """
+
+    def __init__(self, max_size=4096, resolution=1e-4):
+        """
+        :param max_size: maximum number of answers. The least recently used ones are dropped
+        :type max_size: int
+        :param resolution: quantization step of the values, in meters or radians
+        :type resolution: float
+        """
+        self.max_size = max_size
+        self.resolution = resolution
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    def key(self, command_name, values, tcp, metadata=(), hardware_version=None):
+        """
+        :param command_name: name of the command
+        :type command_name: str
+        :param values: joints or pose of the request
+        :type values: list[float]
+        :param tcp: TCP of the robot, as given by :func:`~pyniryo.api.tcp_client.NiryoRobot.get_tcp`. The nested
+            lists, dicts and objects with a ``to_list`` method are flattened
+        :param metadata: other values the answer depends on, like the frame of the pose
+        :type metadata: tuple
+        :param hardware_version: hardware version of the robot, as given by
+            :func:`~pyniryo.api.tcp_client.NiryoRobot.get_hardware_status`
+        :type hardware_version: str
+        :return: key of the request, made of strings, numbers, booleans and None, so that it can be saved
+        :rtype: tuple
+        """
+        return ((command_name, hardware_version) + tuple(metadata) + tuple(self.__flatten(tcp)) +
+                tuple(self.__flatten(values)))
+
+    def __flatten(self, value):
+        """
+        Yield the scalars of a nested value, the numbers quantized to the resolution and the dicts sorted by key
+        """
+        if hasattr(value, "to_list"):
+            value = value.to_list()
+        if isinstance(value, dict):
+            for item_key in sorted(value, key=str):
+                yield str(item_key)
+                yield from self.__flatten(value[item_key])
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                yield from self.__flatten(item)
+        elif isinstance(value, bool) or value is None or isinstance(value, str):
+            yield value
+        elif isinstance(value, numbers.Real):
+            yield round(value / self.resolution)
+        else:
+            yield str(value)
+
+    def get(self, key):
+        """
+        :param key: key of the request, see :func:`key`
+        :type key: tuple
+        :return: the cached answer, None if there is none
+        """
+        with self.__lock:
+            answer = self.__entries.get(key)
+            if answer is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return answer
+
+    def put(self, key, answer):
+        """
+        :param key: key of the request, see :func:`key`
+        :type key: tuple
+        :param answer: answer to cache, serializable in JSON
+        :rtype: None
+        """
+        with self.__lock:
+            self.__entries[key] = answer
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Forget the answers. The statistics are kept
+
+        :rtype: None
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        """
+        Example: ::
+
+            {"hits": 950, "misses": 50, "hit_ratio": 0.95, "size": 50, "max_size": 4096}
+
+        :return: number of hits and misses, and number of cached answers
+        :rtype: dict
+        """
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "hit_ratio": self.__hits / lookups if lookups else 0.0,
+                "size": len(self.__entries),
+                "max_size": self.max_size,
+            }
+
+    def save(self, path):
+        """
+        Write the cached answers to a JSON file, from the least to the most recently used
+
+        :param path: path of the file
+        :type path: str
+        :rtype: None
+        """
+        with self.__lock:
+            entries = [[list(key), answer] for key, answer in self.__entries.items()]
+        with open(path, "w") as cache_file:
+            json.dump({"version": KINEMATICS_CACHE_VERSION, "resolution": self.resolution, "entries": entries},
+                      cache_file)
+
+    @classmethod
+    def load(cls, path, max_size=4096):
+        """
+        Read the answers written by :func:`save`
+
+        :param path: path of the file
+        :type path: str
+        :param max_size: maximum number of answers
+        :type max_size: int
+        :rtype: KinematicsCache
+        """
+        with open(path) as cache_file:
+            content = json.load(cache_file)
+        if content.get("version") != KINEMATICS_CACHE_VERSION:
+            raise ValueError("{} is not a kinematics cache file of version {}".format(path, KINEMATICS_CACHE_VERSION))
+        cache = cls(max_size, content["resolution"])
+        for key, answer in content["entries"]:
+            cache.put(tuple(key), answer)
+        return cache
+
+
+class MetadataCache(object):
+    """
+    Thread safe cache of the metadata stored by the robot, which only changes when it is saved, edited or deleted.
+    The entries are keyed on a tuple whose first member is their kind, like ``("sounds", )`` or
+    ``("workspace_ratio", "workspace_1")``. The client invalidates the kinds changed by its own commands:
+    :func:`refresh` the cache when the metadata is changed by another client, like Niryo Studio
+    """
+
+    # Kinds of entries
+    POSES = "poses"
+    TRAJECTORIES = "trajectories"
+    WORKSPACES = "workspaces"
+    WORKSPACE_RATIO = "workspace_ratio"
+    DYNAMIC_FRAMES = "dynamic_frames"
+    SOUNDS = "sounds"
+    CAMERA_INTRINSICS = "camera_intrinsics"
+
+    def __init__(self, enabled=True):
+        """
+        :param enabled: whether the entries are kept. If False, every lookup fetches the value
+        :type enabled: bool
+        """
+        self.enabled = enabled
+        self.__lock = threading.Lock()
+        self.__entries = {}
+        # Incremented by each invalidation, so that a value fetched meanwhile isn't kept
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    def get_or_fetch(self, key, fetch):
+        """
+        :param key: key of the entry, starting with its kind
+        :type key: tuple
+        :param fetch: function requesting the value to the robot, called on a miss
+        :type fetch: callable
+        :return: the cached or fetched value. It is shared with the next lookups and must not be modified
+        """
+        with self.__lock:
+            if self.enabled and key in self.__entries:
+                self.__hits += 1
+                return self.__entries[key]
+            self.__misses += 1
+            generation = self.__generation
+        value = fetch()
+        with self.__lock:
+            if self.enabled and generation == self.__generation:
+                self.__entries[key] = value
+        return value
+
+    def invalidate(self, *kinds):
+        """
+        Forget the entries of some kinds
+
+        :param kinds: kinds of the entries, like :attr:`SOUNDS`
+        :type kinds: str
+        :rtype: None
+        """
+        with self.__lock:
+            self.__generation += 1
+            for key in [key for key in self.__entries if key[0] in kinds]:
+                del self.__entries[key]
+
+    def refresh(self):
+        """
+        Forget all the entries: they are requested again on their next lookup. The statistics are kept
+
+        :rtype: None
+        """
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
+
+    def stats(self):
+        """
+        Example: ::
+
+            {"hits": 120, "misses": 3, "hit_ratio": 0.975, "size": 3}
+
+        :return: number of hits and misses, and number of cached entries
+        :rtype: dict
+        """
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "hit_ratio": self.__hits / lookups if lookups else 0.0,
+                "size": len(self.__entries),
+            }
@@ -0,0 +1,324 @@
+import socket
+import threading
+import time
+
+from .communication_functions import (content_to_dict,
+                                      receive_exactly,
+                                      receive_packet_size,
+                                      request_to_packet,
+                                      request_to_packet_chunks)
+from .enums_communication import ChannelRole, DEFAULT_PACKET_SIZE_INFOS
+from .exceptions import ClientNotConnectedException, HostNotReachableException
+from .profiling import active_call
+
+# Commands which only read a value, and answer right away even when the robot is moving
+QUERY_COMMANDS = frozenset([
+    "GET_LEARNING_MODE",
+    "GET_COLLISION_DETECTED",
+    "GET_JOINTS",
+    "GET_POSE",
+    "GET_POSE_QUAT",
+    "GET_HOME_POSE",
+    "FORWARD_KINEMATICS",
+    "INVERSE_KINEMATICS",
+    "GET_POSE_SAVED",
+    "GET_SAVED_POSE_LIST",
+    "GET_TRAJECTORY_SAVED",
+    "GET_SAVED_TRAJECTORY_LIST",
+    "GET_SAVED_DYNAMIC_FRAME_LIST",
+    "GET_SAVED_DYNAMIC_FRAME",
+    "GET_CURRENT_TOOL_ID",
+    "GET_CURRENT_TOOL_POSITION",
+    "GET_GRIPPER_SPECS",
+    "GET_TCP",
+    "DIGITAL_READ",
+    "GET_DIGITAL_IO_STATE",
+    "GET_HARDWARE_STATUS",
+    "ANALOG_READ",
+    "GET_ANALOG_IO_STATE",
+    "CUSTOM_BUTTON_STATE",
+    "GET_CONNECTED_CONVEYORS_ID",
+    "GET_CONVEYORS_FEEDBACK",
+    "GET_TARGET_POSE_FROM_REL",
+    "GET_WORKSPACE_RATIO",
+    "GET_WORKSPACE_LIST",
+    "GET_SOUNDS",
+    "GET_SOUND_DURATION",
+])
+
+# Commands of the camera, which don't move the robot
+VISION_COMMANDS = frozenset([
+    "GET_IMAGE_COMPRESSED",
+    "GET_CAMERA_INTRINSICS",
+    "GET_IMAGE_PARAMETERS",
+    "GET_TARGET_POSE_FROM_CAM",
+    "DETECT_OBJECT",
+])
+
+
+def command_channel_role(command_name):
+    """
+    :param command_name: name of the command
+    :type command_name: str
+    :return: the role of the channel on which the command is sent
+    :rtype: ChannelRole
+    """
+    if command_name in QUERY_COMMANDS:
+        return ChannelRole.QUERY
+    if command_name in VISION_COMMANDS:
+        return ChannelRole.VISION
+    return ChannelRole.MOTION
+
+
+def _connect_socket(address, timeout):
+    client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    client_socket.settimeout(timeout)
+    try:
+        client_socket.connect(address)
+    except (socket.timeout, socket.error):
+        client_socket.close()
+        raise
+    return client_socket
+
+
+class Channel(object):
+    """
+    TCP connection to the robot. The robot answers the requests of a connection one after the other,
+    so each request and its answer are exchanged while holding the channel's lock.
+    """
+
+    def __init__(self, role, logger, metrics=None, recorder=None, connector=None):
+        """
+        :param role: commands sent on this channel
+        :type role: ChannelRole
+        :param logger: logger of the robot instance
+        :type logger: logging.Logger
+        :param metrics: metrics in which the exchanged requests are recorded
+        :type metrics: RobotMetrics
+        :param recorder: recorder of the bytes exchanged on the connection
+        :type recorder: SessionRecorder
+        :param connector: function opening the connection instead of a TCP socket,
+            with the signature of :func:`socket.create_connection`
+        :type connector: callable
+        """
+        self.role = role
+        self.lock = threading.RLock()
+        # Names of the commands sent binary encoded and size of the packets' header, negotiated during the handshake
+        self.binary_commands = frozenset()
+        self.packet_size_infos = DEFAULT_PACKET_SIZE_INFOS
+
+        self.metrics = metrics
+        self.recorder = recorder
+        self.connector = connector
+
+        self.__socket = None
+        self.__logger = logger
+
+    def __repr__(self):
+        return "<{} {} {}>".format(self.__class__.__name__,
+                                   self.role.name,
+                                   "connected" if self.connected else "not connected")
+
+    @property
+    def connected(self):
+        """
+        :type: bool
+        """
+        return self.__socket is not None
+
+    def connect(self, ip_address, port, timeout):
+        """
+        Open the connection
+
+        :param ip_address: IP address of the robot
+        :type ip_address: str
+        :param port: port of the robot's TCP server
+        :type port: int
+        :param timeout: maximum time to connect, in seconds. It is kept for the exchanges until
+            :func:`set_timeout` is called, so that a robot which doesn't answer the handshake doesn't block
+        :type timeout: float
+        :rtype: None
+        """
+        try:
+            client_socket = (self.connector or _connect_socket)((ip_address, port), timeout)
+        except (socket.timeout, socket.error) as e:
+            raise ClientNotConnectedException("Unable to connect to the robot : {}".format(e))
+        if self.recorder is not None:
+            client_socket = self.recorder.wrap(client_socket, self.role.name)
+        self.__socket = client_socket
+        self.binary_commands = frozenset()
+        self.packet_size_infos = DEFAULT_PACKET_SIZE_INFOS
+
+    def set_timeout(self, timeout):
+        """
+        :param timeout: maximum time to wait for each answer, in seconds. None waits as long as the robot needs,
+            like during a long motion
+        :type timeout: float
+        :rtype: None
+        """
+        client_socket = self.__socket
+        if client_socket is not None:
+            client_socket.settimeout(timeout)
+
+    def close(self):
+        """
+        Close the connection
+
+        :return: ``True`` if the connection was open
+        :rtype: bool
+        """
+        client_socket, self.__socket = self.__socket, None
+        if client_socket is None:
+            return False
+        try:
+            client_socket.shutdown(socket.SHUT_RDWR)
+            client_socket.close()
+        except socket.error:
+            pass
+        return True
+
+    # - Sending
+    def to_packet(self, request):
+        """
+        :param request: dict of a command
+        :type request: dict
+        :return: packet of the request, encoded as negotiated on this channel
+        :rtype: bytes
+        """
+        return request_to_packet(request, self.binary_commands, self.packet_size_infos)
+
+    def send_request(self, request, call=None):
+        """
+        :param request: dict of a command
+        :type request: dict
+        :param call: profile of the call which sends the request
+        :type call: CallProfile
+        :return: number of bytes sent
+        :rtype: int
+        """
+        nbr_bytes = 0
+        for chunk in request_to_packet_chunks(request, self.binary_commands, self.packet_size_infos):
+            if call is not None:
+                call.mark("encode")
+            self.send_packet(chunk)
+            if call is not None:
+                call.mark("send")
+            nbr_bytes += len(chunk)
+        return nbr_bytes
+
+    def send_packet(self, packet):
+        client_socket = self.__socket
+        if client_socket is None:
+            raise ClientNotConnectedException()
+        try:
+            client_socket.sendall(packet)
+        except socket.error as e:
+            self.__logger.error(e)
+            raise HostNotReachableException()
+
+    # - Receiving
+    def receive(self, with_payload):
+        """
+        Receive the answer of a request
+
+        :param with_payload: whether the answer is followed by a payload
+        :type with_payload: bool
+        :return: received dict, payload
+        :rtype: tuple
+        """
+        received_dict, payload, _ = self.__receive(with_payload)
+        return received_dict, payload
+
+    def __receive(self, with_payload, call=None):
+        """
+        :return: received dict, payload, number of bytes received
+        """
+        client_socket = self.__socket
+        if client_socket is None:
+            raise ClientNotConnectedException()
+        received_dict, payload = None, None
+        try:
+            size = receive_packet_size(client_socket, self.packet_size_infos)
+            if call is not None:
+                call.mark("wait")
+            if size is not None:
+                content = receive_exactly(client_socket, size)
+                if call is not None:
+                    call.mark("receive")
+                received_dict = content_to_dict(content)
+                if call is not None:
+                    call.mark("decode")
+            if received_dict and with_payload:
+                payload = receive_exactly(client_socket, received_dict["payload_size"])
+                if call is not None:
+                    call.mark("receive")
+        except socket.error as e:
+            self.__logger.error(e)
+            raise HostNotReachableException()
+        if not received_dict or (with_payload and payload is None):
+            raise HostNotReachableException()
+        nbr_bytes = self.packet_size_infos["nbr_bytes"] + size + (len(payload) if payload is not None else 0)
+        return received_dict, payload, nbr_bytes
+
+    def exchange(self, request, with_payload):
+        """
+        Send a request and receive its answer
+
+        :param request: dict of the command
+        :type request: dict
+        :param with_payload: whether the answer is followed by a payload
+        :type with_payload: bool
+        :return: received dict, payload
+        :rtype: tuple
+        """
+        call = active_call()
+        with self.lock:
+            start_time = time.perf_counter()
+            if call is not None:
+                call.mark("queue")
+            try:
+                nbr_bytes_sent = self.send_request(request, call)
+                received_dict, payload, nbr_bytes_received = self.__receive(with_payload, call)
+            except (ClientNotConnectedException, HostNotReachableException):
+                self.__record_failure(request)
+                raise
+            self.__record(request, start_time, nbr_bytes_sent, received_dict, nbr_bytes_received)
+        return received_dict, payload
+
+    def exchange_many(self, requests):
+        """
+        Send requests back to back, then receive their answers in order
+
+        :param requests: dict of each command, and whether its answer is followed by a payload
+        :type requests: list[(dict, bool)]
+        :return: received dict and payload of each request
+        :rtype: list[tuple]
+        """
+        answers = []
+        with self.lock:
+            start_time = time.perf_counter()
+            packets = [self.to_packet(request) for request, _ in requests]
+            try:
+                self.send_packet(b"".join(packets))
+                for (request, with_payload), packet in zip(requests, packets):
+                    received_dict, payload, nbr_bytes_received = self.__receive(with_payload)
+                    self.__record(request, start_time, len(packet), received_dict, nbr_bytes_received)
+                    answers.append((received_dict, payload))
+            except (ClientNotConnectedException, HostNotReachableException):
+                for request, _ in requests[len(answers):]:
+                    self.__record_failure(request)
+                raise
+        return answers
+
+    # - Metrics
+    def __record(self, request, start_time, nbr_bytes_sent, received_dict, nbr_bytes_received):
+        if self.metrics is not None:
+            self.metrics.record(request["command"],
+                                time.perf_counter() - start_time,
+                                nbr_bytes_sent,
+                                nbr_bytes_received,
+                                error=received_dict.get("status") != "OK")
+
+    def __record_failure(self, request):
+        if self.metrics is not None:
+            self.metrics.record_failure(request["command"])
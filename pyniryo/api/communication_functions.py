@@ -6,11 +6,64 @@ import sys
 import ast
 import json
 import struct
+from enum import Enum
 
-from .enums_communication import READ_SIZE, DEFAULT_PACKET_SIZE_INFOS
+from .binary_encoding import decode, encode, is_binary
+from .enums_communication import READ_SIZE, DEFAULT_PACKET_SIZE_INFOS, LARGE_FRAMING
+from .exceptions import InvalidAnswerException, NiryoRobotException, TcpCommandException
+from .schemas import SCHEMAS_BY_NAME
+
+# Commands whose JSON requests are encoded piece by piece and sent in several pieces, as they can be very long
+STREAMED_COMMANDS = frozenset([
+    "EXECUTE_TRAJECTORY",
+    "EXECUTE_TRAJECTORY_FROM_POSES",
+    "EXECUTE_TRAJECTORY_FROM_POSES_AND_JOINTS",
+    "SAVE_TRAJECTORY",
+])
+
+# Size of the pieces written on the socket when a request is streamed
+STREAM_CHUNK_SIZE = 64 * 1024
+# Number of items of a streamed list encoded at once
+JSON_SLICE_SIZE = 256
 
 
 # --- RECEPTION -- #
+def receive_exactly(sckt, size, buffer_size=READ_SIZE):
+    """
+    Receive exactly ``size`` bytes in a single preallocated buffer.
+    Data is read in place with ``recv_into``, so no intermediate bytes object is created
+
+    :param sckt: the socket
+    :param size: number of bytes to read
+    :param buffer_size: maximum number of bytes read per ``recv_into`` call
+    :return: memoryview on the received bytes, or None if the connection has been closed before the end
+    :rtype: memoryview
+    """
+    view = memoryview(bytearray(size))
+    nbr_received = 0
+    while nbr_received < size:
+        nbr_read = sckt.recv_into(view[nbr_received:], min(buffer_size, size - nbr_received))
+        if nbr_read == 0:
+            return None
+        nbr_received += nbr_read
+    return view
+
+
+def receive_packet_size(sckt, packet_size_infos=DEFAULT_PACKET_SIZE_INFOS):
+    """
+    Receive the header of a packet, which contains the size of the packet
+
+    :param sckt: the socket
+    :param packet_size_infos: Format de l'objet du message : permet de savoir sur cb de bytes est codee la taille
+    :return: size of the incoming packet, or None if the connection has been closed
+    :rtype: int
+    """
+    received_data = receive_exactly(sckt, packet_size_infos["nbr_bytes"])
+    if received_data is None:
+        return None
+    return int(struct.unpack(packet_size_infos["type"], received_data)[0])
+
+
 def receive_data(sckt, packet_size_infos, buffer_size):
     """
     Receive msg which cannot be contained in only one buffer
@@ -18,19 +71,16 @@ def receive_data(sckt, packet_size_infos, buffer_size):
     :param sckt: the socket
     :param packet_size_infos: Format de l'objet du message : permet de savoir sur cb de bytes est codee la taille
     :param buffer_size: buffer size for reading socket's buffer
-    :return: Bytes corresponding to received packet !
+    :return: String corresponding to received packet !
     """
-    nbr_bytes = packet_size_infos["nbr_bytes"]
-    received_data = sckt.recv(nbr_bytes)
-    if len(received_data) != nbr_bytes:
+    size_packet = receive_packet_size(sckt, packet_size_infos)
+    if size_packet is None:
+        return None
+    received_data = receive_exactly(sckt, size_packet, buffer_size)
+    if received_data is None:
         return None
-    size_packet = int(struct.unpack(packet_size_infos["type"], received_data)[0])
-    received_big_data = "" if sys.version_info[0] == 2 else b""
-
-    while len(received_big_data) < size_packet:
-        received_big_data += sckt.recv(min(buffer_size, size_packet - len(received_big_data)))
 
-    return received_big_data if sys.version_info[0] == 2 else received_big_data.decode()
+    return received_data.tobytes() if sys.version_info[0] == 2 else str(received_data, 'utf-8')
 
 
 def receive_dict(sckt, packet_size_infos=DEFAULT_PACKET_SIZE_INFOS, buffer_size=READ_SIZE):
@@ -40,10 +90,12 @@ def receive_dict(sckt, packet_size_infos=DEFAULT_PACKET_SIZE_INFOS, buffer_size=
     :param sckt: the socket
     :param packet_size_infos: Format de l'objet du message : permet de savoir sur cb de bytes est codee la taille
     :param buffer_size: buffer size for reading socket's buffer
-    :return:
+    :return: dict of the JSON or binary encoded packet
     """
-    msg = receive_data(sckt, buffer_size=buffer_size, packet_size_infos=packet_size_infos)
-    return data_to_dict(msg)
+    size_packet = receive_packet_size(sckt, packet_size_infos)
+    if size_packet is None:
+        return None
+    return content_to_dict(receive_exactly(sckt, size_packet, buffer_size))
 
 
 def receive_dict_w_payload(sckt, packet_size_infos=DEFAULT_PACKET_SIZE_INFOS, buffer_size=READ_SIZE):
@@ -54,17 +106,67 @@ def receive_dict_w_payload(sckt, packet_size_infos=DEFAULT_PACKET_SIZE_INFOS, bu
     :param sckt: the socket
     :param packet_size_infos: Format de l'objet du message : permet de savoir sur cb de bytes est codee la taille
     :param buffer_size: buffer size for reading socket's buffer
-    :return: dict of packet's JSON, payload
+    :return: dict of packet's JSON, payload as a memoryview on the received bytes
     """
     dict_data = receive_dict(sckt, buffer_size=buffer_size, packet_size_infos=packet_size_infos)
-    payload_size = dict_data["payload_size"]
-    received_payload = "" if sys.version_info[0] == 2 else b""
-    while len(received_payload) < payload_size:
-        received_payload += sckt.recv(buffer_size)
+    if dict_data is None:
+        return None, None
+    received_payload = receive_exactly(sckt, dict_data["payload_size"], buffer_size)
 
     return dict_data, received_payload
 
 
+# - COMMANDS - #
+def build_command_dict(command_type, *parameter_list):
+    """
+    Build the dict of a command, ready to be converted to a packet
+
+    :param command_type: the command
+    :type command_type: Command
+    :param parameter_list: parameters of the command
+    :return: dict of the command
+    :rtype: dict
+    """
+    command = command_type.name
+    new_param_list = []
+    for parameter in parameter_list:
+        if parameter is None:
+            new_param_list.append("None")
+        elif isinstance(parameter, Enum):
+            new_param_list.append(parameter.name)
+        elif isinstance(parameter, bool):
+            new_param_list.append(str(parameter).upper())
+        else:
+            new_param_list.append(parameter)
+
+    return {"command": command, "param_list": new_param_list}
+
+
+def parse_answer(received_dict, payload=None, with_payload=False):
+    """
+    Check the answer of the robot and extract its content
+
+    :param received_dict: dict of the answer
+    :type received_dict: dict
+    :param payload: payload received along the answer
+    :param with_payload: whether the payload has to be returned
+    :type with_payload: bool
+    :return: the returned parameters, and the payload if ``with_payload`` is True
+    """
+    answer_status = received_dict["status"]
+    if answer_status not in ["OK", "KO"]:
+        raise InvalidAnswerException(answer_status)
+    if received_dict["status"] != "OK":
+        raise NiryoRobotException("Command {} KO : {}".format(received_dict['command'], received_dict["message"]))
+    list_ret_param = received_dict["list_ret_param"]
+    if len(list_ret_param) == 1:
+        list_ret_param = list_ret_param[0]
+    if not with_payload:
+        return list_ret_param
+    else:
+        return list_ret_param, payload
+
+
 # - JSON - #
 def data_to_dict(data):
     """
@@ -78,6 +180,21 @@ def data_to_dict(data):
     return json.loads(data)
 
 
+def content_to_dict(content):
+    """
+    Convert the content of a packet, either JSON or binary encoded, to a dict
+
+    :param content: content of the packet
+    :type content: bytes or any object supporting the buffer protocol
+    :return: dict of this content
+    """
+    if content is None:
+        return None
+    if is_binary(content):
+        return decode(content)
+    return json.loads(str(content, 'utf-8'))
+
+
 def dict_to_packet(dict_obj, packet_size_infos=DEFAULT_PACKET_SIZE_INFOS):
     """
     Convert dict to packet
@@ -91,6 +208,144 @@ def dict_to_packet(dict_obj, packet_size_infos=DEFAULT_PACKET_SIZE_INFOS):
     if sys.version_info[0] == 3:
         json_obj = json_obj.encode()
     packet = "" if sys.version_info[0] == 2 else b""
-    packet += struct.pack(packet_size_infos["type"], len(json_obj))
+    packet += pack_packet_size(len(json_obj), packet_size_infos)
     packet += json_obj
     return packet
+
+
+def dict_to_binary_packet(dict_obj, packet_size_infos=DEFAULT_PACKET_SIZE_INFOS):
+    """
+    Convert dict to a binary encoded packet
+
+    :type dict_obj: dict
+    :param packet_size_infos: Format of the size of the packet
+    :return: packet
+    :rtype: bytes
+    """
+    content = encode(dict_obj)
+    return pack_packet_size(len(content), packet_size_infos) + content
+
+
+def request_to_packet(request_dict, binary_commands=(), packet_size_infos=DEFAULT_PACKET_SIZE_INFOS):
+    """
+    Convert the dict of a command to a packet, binary encoded if the command is one of ``binary_commands``
+
+    :param request_dict: dict of the command
+    :type request_dict: dict
+    :param binary_commands: names of the commands to binary encode
+    :type binary_commands: set[str]
+    :param packet_size_infos:
+    :return: packet
+    :rtype: bytes
+    """
+    if request_dict["command"] in binary_commands:
+        return dict_to_binary_packet(request_dict, packet_size_infos)
+    schema = SCHEMAS_BY_NAME.get(request_dict["command"])
+    if schema is None or len(request_dict) != 2:
+        return dict_to_packet(request_dict, packet_size_infos)
+    # The JSON of the command's name is encoded once, by its schema
+    content = schema.to_json(request_dict["param_list"])
+    return pack_packet_size(len(content), packet_size_infos) + content
+
+
+def request_to_packet_chunks(request_dict, binary_commands=(), packet_size_infos=DEFAULT_PACKET_SIZE_INFOS):
+    """
+    Convert the dict of a command to the successive pieces of its packet.
+
+    The JSON requests of the :data:`STREAMED_COMMANDS` are encoded once, piece by piece, into a single buffer:
+    no intermediate string of the whole JSON is built, so the memory used by the encoding is about the size of
+    the encoded request, on top of the request itself. The size of the packet is then known, so an exception
+    is raised before anything is sent if the packet is too long for the framing, and the buffer is sent in pieces
+    of :data:`STREAM_CHUNK_SIZE` bytes after the header. The other requests are a single piece.
+
+    :param request_dict: dict of the command
+    :type request_dict: dict
+    :param binary_commands: names of the commands to binary encode
+    :type binary_commands: set[str]
+    :param packet_size_infos:
+    :return: pieces of the packet, bytes or memoryviews to be written one after the other
+    :rtype: Iterator[bytes]
+    """
+    if request_dict["command"] not in STREAMED_COMMANDS or request_dict["command"] in binary_commands:
+        return iter([request_to_packet(request_dict, binary_commands, packet_size_infos)])
+    content = bytearray()
+    for chunk in iter_json(request_dict):
+        content += chunk.encode()
+    return _iter_streamed_packet(pack_packet_size(len(content), packet_size_infos), content)
+
+
+def _iter_streamed_packet(header, content):
+    yield header
+    content = memoryview(content)
+    for start in range(0, len(content), STREAM_CHUNK_SIZE):
+        yield content[start:start + STREAM_CHUNK_SIZE]
+
+
+def iter_json(value, depth=3):
+    """
+    Encode a value in JSON piece by piece. The concatenation of the pieces is equal to ``json.dumps(value)``
+
+    :param value: value to encode
+    :param depth: number of nested lists and dicts split into pieces. Deeper values are encoded at once
+    :type depth: int
+    :return: pieces of the JSON
+    :rtype: Iterator[str]
+    """
+    if depth == 1 and isinstance(value, (list, tuple)):
+        # The items are encoded at once, by slices to limit the number of calls
+        yield '['
+        for start in range(0, len(value), JSON_SLICE_SIZE):
+            yield (', ' if start else '') + json.dumps(value[start:start + JSON_SLICE_SIZE])[1:-1]
+        yield ']'
+    elif depth > 0 and isinstance(value, (list, tuple)):
+        yield '['
+        for index, item in enumerate(value):
+            if index:
+                yield ', '
+            yield from iter_json(item, depth - 1)
+        yield ']'
+    elif depth > 0 and isinstance(value, dict):
+        yield '{'
+        for index, (key, item) in enumerate(value.items()):
+            yield (', ' if index else '') + json.dumps(key) + ': '
+            yield from iter_json(item, depth - 1)
+        yield '}'
+    else:
+        yield json.dumps(value)
+
+
+# - FRAMING - #
+def max_packet_size(packet_size_infos=DEFAULT_PACKET_SIZE_INFOS):
+    """
+    :param packet_size_infos: Format of the size of the packets
+    :return: the maximum size of the content of a packet, in bytes
+    :rtype: int
+    """
+    return 2**(8 * packet_size_infos["nbr_bytes"]) - 1
+
+
+def pack_packet_size(size, packet_size_infos=DEFAULT_PACKET_SIZE_INFOS):
+    """
+    Build the header of a packet
+
+    :param size: size of the content of the packet, in bytes
+    :type size: int
+    :param packet_size_infos: Format of the size of the packet
+    :return: header of the packet
+    :rtype: bytes
+    """
+    if size > max_packet_size(packet_size_infos):
+        raise TcpCommandException(
+            "The request is {} bytes long, which exceeds the {} bytes allowed by the connection's framing. "
+            "Split the trajectory, or upgrade the robot's system to send larger requests".format(
+                size, max_packet_size(packet_size_infos)))
+    return struct.pack(packet_size_infos["type"], size)
+
+
+def server_supports_large_framing(server_info):
+    """
+    :param server_info: answer of the server to the handshake
+    :return: ``True`` if the server advertises the packets with a 4 bytes size
+    :rtype: bool
+    """
+    return isinstance(server_info, dict) and LARGE_FRAMING in server_info.get("framings", [])
@@ -11,6 +11,12 @@ DEFAULT_PACKET_SIZE_INFOS = {
     "nbr_bytes": 2,
     "type": '@H',
 }
+# Framing negotiated during the handshake to send packets larger than 65535 bytes
+LARGE_FRAMING = "u32-v1"
+LARGE_PACKET_SIZE_INFOS = {
+    "nbr_bytes": 4,
+    "type": '<I',
+}
 
 
 @unique
@@ -139,6 +145,16 @@ class ObjectShape(Enum):
     ANY = "ANY"
 
 
+@unique
+class ChannelRole(Enum):
+    """
+    Enumeration of the connections a robot instance can open, so that long motions don't block the other commands
+    """
+    MOTION = 0
+    QUERY = 1
+    VISION = 2
+
+
 @unique
 class Command(Enum):
     """
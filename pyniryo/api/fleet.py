@@ -0,0 +1,255 @@
+import concurrent.futures
+
+from .exceptions import ClientNotConnectedException, NiryoRobotException
+from .tcp_client import NiryoRobot
+
+
+class NiryoFleet(object):
+    """
+    Group of robots controlled together.
+
+    The fleet holds one connection per robot and broadcasts the calls to all the robots concurrently,
+    so a fleet-wide call takes about the time of the slowest robot instead of the sum of all of them.
+    Any method or property of :class:`~pyniryo.api.tcp_client.NiryoRobot` can be called on the fleet.
+    The result is a dict which associates each robot's IP address to what the robot returned,
+    or to the exception it raised.
+
+    Example: ::
+
+        fleet = NiryoFleet(["10.10.10.10", "10.10.10.11", "10.10.10.12"])
+        fleet.calibrate_all()
+        hardware_status = fleet.get_hardware_status()
+        for ip_address, status in hardware_status.items():
+            if isinstance(status, Exception):
+                print(ip_address, "failed:", status)
+            else:
+                print(ip_address, status.rpi_temperature)
+        fleet.move_all_home()
+        fleet.close_connection()
+
+    Each robot has its own worker thread, so the calls made to a robot are always executed one after the other.
+    When a robot doesn't answer before the timeout, its result is a :exc:`TimeoutError`, and the call keeps running
+    in the background: the next calls to this robot are executed once it has finished.
+    """
+
+    def __init__(self, ip_addresses, timeout=None, verbose=True):
+        """
+        :param ip_addresses: IP addresses of the robots
+        :type ip_addresses: list[str]
+        :param timeout: Default maximum time in seconds to wait for each robot's answer. None means no limit
+        :type timeout: float
+        :param verbose: Enable or disable the information logs of the robots
+        :type verbose: bool
+        """
+        self.__ip_addresses = list(dict.fromkeys(ip_addresses))
+        self.__timeout = timeout
+        self.__robots = {ip_address: NiryoRobot(verbose=verbose) for ip_address in self.__ip_addresses}
+        self.__executors = {
+            ip_address: concurrent.futures.ThreadPoolExecutor(max_workers=1,
+                                                              thread_name_prefix='NiryoFleet-{}'.format(ip_address))
+            for ip_address in self.__ip_addresses
+        }
+        self.__connected = set()
+        self.__connection_errors = {}
+
+        self.connect()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_connection()
+        self.shutdown()
+
+    def __str__(self):
+        return "{}({})".format(self.__class__.__name__, ", ".join(self.__ip_addresses))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __getattr__(self, name):
+        attribute = getattr(NiryoRobot, name, None)
+        if name.startswith('_') or attribute is None:
+            raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+        if isinstance(attribute, property):
+            return self.broadcast(name)
+
+        def broadcast_method(*args, **kwargs):
+            return self.broadcast(name, *args, **kwargs)
+
+        broadcast_method.__name__ = name
+        broadcast_method.__doc__ = attribute.__doc__
+        return broadcast_method
+
+    @property
+    def ip_addresses(self):
+        """
+        IP addresses of the robots of the fleet
+
+        :type: list[str]
+        """
+        return list(self.__ip_addresses)
+
+    @property
+    def robots(self):
+        """
+        Robot instance of each IP address. Use it to send a command to a single robot
+
+        :type: dict[str, NiryoRobot]
+        """
+        return dict(self.__robots)
+
+    # -- Connection
+    def connect(self):
+        """
+        Connect to the robots which are not connected yet
+
+        :return: None for each robot which is connected, or the exception raised during the connection
+        :rtype: dict[str, Union[None, Exception]]
+        """
+        to_connect = [ip_address for ip_address in self.__ip_addresses if ip_address not in self.__connected]
+        results = self.__run({ip_address: (self.__robots[ip_address].connect, (ip_address, ), {})
+                              for ip_address in to_connect},
+                             timeout=None)
+        for ip_address, result in results.items():
+            if isinstance(result, Exception):
+                self.__connection_errors[ip_address] = result
+            else:
+                self.__connected.add(ip_address)
+                self.__connection_errors.pop(ip_address, None)
+        return results
+
+    def close_connection(self):
+        """
+        Close the connection with all the robots
+
+        :rtype: None
+        """
+        self.__run({ip_address: (robot.close_connection, (), {})
+                    for ip_address, robot in self.__robots.items()},
+                   timeout=None)
+        self.__connected.clear()
+
+    def shutdown(self):
+        """
+        Stop the worker threads of the fleet. The fleet cannot be used anymore afterwards
+
+        :rtype: None
+        """
+        for executor in self.__executors.values():
+            executor.shutdown(wait=False)
+
+    # -- Broadcast
+    def __run(self, calls, timeout):
+        """
+        Run the calls concurrently, each in the worker of its robot
+
+        :param calls: (function, args, kwargs) to run for each robot
+        :type calls: dict[str, tuple]
+        :param timeout: maximum time to wait for each robot
+        :type timeout: float
+        :rtype: dict[str, object]
+        """
+        futures = {
+            ip_address: self.__executors[ip_address].submit(function, *args, **kwargs)
+            for ip_address, (function, args, kwargs) in calls.items()
+        }
+        concurrent.futures.wait(futures.values(), timeout=timeout)
+
+        results = {}
+        for ip_address, future in futures.items():
+            if not future.done():
+                results[ip_address] = TimeoutError("Robot {} didn't answer within {}s".format(ip_address, timeout))
+            elif future.exception() is not None:
+                results[ip_address] = future.exception()
+            else:
+                results[ip_address] = future.result()
+        return results
+
+    def __robot_call(self, ip_address, name, args, kwargs):
+        if ip_address not in self.__connected:
+            return self.__raise_not_connected, (ip_address, self.__connection_errors.get(ip_address)), {}
+        robot = self.__robots[ip_address]
+        if isinstance(getattr(NiryoRobot, name), property):
+            return getattr, (robot, name), {}
+        return getattr(robot, name), args, kwargs
+
+    @staticmethod
+    def __raise_not_connected(ip_address, connection_error):
+        message = "Robot {} is not connected".format(ip_address)
+        if connection_error is not None:
+            message += " : {}".format(connection_error)
+        raise ClientNotConnectedException(message)
+
+    def broadcast(self, name, *args, **kwargs):
+        """
+        Call a method or read a property on all the robots concurrently
+
+        Example: ::
+
+            fleet.broadcast("move", JointsPosition(0.2, 0.0, 0.0, 0.0, 0.0, 0.0))
+            fleet.broadcast("joints")
+
+        :param name: name of the NiryoRobot's method or property
+        :type name: str
+        :param args: arguments given to the method of each robot
+        :param kwargs: keyword arguments given to the method of each robot. ``timeout`` is reserved to override
+            the default timeout of the fleet
+        :return: result or raised exception of each robot
+        :rtype: dict[str, object]
+        """
+        timeout = kwargs.pop('timeout', self.__timeout)
+        return self.__run({ip_address: self.__robot_call(ip_address, name, args, kwargs)
+                           for ip_address in self.__ip_addresses},
+                          timeout=timeout)
+
+    def call_each(self, name, args_per_robot, timeout=None):
+        """
+        Call a method on several robots concurrently, with different arguments for each robot
+
+        Example: ::
+
+            fleet.call_each("move", {"10.10.10.10": (pose_1, ), "10.10.10.11": (pose_2, )})
+
+        :param name: name of the NiryoRobot's method
+        :type name: str
+        :param args_per_robot: arguments of each robot. Robots which are not in the dict are not called.
+            A :exc:`NiryoRobotException` is raised, before any call, if an IP address isn't in the fleet
+        :type args_per_robot: dict[str, tuple]
+        :param timeout: maximum time to wait for each robot. Default to the fleet's timeout
+        :type timeout: float
+        :return: result or raised exception of each robot called
+        :rtype: dict[str, object]
+        """
+        unknown_ip_addresses = [ip_address for ip_address in args_per_robot if ip_address not in self.__robots]
+        if unknown_ip_addresses:
+            raise NiryoRobotException("Robots {} are not in the fleet. Robots of the fleet: {}".format(
+                ", ".join(unknown_ip_addresses), ", ".join(self.__ip_addresses)))
+        if timeout is None:
+            timeout = self.__timeout
+        return self.__run({ip_address: self.__robot_call(ip_address, name, tuple(args), {})
+                           for ip_address, args in args_per_robot.items()},
+                          timeout=timeout)
+
+    # -- Fleet-wide helpers
+    def calibrate_all(self, timeout=None):
+        """
+        Start an automatic motors calibration on all the robots which are not calibrated yet
+
+        :param timeout: maximum time to wait for each robot. Default to the fleet's timeout
+        :type timeout: float
+        :return: None or raised exception of each robot
+        :rtype: dict[str, Union[None, Exception]]
+        """
+        return self.broadcast("calibrate_auto", timeout=self.__timeout if timeout is None else timeout)
+
+    def move_all_home(self, timeout=None):
+        """
+        Move all the robots to their home pose
+
+        :param timeout: maximum time to wait for each robot. Default to the fleet's timeout
+        :type timeout: float
+        :return: None or raised exception of each robot
+        :rtype: dict[str, Union[None, Exception]]
+        """
+        return self.broadcast("move_to_home_pose", timeout=self.__timeout if timeout is None else timeout)
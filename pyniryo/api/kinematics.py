@@ -0,0 +1,114 @@
+"""
+Local forward kinematics of an arm, computed by NumPy on whole arrays of joints positions,
+without a ``FORWARD_KINEMATICS`` request per position.
+
+Example: ::
+
+    chain = KinematicChain("my_arm", joint_origins=[...], tool_origin=[...])  # From the URDF of the arm
+    trajectory = JointsArray(...)  # (N, 6)
+    poses = chain.forward_kinematics(trajectory)  # (N, 6) poses of the tool_link
+    out_of_bounds = poses[:, 2] < 0.05
+
+The poses are those of the tool_link. Give the transformation of :func:`~pyniryo.api.tcp_client.NiryoRobot.set_tcp`
+to get the poses of the TCP.
+
+.. warning::
+    No chain of the Ned, Ned2 or Ned3Pro arms is bundled: the geometries which could be checked against a robot
+    weren't precise enough to replace its answers. Check a chain with :func:`compare_with_robot` before using it,
+    for instance for bounds checks.
+"""
+
+import numpy as np
+
+from . import transforms
+
+
+class KinematicChain(object):
+    """
+    Serial chain of revolute joints. Each joint rotates about the z axis of its frame, and the frame of each joint is
+    given by a pose [x, y, z, roll, pitch, yaw] in the frame of the previous joint, like in the URDF of the robot
+    """
+
+    def __init__(self, name, joint_origins, tool_origin):
+        """
+        :param name: name of the arm
+        :type name: str
+        :param joint_origins: pose of the frame of each joint in the frame of the previous one, the first one
+            in the base_link frame
+        :type joint_origins: list[list[float]]
+        :param tool_origin: pose of the tool_link in the frame of the last joint
+        :type tool_origin: list[float]
+        """
+        self.name = name
+        self.joint_origins = transforms.poses_to_transforms(joint_origins)
+        self.tool_origin = transforms.poses_to_transforms(tool_origin)
+
+    def __repr__(self):
+        return "<{} {}>".format(self.__class__.__name__, self.name)
+
+    @property
+    def nb_joints(self):
+        """
+        :type: int
+        """
+        return len(self.joint_origins)
+
+    def forward_transforms(self, joints, tcp=None):
+        """
+        :param joints: joints positions, of shape (..., nb_joints). A :class:`~pyniryo.api.objects.JointsArray`
+            can be given as well
+        :param tcp: transformation between the tool_link and the TCP [x, y, z, roll, pitch, yaw], None for the
+            tool_link
+        :type tcp: list[float]
+        :return: homogeneous transforms of the tool_link or of the TCP in the base_link frame, of shape (..., 4, 4)
+        :rtype: numpy.ndarray
+        """
+        joints = np.asarray(joints, dtype=np.float64)
+        if joints.shape[-1:] != (self.nb_joints, ):
+            raise ValueError("Expected an array of shape (..., {}), got {}".format(self.nb_joints, joints.shape))
+        cos, sin = np.cos(joints), np.sin(joints)
+        result = np.broadcast_to(np.eye(4), joints.shape[:-1] + (4, 4))
+        for index, origin in enumerate(self.joint_origins):
+            result = result @ origin
+            # Rotation about the z axis of the joint: only the x and y axes of its frame change
+            cos_joint, sin_joint = cos[..., index, np.newaxis], sin[..., index, np.newaxis]
+            axis_x, axis_y = result[..., :, 0].copy(), result[..., :, 1]
+            result[..., :, 0] = cos_joint * axis_x + sin_joint * axis_y
+            result[..., :, 1] = cos_joint * axis_y - sin_joint * axis_x
+        result = result @ self.tool_origin
+        if tcp is not None:
+            result = result @ transforms.poses_to_transforms(tcp)
+        return result
+
+    def forward_kinematics(self, joints, tcp=None):
+        """
+        :param joints: joints positions, of shape (..., nb_joints). A :class:`~pyniryo.api.objects.JointsArray`
+            can be given as well
+        :param tcp: transformation between the tool_link and the TCP [x, y, z, roll, pitch, yaw], None for the
+            tool_link
+        :type tcp: list[float]
+        :return: poses [x, y, z, roll, pitch, yaw] of the tool_link or of the TCP, of shape (..., 6)
+        :rtype: numpy.ndarray
+        """
+        return transforms.transforms_to_poses(self.forward_transforms(joints, tcp))
+
+
+def compare_with_robot(robot, joints, chain, tcp=None):
+    """
+    Compare the local forward kinematics with the robot's :func:`~pyniryo.api.tcp_client.NiryoRobot.forward_kinematics`
+
+    :param robot: connected robot
+    :type robot: NiryoRobot
+    :param joints: joints positions, of shape (N, nb_joints)
+    :param chain: chain to check
+    :type chain: KinematicChain
+    :param tcp: transformation between the tool_link and the TCP, if the robot's TCP is enabled
+    :type tcp: list[float]
+    :return: distances between the positions and angles between the orientations, of shape (N, )
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    joints = np.asarray(joints, dtype=np.float64)
+    robot_poses = [robot.forward_kinematics(joints_position).to_list() for joints_position in joints.tolist()]
+    local_poses = chain.forward_kinematics(joints, tcp)
+    return (transforms.position_distances(local_poses, robot_poses),
+            transforms.rotation_angles(local_poses, robot_poses))
@@ -0,0 +1,256 @@
+"""
+Metrics of the requests sent to a robot: number of calls and errors, bytes sent and received,
+and latency histograms, per command.
+
+Every :class:`~pyniryo.api.tcp_client.NiryoRobot` records the metrics of its requests in
+:attr:`~pyniryo.api.tcp_client.NiryoRobot.metrics`. The latency of a request is the time between the start
+of its sending and the end of the reception of its answer, encoding and decoding included.
+In a :func:`~pyniryo.api.tcp_client.NiryoRobot.batch`, it is measured from the sending of the whole batch.
+
+Example: ::
+
+    robot = NiryoRobot("10.10.10.10")
+    ...
+    print(robot.metrics.snapshot()["GET_HARDWARE_STATUS"]["latency"]["p99"])
+    with open("/var/lib/node_exporter/robot.prom", "w") as prom_file:
+        prom_file.write(robot.metrics.to_prometheus(labels={"robot": "10.10.10.10"}))
+"""
+
+import bisect
+import json
+import math
+import threading
+
+# Upper bounds of the buckets of the latency histograms, in seconds: 4 buckets per power of 2 from 100us to 200s
+BUCKETS_PER_OCTAVE = 4
+BUCKET_BOUNDS = tuple(1e-4 * 2**(index / BUCKETS_PER_OCTAVE) for index in range(BUCKETS_PER_OCTAVE * 21 + 1))
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of durations with exponential buckets. The quantiles are interpolated within the buckets,
+    so their relative error is below 19%, the width of a bucket
+    """
+
+    def __init__(self):
+        # The last bucket counts the durations above the last bound
+        self.__counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, duration):
+        """
+        :param duration: duration in seconds
+        :type duration: float
+        :rtype: None
+        """
+        self.__counts[bisect.bisect_left(BUCKET_BOUNDS, duration)] += 1
+        self.count += 1
+        self.sum += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+    def quantile(self, q):
+        """
+        :param q: quantile, between 0 and 1
+        :type q: float
+        :return: estimation of the quantile, None if nothing has been recorded
+        :rtype: float
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulated_count = 0
+        for index, count in enumerate(self.__counts):
+            if count and cumulated_count + count >= rank:
+                lower = BUCKET_BOUNDS[index - 1] if index > 0 else 0.0
+                upper = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                value = lower + (upper - lower) * (rank - cumulated_count) / count
+                return min(max(value, self.min), self.max)
+            cumulated_count += count
+        return self.max
+
+    def cumulative_counts(self, bounds):
+        """
+        :param bounds: upper bounds, which must be bounds of the buckets
+        :type bounds: list[float]
+        :return: number of durations lower than or equal to each bound
+        :rtype: list[int]
+        """
+        counts = []
+        for bound in bounds:
+            counts.append(sum(self.__counts[:bisect.bisect_left(BUCKET_BOUNDS, bound) + 1]))
+        return counts
+
+    def to_dict(self):
+        """
+        :return: count, sum, min, max, mean and p50, p95, p99 quantiles in seconds
+        :rtype: dict
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _CommandMetrics(object):
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = LatencyHistogram()
+
+
+class RobotMetrics(object):
+    """
+    Thread safe metrics of the requests sent to a robot, per command name
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__commands = {}
+
+    def __command_metrics(self, command_name):
+        command_metrics = self.__commands.get(command_name)
+        if command_metrics is None:
+            command_metrics = self.__commands[command_name] = _CommandMetrics()
+        return command_metrics
+
+    def record(self, command_name, duration, bytes_sent, bytes_received, error=False):
+        """
+        Record a request which has been answered
+
+        :param command_name: name of the command
+        :type command_name: str
+        :param duration: latency of the request in seconds
+        :type duration: float
+        :param bytes_sent: size of the request's packet
+        :type bytes_sent: int
+        :param bytes_received: size of the answer's packet and payload
+        :type bytes_received: int
+        :param error: whether the robot answered with an error
+        :type error: bool
+        :rtype: None
+        """
+        with self.__lock:
+            command_metrics = self.__command_metrics(command_name)
+            command_metrics.calls += 1
+            command_metrics.errors += bool(error)
+            command_metrics.bytes_sent += bytes_sent
+            command_metrics.bytes_received += bytes_received
+            command_metrics.latency.record(duration)
+
+    def record_failure(self, command_name, bytes_sent=0):
+        """
+        Record a request which hasn't been answered, because of a connection error
+
+        :param command_name: name of the command
+        :type command_name: str
+        :param bytes_sent: number of bytes of the request which have been sent
+        :type bytes_sent: int
+        :rtype: None
+        """
+        with self.__lock:
+            command_metrics = self.__command_metrics(command_name)
+            command_metrics.calls += 1
+            command_metrics.errors += 1
+            command_metrics.bytes_sent += bytes_sent
+
+    def reset(self):
+        """
+        Forget all the recorded requests
+
+        :rtype: None
+        """
+        with self.__lock:
+            self.__commands = {}
+
+    def snapshot(self):
+        """
+        Example: ::
+
+            {"GET_JOINTS": {"calls": 120, "errors": 0, "bytes_sent": 5400, "bytes_received": 13800,
+                            "latency": {"count": 120, "sum": 0.35, "min": 0.0021, "max": 0.0094,
+                                        "mean": 0.0029, "p50": 0.0027, "p95": 0.0041, "p99": 0.0082}}}
+
+        :return: metrics per command name. The latencies are in seconds, the quantiles are estimations
+        :rtype: dict[str, dict]
+        """
+        with self.__lock:
+            return {
+                command_name: {
+                    "calls": command_metrics.calls,
+                    "errors": command_metrics.errors,
+                    "bytes_sent": command_metrics.bytes_sent,
+                    "bytes_received": command_metrics.bytes_received,
+                    "latency": command_metrics.latency.to_dict(),
+                }
+                for command_name, command_metrics in sorted(self.__commands.items())
+            }
+
+    def to_json(self, indent=None):
+        """
+        :param indent: indentation of the JSON, None for a single line
+        :type indent: int
+        :return: the :func:`snapshot` in JSON
+        :rtype: str
+        """
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix="pyniryo", labels=None):
+        """
+        Export the metrics in the Prometheus text format, to be served to Prometheus or
+        written in a file read by the textfile collector of the node exporter.
+        The latency histograms have a bucket per power of 2 from 100us to 200s
+
+        :param prefix: prefix of the metrics' names
+        :type prefix: str
+        :param labels: labels added to every metric, for instance to identify the robot
+        :type labels: dict[str, str]
+        :return: the metrics in the Prometheus text format
+        :rtype: str
+        """
+        extra_labels = "".join(',{}="{}"'.format(name, _escape_label(value))
+                               for name, value in sorted((labels or {}).items()))
+        bounds = BUCKET_BOUNDS[::BUCKETS_PER_OCTAVE]
+        with self.__lock:
+            commands = sorted(self.__commands.items())
+            lines = []
+            for name, help_text, attribute in (
+                ("requests_total", "Requests sent to the robot", "calls"),
+                ("request_errors_total", "Requests which failed or were answered with an error", "errors"),
+                ("sent_bytes_total", "Bytes sent to the robot", "bytes_sent"),
+                ("received_bytes_total", "Bytes received from the robot", "bytes_received"),
+            ):
+                lines.append("# HELP {}_{} {}".format(prefix, name, help_text))
+                lines.append("# TYPE {}_{} counter".format(prefix, name))
+                for command_name, command_metrics in commands:
+                    lines.append('{}_{}{{command="{}"{}}} {}'.format(prefix, name, command_name, extra_labels,
+                                                                    getattr(command_metrics, attribute)))
+
+            name = "{}_request_duration_seconds".format(prefix)
+            lines.append("# HELP {} Latency of the requests answered by the robot".format(name))
+            lines.append("# TYPE {} histogram".format(name))
+            for command_name, command_metrics in commands:
+                command_labels = 'command="{}"{}'.format(command_name, extra_labels)
+                latency = command_metrics.latency
+                for bound, count in zip(bounds, latency.cumulative_counts(bounds)):
+                    lines.append('{}_bucket{{{},le="{:.6g}"}} {}'.format(name, command_labels, bound, count))
+                lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(name, command_labels, latency.count))
+                lines.append('{}_sum{{{}}} {!r}'.format(name, command_labels, latency.sum))
+                lines.append('{}_count{{{}}} {}'.format(name, command_labels, latency.count))
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,1239 @@
+"""
+Mock of the robot's TCP server, to run and measure the clients without hardware.
+
+The mock speaks the protocol of the robot: framed JSON packets, and the binary encoding and the 4 bytes framing
+when they are negotiated during the handshake. Every :class:`~pyniryo.api.enums_communication.Command`
+is answered with the shape of the robot's answer, computed from a simulated state: joints, pose, saved poses,
+trajectories, workspaces and dynamic frames, IOs, conveyors, tool, sounds and camera settings.
+
+The time taken by the robot is modelled:
+
+- every answer is delayed by ``latency`` plus a random jitter
+- the motions last the time needed to reach the target at ``joint_speed`` and ``linear_speed``,
+  scaled by the max velocity set with ``SET_ARM_MAX_VELOCITY``. The motions are executed one after the other,
+  even when they are sent on different connections
+- the tool actions last ``tool_duration``
+- the sounds and the LED ring animations last their duration when the request waits for their end
+
+``time_scale`` speeds up or slows down all the durations except the latency. 0 makes the motions instantaneous.
+
+The kinematics are not simulated: a joints motion doesn't change the pose and a pose motion doesn't change
+the joints. The camera sends canned JPEG frames, by default a workspace with its 4 markers, a red circle
+and a blue square.
+
+Faults can be injected to test the error handling: KO answers, disconnections and truncated answers.
+
+Example: ::
+
+    with MockRobotServer(latency=0.002, jitter=0.001, time_scale=0.0) as server:
+        robot = NiryoRobot("127.0.0.1")
+        robot.move(JointsPosition(0.2, 0.0, 0.0, 0.0, 0.0, 0.0))
+
+        server.inject_fault(MockFault.DISCONNECT, Command.GET_JOINTS)
+        robot.get_joints()  # Raises HostNotReachableException
+
+The clients always connect to :data:`~pyniryo.api.enums_communication.TCP_PORT`,
+which is the default port of the mock. Usage from a shell: ::
+
+    python -m pyniryo.api.mock_server --latency 0.002 --jitter 0.001
+"""
+
+import argparse
+import logging
+import math
+import random
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter
+from enum import Enum, unique
+
+import numpy as np
+
+from . import transforms
+from .binary_encoding import BINARY_ENCODING
+from .communication_functions import (content_to_dict,
+                                      dict_to_binary_packet,
+                                      dict_to_packet,
+                                      receive_exactly,
+                                      receive_packet_size)
+from .enums_communication import (Command,
+                                  ConveyorID,
+                                  DEFAULT_PACKET_SIZE_INFOS,
+                                  LARGE_FRAMING,
+                                  LARGE_PACKET_SIZE_INFOS,
+                                  PinMode,
+                                  TCP_PORT,
+                                  ToolID)
+from .objects import JointsPosition, PoseObject
+from ..utils.logging import get_logger
+from ..version import __version__
+
+CALIBRATION_DURATION = 3.0  # Duration of a calibration in seconds, before time scaling
+SHUTDOWN_POLL_INTERVAL = 0.05  # Delay to notice that the server has been stopped, in seconds
+
+# Commands which only acknowledge the request
+_ACKNOWLEDGED_COMMANDS = frozenset([
+    Command.SET_JOG_CONTROL,
+    Command.UPDATE_TOOL,
+    Command.TOOL_REBOOT,
+    Command.SETUP_ELECTROMAGNET,
+    Command.SET_VOLUME,
+    Command.STOP_SOUND,
+    Command.SAY,
+    Command.LED_RING_SOLID,
+    Command.LED_RING_TURN_OFF,
+    Command.LED_RING_CUSTOM,
+    Command.LED_RING_SET_LED,
+])
+
+# LED ring animations, with the index of their period parameter. The iterations and the wait flag follow it
+_LED_RING_ANIMATIONS = {
+    Command.LED_RING_FLASH: 1,
+    Command.LED_RING_ALTERNATE: 1,
+    Command.LED_RING_CHASE: 1,
+    Command.LED_RING_WIPE: 1,
+    Command.LED_RING_RAINBOW: 0,
+    Command.LED_RING_RAINBOW_CYCLE: 0,
+    Command.LED_RING_RAINBOW_CHASE: 0,
+    Command.LED_RING_GO_UP: 1,
+    Command.LED_RING_GO_UP_DOWN: 1,
+    Command.LED_RING_BREATH: 1,
+    Command.LED_RING_SNAKE: 1,
+}
+
+# Tool actions, which last ``tool_duration``
+_TOOL_ACTIONS = frozenset([
+    Command.GRASP_WITH_TOOL,
+    Command.RELEASE_WITH_TOOL,
+    Command.OPEN_GRIPPER,
+    Command.CLOSE_GRIPPER,
+    Command.CONTROL_GRIPPER,
+    Command.PULL_AIR_VACUUM_PUMP,
+    Command.PUSH_AIR_VACUUM_PUMP,
+    Command.ACTIVATE_ELECTROMAGNET,
+    Command.DEACTIVATE_ELECTROMAGNET,
+])
+
+GRIPPER_OPEN_POSITION = 2000
+GRIPPER_CLOSED_POSITION = 1000
+
+# Geometry of the default camera frame, in pixels
+_FRAME_SIZE = (640, 480)
+_FRAME_WORKSPACE = (150, 70, 490, 410)
+_FRAME_MARKERS = [(170, 90), (470, 90), (470, 390), (170, 390)]
+
+# Objects of the default camera frame: shape, color, position relative to the workspace, yaw
+_FRAME_OBJECTS = [
+    ("CIRCLE", "RED", 0.441, 0.529, 0.0),
+    ("SQUARE", "BLUE", 0.735, 0.324, 0.0),
+]
+
+
+@unique
+class MockFault(Enum):
+    """
+    Enumeration of the faults the mock server can inject
+    """
+    KO = "ko"  # Answer with a KO status
+    DISCONNECT = "disconnect"  # Close the connection without answering
+    TRUNCATE = "truncate"  # Send half of the answer, then close the connection
+
+
+class _CommandFailed(Exception):
+    """
+    Raised by a command handler to answer with a KO status
+    """
+
+
+class _CloseConnection(Exception):
+    """
+    Raised to close the connection of the request
+    """
+
+
+def make_workspace_frame():
+    """
+    Draw a camera frame of a workspace with its 4 markers, a red circle and a blue square,
+    which can be extracted with :func:`~pyniryo.vision.image_functions.extract_img_workspace`
+
+    :return: the frame compressed in JPEG
+    :rtype: bytes
+    """
+    import cv2
+
+    width, height = _FRAME_SIZE
+    img = np.full((height, width, 3), 200, dtype=np.uint8)
+    x_min, y_min, x_max, y_max = _FRAME_WORKSPACE
+    cv2.rectangle(img, (x_min, y_min), (x_max, y_max), (235, 235, 235), -1)
+    for index, center in enumerate(_FRAME_MARKERS):
+        cv2.circle(img, center, 18, (20, 20, 20), -1)
+        cv2.circle(img, center, 12, (235, 235, 235), -1)
+        cv2.circle(img, center, 7, (20, 20, 20), -1)
+        if index == 0:
+            # The origin marker has a dot in its center
+            cv2.circle(img, center, 3, (235, 235, 235), -1)
+    cv2.circle(img, (300, 250), 25, (30, 30, 220), -1)
+    cv2.rectangle(img, (380, 160), (420, 200), (220, 60, 30), -1)
+    return cv2.imencode('.jpg', img)[1].tobytes()
+
+
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.upper() == "TRUE"
+    return bool(value)
+
+
+def _to_pose_list(value):
+    if isinstance(value, dict):
+        return PoseObject.from_dict(value).to_list()
+    if len(value) == 7:
+        # [x, y, z, qx, qy, qz, qw]
+        return [float(coordinate) for coordinate in value[:3]] + transforms.quaternion_to_euler(value[3:]).tolist()
+    return [float(coordinate) for coordinate in value]
+
+
+def _to_joints_list(value):
+    if isinstance(value, dict):
+        return JointsPosition.from_dict(value).to_list()
+    return [float(joint) for joint in value]
+
+
+class MockRobotState(object):
+    """
+    Simulated state of the mock robot. Its attributes can be read and set by the tests
+    """
+
+    def __init__(self):
+        self.hardware_version = "ned2"
+        self.joints = [0.0, 0.5, -1.25, 0.0, 0.0, 0.0]
+        self.pose = [0.14, 0.0, 0.2, 0.0, 0.76, 0.0]
+        self.home_pose = [0.0, 0.5, -1.25, 0.0, 0.0, 0.0]
+        self.calibrated = True
+        self.learning_mode = False
+        self.collision_detected = False
+        self.max_velocity = 100
+        self.tool = ToolID.GRIPPER_1
+        self.tool_position = GRIPPER_OPEN_POSITION
+        self.tcp = [False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        self.digital_pins = {name: [PinMode.INPUT.value, 0] for name in ("DI1", "DI2", "DI3", "DI4", "DI5")}
+        self.digital_pins.update({name: [PinMode.OUTPUT.value, 0] for name in ("DO1", "DO2", "DO3", "DO4")})
+        self.analog_pins = {"AI1": [PinMode.INPUT.value, 0.0], "AI2": [PinMode.INPUT.value, 0.0]}
+        self.analog_pins.update({"AO1": [PinMode.OUTPUT.value, 0.0], "AO2": [PinMode.OUTPUT.value, 0.0]})
+        self.custom_button = "released"
+        self.conveyors = {}
+        self.saved_poses = {}
+        self.trajectories = {}
+        self.workspaces = {}
+        self.dynamic_frames = {}
+        self.image_parameters = [1.0, 1.0, 1.0]
+        self.sounds = {"connected.wav": 1.2, "ready.wav": 1.5, "calibration.wav": 2.0, "error.wav": 0.8}
+        self.last_trajectory = []
+
+
+class _MockRequestHandler(socketserver.BaseRequestHandler):
+
+    def setup(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.packet_size_infos = DEFAULT_PACKET_SIZE_INFOS
+        self.server.mock._add_connection(self.request)
+
+    def handle(self):
+        mock = self.server.mock
+        try:
+            while True:
+                size = receive_packet_size(self.request, self.packet_size_infos)
+                if size is None:
+                    return
+                content = receive_exactly(self.request, size)
+                if content is None:
+                    return
+                request = content_to_dict(content)
+                answer, payload = mock._answer(request, self)
+                if request["command"] in mock._binary_answers(self):
+                    packet = dict_to_binary_packet(answer, self.packet_size_infos)
+                else:
+                    packet = dict_to_packet(answer, self.packet_size_infos)
+                if payload is not None:
+                    packet = bytes(packet) + payload
+                mock._send(self, request["command"], packet)
+                if request["command"] == Command.HANDSHAKE.name and answer["status"] == "OK":
+                    self.__apply_selection(request["param_list"])
+        except (_CloseConnection, OSError):
+            pass
+
+    def finish(self):
+        self.server.mock._remove_connection(self.request)
+
+    def __apply_selection(self, param_list):
+        # The answer to the selection is sent with the previous protocol
+        if len(param_list) < 2 or not isinstance(param_list[1], dict):
+            return
+        selection = param_list[1]
+        self.binary_commands = frozenset(selection.get("binary_commands", [])) \
+            if selection.get("encoding") == BINARY_ENCODING else frozenset()
+        if selection.get("framing") == LARGE_FRAMING:
+            self.packet_size_infos = LARGE_PACKET_SIZE_INFOS
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class MockRobotServer(object):
+    """
+    TCP server mocking a robot. See the module documentation
+
+    :ivar state: simulated state of the robot
+    :vartype state: MockRobotState
+    """
+
+    def __init__(self,
+                 host="127.0.0.1",
+                 port=TCP_PORT,
+                 latency=0.0,
+                 jitter=0.0,
+                 joint_speed=1.0,
+                 linear_speed=0.2,
+                 tool_duration=0.5,
+                 time_scale=1.0,
+                 frames=None,
+                 binary_encoding=False,
+                 large_framing=False,
+                 seed=None,
+                 verbose=True,
+                 logger=None):
+        """
+        :param host: address the server listens on
+        :type host: str
+        :param port: port the server listens on. 0 picks a free port
+        :type port: int
+        :param latency: minimum delay before answering a request, in seconds
+        :type latency: float
+        :param jitter: maximum random delay added to the latency, in seconds
+        :type jitter: float
+        :param joint_speed: speed of the joints at full velocity, in radians per second
+        :type joint_speed: float
+        :param linear_speed: speed of the end effector at full velocity, in meters per second
+        :type linear_speed: float
+        :param tool_duration: duration of the tool actions, in seconds
+        :type tool_duration: float
+        :param time_scale: factor applied to the durations of the motions, tool actions and sounds
+        :type time_scale: float
+        :param frames: JPEG frames sent in turn by the camera. Defaults to :func:`make_workspace_frame`
+        :type frames: list[bytes]
+        :param binary_encoding: advertise the binary encoding during the handshake
+        :type binary_encoding: bool
+        :param large_framing: advertise the 4 bytes framing during the handshake
+        :type large_framing: bool
+        :param seed: seed of the jitter
+        :type seed: int
+        :param verbose: Enable or disable the information logs
+        :type verbose: bool
+        :param logger: A custom logger for the server
+        :type logger: logging.Logger
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.joint_speed = joint_speed
+        self.linear_speed = linear_speed
+        self.tool_duration = tool_duration
+        self.time_scale = time_scale
+        self.binary_encoding = binary_encoding
+        self.large_framing = large_framing
+        self.state = MockRobotState()
+
+        self.__logger = get_logger(self.__class__.__name__) if logger is None else logger
+        if not verbose:
+            self.__logger.setLevel(logging.WARNING)
+        self.__frames = list(frames) if frames is not None else None
+        self.__frame_index = 0
+        self.__random = random.Random(seed)
+        self.__state_lock = threading.RLock()
+        self.__motion_lock = threading.Lock()
+        self.__faults = []
+        self.__request_counts = Counter()
+        self.__connections = set()
+        self.__server = None
+        self.__thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __repr__(self):
+        state = "listening on {}:{}".format(*self.address) if self.__server is not None else "stopped"
+        return "<{} {}>".format(self.__class__.__name__, state)
+
+    # -- Server
+    def start(self):
+        """
+        Start listening in a background thread
+
+        :rtype: None
+        """
+        if self.__server is not None:
+            return
+        self.__server = _ThreadingServer((self.host, self.port), _MockRequestHandler)
+        self.__server.mock = self
+        self.__thread = threading.Thread(target=self.__server.serve_forever,
+                                         args=(SHUTDOWN_POLL_INTERVAL, ),
+                                         name="MockRobotServer",
+                                         daemon=True)
+        self.__thread.start()
+        self.__logger.info("Mock robot listening on {}:{}".format(*self.address))
+
+    def serve_forever(self):
+        """
+        Start listening and block until the process is interrupted
+
+        :rtype: None
+        """
+        self.start()
+        try:
+            while self.__thread.is_alive():
+                self.__thread.join(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        Stop listening and close the open connections
+
+        :rtype: None
+        """
+        if self.__server is None:
+            return
+        server, self.__server = self.__server, None
+        server.shutdown()
+        server.server_close()
+        with self.__state_lock:
+            connections = list(self.__connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.__thread.join()
+        self.__thread = None
+
+    @property
+    def address(self):
+        """
+        Address and port the server listens on
+
+        :type: (str, int)
+        """
+        if self.__server is None:
+            return self.host, self.port
+        return self.__server.server_address[:2]
+
+    @property
+    def nb_connections(self):
+        """
+        Number of open connections
+
+        :type: int
+        """
+        with self.__state_lock:
+            return len(self.__connections)
+
+    def request_counts(self):
+        """
+        :return: number of requests received per command name
+        :rtype: dict[str, int]
+        """
+        with self.__state_lock:
+            return dict(self.__request_counts)
+
+    @staticmethod
+    def handles(command):
+        """
+        :param command: a command
+        :type command: Command
+        :return: ``True`` if the mock answers the command
+        :rtype: bool
+        """
+        return (command in _ACKNOWLEDGED_COMMANDS or command in _TOOL_ACTIONS or command in _LED_RING_ANIMATIONS
+                or command in (Command.HANDSHAKE, Command.GET_IMAGE_COMPRESSED)
+                or hasattr(MockRobotServer, '_cmd_' + command.name.lower()))
+
+    # -- Faults
+    def inject_fault(self, fault, command=None, count=1):
+        """
+        Inject a fault on the next requests
+
+        :param fault: the fault to inject
+        :type fault: MockFault
+        :param command: command whose requests are faulty. None for any command
+        :type command: Command
+        :param count: number of faulty requests
+        :type count: int
+        :rtype: None
+        """
+        if not isinstance(fault, MockFault):
+            raise TypeError("fault must be a MockFault, got {!r}".format(fault))
+        with self.__state_lock:
+            self.__faults.append([fault, None if command is None else command.name, count])
+
+    def clear_faults(self):
+        """
+        Remove the faults which haven't been triggered yet
+
+        :rtype: None
+        """
+        with self.__state_lock:
+            self.__faults = []
+
+    def __pop_fault(self, command_name):
+        with self.__state_lock:
+            for fault in self.__faults:
+                if fault[1] is None or fault[1] == command_name:
+                    fault[2] -= 1
+                    if fault[2] <= 0:
+                        self.__faults.remove(fault)
+                    return fault[0]
+        return None
+
+    # -- Protocol
+    def _add_connection(self, connection):
+        with self.__state_lock:
+            self.__connections.add(connection)
+
+    def _remove_connection(self, connection):
+        with self.__state_lock:
+            self.__connections.discard(connection)
+
+    @staticmethod
+    def _binary_answers(handler):
+        return getattr(handler, "binary_commands", ())
+
+    def _answer(self, request, handler):
+        """
+        Compute the answer to a request
+
+        :return: answer dict, payload
+        """
+        command_name = request.get("command")
+        with self.__state_lock:
+            self.__request_counts[command_name] += 1
+        self.__sleep(self.latency + self.__random.uniform(0.0, self.jitter) if self.jitter else self.latency)
+
+        fault = self.__pop_fault(command_name)
+        if fault is MockFault.DISCONNECT:
+            raise _CloseConnection()
+        handler.truncate = fault is MockFault.TRUNCATE
+
+        answer = {"command": command_name, "status": "OK", "message": "", "list_ret_param": []}
+        payload = None
+        try:
+            if fault is MockFault.KO:
+                raise _CommandFailed("Injected fault")
+            try:
+                command = Command[command_name]
+            except KeyError:
+                raise _CommandFailed("Unknown command : {}".format(command_name)) from None
+            list_ret_param, payload = self.__execute(command, request.get("param_list", []), handler)
+            answer["list_ret_param"] = list_ret_param
+        except _CommandFailed as exception:
+            answer.update(status="KO", message=str(exception))
+        except (KeyError, IndexError, TypeError, ValueError) as exception:
+            answer.update(status="KO", message="Invalid parameters : {!r}".format(exception))
+        if payload is not None:
+            answer["payload_size"] = len(payload)
+        return answer, payload
+
+    def _send(self, handler, command_name, packet):
+        if getattr(handler, "truncate", False):
+            handler.request.sendall(bytes(packet)[:max(1, len(packet) // 2)])
+            raise _CloseConnection()
+        handler.request.sendall(packet)
+
+    def __execute(self, command, params, handler):
+        if command in _ACKNOWLEDGED_COMMANDS:
+            return [], None
+        if command in _TOOL_ACTIONS:
+            return self.__tool_action(command, params), None
+        if command in _LED_RING_ANIMATIONS:
+            return self.__led_ring_animation(command, params), None
+        if command is Command.GET_IMAGE_COMPRESSED:
+            return [], self.__next_frame()
+        if command is Command.HANDSHAKE:
+            return self.__handshake(params, handler), None
+        return getattr(self, '_cmd_' + command.name.lower())(params), None
+
+    def __handshake(self, params, handler):
+        if len(params) > 1:
+            selection = params[1] if isinstance(params[1], dict) else {}
+            if selection.get("encoding") not in (None, BINARY_ENCODING) or \
+                    selection.get("framing") not in (None, LARGE_FRAMING):
+                raise _CommandFailed("Unsupported protocol selection : {}".format(selection))
+            return []
+        server_info = {"message": "Mock robot server, PyNiryo {}".format(__version__), "version": __version__}
+        if self.binary_encoding:
+            server_info["encodings"] = [BINARY_ENCODING]
+        if self.large_framing:
+            server_info["framings"] = [LARGE_FRAMING]
+        return [server_info]
+
+    # -- Durations
+    def __sleep(self, duration):
+        if duration > 0:
+            time.sleep(duration)
+
+    def __scaled(self, duration):
+        return duration * self.time_scale
+
+    def __motion_duration(self, joints=None, pose=None):
+        duration = 0.0
+        with self.__state_lock:
+            if joints is not None:
+                duration = max(abs(target - current) for target, current in zip(joints, self.state.joints))
+                duration /= self.joint_speed
+            if pose is not None:
+                translation = math.sqrt(sum((pose[i] - self.state.pose[i])**2 for i in range(3)))
+                rotation = max(abs(pose[i] - self.state.pose[i]) for i in range(3, 6))
+                duration = max(duration, translation / self.linear_speed, rotation / self.joint_speed)
+            return duration * 100.0 / max(self.state.max_velocity, 1)
+
+    def __move(self, joints=None, pose=None):
+        """
+        Run a motion: wait for the previous motions, then for the duration of this one, then update the state
+        """
+        with self.__motion_lock:
+            with self.__state_lock:
+                if self.state.collision_detected:
+                    raise _CommandFailed("A collision has been detected, clear it before moving")
+            self.__sleep(self.__scaled(self.__motion_duration(joints, pose)))
+            with self.__state_lock:
+                self.state.learning_mode = False
+                if joints is not None:
+                    self.state.joints = list(joints)
+                if pose is not None:
+                    self.state.pose = list(pose)
+
+    def __move_through(self, waypoints):
+        """
+        Run a trajectory of ("joint", joints) and ("pose", pose) waypoints
+        """
+        for waypoint_type, waypoint in waypoints:
+            if waypoint_type == "joint":
+                self.__move(joints=waypoint)
+            else:
+                self.__move(pose=waypoint)
+
+    def __tool_action(self, command, params):
+        with self.__motion_lock:
+            self.__sleep(self.__scaled(self.tool_duration))
+        with self.__state_lock:
+            if command is Command.OPEN_GRIPPER:
+                self.state.tool_position = GRIPPER_OPEN_POSITION
+            elif command is Command.CLOSE_GRIPPER:
+                self.state.tool_position = GRIPPER_CLOSED_POSITION
+            elif command is Command.CONTROL_GRIPPER:
+                self.state.tool_position = int(params[0])
+        return []
+
+    def __led_ring_animation(self, command, params):
+        period_index = _LED_RING_ANIMATIONS[command]
+        period = float(params[period_index])
+        if command is Command.LED_RING_WIPE:
+            # A single iteration
+            iterations, wait = 1, params[period_index + 1]
+        else:
+            iterations, wait = int(params[period_index + 1]), params[period_index + 2]
+        # 0 iterations is an endless animation, which doesn't block
+        if _to_bool(wait) and iterations > 0:
+            self.__sleep(self.__scaled(period * iterations))
+        return []
+
+    def __next_frame(self):
+        with self.__state_lock:
+            if self.__frames is None:
+                self.__frames = [make_workspace_frame()]
+            frame = self.__frames[self.__frame_index % len(self.__frames)]
+            self.__frame_index += 1
+            return frame
+
+    def __get(self, saved, name, kind):
+        with self.__state_lock:
+            if name not in saved:
+                raise _CommandFailed("{} {} does not exist".format(kind, name))
+            return saved[name]
+
+    def __delete(self, saved, name, kind):
+        with self.__state_lock:
+            if saved.pop(name, None) is None:
+                raise _CommandFailed("{} {} does not exist".format(kind, name))
+        return []
+
+    # -- Main purpose
+    def _cmd_calibrate(self, params):
+        with self.__motion_lock:
+            self.__sleep(self.__scaled(CALIBRATION_DURATION))
+        with self.__state_lock:
+            self.state.calibrated = True
+        return []
+
+    def _cmd_set_learning_mode(self, params):
+        with self.__state_lock:
+            self.state.learning_mode = _to_bool(params[0])
+        return []
+
+    def _cmd_get_learning_mode(self, params):
+        return [self.state.learning_mode]
+
+    def _cmd_set_arm_max_velocity(self, params):
+        velocity = int(params[0])
+        if not 1 <= velocity <= 100:
+            raise _CommandFailed("The max velocity must be between 1 and 100, got {}".format(velocity))
+        with self.__state_lock:
+            self.state.max_velocity = velocity
+        return []
+
+    def _cmd_get_collision_detected(self, params):
+        return [self.state.collision_detected]
+
+    def _cmd_clear_collision_detected(self, params):
+        with self.__state_lock:
+            self.state.collision_detected = False
+        return []
+
+    # -- Joints & pose
+    def _cmd_get_joints(self, params):
+        with self.__state_lock:
+            return list(self.state.joints)
+
+    def _cmd_get_pose(self, params):
+        with self.__state_lock:
+            return list(self.state.pose)
+
+    def _cmd_get_pose_quat(self, params):
+        with self.__state_lock:
+            pose = PoseObject(*self.state.pose)
+        return pose.to_list()[:3] + [float(value) for value in pose.quaternion()]
+
+    def _cmd_get_home_pose(self, params):
+        with self.__state_lock:
+            return list(self.state.home_pose)
+
+    def _cmd_set_home_pose(self, params):
+        with self.__state_lock:
+            self.state.home_pose = _to_joints_list(params[0])
+        return []
+
+    def _cmd_reset_home_pose(self, params):
+        with self.__state_lock:
+            self.state.home_pose = MockRobotState().home_pose
+        return []
+
+    def _cmd_forward_kinematics(self, params):
+        _to_joints_list(params[0])
+        with self.__state_lock:
+            return [PoseObject(*self.state.pose).to_dict()]
+
+    def _cmd_inverse_kinematics(self, params):
+        _to_pose_list(params[0])
+        with self.__state_lock:
+            return [JointsPosition(*self.state.joints).to_dict()]
+
+    # -- Moves
+    def _cmd_move_joints(self, params):
+        self.__move(joints=_to_joints_list(params[:6]))
+        return []
+
+    def _cmd_move_pose(self, params):
+        self.__move(pose=_to_pose_list(params[:6]))
+        return []
+
+    _cmd_move_linear_pose = _cmd_move_pose
+
+    def _cmd_shift_pose(self, params):
+        axis = ["X", "Y", "Z", "ROLL", "PITCH", "YAW"].index(params[0])
+        with self.__state_lock:
+            pose = list(self.state.pose)
+        pose[axis] += float(params[1])
+        self.__move(pose=pose)
+        return []
+
+    _cmd_shift_linear_pose = _cmd_shift_pose
+
+    def _cmd_jog_joints(self, params):
+        with self.__state_lock:
+            joints = [joint + float(offset) for joint, offset in zip(self.state.joints, params)]
+        self.__move(joints=joints)
+        return []
+
+    def _cmd_jog_pose(self, params):
+        with self.__state_lock:
+            pose = [coordinate + float(offset) for coordinate, offset in zip(self.state.pose, params)]
+        self.__move(pose=pose)
+        return []
+
+    def _cmd_move(self, params):
+        position = params[0]
+        if position["obj_type"] == "JOINTS":
+            self.__move(joints=_to_joints_list(position))
+        else:
+            self.__move(pose=_to_pose_list(position))
+        return []
+
+    def _cmd_jog(self, params):
+        position = params[0]
+        if position["obj_type"] == "JOINTS":
+            return self._cmd_jog_joints(_to_joints_list(position))
+        return self._cmd_jog_pose(_to_pose_list(position))
+
+    def _cmd_move_to_home_pose(self, params):
+        with self.__state_lock:
+            home_pose = list(self.state.home_pose)
+        self.__move(joints=home_pose)
+        return []
+
+    def _cmd_move_relative(self, params):
+        # The kinematics aren't simulated, the offset is applied in the world frame whatever the frame
+        with self.__state_lock:
+            pose = [coordinate + float(offset) for coordinate, offset in zip(self.state.pose, params[0])]
+        self.__move(pose=pose)
+        return []
+
+    _cmd_move_linear_relative = _cmd_move_relative
+
+    # -- Saved poses
+    def _cmd_get_pose_saved(self, params):
+        return [PoseObject(*self.__get(self.state.saved_poses, params[0], "Pose")).to_dict()]
+
+    def _cmd_save_pose(self, params):
+        with self.__state_lock:
+            self.state.saved_poses[params[0]] = _to_pose_list(params[1])
+        return []
+
+    def _cmd_delete_pose(self, params):
+        return self.__delete(self.state.saved_poses, params[0], "Pose")
+
+    def _cmd_get_saved_pose_list(self, params):
+        with self.__state_lock:
+            return [sorted(self.state.saved_poses)]
+
+    # -- Pick & place
+    def __pick_or_place(self, pose):
+        approach_pose = list(pose)
+        approach_pose[2] += 0.05
+        self.__move(pose=approach_pose)
+        self.__move(pose=pose)
+        self.__tool_action(Command.GRASP_WITH_TOOL, [])
+        self.__move(pose=approach_pose)
+
+    def _cmd_pick_from_pose(self, params):
+        self.__pick_or_place(_to_pose_list(params[:6]))
+        return []
+
+    _cmd_place_from_pose = _cmd_pick_from_pose
+
+    def _cmd_pick(self, params):
+        position = params[0]
+        if position.get("obj_type") == "JOINTS":
+            self.__move(joints=_to_joints_list(position))
+            self.__tool_action(Command.GRASP_WITH_TOOL, [])
+        else:
+            self.__pick_or_place(_to_pose_list(position))
+        return []
+
+    _cmd_place = _cmd_pick
+
+    def _cmd_pick_and_place(self, params):
+        self._cmd_pick([params[0]])
+        self._cmd_place([params[1]])
+        return []
+
+    # -- Trajectories
+    def _cmd_get_trajectory_saved(self, params):
+        _, joints_list = self.__get(self.state.trajectories, params[0], "Trajectory")
+        return [[JointsPosition(*joints).to_dict() for joints in joints_list]]
+
+    def _cmd_get_saved_trajectory_list(self, params):
+        with self.__state_lock:
+            return [sorted(self.state.trajectories)]
+
+    def _cmd_execute_registered_trajectory(self, params):
+        _, joints_list = self.__get(self.state.trajectories, params[0], "Trajectory")
+        self.__move_through([("joint", joints) for joints in joints_list])
+        return []
+
+    def _cmd_execute_trajectory_from_poses(self, params):
+        self.__move_through([("pose", _to_pose_list(pose)) for pose in params[0]])
+        return []
+
+    def _cmd_execute_trajectory_from_poses_and_joints(self, params):
+        # A single type applies to all the waypoints
+        types = params[1] if len(params[1]) > 1 else params[1] * len(params[0])
+        waypoints = []
+        for waypoint, waypoint_type in zip(params[0], types):
+            if waypoint_type == "joint":
+                waypoints.append(("joint", _to_joints_list(waypoint)))
+            else:
+                waypoints.append(("pose", _to_pose_list(waypoint)))
+        self.__move_through(waypoints)
+        return []
+
+    def _cmd_execute_trajectory(self, params):
+        waypoints = []
+        for waypoint in params[0]:
+            if waypoint["obj_type"] == "POSE":
+                waypoints.append(("pose", _to_pose_list(waypoint)))
+            else:
+                waypoints.append(("joint", _to_joints_list(waypoint)))
+        self.__move_through(waypoints)
+        with self.__state_lock:
+            self.state.last_trajectory = [waypoint for waypoint_type, waypoint in waypoints if waypoint_type == "joint"]
+        return []
+
+    def _cmd_save_trajectory(self, params):
+        joints_list = [_to_joints_list(joints) for joints in params[0]]
+        with self.__state_lock:
+            self.state.trajectories[params[1]] = (params[2], joints_list)
+        return []
+
+    def _cmd_save_last_learned_trajectory(self, params):
+        with self.__state_lock:
+            joints_list = self.state.last_trajectory or [list(self.state.joints)]
+            self.state.trajectories[params[0]] = (params[1], joints_list)
+        return []
+
+    def _cmd_update_trajectory_infos(self, params):
+        with self.__state_lock:
+            _, joints_list = self.__get(self.state.trajectories, params[0], "Trajectory")
+            del self.state.trajectories[params[0]]
+            self.state.trajectories[params[1]] = (params[2], joints_list)
+        return []
+
+    def _cmd_delete_trajectory(self, params):
+        return self.__delete(self.state.trajectories, params[0], "Trajectory")
+
+    def _cmd_clean_trajectory_memory(self, params):
+        with self.__state_lock:
+            self.state.last_trajectory = []
+        return []
+
+    # -- Dynamic frames
+    def _cmd_get_saved_dynamic_frame_list(self, params):
+        with self.__state_lock:
+            names = sorted(self.state.dynamic_frames)
+            return [names, [self.state.dynamic_frames[name][0] for name in names]]
+
+    def _cmd_get_saved_dynamic_frame(self, params):
+        description, pose = self.__get(self.state.dynamic_frames, params[0], "Dynamic frame")
+        return [params[0], description, list(pose)]
+
+    def __save_dynamic_frame(self, name, description, origin, point_x, point_y):
+        origin, point_x, point_y = (np.array(point[:3], dtype=float) for point in (origin, point_x, point_y))
+        axis_x = point_x - origin
+        axis_z = np.cross(axis_x, point_y - origin)
+        if np.linalg.norm(axis_x) < 1e-9 or np.linalg.norm(axis_z) < 1e-9:
+            raise _CommandFailed("The points of the dynamic frame {} are aligned".format(name))
+        axis_x /= np.linalg.norm(axis_x)
+        axis_z /= np.linalg.norm(axis_z)
+        rotation = np.column_stack([axis_x, np.cross(axis_z, axis_x), axis_z])
+        pose = origin.tolist() + transforms.matrix_to_euler(rotation).tolist()
+        with self.__state_lock:
+            self.state.dynamic_frames[name] = (description, pose)
+        return []
+
+    def _cmd_save_dynamic_frame_from_poses(self, params):
+        return self.__save_dynamic_frame(params[0], params[1], *(_to_pose_list(pose) for pose in params[2:5]))
+
+    def _cmd_save_dynamic_frame_from_points(self, params):
+        return self.__save_dynamic_frame(params[0], params[1], *(_to_pose_list(point) for point in params[2:5]))
+
+    def _cmd_edit_dynamic_frame(self, params):
+        with self.__state_lock:
+            _, pose = self.__get(self.state.dynamic_frames, params[0], "Dynamic frame")
+            del self.state.dynamic_frames[params[0]]
+            self.state.dynamic_frames[params[1]] = (params[2], pose)
+        return []
+
+    def _cmd_delete_dynamic_frame(self, params):
+        return self.__delete(self.state.dynamic_frames, params[0], "Dynamic frame")
+
+    # -- Tools
+    def _cmd_get_current_tool_id(self, params):
+        return [self.state.tool.name]
+
+    def _cmd_get_current_tool_position(self, params):
+        return [self.state.tool_position]
+
+    def _cmd_get_gripper_specs(self, params):
+        # Position limits, then torque limits of the gripper
+        return [[GRIPPER_CLOSED_POSITION, GRIPPER_OPEN_POSITION], [0, 100]]
+
+    def _cmd_enable_tcp(self, params):
+        with self.__state_lock:
+            self.state.tcp[0] = _to_bool(params[0])
+        return []
+
+    def _cmd_set_tcp(self, params):
+        with self.__state_lock:
+            self.state.tcp = [True] + [float(value) for value in params[:6]]
+        return []
+
+    def _cmd_reset_tcp(self, params):
+        with self.__state_lock:
+            self.state.tcp = [self.state.tcp[0], 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        return []
+
+    def _cmd_get_tcp(self, params):
+        with self.__state_lock:
+            return list(self.state.tcp)
+
+    # -- IOs
+    def _cmd_set_pin_mode(self, params):
+        with self.__state_lock:
+            self.__get(self.state.digital_pins, params[0], "Pin")[0] = PinMode[params[1]].value
+        return []
+
+    def _cmd_digital_write(self, params):
+        with self.__state_lock:
+            pin = self.__get(self.state.digital_pins, params[0], "Pin")
+            if pin[0] != PinMode.OUTPUT.value:
+                raise _CommandFailed("Pin {} is not an output".format(params[0]))
+            pin[1] = int(params[1] in ("HIGH", "TRUE", 1, True))
+        return []
+
+    def _cmd_digital_read(self, params):
+        return ["HIGH" if self.__get(self.state.digital_pins, params[0], "Pin")[1] else "LOW"]
+
+    def _cmd_get_digital_io_state(self, params):
+        with self.__state_lock:
+            return [[[name, mode, value] for name, (mode, value) in self.state.digital_pins.items()]]
+
+    def _cmd_analog_write(self, params):
+        with self.__state_lock:
+            pin = self.__get(self.state.analog_pins, params[0], "Pin")
+            if pin[0] != PinMode.OUTPUT.value:
+                raise _CommandFailed("Pin {} is not an output".format(params[0]))
+            pin[1] = float(params[1])
+        return []
+
+    def _cmd_analog_read(self, params):
+        return [self.__get(self.state.analog_pins, params[0], "Pin")[1]]
+
+    def _cmd_get_analog_io_state(self, params):
+        with self.__state_lock:
+            return [[[name, mode, value] for name, (mode, value) in self.state.analog_pins.items()]]
+
+    def _cmd_custom_button_state(self, params):
+        return [self.state.custom_button]
+
+    def _cmd_get_hardware_status(self, params):
+        temperatures = [round(35.0 + self.__random.uniform(-0.5, 0.5), 1) for _ in range(6)]
+        return [
+            45.0,
+            self.state.hardware_version,
+            True,
+            "",
+            not self.state.calibrated,
+            False,
+            ["joint_{}".format(index) for index in range(1, 7)],
+            ["Stepper"] * 3 + ["DXL XL-430"] * 2 + ["DXL XL-330"],
+            temperatures,
+            [12.0] * 6,
+            [0] * 6,
+        ]
+
+    # -- Conveyors
+    def _cmd_set_conveyor(self, params):
+        with self.__state_lock:
+            for conveyor_id in (ConveyorID.ID_1, ConveyorID.ID_2):
+                if conveyor_id.name not in self.state.conveyors:
+                    self.state.conveyors[conveyor_id.name] = {"direction": 1, "running": False, "speed": 0}
+                    return [conveyor_id.name]
+        return [ConveyorID.NONE.name]
+
+    def _cmd_unset_conveyor(self, params):
+        return self.__delete(self.state.conveyors, params[0], "Conveyor")
+
+    def _cmd_control_conveyor(self, params):
+        with self.__state_lock:
+            conveyor = self.__get(self.state.conveyors, params[0], "Conveyor")
+            conveyor.update(running=_to_bool(params[1]),
+                            speed=int(params[2]),
+                            direction=1 if params[3] == "FORWARD" else -1)
+        return []
+
+    def _cmd_get_connected_conveyors_id(self, params):
+        with self.__state_lock:
+            return [list(self.state.conveyors)]
+
+    def _cmd_get_conveyors_feedback(self, params):
+        with self.__state_lock:
+            return [[
+                dict(conveyor, conveyor_id=conveyor_id, connection_state=True)
+                for conveyor_id, conveyor in self.state.conveyors.items()
+            ]]
+
+    # -- Vision
+    def _cmd_get_camera_intrinsics(self, params):
+        width, height = _FRAME_SIZE
+        return [[[600.0, 0.0, width / 2.0], [0.0, 600.0, height / 2.0], [0.0, 0.0, 1.0]],
+                [0.05, -0.1, 0.0, 0.0, 0.0]]
+
+    def _cmd_set_image_brightness(self, params):
+        with self.__state_lock:
+            self.state.image_parameters[0] = float(params[0])
+        return []
+
+    def _cmd_set_image_contrast(self, params):
+        with self.__state_lock:
+            self.state.image_parameters[1] = float(params[0])
+        return []
+
+    def _cmd_set_image_saturation(self, params):
+        with self.__state_lock:
+            self.state.image_parameters[2] = float(params[0])
+        return []
+
+    def _cmd_get_image_parameters(self, params):
+        with self.__state_lock:
+            return list(self.state.image_parameters)
+
+    def __detect(self, workspace_name, shape, color):
+        self.__get(self.state.workspaces, workspace_name, "Workspace")
+        for object_shape, object_color, x_rel, y_rel, yaw_rel in _FRAME_OBJECTS:
+            if shape in ("ANY", object_shape) and color in ("ANY", object_color):
+                return object_shape, object_color, x_rel, y_rel, yaw_rel
+        return None
+
+    def __target_pose(self, workspace_name, height_offset, x_rel, y_rel, yaw_rel):
+        origin, point_2, _, point_4 = (np.array(point) for point in self.__get(self.state.workspaces,
+                                                                                workspace_name,
+                                                                                "Workspace"))
+        position = origin + x_rel * (point_2 - origin) + y_rel * (point_4 - origin)
+        position[2] += height_offset
+        axis_angle = math.atan2(point_2[1] - origin[1], point_2[0] - origin[0])
+        return position.tolist() + [0.0, math.pi / 2, axis_angle + yaw_rel]
+
+    def _cmd_get_target_pose_from_rel(self, params):
+        return self.__target_pose(params[0], float(params[1]), float(params[2]), float(params[3]), float(params[4]))
+
+    def _cmd_get_target_pose_from_cam(self, params):
+        detected = self.__detect(params[0], params[2], params[3])
+        if detected is None:
+            return [False, [0.0] * 6, "ANY", "ANY"]
+        shape, color, x_rel, y_rel, yaw_rel = detected
+        return [True, self.__target_pose(params[0], float(params[1]), x_rel, y_rel, yaw_rel), shape, color]
+
+    def _cmd_vision_pick(self, params):
+        detected = self.__detect(params[0], params[2], params[3])
+        if detected is None:
+            return [False, "ANY", "ANY"]
+        shape, color, x_rel, y_rel, yaw_rel = detected
+        self.__pick_or_place(self.__target_pose(params[0], float(params[1]), x_rel, y_rel, yaw_rel))
+        return [True, shape, color]
+
+    def _cmd_move_to_object(self, params):
+        detected = self.__detect(params[0], params[2], params[3])
+        if detected is None:
+            return [False, "ANY", "ANY"]
+        shape, color, x_rel, y_rel, yaw_rel = detected
+        self.__move(pose=self.__target_pose(params[0], float(params[1]), x_rel, y_rel, yaw_rel))
+        return [True, shape, color]
+
+    def _cmd_detect_object(self, params):
+        detected = self.__detect(params[0], params[1], params[2])
+        if detected is None:
+            return [False, 0.0, 0.0, 0.0, "ANY", "ANY"]
+        shape, color, x_rel, y_rel, yaw_rel = detected
+        return [True, x_rel, y_rel, yaw_rel, shape, color]
+
+    def __save_workspace(self, name, points):
+        if len(points) != 4:
+            raise _CommandFailed("A workspace is defined by 4 points, got {}".format(len(points)))
+        with self.__state_lock:
+            self.state.workspaces[name] = [_to_pose_list(point)[:3] for point in points]
+        return []
+
+    def _cmd_save_workspace_from_poses(self, params):
+        return self.__save_workspace(params[0], params[1:])
+
+    def _cmd_save_workspace_from_points(self, params):
+        return self.__save_workspace(params[0], params[1:])
+
+    def _cmd_delete_workspace(self, params):
+        return self.__delete(self.state.workspaces, params[0], "Workspace")
+
+    def _cmd_get_workspace_ratio(self, params):
+        origin, point_2, _, point_4 = (np.array(point) for point in self.__get(self.state.workspaces,
+                                                                                params[0],
+                                                                                "Workspace"))
+        return [float(np.linalg.norm(point_2 - origin) / np.linalg.norm(point_4 - origin))]
+
+    def _cmd_get_workspace_list(self, params):
+        with self.__state_lock:
+            return [sorted(self.state.workspaces)]
+
+    # -- Sound
+    def _cmd_play_sound(self, params):
+        duration = self.__get(self.state.sounds, params[0], "Sound")
+        if _to_bool(params[1]):
+            self.__sleep(self.__scaled(duration))
+        return []
+
+    def _cmd_delete_sound(self, params):
+        return self.__delete(self.state.sounds, params[0], "Sound")
+
+    def _cmd_import_sound(self, params):
+        with self.__state_lock:
+            self.state.sounds[params[0]] = 1.0
+        return []
+
+    def _cmd_get_sounds(self, params):
+        with self.__state_lock:
+            return [sorted(self.state.sounds)]
+
+    def _cmd_get_sound_duration(self, params):
+        return [self.__get(self.state.sounds, params[0], "Sound")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock of the robot's TCP server")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=TCP_PORT, help="port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="delay before each answer, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum random delay added, in seconds")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="factor applied to the motions durations")
+    parser.add_argument("--binary-encoding", action="store_true", help="advertise the binary encoding")
+    parser.add_argument("--large-framing", action="store_true", help="advertise the 4 bytes framing")
+    parser.add_argument("--frame", action="append", help="JPEG file sent by the camera, can be repeated")
+    parser.add_argument("--seed", type=int, help="seed of the jitter")
+    args = parser.parse_args()
+
+    frames = None
+    if args.frame:
+        frames = []
+        for path in args.frame:
+            with open(path, "rb") as frame_file:
+                frames.append(frame_file.read())
+
+    logging.basicConfig(level=logging.INFO)
+    MockRobotServer(host=args.host,
+                    port=args.port,
+                    latency=args.latency,
+                    jitter=args.jitter,
+                    time_scale=args.time_scale,
+                    frames=frames,
+                    binary_encoding=args.binary_encoding,
+                    large_framing=args.large_framing,
+                    seed=args.seed).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import concurrent.futures
+
+
+class MotionHandle(object):
+    """
+    Handle on a motion running in the background, returned by :func:`NiryoRobot.move_async`
+    and :func:`NiryoRobot.execute_trajectory_async`.
+
+    Example: ::
+
+        handle = robot.move_async(place_pose)
+        next_pick_pose = compute_next_pick(robot.get_img_compressed())
+        handle.result()  # Wait for the end of the motion, raise its exception if it failed
+        robot.move(next_pick_pose)
+    """
+
+    def __init__(self, name, future):
+        """
+        :param name: name of the motion command
+        :type name: str
+        :param future: future of the motion
+        :type future: concurrent.futures.Future
+        """
+        self.__name = name
+        self.__future = future
+
+    def __repr__(self):
+        if not self.__future.done():
+            state = "running"
+        elif self.__future.exception() is not None:
+            state = "raised {!r}".format(self.__future.exception())
+        else:
+            state = "done"
+        return "<{} {} {}>".format(self.__class__.__name__, self.__name, state)
+
+    def done(self):
+        """
+        :return: ``True`` if the motion has finished, successfully or not
+        :rtype: bool
+        """
+        return self.__future.done()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the end of the motion
+
+        :param timeout: Maximum time to wait in seconds. None means no limit
+        :type timeout: float
+        :return: ``True`` if the motion has finished, ``False`` if the timeout has expired
+        :rtype: bool
+        """
+        concurrent.futures.wait([self.__future], timeout=timeout)
+        return self.__future.done()
+
+    def result(self, timeout=None):
+        """
+        Wait for the end of the motion and return what the motion command returned.
+        Raise the exception raised by the motion command if any
+
+        :param timeout: Maximum time to wait in seconds. None means no limit
+        :type timeout: float
+        :raises TimeoutError: if the motion hasn't finished before the timeout
+        :return: What the motion command returned
+        """
+        try:
+            return self.__future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError("The motion {} hasn't finished within {}s".format(self.__name, timeout)) from None
+
+    def exception(self, timeout=None):
+        """
+        Wait for the end of the motion and return the exception it raised
+
+        :param timeout: Maximum time to wait in seconds. None means no limit
+        :type timeout: float
+        :raises TimeoutError: if the motion hasn't finished before the timeout
+        :return: The exception raised by the motion command, or None
+        :rtype: Exception
+        """
+        try:
+            return self.__future.exception(timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError("The motion {} hasn't finished within {}s".format(self.__name, timeout)) from None
+
+    def add_done_callback(self, callback):
+        """
+        Call a function with this handle when the motion finishes.
+        The function is called right away if the motion has already finished,
+        otherwise it is called from the thread which runs the motions
+
+        :param callback: function taking the handle as only parameter
+        :type callback: callable
+        :rtype: None
+        """
+        self.__future.add_done_callback(lambda _: callback(self))
@@ -2,11 +2,17 @@
 # coding=utf-8
 import math
 import re
+import time
 
 import numpy as np
 
+from . import transforms
 from .enums_communication import LengthUnit
 
+# Attributes of a pose, in the order of its list
+_POSE_ATTRIBUTES = ('x', 'y', 'z', 'roll', 'pitch', 'yaw')
+_JOINT_KEY = re.compile(r'^joint_\d+$')
+
 
 class PoseMetadata:
     """
@@ -153,10 +159,12 @@ class PoseObject:
             yield attr
 
     def __getitem__(self, value):
+        if isinstance(value, int):
+            return float(getattr(self, _POSE_ATTRIBUTES[value]))
         return self.to_list()[value]
 
     def __setitem__(self, key, value):
-        attr = ['x', 'y', 'z', 'roll', 'pitch', 'yaw'][key]
+        attr = _POSE_ATTRIBUTES[key]
         setattr(self, attr, value)
 
     def __len__(self):
@@ -212,27 +220,7 @@ class PoseObject:
         :return: A quaternion.
         :rtype: list
         """
-        # simplified version of the tf.transformations.quaternion_from_euler function
-        ai = self.roll / 2.0
-        aj = self.pitch / 2.0
-        ak = self.yaw / 2.0
-        ci = math.cos(ai)
-        si = math.sin(ai)
-        cj = math.cos(aj)
-        sj = math.sin(aj)
-        ck = math.cos(ak)
-        sk = math.sin(ak)
-        cc = ci * ck
-        cs = ci * sk
-        sc = si * ck
-        ss = si * sk
-
-        quaternion = np.array([
-            cj * sc - sj * cs,
-            cj * ss + sj * cc,
-            cj * cs - sj * sc,
-            cj * cc + sj * ss,
-        ])
+        quaternion = transforms.euler_to_quaternion([self.roll, self.pitch, self.yaw])
 
         # Normalize the quaternion
         mag2 = np.square(quaternion).sum()
@@ -322,7 +310,7 @@ class JointsPosition:
         joints = []
         other_args = {}
         for name, value in d.items():
-            if re.match(r'^joint_\d+$', name):
+            if _JOINT_KEY.match(name):
                 joints.append(value)
         if 'metadata' in d:
             other_args['metadata'] = JointsPositionMetadata.from_dict(d['metadata'])
@@ -335,6 +323,369 @@ class JointsPosition:
         return repr_str
 
 
+def _as_rows(values, nb_columns=None):
+    """
+    :param values: array-like of shape (N, nb_columns)
+    :param nb_columns: number of values per row, None to accept any number
+    :return: the values as a 2D float64 array, without copying them if they already are one
+    :rtype: numpy.ndarray
+    """
+    array = np.asarray(values, dtype=np.float64)
+    if array.size == 0 and array.ndim < 2:
+        array = array.reshape(0, 6 if nb_columns is None else nb_columns)
+    if array.ndim != 2 or (nb_columns is not None and array.shape[1] != nb_columns):
+        raise ValueError("Expected an array of shape (N, {}), got {}".format(
+            'M' if nb_columns is None else nb_columns, array.shape))
+    return array
+
+
+def _row_property(index, name):
+    def getter(self):
+        return float(self.row[index])
+
+    def setter(self, value):
+        self.row[index] = value
+
+    return property(getter, setter, doc="{} of the row".format(name))
+
+
+class PoseView:
+    """
+    Pose of a :class:`PoseArray`. It reads and writes its row of the array, like a :class:`PoseObject`
+
+    :ivar row: row of the array, [x, y, z, roll, pitch, yaw]
+    :type row: numpy.ndarray
+    :ivar metadata: metadata shared by the poses of the array
+    :type metadata: PoseMetadata
+    """
+    __slots__ = ('row', 'metadata')
+
+    x = _row_property(0, 'x')
+    y = _row_property(1, 'y')
+    z = _row_property(2, 'z')
+    roll = _row_property(3, 'roll')
+    pitch = _row_property(4, 'pitch')
+    yaw = _row_property(5, 'yaw')
+
+    def __init__(self, row, metadata):
+        self.row = row
+        self.metadata = metadata
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, ", ".join(
+            "{}={!r}".format(name, value) for name, value in zip(_POSE_ATTRIBUTES, self.to_list())))
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __getitem__(self, value):
+        if isinstance(value, int):
+            return float(self.row[value])
+        return self.to_list()[value]
+
+    def __setitem__(self, key, value):
+        self.row[key] = value
+
+    def __len__(self):
+        return 6
+
+    def __eq__(self, other):
+        if not isinstance(other, (PoseView, PoseObject)):
+            return NotImplemented
+        return self.to_list() == other.to_list() and self.metadata == other.metadata
+
+    def to_list(self):
+        """
+        :return: A list [x, y, z, roll, pitch, yaw]
+        :rtype: list[float]
+        """
+        return self.row.tolist()
+
+    def to_dict(self):
+        """
+        :return: A dictionary representing the pose, like :func:`PoseObject.to_dict`
+        :rtype: dict
+        """
+        return dict(zip(_POSE_ATTRIBUTES, self.row.tolist()), metadata=self.metadata.to_dict())
+
+    def to_pose(self):
+        """
+        :return: A copy of the pose
+        :rtype: PoseObject
+        """
+        return PoseObject(*self.row.tolist(), metadata=self.metadata)
+
+
+class JointsView:
+    """
+    Joints positions of a :class:`JointsArray`. It reads and writes its row of the array, like a
+    :class:`JointsPosition`
+
+    :ivar row: row of the array
+    :type row: numpy.ndarray
+    :ivar metadata: metadata shared by the positions of the array
+    :type metadata: JointsPositionMetadata
+    """
+    __slots__ = ('row', 'metadata')
+
+    def __init__(self, row, metadata):
+        self.row = row
+        self.metadata = metadata
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, ", ".join(str(joint) for joint in self.to_list()))
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __getitem__(self, item):
+        if isinstance(item, int):
+            return float(self.row[item])
+        return self.to_list()[item]
+
+    def __setitem__(self, key, value):
+        self.row[key] = value
+
+    def __len__(self):
+        return len(self.row)
+
+    def __eq__(self, other):
+        if not isinstance(other, (JointsView, JointsPosition)):
+            return NotImplemented
+        return self.to_list() == other.to_list()
+
+    def to_list(self):
+        """
+        :return: A list containing all the joints positions.
+        :rtype: list[float]
+        """
+        return self.row.tolist()
+
+    def to_dict(self):
+        """
+        :return: A dictionary representing the joints positions, like :func:`JointsPosition.to_dict`
+        :rtype: dict
+        """
+        d = {f'joint_{n}': joint for n, joint in enumerate(self.row.tolist())}
+        d['metadata'] = self.metadata.to_dict()
+        return d
+
+    def to_joints(self):
+        """
+        :return: A copy of the joints positions
+        :rtype: JointsPosition
+        """
+        return JointsPosition(*self.row.tolist(), metadata=self.metadata)
+
+
+class PoseArray:
+    """
+    Sequence of poses sharing the same metadata, stored in a single (N, 6) float64 array
+    with a [x, y, z, roll, pitch, yaw] row per pose. It can be given to
+    :func:`~pyniryo.api.tcp_client.NiryoRobot.execute_trajectory` instead of a list of :class:`PoseObject`.
+
+    Indexing returns a :class:`PoseView` on a row and slicing returns a PoseArray sharing the same array:
+    no :class:`PoseObject` is created unless asked for. Reading a view goes through NumPy,
+    so computations over many poses are faster on the columns of :attr:`data`.
+
+    Example: ::
+
+        poses = PoseArray(np.zeros((1000, 6)))
+        poses.data[:, 2] = np.linspace(0.1, 0.3, 1000)
+        poses[0].z  # 0.1
+        robot.execute_trajectory(poses[::10])
+
+    :param poses: array-like of shape (N, 6). A float64 array is used without being copied
+    :param metadata: The metadata of all the poses.
+    :type metadata: PoseMetadata
+    """
+
+    def __init__(self, poses=(), metadata=PoseMetadata.v2()):
+        self.data = _as_rows(poses, 6)
+        self.metadata = metadata
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} poses, metadata={self.metadata!r})"
+
+    def __iter__(self):
+        metadata = self.metadata
+        for row in self.data:
+            yield PoseView(row, metadata)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return PoseView(self.data[item], self.metadata)
+        return self.__class__(self.data[item], self.metadata)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        return np.array_equal(self.data, other.data) and self.metadata == other.metadata
+
+    def to_list(self):
+        """
+        :return: A list of [x, y, z, roll, pitch, yaw]
+        :rtype: list[list[float]]
+        """
+        return self.data.tolist()
+
+    def to_poses(self):
+        """
+        :return: A copy of each pose
+        :rtype: list[PoseObject]
+        """
+        return [PoseObject(*pose, metadata=self.metadata) for pose in self.data.tolist()]
+
+    def quaternions(self):
+        """
+        :return: The quaternion [qx, qy, qz, qw] of each pose, of shape (N, 4)
+        :rtype: numpy.ndarray
+        """
+        return transforms.euler_to_quaternion(self.data[:, 3:])
+
+    def to_dict(self):
+        """
+        :return: A list of dictionaries representing the poses, like :func:`PoseObject.to_dict`.
+            They share the same metadata dictionary
+        :rtype: list[dict]
+        """
+        metadata = self.metadata.to_dict()
+        return [{
+            'x': x, 'y': y, 'z': z, 'roll': roll, 'pitch': pitch, 'yaw': yaw, 'metadata': metadata
+        } for x, y, z, roll, pitch, yaw in self.data.tolist()]
+
+    @classmethod
+    def from_dict(cls, dicts):
+        """
+        Creates a new PoseArray from a list of dictionaries representing poses.
+        The metadata of the first pose is used for all of them.
+
+        :param dicts: A list of dictionaries representing poses.
+        :type dicts: list[dict]
+        :rtype: PoseArray
+        """
+        if dicts and 'metadata' in dicts[0]:
+            metadata = PoseMetadata.from_dict(dicts[0]['metadata'])
+        else:
+            metadata = PoseMetadata.v2()
+        return cls([[d['x'], d['y'], d['z'], d['roll'], d['pitch'], d['yaw']] for d in dicts], metadata)
+
+    @classmethod
+    def from_poses(cls, poses):
+        """
+        Creates a new PoseArray from poses. The metadata of the first pose is used for all of them.
+
+        :param poses: The poses.
+        :type poses: list[PoseObject]
+        :rtype: PoseArray
+        """
+        metadata = poses[0].metadata if poses else PoseMetadata.v2()
+        return cls([pose.to_list() for pose in poses], metadata)
+
+
+class JointsArray:
+    """
+    Sequence of joints positions sharing the same metadata, stored in a single (N, M) float64 array
+    with a row per position. It can be given to
+    :func:`~pyniryo.api.tcp_client.NiryoRobot.execute_trajectory` and
+    :func:`~pyniryo.api.tcp_client.NiryoRobot.save_trajectory` instead of a list of :class:`JointsPosition`.
+
+    Indexing returns a :class:`JointsView` on a row and slicing returns a JointsArray sharing the same array:
+    no :class:`JointsPosition` is created unless asked for.
+
+    :param joints: array-like of shape (N, M). A float64 array is used without being copied
+    :param metadata: The metadata of all the positions.
+    :type metadata: JointsPositionMetadata
+    """
+
+    def __init__(self, joints=(), metadata=JointsPositionMetadata.v1()):
+        self.data = _as_rows(joints)
+        self.metadata = metadata
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} positions, metadata={self.metadata!r})"
+
+    def __iter__(self):
+        metadata = self.metadata
+        for row in self.data:
+            yield JointsView(row, metadata)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return JointsView(self.data[item], self.metadata)
+        return self.__class__(self.data[item], self.metadata)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        return np.array_equal(self.data, other.data)
+
+    def to_list(self):
+        """
+        :return: A list of the joints positions
+        :rtype: list[list[float]]
+        """
+        return self.data.tolist()
+
+    def to_joints(self):
+        """
+        :return: A copy of each joints position
+        :rtype: list[JointsPosition]
+        """
+        return [JointsPosition(*joints, metadata=self.metadata) for joints in self.data.tolist()]
+
+    def to_dict(self):
+        """
+        :return: A list of dictionaries representing the positions, like :func:`JointsPosition.to_dict`.
+            They share the same metadata dictionary
+        :rtype: list[dict]
+        """
+        names = [f'joint_{n}' for n in range(self.data.shape[1])]
+        metadata = self.metadata.to_dict()
+        return [dict(zip(names, joints), metadata=metadata) for joints in self.data.tolist()]
+
+    @classmethod
+    def from_dict(cls, dicts):
+        """
+        Creates a new JointsArray from a list of dictionaries representing joints positions.
+        The joints and the metadata of the first position are used for all of them.
+
+        :param dicts: A list of dictionaries representing joints positions.
+        :type dicts: list[dict]
+        :rtype: JointsArray
+        """
+        if not dicts:
+            return cls()
+        names = [name for name in dicts[0] if _JOINT_KEY.match(name)]
+        other_args = {}
+        if 'metadata' in dicts[0]:
+            other_args['metadata'] = JointsPositionMetadata.from_dict(dicts[0]['metadata'])
+        return cls([[d[name] for name in names] for d in dicts], **other_args)
+
+    @classmethod
+    def from_joints(cls, joints_positions):
+        """
+        Creates a new JointsArray from joints positions, or lists of joints.
+
+        :param joints_positions: The joints positions.
+        :type joints_positions: list[JointsPosition | list[float]]
+        :rtype: JointsArray
+        """
+        return cls([list(joints) for joints in joints_positions])
+
+
 class HardwareStatusObject:
     """
     Object used to store every hardware information
@@ -448,3 +799,56 @@ class AnalogPinObject:
 
     def __repr__(self):
         return self.__str__()
+
+
+class RobotState:
+    """
+    Snapshot of the robot's state, refreshed in the background by :func:`NiryoRobot.start_state_streaming`.
+    A field is None if the robot couldn't provide it
+    """
+
+    def __init__(self,
+                 joints,
+                 pose,
+                 learning_mode,
+                 collision_detected,
+                 digital_io_state,
+                 conveyors_feedback,
+                 timestamp=None):
+        # JointsPosition of the robot
+        self.joints = joints
+        # PoseObject of the end effector
+        self.pose = pose
+        # Boolean indicating if the learning mode is on
+        self.learning_mode = learning_mode
+        # Boolean indicating if a collision has been detected
+        self.collision_detected = collision_detected
+        # List of DigitalPinObject
+        self.digital_io_state = digital_io_state
+        # List of the conveyors' feedback
+        self.conveyors_feedback = conveyors_feedback
+        # time.monotonic() value at which the snapshot has been taken
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+
+    @property
+    def age(self):
+        """
+        Time elapsed since the snapshot has been taken, in seconds
+
+        :type: float
+        """
+        return time.monotonic() - self.timestamp
+
+    def __str__(self):
+        list_string_ret = list()
+        list_string_ret.append("Age (s) : {:.3f}".format(self.age))
+        list_string_ret.append("Joints : {}".format(self.joints))
+        list_string_ret.append("Pose : {}".format(self.pose))
+        list_string_ret.append("Learning mode : {}".format(self.learning_mode))
+        list_string_ret.append("Collision detected : {}".format(self.collision_detected))
+        list_string_ret.append("Digital IO : {}".format(self.digital_io_state))
+        list_string_ret.append("Conveyors feedback : {}".format(self.conveyors_feedback))
+        return "\n".join(list_string_ret)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,164 @@
+"""
+Breakdown of the time spent in the requests of :class:`~pyniryo.api.tcp_client.NiryoRobot`, phase by phase.
+See :func:`~pyniryo.api.tcp_client.NiryoRobot.profile`: each request is a call, named after its command.
+
+The phases of a call are, in order:
+
+- ``validation``: checking and converting the parameters with the converters of the command's schema,
+  see :mod:`~pyniryo.api.schemas`
+- ``build``: building the dict of the request
+- ``queue``: waiting for the connection to be free, when several threads share it
+- ``encode``: encoding the request in JSON or binary
+- ``send``: writing the request on the socket
+- ``wait``: waiting for the robot's answer
+- ``receive``: reading the answer and its payload
+- ``decode``: decoding the answer and checking its status
+- ``result``: building the returned object from the answer, like a :class:`~pyniryo.api.objects.PoseObject`
+
+A function profiled with :func:`Profiler.run` which sends several requests goes through the phases several times,
+the durations are summed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+PHASES = ("validation", "build", "queue", "encode", "send", "wait", "receive", "decode", "result")
+
+# Call being profiled in the current thread
+_local = threading.local()
+
+
+def active_call():
+    """
+    :return: the call being profiled in the current thread, or None
+    :rtype: CallProfile
+    """
+    return getattr(_local, "call", None)
+
+
+class CallProfile(object):
+    """
+    Durations of the phases of a call, in seconds
+    """
+
+    def __init__(self, name):
+        """
+        :param name: name of the method
+        :type name: str
+        """
+        self.name = name
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.nb_requests = 0
+        self.error = False
+        self.start_time = time.perf_counter()
+        self.total = 0.0
+        self.__last_time = self.start_time
+
+    def __repr__(self):
+        return "<{} {} {:.1f}us>".format(self.__class__.__name__, self.name, self.total * 1e6)
+
+    def mark(self, phase):
+        """
+        End a phase: the time elapsed since the end of the previous phase is added to this one
+
+        :param phase: one of :data:`PHASES`
+        :type phase: str
+        :rtype: None
+        """
+        now = time.perf_counter()
+        self.phases[phase] += now - self.__last_time
+        self.__last_time = now
+
+    def _finish(self):
+        self.mark("result")
+        self.total = self.__last_time - self.start_time
+
+
+class Profiler(object):
+    """
+    Collects the :class:`CallProfile` of the profiled calls
+    """
+
+    def __init__(self, on_call=None):
+        """
+        :param on_call: function called with each :class:`CallProfile` when the call returns
+        :type on_call: callable
+        """
+        self.__on_call = on_call
+        self.__lock = threading.Lock()
+        self.__calls = []
+
+    @property
+    def calls(self):
+        """
+        Profiles of the calls, in the order they have returned
+
+        :type: list[CallProfile]
+        """
+        with self.__lock:
+            return list(self.__calls)
+
+    def run(self, name, function, *args, **kwargs):
+        """
+        Profile a call. The calls made by the profiled function are part of its profile
+
+        :param name: name of the call
+        :type name: str
+        :param function: function to call
+        :type function: callable
+        :return: what the function returns
+        """
+        if active_call() is not None:
+            return function(*args, **kwargs)
+        call = _local.call = CallProfile(name)
+        try:
+            return function(*args, **kwargs)
+        except Exception:
+            call.error = True
+            raise
+        finally:
+            call._finish()
+            _local.call = None
+            with self.__lock:
+                self.__calls.append(call)
+            if self.__on_call is not None:
+                self.__on_call(call)
+
+    def summary(self):
+        """
+        Example: ::
+
+            {"GET_POSE": {"calls": 1000, "errors": 0, "total": 0.0031,
+                          "phases": {"validation": 0.0000012, "build": 0.0000021, ... "result": 0.0000143}}}
+
+        :return: number of calls and errors, mean duration of the calls and of their phases in seconds, per name
+        :rtype: dict[str, dict]
+        """
+        summary = OrderedDict()
+        for call in self.calls:
+            name_summary = summary.setdefault(call.name, {
+                "calls": 0, "errors": 0, "total": 0.0, "phases": dict.fromkeys(PHASES, 0.0)
+            })
+            name_summary["calls"] += 1
+            name_summary["errors"] += call.error
+            name_summary["total"] += call.total
+            for phase, duration in call.phases.items():
+                name_summary["phases"][phase] += duration
+        for name_summary in summary.values():
+            name_summary["total"] /= name_summary["calls"]
+            for phase in PHASES:
+                name_summary["phases"][phase] /= name_summary["calls"]
+        return summary
+
+    def report(self):
+        """
+        :return: table of the mean durations of the calls and of their phases, in microseconds
+        :rtype: str
+        """
+        lines = ["{:>28} | {:>6} | {:>9} | ".format("call", "calls", "total") +
+                 " | ".join("{:>10}".format(phase) for phase in PHASES)]
+        for name, name_summary in self.summary().items():
+            lines.append("{:>28} | {:>6} | {:>9.1f} | ".format(name, name_summary["calls"], name_summary["total"] * 1e6)
+                         + " | ".join("{:>10.1f}".format(name_summary["phases"][phase] * 1e6) for phase in PHASES))
+        return "\n".join(lines)
@@ -0,0 +1,353 @@
+"""
+Recording of the bytes exchanged with a robot, and replay of a recorded session without the robot.
+
+A :class:`SessionRecorder` appends every packet sent and every piece of answer and payload received
+by a :class:`~pyniryo.api.tcp_client.NiryoRobot`, with its timestamp, to a memory-mapped log file.
+A :class:`SessionReplayer` serves the recorded answers back through fake sockets,
+so that a session can be replayed offline and at full speed: to reproduce an incident,
+or to benchmark the client-side processing of the answers, images included.
+
+Example: ::
+
+    with SessionRecorder("session.rec") as recorder:
+        robot = NiryoRobot("10.10.10.10", recorder=recorder)
+        robot.get_joints()
+        img = robot.get_img_compressed()
+        robot.close_connection()
+
+    # Later, without the robot: the same calls get the same answers
+    replayer = SessionReplayer("session.rec")
+    robot = NiryoRobot("10.10.10.10", connector=replayer.create_connection)
+    robot.get_joints()
+    img = robot.get_img_compressed()
+
+The log file starts with :data:`FILE_MAGIC`, followed by the records. Each record is a header
+(kind, connection number, timestamp in seconds since the epoch, size of the data, see :data:`RECORD_HEADER`)
+followed by the data. The file is preallocated with zeros, and a null kind marks the end of the records,
+so a log file is readable even if the recording process has been killed.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+from enum import IntEnum
+
+from .exceptions import ReplayMismatchException
+
+FILE_MAGIC = b"PYNIRYO-REC-1\n"
+# Kind, connection number, timestamp, size of the data
+RECORD_HEADER = struct.Struct("<BHdI")
+# Size of the file when the recording starts. It is doubled each time it is full
+INITIAL_FILE_SIZE = 1024 * 1024
+
+
+class RecordKind(IntEnum):
+    """
+    Kinds of the records of a log file
+    """
+    # Data: label of the connection, like the role of the channel
+    OPEN = 1
+    # Data: bytes written on the socket
+    SENT = 2
+    # Data: bytes read from the socket
+    RECEIVED = 3
+    # No data
+    CLOSE = 4
+
+
+Record = namedtuple("Record", ["kind", "connection", "timestamp", "data"])
+
+
+class SessionRecorder(object):
+    """
+    Thread safe, append-only, memory-mapped log of the bytes exchanged on the connections to a robot.
+    Give it to :class:`~pyniryo.api.tcp_client.NiryoRobot` through its ``recorder`` parameter,
+    before the connection, so that the handshakes are recorded too
+    """
+
+    def __init__(self, path, initial_size=INITIAL_FILE_SIZE):
+        """
+        :param path: path of the log file. It is overwritten if it exists
+        :type path: str
+        :param initial_size: size of the file when the recording starts, in bytes
+        :type initial_size: int
+        """
+        self.__lock = threading.Lock()
+        self.__file = open(path, "w+b")
+        self.__size = max(initial_size, len(FILE_MAGIC) + RECORD_HEADER.size)
+        self.__file.truncate(self.__size)
+        self.__map = mmap.mmap(self.__file.fileno(), self.__size)
+        self.__map[:len(FILE_MAGIC)] = FILE_MAGIC
+        self.__offset = len(FILE_MAGIC)
+        self.__nb_connections = 0
+
+        self.path = path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def closed(self):
+        """
+        :type: bool
+        """
+        return self.__map is None
+
+    @property
+    def size(self):
+        """
+        Number of bytes written in the log file
+
+        :type: int
+        """
+        return self.__offset
+
+    def wrap(self, client_socket, label=""):
+        """
+        Record the bytes exchanged on a socket
+
+        :param client_socket: connected socket
+        :type client_socket: socket.socket
+        :param label: label of the connection, saved in the log file
+        :type label: str
+        :return: socket recording what is sent and received, to be used instead of ``client_socket``
+        :rtype: RecordingSocket
+        """
+        with self.__lock:
+            connection = self.__nb_connections
+            self.__nb_connections += 1
+        self.append(RecordKind.OPEN, connection, label.encode())
+        return RecordingSocket(client_socket, self, connection)
+
+    def append(self, kind, connection, data=b""):
+        """
+        Append a record to the log file. Nothing is recorded once the recorder is closed
+
+        :param kind: kind of the record
+        :type kind: RecordKind
+        :param connection: number of the connection
+        :type connection: int
+        :param data: data of the record
+        :type data: bytes
+        :rtype: None
+        """
+        timestamp = time.time()
+        with self.__lock:
+            if self.__map is None:
+                return
+            end = self.__offset + RECORD_HEADER.size + len(data)
+            # Keep room for the null kind marking the end of the records
+            if end + 1 > self.__size:
+                self.__grow(end + 1)
+            RECORD_HEADER.pack_into(self.__map, self.__offset, kind, connection, timestamp, len(data))
+            self.__map[self.__offset + RECORD_HEADER.size:end] = data
+            self.__offset = end
+
+    def __grow(self, min_size):
+        self.__size = max(2 * self.__size, min_size)
+        self.__map.close()
+        self.__file.truncate(self.__size)
+        self.__map = mmap.mmap(self.__file.fileno(), self.__size)
+
+    def flush(self):
+        """
+        Write the records to the disk
+
+        :rtype: None
+        """
+        with self.__lock:
+            if self.__map is not None:
+                self.__map.flush()
+
+    def close(self):
+        """
+        Stop the recording, and truncate the log file to its content
+
+        :rtype: None
+        """
+        with self.__lock:
+            if self.__map is None:
+                return
+            self.__map.flush()
+            self.__map.close()
+            self.__map = None
+            self.__file.truncate(self.__offset)
+            self.__file.close()
+
+
+class RecordingSocket(object):
+    """
+    Socket recording the bytes sent and received in a :class:`SessionRecorder`
+    """
+
+    def __init__(self, client_socket, recorder, connection):
+        self.__socket = client_socket
+        self.__recorder = recorder
+        self.__connection = connection
+
+    def sendall(self, data):
+        self.__socket.sendall(data)
+        self.__recorder.append(RecordKind.SENT, self.__connection, bytes(data))
+
+    def recv_into(self, buffer, nbytes=0):
+        nbr_read = self.__socket.recv_into(buffer, nbytes)
+        if nbr_read:
+            self.__recorder.append(RecordKind.RECEIVED, self.__connection, bytes(memoryview(buffer)[:nbr_read]))
+        return nbr_read
+
+    def settimeout(self, timeout):
+        self.__socket.settimeout(timeout)
+
+    def shutdown(self, how):
+        self.__socket.shutdown(how)
+
+    def close(self):
+        self.__socket.close()
+        self.__recorder.append(RecordKind.CLOSE, self.__connection)
+
+
+def read_records(path):
+    """
+    Read the records of a log file written by a :class:`SessionRecorder`.
+    A record truncated by the end of the file is ignored
+
+    :param path: path of the log file
+    :type path: str
+    :return: records, in the order they have been written
+    :rtype: Iterator[Record]
+    """
+    with open(path, "rb") as log_file:
+        if os.fstat(log_file.fileno()).st_size < len(FILE_MAGIC) or log_file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError("{} is not a session log file".format(path))
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+            offset = len(FILE_MAGIC)
+            while offset + RECORD_HEADER.size <= len(log_map):
+                kind, connection, timestamp, size = RECORD_HEADER.unpack_from(log_map, offset)
+                start = offset + RECORD_HEADER.size
+                if kind == 0 or start + size > len(log_map):
+                    return
+                yield Record(RecordKind(kind), connection, timestamp, log_map[start:start + size])
+                offset = start + size
+
+
+class SessionReplayer(object):
+    """
+    Replays a session recorded by a :class:`SessionRecorder`. Give its :func:`create_connection` to
+    :class:`~pyniryo.api.tcp_client.NiryoRobot` through its ``connector`` parameter: the connections opened by the
+    robot are given, in order, the answers received by the recorded connections.
+    The answers are served as soon as they are read, without the recorded delays
+    """
+
+    def __init__(self, path, check_requests=True):
+        """
+        :param path: path of the log file
+        :type path: str
+        :param check_requests: whether to raise a :class:`ReplayMismatchException` when the client sends
+            something else than what has been recorded
+        :type check_requests: bool
+        """
+        sent, received = {}, {}
+        self.labels = []
+        self.records = list(read_records(path))
+        for record in self.records:
+            if record.kind == RecordKind.OPEN:
+                self.labels.append(record.data.decode())
+                sent[record.connection], received[record.connection] = [], []
+            elif record.kind == RecordKind.SENT:
+                sent[record.connection].append(record.data)
+            elif record.kind == RecordKind.RECEIVED:
+                received[record.connection].append(record.data)
+        self.__streams = [(b"".join(sent[connection]), b"".join(received[connection]))
+                          for connection in sorted(sent)]
+        self.__check_requests = check_requests
+        self.__lock = threading.Lock()
+        self.__nb_connections = 0
+
+    @property
+    def nb_connections(self):
+        """
+        Number of connections opened by the replay
+
+        :type: int
+        """
+        return self.__nb_connections
+
+    def rewind(self):
+        """
+        Replay the session from the start: the next connection is given the answers of the first recorded one
+
+        :rtype: None
+        """
+        with self.__lock:
+            self.__nb_connections = 0
+
+    def create_connection(self, address, timeout=None):
+        """
+        Open the next recorded connection, like :func:`socket.create_connection`
+
+        :param address: ignored
+        :param timeout: ignored
+        :rtype: ReplaySocket
+        """
+        with self.__lock:
+            connection = self.__nb_connections
+            if connection >= len(self.__streams):
+                raise ConnectionRefusedError("The recorded session has only {} connections".format(
+                    len(self.__streams)))
+            self.__nb_connections += 1
+        sent, received = self.__streams[connection]
+        return ReplaySocket(sent if self.__check_requests else None, received)
+
+
+class ReplaySocket(object):
+    """
+    Fake socket serving recorded answers
+    """
+
+    def __init__(self, expected_sent, received):
+        """
+        :param expected_sent: bytes which the client must send, None to accept anything
+        :type expected_sent: bytes
+        :param received: bytes served to the client
+        :type received: bytes
+        """
+        self.__expected_sent = expected_sent
+        self.__sent_offset = 0
+        self.__received = memoryview(received)
+        self.__received_offset = 0
+
+    def sendall(self, data):
+        if self.__expected_sent is None:
+            return
+        end = self.__sent_offset + len(data)
+        if self.__expected_sent[self.__sent_offset:end] != data:
+            raise ReplayMismatchException(
+                "The request sent at byte {} differs from the recorded one".format(self.__sent_offset))
+        self.__sent_offset = end
+
+    def recv_into(self, buffer, nbytes=0):
+        """
+        :return: number of bytes read, 0 once all the recorded bytes have been served
+        """
+        view = memoryview(buffer)
+        nbytes = nbytes or len(view)
+        end = min(self.__received_offset + nbytes, len(self.__received))
+        nbr_read = end - self.__received_offset
+        view[:nbr_read] = self.__received[self.__received_offset:end]
+        self.__received_offset = end
+        return nbr_read
+
+    def settimeout(self, timeout):
+        pass
+
+    def shutdown(self, how):
+        pass
+
+    def close(self):
+        pass
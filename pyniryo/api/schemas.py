@@ -0,0 +1,502 @@
+"""
+Declarative schemas of the commands: how their parameters are checked and serialized, and how their answers are
+decoded into the objects returned by :class:`~pyniryo.api.tcp_client.NiryoRobot`.
+
+Each parameter of a schema is a converter, which checks a value given to a method and returns it ready to be
+encoded, or raises a :class:`~pyniryo.api.exceptions.TcpCommandException`. The converters are built once,
+when the table is compiled at import, so a request is built with a single call per parameter,
+without going through the checking methods of the client.
+
+Example: ::
+
+    >>> SCHEMAS[Command.DIGITAL_WRITE].build(PinID.DO1, PinState.HIGH)
+    {'command': 'DIGITAL_WRITE', 'param_list': ['DO1', 'HIGH']}
+    >>> SCHEMAS[Command.DIGITAL_READ].decode('HIGH')
+    <PinState.HIGH: True>
+"""
+
+import json
+import math
+from enum import Enum
+
+import numpy as np
+
+from .enums_communication import (CalibrateMode,
+                                  Command,
+                                  ConveyorDirection,
+                                  ConveyorID,
+                                  ObjectColor,
+                                  ObjectShape,
+                                  PinID,
+                                  PinMode,
+                                  PinState,
+                                  RobotAxis,
+                                  ToolID)
+from .exceptions import TcpCommandException
+from .objects import (AnalogPinObject,
+                      DigitalPinObject,
+                      HardwareStatusObject,
+                      JointsPosition,
+                      PoseMetadata,
+                      PoseObject)
+
+
+# --- PARAMETERS --- #
+def _raise_expected_choice(expected_choice, given):
+    raise TcpCommandException("Expected one of the following: {}.\nGiven: {}".format(expected_choice, given))
+
+
+def _raise_expected_type(expected_type, given):
+    raise TcpCommandException("Expected type: {}.\nGiven: {}".format(expected_type, given))
+
+
+def _raise_expected_range(range_min, range_max, given):
+    raise TcpCommandException("Expected the following condition: {} <= value <= {}\nGiven: {}".format(
+        range_min, range_max, given))
+
+
+def value(parameter):
+    """
+    Parameter sent as it is given: None, the enums and the booleans are converted to strings
+    """
+    if parameter is None:
+        return "None"
+    if isinstance(parameter, Enum):
+        return parameter.name
+    if isinstance(parameter, bool):
+        return str(parameter).upper()
+    return parameter
+
+
+def boolean(parameter):
+    if type(parameter) is not bool:
+        _raise_expected_type(bool.__name__, parameter)
+    return "TRUE" if parameter else "FALSE"
+
+
+def string(parameter):
+    if type(parameter) is not str:
+        _raise_expected_type(str.__name__, parameter)
+    return parameter
+
+
+def enum(enum_):
+    """
+    :param enum_: enum to which the parameter must belong
+    :return: converter sending the name of the enum member
+    """
+    members = list(enum_)
+
+    def convert(parameter):
+        if not isinstance(parameter, enum_):
+            _raise_expected_choice(members, parameter)
+        return parameter.name
+
+    return convert
+
+
+def pin(by_name=False):
+    """
+    :param by_name: send the name of a :class:`PinID` instead of its value
+    :return: converter of a :class:`PinID` or of the string of a pin
+    """
+
+    def convert(parameter):
+        if isinstance(parameter, PinID):
+            return parameter.name if by_name else parameter.value
+        if not isinstance(parameter, str):
+            _raise_expected_type("PinID or str", parameter)
+        return parameter
+
+    return convert
+
+
+def number(range_min=-math.inf, range_max=math.inf, type_=None):
+    """
+    :param range_min: minimum value of the parameter
+    :param range_max: maximum value of the parameter
+    :param type_: type to which the parameter is converted, None to send it as it is
+    :return: converter of a number
+    """
+
+    def convert(parameter):
+        if type_ is not None:
+            try:
+                parameter = type_(parameter)
+            except (TypeError, ValueError):
+                _raise_expected_type(type_.__name__, parameter)
+        if not range_min <= parameter <= range_max:
+            _raise_expected_range(range_min, range_max, parameter)
+        return parameter
+
+    return convert
+
+
+def to_int(parameter):
+    try:
+        return int(parameter)
+    except (TypeError, ValueError):
+        _raise_expected_type(int.__name__, parameter)
+
+
+def to_float(parameter):
+    try:
+        return float(parameter)
+    except (TypeError, ValueError):
+        _raise_expected_type(float.__name__, parameter)
+
+
+def convertible(type_, range_min=-math.inf, range_max=math.inf):
+    """
+    :param type_: type to which the parameter must be convertible
+    :param range_min: minimum value of the parameter
+    :param range_max: maximum value of the parameter
+    :return: converter checking the parameter, which is sent as it is given
+    """
+
+    def convert(parameter):
+        try:
+            type_(parameter)
+        except (TypeError, ValueError):
+            _raise_expected_type(type_.__name__, parameter)
+        try:
+            in_range = range_min <= parameter <= range_max
+        except TypeError:
+            _raise_expected_type(type_.__name__, parameter)
+        if not in_range:
+            _raise_expected_range(range_min, range_max, parameter)
+        return parameter
+
+    return convert
+
+
+def float_list(list_only=False):
+    """
+    :param list_only: reject the parameters which are not lists, like tuples or arrays
+    :return: converter of an iterable of numbers, like a point, sent as a list of floats
+    """
+
+    def convert(parameter):
+        if list_only and type(parameter) is not list:
+            _raise_expected_type(list.__name__, parameter)
+        try:
+            return [float(item) for item in parameter]
+        except (TypeError, ValueError):
+            _raise_expected_type(float.__name__, parameter)
+
+    return convert
+
+
+# --- ANSWERS --- #
+def _pose_v1(data):
+    return PoseObject(*map(float, data), metadata=PoseMetadata.v1())
+
+
+def _floats(data):
+    return [float(item) for item in data]
+
+
+def _joints_position(data):
+    return JointsPosition(*data)
+
+
+def _trajectory(data):
+    return [JointsPosition.from_dict(joints) for joints in data]
+
+
+def _to_tuple(data):
+    if not isinstance(data, list):
+        return data
+    return tuple(_to_tuple(item) for item in data)
+
+
+def _digital_io_state(data):
+    return [DigitalPinObject(PinID(name), name, PinMode(mode), PinState(bool(state))) for name, mode, state in data]
+
+
+def _analog_io_state(data):
+    return [AnalogPinObject(PinID(name), name, PinMode(mode), state) for name, mode, state in data]
+
+
+def _hardware_status(data):
+    return HardwareStatusObject(float(data[0]), data[1], data[2], data[3], data[4], data[5], data[6], data[7],
+                                _floats(data[8]), _floats(data[9]), data[10])
+
+
+def _conveyors_id(data):
+    return [ConveyorID[conveyor_id] for conveyor_id in data]
+
+
+def _conveyors_feedback(data):
+    for feedback in data:
+        feedback['conveyor_id'] = ConveyorID[feedback['conveyor_id']]
+        feedback['direction'] = ConveyorDirection(feedback['direction'])
+    return data
+
+
+def _target_pose_from_cam(data):
+    if data[0]:
+        return data[0], PoseObject(*data[1]), ObjectShape[data[2]], ObjectColor[data[3]]
+    return data[0], PoseObject(0, 0, 0, 0, 0, 0), ObjectShape.ANY, ObjectColor.ANY
+
+
+def _object_moved_with_vision(data):
+    if data[0] is True:
+        return data[0], ObjectShape[data[1]], ObjectColor[data[2]]
+    return data[0], ObjectShape.ANY, ObjectColor.ANY
+
+
+def _detected_object(data):
+    if not data[0]:
+        return data[0], 3 * [0.0], ObjectShape.ANY, ObjectColor.ANY
+    return data[0], data[1:4], ObjectShape[data[4]], ObjectColor[data[5]]
+
+
+def _camera_intrinsics(data):
+    return np.reshape(data[0], (3, 3)), np.expand_dims(data[1], axis=0)
+
+
+# --- SCHEMAS --- #
+class CommandSchema(object):
+    """
+    Compiled schema of a command. Its functions are chosen once, according to the parameters of the command:
+
+    - ``check(*parameter_list)`` checks and converts the parameters, and returns the parameters list of the request
+    - ``build(*parameter_list)`` returns the dict of the request, with the parameters list of ``check``
+    - ``decode(list_ret_param)`` returns the object built from the parameters of the answer
+    """
+
+    def __init__(self, command, parameters=None, answer=None):
+        """
+        :param command: the command
+        :type command: Command
+        :param parameters: converter of each parameter, None to accept any number of parameters sent with :func:`value`
+        :type parameters: tuple[callable]
+        :param answer: function building the returned object from the answer's parameters, None to return them
+        :type answer: callable
+        """
+        self.command = command
+        self.name = command.name
+        self.parameters = parameters
+        self.answer = answer
+
+        if parameters is None:
+            self.check = self.__check_any
+        elif not parameters:
+            self.check = self.__check_empty
+        elif len(parameters) == 1:
+            self.check = self.__check_single
+        else:
+            self.check = self.__check_fixed
+        self.decode = answer if answer is not None else _identity
+
+        # Beginning of the JSON of the requests, and JSON of a request without parameters
+        self.__json_prefix = '{{"command": {}, "param_list": '.format(json.dumps(self.name)).encode()
+        self.__json_empty = self.__json_prefix + b'[]}'
+
+    def __repr__(self):
+        return "<{} {}>".format(self.__class__.__name__, self.name)
+
+    def to_json(self, param_list):
+        """
+        :param param_list: parameters of a request built by this schema
+        :type param_list: list
+        :return: the JSON of the request, equal to the one of :func:`json.dumps`
+        :rtype: bytes
+        """
+        if not param_list:
+            return self.__json_empty
+        return self.__json_prefix + json.dumps(param_list).encode() + b'}'
+
+    def build(self, *parameter_list):
+        return {"command": self.name, "param_list": self.check(*parameter_list)}
+
+    def __check_any(self, *parameter_list):
+        return [value(parameter) for parameter in parameter_list]
+
+    def __check_empty(self, *parameter_list):
+        if parameter_list:
+            self.__raise_nb_parameters(parameter_list)
+        return []
+
+    def __check_single(self, *parameter_list):
+        if len(parameter_list) != 1:
+            self.__raise_nb_parameters(parameter_list)
+        return [self.parameters[0](parameter_list[0])]
+
+    def __check_fixed(self, *parameter_list):
+        if len(parameter_list) != len(self.parameters):
+            self.__raise_nb_parameters(parameter_list)
+        return [convert(parameter) for convert, parameter in zip(self.parameters, parameter_list)]
+
+    def __raise_nb_parameters(self, parameter_list):
+        raise TcpCommandException("{} expects {} parameters, {} given".format(self.name, len(self.parameters),
+                                                                               len(parameter_list)))
+
+
+def _identity(data):
+    return data
+
+
+_VISION_TARGET = (string, to_float, enum(ObjectShape), enum(ObjectColor))
+_LED_RING_ANIMATION = (value, value, value, value)
+_POINT = float_list()
+_LIST_POINT = float_list(list_only=True)
+
+# Parameters and answer of each command. The commands sent with a variable number of parameters have no parameters
+_TABLE = {
+    # Main purpose
+    Command.CALIBRATE: ((enum(CalibrateMode), ), None),
+    Command.SET_LEARNING_MODE: ((boolean, ), None),
+    Command.GET_LEARNING_MODE: ((), None),
+    Command.SET_ARM_MAX_VELOCITY: ((number(1, 200), ), None),
+    Command.SET_JOG_CONTROL: ((boolean, ), None),
+    Command.GET_COLLISION_DETECTED: ((), None),
+    Command.CLEAR_COLLISION_DETECTED: ((), None),
+    Command.HANDSHAKE: (None, None),
+
+    # Move
+    Command.GET_JOINTS: ((), _joints_position),
+    Command.GET_POSE: ((), _pose_v1),
+    Command.GET_POSE_QUAT: ((), _floats),
+    Command.GET_HOME_POSE: ((), _joints_position),
+    Command.SET_HOME_POSE: ((value, ), None),
+    Command.RESET_HOME_POSE: ((), None),
+    Command.MOVE_JOINTS: (None, None),
+    Command.MOVE_POSE: (None, None),
+    Command.SHIFT_POSE: ((enum(RobotAxis), to_float, value), None),
+    Command.MOVE_LINEAR_POSE: (None, None),
+    Command.SHIFT_LINEAR_POSE: (None, None),
+    Command.JOG_JOINTS: (None, None),
+    Command.JOG_POSE: (None, None),
+    Command.FORWARD_KINEMATICS: ((value, ), PoseObject.from_dict),
+    Command.INVERSE_KINEMATICS: ((value, ), JointsPosition.from_dict),
+    Command.MOVE: ((value, value), None),
+    Command.JOG: ((value, value), None),
+    Command.MOVE_TO_HOME_POSE: ((), None),
+
+    # Saved poses
+    Command.GET_POSE_SAVED: ((string, ), PoseObject.from_dict),
+    Command.SAVE_POSE: ((string, value), None),
+    Command.DELETE_POSE: ((string, ), None),
+    Command.GET_SAVED_POSE_LIST: ((), None),
+
+    # Pick & place
+    Command.PICK_FROM_POSE: (None, None),
+    Command.PLACE_FROM_POSE: (None, None),
+    Command.PICK_AND_PLACE: ((value, value, value), None),
+    Command.PICK: ((value, ), None),
+    Command.PLACE: ((value, ), None),
+
+    # Trajectories
+    Command.GET_TRAJECTORY_SAVED: ((string, ), _trajectory),
+    Command.GET_SAVED_TRAJECTORY_LIST: ((), None),
+    Command.EXECUTE_REGISTERED_TRAJECTORY: ((string, ), None),
+    Command.EXECUTE_TRAJECTORY_FROM_POSES: ((value, value), None),
+    Command.EXECUTE_TRAJECTORY_FROM_POSES_AND_JOINTS: ((value, value, value), None),
+    Command.SAVE_TRAJECTORY: ((value, string, string), None),
+    Command.SAVE_LAST_LEARNED_TRAJECTORY: ((string, string), None),
+    Command.UPDATE_TRAJECTORY_INFOS: ((string, string, string), None),
+    Command.DELETE_TRAJECTORY: ((string, ), None),
+    Command.CLEAN_TRAJECTORY_MEMORY: ((), None),
+    Command.EXECUTE_TRAJECTORY: ((value, value), None),
+
+    # Dynamic frames
+    Command.GET_SAVED_DYNAMIC_FRAME_LIST: ((), None),
+    Command.GET_SAVED_DYNAMIC_FRAME: ((string, ), None),
+    Command.SAVE_DYNAMIC_FRAME_FROM_POSES: ((string, string, value, value, value, boolean), None),
+    Command.SAVE_DYNAMIC_FRAME_FROM_POINTS: ((string, string, _LIST_POINT, _LIST_POINT, _LIST_POINT, boolean), None),
+    Command.EDIT_DYNAMIC_FRAME: ((string, string, string), None),
+    Command.DELETE_DYNAMIC_FRAME: ((string, boolean), None),
+    Command.MOVE_RELATIVE: ((value, value), None),
+    Command.MOVE_LINEAR_RELATIVE: ((value, value), None),
+
+    # Tools
+    Command.UPDATE_TOOL: ((), None),
+    Command.OPEN_GRIPPER: ((to_int, to_int, to_int), None),
+    Command.CLOSE_GRIPPER: ((to_int, to_int, to_int), None),
+    Command.PULL_AIR_VACUUM_PUMP: ((), None),
+    Command.PUSH_AIR_VACUUM_PUMP: ((), None),
+    Command.SETUP_ELECTROMAGNET: ((pin(), ), None),
+    Command.ACTIVATE_ELECTROMAGNET: ((pin(), ), None),
+    Command.DEACTIVATE_ELECTROMAGNET: ((pin(), ), None),
+    Command.GET_CURRENT_TOOL_ID: ((), ToolID.__getitem__),
+    Command.GRASP_WITH_TOOL: ((), None),
+    Command.RELEASE_WITH_TOOL: ((), None),
+    Command.CONTROL_GRIPPER: ((to_int, to_int, to_int, to_int), None),
+    Command.GET_CURRENT_TOOL_POSITION: ((), None),
+    Command.GET_GRIPPER_SPECS: ((value, ), _to_tuple),
+    Command.ENABLE_TCP: ((boolean, ), None),
+    Command.SET_TCP: (None, None),
+    Command.RESET_TCP: ((), None),
+    Command.TOOL_REBOOT: ((), None),
+    Command.GET_TCP: ((), None),
+
+    # Hardware
+    Command.SET_PIN_MODE: ((pin(), enum(PinMode)), None),
+    Command.DIGITAL_WRITE: ((pin(), enum(PinState)), None),
+    Command.DIGITAL_READ: ((pin(), ), PinState.__getitem__),
+    Command.GET_DIGITAL_IO_STATE: ((), _digital_io_state),
+    Command.GET_HARDWARE_STATUS: ((), _hardware_status),
+    Command.ANALOG_WRITE: ((pin(by_name=True), number(0, 5)), None),
+    Command.ANALOG_READ: ((pin(by_name=True), ), None),
+    Command.GET_ANALOG_IO_STATE: ((), _analog_io_state),
+    Command.CUSTOM_BUTTON_STATE: ((), None),
+
+    # Conveyors
+    Command.SET_CONVEYOR: ((), ConveyorID.__getitem__),
+    Command.UNSET_CONVEYOR: ((value, ), None),
+    Command.CONTROL_CONVEYOR: ((enum(ConveyorID), boolean, convertible(int), enum(ConveyorDirection)), None),
+    Command.GET_CONNECTED_CONVEYORS_ID: ((), _conveyors_id),
+    Command.GET_CONVEYORS_FEEDBACK: ((), _conveyors_feedback),
+
+    # Vision
+    Command.GET_IMAGE_COMPRESSED: ((), None),
+    Command.GET_TARGET_POSE_FROM_REL: ((string, to_float, number(0.0, 1.0, float), number(0.0, 1.0, float), to_float),
+                                       lambda data: PoseObject(*data)),
+    Command.GET_TARGET_POSE_FROM_CAM: (_VISION_TARGET, _target_pose_from_cam),
+    Command.VISION_PICK: (_VISION_TARGET, _object_moved_with_vision),
+    Command.MOVE_TO_OBJECT: (_VISION_TARGET, _object_moved_with_vision),
+    Command.DETECT_OBJECT: ((string, enum(ObjectShape), enum(ObjectColor)), _detected_object),
+    Command.GET_CAMERA_INTRINSICS: ((), _camera_intrinsics),
+    Command.SAVE_WORKSPACE_FROM_POSES: ((string, value, value, value, value), None),
+    Command.SAVE_WORKSPACE_FROM_POINTS: ((string, _POINT, _POINT, _POINT, _POINT), None),
+    Command.DELETE_WORKSPACE: ((string, ), None),
+    Command.GET_WORKSPACE_RATIO: ((string, ), None),
+    Command.GET_WORKSPACE_LIST: ((), None),
+    Command.SET_IMAGE_BRIGHTNESS: ((convertible(float, 0.0), ), None),
+    Command.SET_IMAGE_CONTRAST: ((convertible(float, 0.0), ), None),
+    Command.SET_IMAGE_SATURATION: ((convertible(float, 0.0), ), None),
+    Command.GET_IMAGE_PARAMETERS: ((), tuple),
+
+    # Sound
+    Command.PLAY_SOUND: ((value, value, value, value), None),
+    Command.SET_VOLUME: ((number(0, 200), ), None),
+    Command.STOP_SOUND: ((), None),
+    Command.DELETE_SOUND: (None, None),
+    Command.IMPORT_SOUND: (None, None),
+    Command.GET_SOUNDS: ((), None),
+    Command.GET_SOUND_DURATION: ((value, ), None),
+    Command.SAY: ((value, value), None),
+
+    # Led ring
+    Command.LED_RING_SOLID: ((value, value), None),
+    Command.LED_RING_TURN_OFF: ((value, ), None),
+    Command.LED_RING_FLASH: (_LED_RING_ANIMATION, None),
+    Command.LED_RING_ALTERNATE: (_LED_RING_ANIMATION, None),
+    Command.LED_RING_CHASE: (_LED_RING_ANIMATION, None),
+    Command.LED_RING_WIPE: ((value, value, value), None),
+    Command.LED_RING_RAINBOW: ((value, value, value), None),
+    Command.LED_RING_RAINBOW_CYCLE: ((value, value, value), None),
+    Command.LED_RING_RAINBOW_CHASE: ((value, value, value), None),
+    Command.LED_RING_GO_UP: (_LED_RING_ANIMATION, None),
+    Command.LED_RING_GO_UP_DOWN: (_LED_RING_ANIMATION, None),
+    Command.LED_RING_BREATH: (_LED_RING_ANIMATION, None),
+    Command.LED_RING_SNAKE: (_LED_RING_ANIMATION, None),
+    Command.LED_RING_CUSTOM: ((value, ), None),
+    Command.LED_RING_SET_LED: ((value, value), None),
+}
+
+SCHEMAS = {command: CommandSchema(command, parameters, answer) for command, (parameters, answer) in _TABLE.items()}
+SCHEMAS_BY_NAME = {schema.name: schema for schema in SCHEMAS.values()}
+
@@ -1,49 +1,81 @@
+import concurrent.futures
+import copy
 import logging
 import time
-import socket
+import threading
 import warnings
 from contextlib import contextmanager
 
 from typing_extensions import deprecated
 
-from enum import Enum
-
-import numpy as np
-
 # Communication imports
 from .enums_communication import (CalibrateMode,
+                                  ChannelRole,
                                   Command,
                                   ConveyorDirection,
                                   ConveyorID,
+                                  LARGE_FRAMING,
+                                  LARGE_PACKET_SIZE_INFOS,
                                   ObjectColor,
                                   ObjectShape,
-                                  PinID,
-                                  PinMode,
-                                  PinState,
-                                  RobotAxis,
                                   TCP_PORT,
                                   TCP_TIMEOUT,
                                   ToolID)
-from .communication_functions import dict_to_packet, receive_dict, receive_dict_w_payload
-
+from .binary_encoding import binary_encoding_selection, server_supports_binary, BINARY_COMMANDS
+from .channels import Channel, command_channel_role
+from .communication_functions import parse_answer, server_supports_large_framing
+
+from .batch import CommandBatch
+from .caches import MetadataCache
+from .metrics import RobotMetrics
+from .motion_handle import MotionHandle
+from .profiling import Profiler, active_call
+from .schemas import SCHEMAS
 from .exceptions import (ClientNotConnectedException,
                          HostNotReachableException,
-                         InvalidAnswerException,
                          NiryoRobotException,
                          TcpCommandException)
-from .objects import PoseObject, HardwareStatusObject, DigitalPinObject, AnalogPinObject, JointsPosition, PoseMetadata
+from .objects import (PoseObject,
+                      PoseArray,
+                      JointsPosition,
+                      JointsArray,
+                      PoseMetadata,
+                      RobotState)
 from ..utils.logging import get_logger
 from ..version import __version__
 
 
+# Kinds of metadata changed by the commands on the workspaces, which have a dynamic frame of their own
+_WORKSPACE_METADATA = (MetadataCache.WORKSPACES, MetadataCache.WORKSPACE_RATIO, MetadataCache.DYNAMIC_FRAMES)
+
+
 def get_deprecation_msg(old_method, new_method):
     return (f'`{old_method}` is deprecated and will be deleted in future releases.'
             f' Use `{new_method}` instead.')
 
 
+class _PendingRequest(BaseException):
+    """
+    Raised in deferred mode when a method needs the answer of a request which has not been received yet.
+    It inherits from BaseException so that it cannot be swallowed by the error handling of the public methods.
+    """
+
+    def __init__(self, request, with_payload):
+        super(_PendingRequest, self).__init__()
+        self.request = request
+        self.with_payload = with_payload
+
+
 class NiryoRobot(object):
 
-    def __init__(self, ip_address=None, verbose=True, logger=None):
+    def __init__(self,
+                 ip_address=None,
+                 verbose=True,
+                 logger=None,
+                 multi_channel=False,
+                 recorder=None,
+                 connector=None,
+                 kinematics_cache=None):
         """
         :param ip_address: IP address of the robot
         :type ip_address: str
@@ -51,14 +83,62 @@ class NiryoRobot(object):
         :type verbose: bool
         :param logger: A custom logger for the NiryoRobot's instance. Note that you're responsible for the logging configuration (Handlers registering).
         :type logger: logging.Logger
+        :param multi_channel: Open a connection for the queries and one for the camera besides the one for the motions,
+            so that the joints, the IOs or the images can be read while a long motion is running.
+            See :attr:`channels`
+        :type multi_channel: bool
+        :param recorder: Record the bytes exchanged with the robot, to replay the session later.
+            See :mod:`~pyniryo.api.recording`
+        :type recorder: SessionRecorder
+        :param connector: Function opening the connections instead of TCP sockets, with the signature of
+            :func:`socket.create_connection`, like :func:`~pyniryo.api.recording.SessionReplayer.create_connection`
+        :type connector: callable
+        :param kinematics_cache: Cache of the answers of the kinematics requests. See :attr:`kinematics_cache`
+        :type kinematics_cache: KinematicsCache
         """
         self.__ip_address = None
         self.__port = TCP_PORT
-        self.__client_socket = None
 
         self.__timeout = TCP_TIMEOUT
 
-        self.__is_connected = False
+        # Connections to the robot. The commands whose channel isn't opened are sent on the motion channel
+        self.__multi_channel = multi_channel
+        self.__channels = {}
+        self.__recorder = recorder
+        self.__connector = connector
+
+        # Answers replayed to the public methods when they are run in deferred mode (see _deferred_call)
+        self.__deferred = threading.local()
+
+        # Serialize the refreshes of the state, which is shared with the state streaming thread
+        self.__state_lock = threading.RLock()
+
+        # Thread running the motions started by the *_async methods, one after the other
+        self.__motion_executor = None
+        self.__motion_executor_lock = threading.Lock()
+
+        self.__state = None
+        self.__state_max_age = None
+        # time.monotonic() value of the last command which may have changed the state, see __invalidate_state
+        self.__state_invalidated_at = float('-inf')
+        self.__state_thread = None
+        self.__state_stop_event = None
+
+        # The arm doesn't change during a connection
+        self.__hardware_version = None
+
+        # Saved poses, trajectories, workspaces, dynamic frames and sounds, and camera intrinsics of the connection
+        self.__metadata_cache = MetadataCache()
+
+        # Answers of the kinematics requests, and TCP of the robot on which they are keyed with the hardware version
+        self.__kinematics_cache = kinematics_cache
+        self.__tcp = None
+
+        # Calls, errors, bytes and latencies of the requests, per command
+        self.__metrics = RobotMetrics()
+
+        # Profiler of the requests, see profile()
+        self.__profiler = None
 
         if logger is None:
             self.__logger = get_logger(self.__class__.__name__)
@@ -75,7 +155,7 @@ class NiryoRobot(object):
         self.close_connection()
 
     def __str__(self):
-        if self.__is_connected:
+        if self.__channels:
             msg = "\nConnected to server ({}) on port: {}\n".format(self.__ip_address, self.__port)
         else:
             msg = "Not Connected"
@@ -98,28 +178,50 @@ class NiryoRobot(object):
         :type ip_address: str
         :rtype: None
         """
-        self.__client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.__client_socket.settimeout(self.__timeout)
-        try:
-            self.__client_socket.connect((ip_address, self.__port))
-        except (socket.timeout, socket.error) as e:
-            self.__client_socket = None
-            raise ClientNotConnectedException("Unable to connect to the robot : {}".format(e))
+        motion_channel = Channel(ChannelRole.MOTION, self.__logger, self.__metrics, self.__recorder,
+                                 self.__connector)
+        motion_channel.connect(ip_address, self.__port, self.__timeout)
 
-        self.__is_connected = True
-        self.__client_socket.settimeout(None)
+        self.__channels = {ChannelRole.MOTION: motion_channel}
+        self.__metadata_cache.refresh()
+        self.__hardware_version = None
+        self.__tcp = None
         self.__ip_address = ip_address
         self.__logger.info("Connected to server ({}) on port {}".format(ip_address, self.__port))
-        self.__handshake()
-
-    def __close_socket(self):
-        if self.__client_socket is not None and self.__is_connected is True:
-            try:
-                self.__client_socket.shutdown(socket.SHUT_RDWR)
-                self.__client_socket.close()
-            except socket.error:
-                pass
-            self.__is_connected = False
+        try:
+            self.__handshake(motion_channel)
+        except BaseException:
+            self.__close_channels()
+            raise
+        motion_channel.set_timeout(None)
+
+        if self.__multi_channel:
+            self.__open_secondary_channels()
+
+    def __open_secondary_channels(self):
+        for role in (ChannelRole.QUERY, ChannelRole.VISION):
+            if role not in self.__channels:
+                self.__open_channel(role)
+
+    def __open_channel(self, role):
+        channel = Channel(role, self.__logger, self.__metrics, self.__recorder, self.__connector)
+        try:
+            channel.connect(self.__ip_address, self.__port, self.__timeout)
+            # The handshake is bounded by the connection's timeout: a robot which accepts the connection
+            # but doesn't answer leaves the client with its motion channel only
+            self.__handshake(channel)
+        except (ClientNotConnectedException, HostNotReachableException, NiryoRobotException) as e:
+            channel.close()
+            self.__logger.warning("Unable to open the {} channel, its commands are sent on the motion channel : {}"
+                                  .format(role.name.lower(), e))
+            return
+        channel.set_timeout(None)
+        self.__channels[role] = channel
+
+    def __close_channels(self):
+        channels, self.__channels = self.__channels, {}
+        was_connected = [channel.close() for channel in channels.values()]
+        if any(was_connected):
             self.__logger.info("Disconnected from robot")
 
     def close_connection(self):
@@ -128,82 +230,505 @@ class NiryoRobot(object):
 
         :rtype: None
         """
-        self.__close_socket()
-        self.__client_socket = None
+        self.stop_state_streaming()
+        self.__close_channels()
+        self.__metadata_cache.refresh()
+        self.__hardware_version = None
+        self.__tcp = None
+        with self.__motion_executor_lock:
+            motion_executor, self.__motion_executor = self.__motion_executor, None
+        if motion_executor is not None:
+            # The running motion is interrupted by the closing of its channel
+            motion_executor.shutdown(wait=False)
 
-    # -- SEND & RECEIVE
+    @property
+    def channels(self):
+        """
+        Roles of the connections opened to the robot. Without ``multi_channel``, all the commands are sent
+        on the motion channel. With it, the queries and the camera's commands have their own connection
+        and can be sent while a long motion like :func:`move` or :func:`execute_trajectory` is running,
+        from another thread. The first motion started by :func:`move_async` or :func:`execute_trajectory_async`
+        opens these connections as well
 
-    # - Sending phase
-    def __send_command(self, command_type, *parameter_list):
-        if self.__is_connected is False:
-            raise ClientNotConnectedException()
-        if self.__client_socket is not None:
-            try:
-                ret_dict = self.__build_dict(command_type, *parameter_list)
-                packet = dict_to_packet(ret_dict)
-                self.__client_socket.send(packet)
-            except socket.error as e:
-                self.__logger.error(e)
-                raise HostNotReachableException()
+        Example: ::
 
-    @staticmethod
-    def __build_dict(command_type, *parameter_list):
-        command = command_type.name
-        new_param_list = []
-        for parameter in parameter_list:
-            if parameter is None:
-                new_param_list.append("None")
-            elif isinstance(parameter, Enum):
-                new_param_list.append(parameter.name)
-            elif isinstance(parameter, bool):
-                new_param_list.append(str(parameter).upper())
-            else:
-                new_param_list.append(parameter)
+            robot = NiryoRobot("10.10.10.10", multi_channel=True)
+            motion = threading.Thread(target=robot.execute_trajectory, args=(trajectory, ))
+            motion.start()
+            while motion.is_alive():
+                print(robot.get_joints(), robot.get_hardware_status().motors_temperature)
+            motion.join()
 
-        return {"command": command, "param_list": new_param_list}
+        :type: list[ChannelRole]
+        """
+        return list(self.__channels)
+
+    @property
+    def metrics(self):
+        """
+        Number of calls and errors, bytes sent and received, and latency histograms of the requests, per command.
+        They are kept when the connection is closed, use ``robot.metrics.reset()`` to forget them
+
+        Example: ::
+
+            for command_name, command_metrics in robot.metrics.snapshot().items():
+                print(command_name, command_metrics["calls"], command_metrics["latency"]["p99"])
+            print(robot.metrics.to_prometheus(labels={"robot": "10.10.10.10"}))
+
+        :type: RobotMetrics
+        """
+        return self.__metrics
+
+    @property
+    def kinematics_cache(self):
+        """
+        Opt-in cache of the answers of :func:`forward_kinematics` and :func:`inverse_kinematics`, None if disabled.
+        See :mod:`~pyniryo.api.caches`
+
+        Example: ::
+
+            robot.kinematics_cache = KinematicsCache(max_size=10000)
+            for slot_pose in grid_poses:
+                robot.move(robot.inverse_kinematics(slot_pose))  # A request per slot, the first time only
+            print(robot.kinematics_cache.stats())
 
-    # - Receiving
+        :type: KinematicsCache
+        """
+        return self.__kinematics_cache
+
+    @kinematics_cache.setter
+    def kinematics_cache(self, kinematics_cache):
+        self.__kinematics_cache = kinematics_cache
+
+    @property
+    def metadata_cache(self):
+        """
+        Cache of the lists of saved poses, trajectories, workspaces, dynamic frames and sounds, of the workspaces'
+        ratios and of the camera intrinsics, emptied at each connection. The entries are invalidated by the
+        commands of this client which save, edit or delete them. See :mod:`~pyniryo.api.caches`
+
+        Example: ::
+
+            robot.play_sound("ready.wav")  # Requests the sounds list once
+            robot.play_sound("ready.wav")  # Checks the sound's name without a request
+            robot.metadata_cache.refresh()  # After the sounds were changed from Niryo Studio
+            robot.metadata_cache.enabled = False  # To always request them
+
+        :type: MetadataCache
+        """
+        return self.__metadata_cache
+
+    @contextmanager
+    def profile(self, profiler=None):
+        """
+        Context manager which profiles the requests this robot sends within a block of code, from any thread.
+        Each request is a call of the profiler, named after its command, split into phases: parameters validation,
+        request building, encoding, sending, waiting for the robot, receiving, decoding and result building.
+        See :mod:`~pyniryo.api.profiling`. Only this robot is profiled, and nothing is patched: the methods
+        bound before the block are profiled as well. The commands queued in a :func:`batch` and the motions
+        of :func:`move_async` and :func:`execute_trajectory_async` aren't profiled
+
+        Example: ::
 
-    def __receive_answer(self, with_payload):
+            with robot.profile() as profiler:
+                for _ in range(1000):
+                    robot.jog(JointsPosition(0.01, 0.0, 0.0, 0.0, 0.0, 0.0))
+                    robot.get_digital_io_state()
+
+            print(profiler.report())
+
+        :param profiler: profiler collecting the calls. A new one is created if None
+        :type profiler: Profiler
+        :rtype: Profiler
+        """
+        profiler = Profiler() if profiler is None else profiler
+        previous_profiler, self.__profiler = self.__profiler, profiler
         try:
-            if not with_payload:
-                received_dict = receive_dict(sckt=self.__client_socket)
-                payload = None
-            else:
-                received_dict, payload = receive_dict_w_payload(sckt=self.__client_socket)
-        except socket.error as e:
-            self.__logger.error(e)
-            raise HostNotReachableException()
-        if not received_dict:
-            raise HostNotReachableException()
-        answer_status = received_dict["status"]
-        if answer_status not in ["OK", "KO"]:
-            raise InvalidAnswerException(answer_status)
-        if received_dict["status"] != "OK":
-            raise NiryoRobotException("Command {} KO : {}".format(received_dict['command'], received_dict["message"]))
-        list_ret_param = received_dict["list_ret_param"]
-        if len(list_ret_param) == 1:
-            list_ret_param = list_ret_param[0]
-        if not with_payload:
-            return list_ret_param
-        else:
-            return list_ret_param, payload
+            yield profiler
+        finally:
+            self.__profiler = previous_profiler
+
+    # -- SEND & RECEIVE
+    def __get_channel(self, role):
+        channels = self.__channels
+        channel = channels.get(role) or channels.get(ChannelRole.MOTION)
+        if channel is None:
+            raise ClientNotConnectedException()
+        return channel
 
     # - Wrapping functions
     def __send_n_receive(self, command_type, *parameter_list, **kwargs):
         with_payload = kwargs.get("with_payload", False)
 
-        self.__send_command(command_type, *parameter_list)
-        return self.__receive_answer(with_payload=with_payload)
+        # The parameters are checked and the answer is decoded by the schema of the command
+        schema = SCHEMAS[command_type]
+        if getattr(self.__deferred, 'answers', None) is not None:
+            return self.__replay_answer(schema, parameter_list, with_payload)
+        profiler = self.__profiler
+        if profiler is not None and active_call() is None:
+            return profiler.run(schema.name, self.__route_n_receive, schema, parameter_list, with_payload)
+        return self.__route_n_receive(schema, parameter_list, with_payload)
+
+    def __route_n_receive(self, schema, parameter_list, with_payload):
+        role = command_channel_role(schema.name)
+        if role is not ChannelRole.MOTION:
+            return self.__channel_send_n_receive(self.__get_channel(role),
+                                                 schema,
+                                                 *parameter_list,
+                                                 with_payload=with_payload)
+        # Any command which isn't a query may change the state of the robot, even if it fails
+        try:
+            return self.__channel_send_n_receive(self.__get_channel(role),
+                                                 schema,
+                                                 *parameter_list,
+                                                 with_payload=with_payload)
+        finally:
+            self.__invalidate_state()
 
-    # Parameters checker
-    def __check_enum_belonging(self, value, enum_):
+    def __channel_send_n_receive(self, channel, schema, *parameter_list, **kwargs):
+        with_payload = kwargs.get("with_payload", False)
+
+        call = active_call()
+        if call is None:
+            received_dict, payload = channel.exchange(schema.build(*parameter_list), with_payload)
+            return self.__decode_answer(schema, received_dict, payload, with_payload)
+
+        call.nb_requests += 1
+        param_list = schema.check(*parameter_list)
+        call.mark("validation")
+        request = {"command": schema.name, "param_list": param_list}
+        call.mark("build")
+        received_dict, payload = channel.exchange(request, with_payload)
+        if with_payload:
+            answer = parse_answer(received_dict, payload, with_payload)
+            call.mark("decode")
+            return answer
+        list_ret_param = parse_answer(received_dict)
+        call.mark("decode")
+        answer = schema.decode(list_ret_param)
+        call.mark("result")
+        return answer
+
+    @staticmethod
+    def __decode_answer(schema, received_dict, payload, with_payload):
+        if with_payload:
+            return parse_answer(received_dict, payload, with_payload)
+        return schema.decode(parse_answer(received_dict))
+
+    # - Batch
+    @contextmanager
+    def batch(self):
+        """
+        Context manager which queues the commands of a block of code and sends them all at once when the block ends.
+        The requests are written back to back on the socket, then the answers are read in order,
+        so a burst of commands costs about one network round trip instead of one per command.
+
+        Each queued command returns a :class:`~pyniryo.api.batch.BatchResult`,
+        whose result is available once the block has ended.
+
+        Example: ::
+
+            with robot.batch() as batch:
+                joints = batch.get_joints()
+                pose = batch.get_pose()
+                io_state = batch.get_digital_io_state()
+                hardware_status = batch.hardware_status
+
+            print(joints.result(), pose.result(), io_state.result(), hardware_status.result())
+
+        Commands which need the answer of a first request to send a second one (like :func:`set_conveyor`)
+        send their next requests one by one once the batch has been received.
+        Nothing is sent if an exception is raised within the block.
+        With several :attr:`channels`, a batch of queries is sent on the query channel, any other batch on the
+        motion channel.
+
+        :rtype: CommandBatch
+        """
+        command_batch = CommandBatch(self)
+        yield command_batch
+        self.__execute_batch(command_batch._pop_calls())
+
+    def __execute_batch(self, calls):
+        if not calls:
+            return
+        roles = set(command_channel_role(request["command"]) for _, request, _, _ in calls)
+        try:
+            channel = self.__get_channel(next(iter(roles)) if len(roles) == 1 else ChannelRole.MOTION)
+            answers = channel.exchange_many([(request, with_payload) for _, request, with_payload, _ in calls])
+        except (ClientNotConnectedException, HostNotReachableException) as e:
+            for _, _, _, batch_result in calls:
+                batch_result._set_exception(e)
+            raise
+
+        if ChannelRole.MOTION in roles:
+            self.__invalidate_state()
+        for (deferred_call, _, _, batch_result), answer in zip(calls, answers):
+            try:
+                request, with_payload = deferred_call.send(answer)
+                batch_result._set_result(self.__run_deferred_call(deferred_call, request, with_payload))
+            except StopIteration as stop:
+                batch_result._set_result(stop.value)
+            except Exception as e:
+                batch_result._set_exception(e)
+
+    def __run_deferred_call(self, deferred_call, request, with_payload):
+        """
+        Exchange the requests of a deferred call one by one until it returns
+        """
+        try:
+            while True:
+                role = command_channel_role(request["command"])
+                try:
+                    answer = self.__get_channel(role).exchange(request, with_payload)
+                finally:
+                    if role is ChannelRole.MOTION:
+                        self.__invalidate_state()
+                request, with_payload = deferred_call.send(answer)
+        except StopIteration as stop:
+            return stop.value
+
+    # - Motion handles
+    def __start_motion(self, method, *args, **kwargs):
+        """
+        Check the parameters of a motion in the calling thread, then run it in the motion thread
+        """
+        deferred_call = self._deferred_call(method, *args, **kwargs)
+        try:
+            request, with_payload = next(deferred_call)
+        except StopIteration as stop:
+            future = concurrent.futures.Future()
+            future.set_result(stop.value)
+            return MotionHandle(method.__name__, future)
+
+        self.__get_channel(ChannelRole.MOTION)
+        with self.__motion_executor_lock:
+            if self.__motion_executor is None:
+                # The motion holds the motion channel until its end: the queries need their own connection
+                self.__open_secondary_channels()
+                if ChannelRole.QUERY not in self.__channels:
+                    warnings.warn(
+                        "No query channel could be opened: the requests sent while a motion of {} is running "
+                        "wait for its end".format(method.__name__),
+                        RuntimeWarning,
+                        stacklevel=3)
+                self.__motion_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='NiryoRobot-motion-{}'.format(self.__ip_address))
+            future = self.__motion_executor.submit(self.__run_deferred_call, deferred_call, request, with_payload)
+        return MotionHandle(method.__name__, future)
+
+    # - State streaming
+    def start_state_streaming(self, rate=10.0, max_age=None):
+        """
+        Start a background thread which refreshes a snapshot of the robot's state at the given rate.
+        The snapshot holds the joints, the pose, the learning mode, the collision flag, the digital IOs
+        and the conveyors' feedback, all fetched in a single :func:`batch`.
+
+        While the streaming is running, the properties :attr:`joints`, :attr:`pose`, :attr:`learning_mode`,
+        :attr:`collision_detected` and :attr:`digital_io_state` return the value of the snapshot
+        instead of sending a request. The ``get_*`` methods still send a request.
+        If the snapshot is older than ``max_age``, it is refreshed synchronously before being read.
+        Any command which isn't a query, like :func:`move` or :func:`digital_write`, drops the snapshot:
+        a property read once it has returned fetches a new one.
+        The properties return the values only: read :attr:`state` to get the snapshot and its ``age``.
+
+        Example: ::
+
+            robot.start_state_streaming(rate=20.0)
+            while True:
+                joints = robot.joints  # No request sent
+                state = robot.state
+                print(state.pose, state.digital_io_state, "received {:.3f}s ago".format(state.age))
+
+        :param rate: Number of refreshes per second
+        :type rate: float
+        :param max_age: Maximum age in seconds of the snapshot returned. Default to twice the refresh period
+        :type max_age: float
+        :rtype: None
+        """
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            self.__raise_exception_expected_type("positive float", rate)
+        period = 1.0 / rate
+        if max_age is None:
+            max_age = 2 * period
+        elif not isinstance(max_age, (int, float)) or max_age < 0:
+            self.__raise_exception_expected_type("positive float", max_age)
+
+        self.stop_state_streaming()
+        # The first snapshot is fetched here so that connection errors are raised to the caller
+        self.__refresh_state()
+
+        self.__state_max_age = max_age
+        self.__state_stop_event = threading.Event()
+        self.__state_thread = threading.Thread(target=self.__stream_state,
+                                               args=(period, self.__state_stop_event),
+                                               name='NiryoRobot-state-{}'.format(self.__ip_address),
+                                               daemon=True)
+        self.__state_thread.start()
+
+    def stop_state_streaming(self):
+        """
+        Stop the background refresh of the robot's state started by :func:`start_state_streaming`.
+        The properties send a request again afterwards
+
+        :rtype: None
+        """
+        state_thread, self.__state_thread = self.__state_thread, None
+        if state_thread is None:
+            return
+        self.__state_stop_event.set()
+        if state_thread is not threading.current_thread():
+            state_thread.join()
+        self.__state = None
+        self.__state_max_age = None
+
+    @property
+    def state_streaming(self):
+        """
+        ``True`` if the robot's state is refreshed in the background
+
+        :type: bool
+        """
+        return self.__state_thread is not None
+
+    @property
+    def state(self):
+        """
+        Snapshot of the robot's state. See :func:`get_state`
+
+        :type: RobotState
+        """
+        return self.get_state()
+
+    def get_state(self, max_age=None):
+        """
+        Get a snapshot of the robot's state.
+        The snapshot of the state streaming is returned if it is recent enough,
+        otherwise a new snapshot is fetched in a single :func:`batch`.
+
+        :param max_age: Maximum age in seconds of the snapshot.
+            Default to the one given to :func:`start_state_streaming`, or 0 if the streaming isn't running
+        :type max_age: float
+        :rtype: RobotState
+        """
+        if max_age is None:
+            max_age = self.__state_max_age or 0
+        state = self.__state
+        if state is None or state.age > max_age:
+            with self.__state_lock:
+                # The streaming thread may have refreshed the state while we were waiting for the socket
+                state = self.__state
+                if state is None or state.age > max_age:
+                    state = self.__refresh_state()
+        return state
+
+    def __refresh_state(self):
+        with self.__state_lock:
+            timestamp = time.monotonic()
+            with self.batch() as batch:
+                results = [
+                    batch.get_joints(),
+                    batch.get_pose(),
+                    batch.get_learning_mode(),
+                    batch.collision_detected,
+                    batch.get_digital_io_state(),
+                    batch.get_conveyors_feedback(),
+                ]
+        # A field is left empty if the robot's system doesn't handle the command
+        state = RobotState(*[None if result.exception() is not None else result.result() for result in results],
+                           timestamp=timestamp)
+        current_state = self.__state
+        # A snapshot requested before a command which may have changed the state is returned, but not kept
+        if timestamp >= self.__state_invalidated_at and (current_state is None or current_state.timestamp < timestamp):
+            self.__state = state
+        return state
+
+    def __invalidate_state(self):
+        """
+        Drop the snapshot of the state after a command which may have changed it
+        """
+        self.__state_invalidated_at = time.monotonic()
+        self.__state = None
+
+    def __stream_state(self, period, stop_event):
+        # The first snapshot has been fetched by start_state_streaming
+        next_refresh = time.monotonic() + period
+        while not stop_event.wait(next_refresh - time.monotonic()):
+            try:
+                self.__refresh_state()
+            except (ClientNotConnectedException, HostNotReachableException) as e:
+                self.__logger.error("State streaming stopped : {}".format(e))
+                self.__state_thread = None
+                self.__state = None
+                return
+            next_refresh = max(next_refresh + period, time.monotonic())
+
+    def __read_state(self, field, request_function):
         """
-        Check if a value belong to an enum
+        Read a field of the streamed state, or send a request if the state isn't streamed
         """
-        if not isinstance(value, enum_):
-            self.__raise_exception_expected_choice([v for v in enum_], value)
+        if (self.__state_thread is not None and threading.current_thread() is not self.__state_thread
+                and getattr(self.__deferred, 'answers', None) is None):
+            value = getattr(self.get_state(), field)
+            if value is not None:
+                return value
+        return request_function()
 
+    # - Deferred mode
+    def __replay_answer(self, schema, parameter_list, with_payload):
+        deferred = self.__deferred
+        if deferred.index >= len(deferred.answers):
+            raise _PendingRequest(schema.build(*parameter_list), with_payload)
+        received_dict, payload = deferred.answers[deferred.index]
+        deferred.index += 1
+        return self.__decode_answer(schema, received_dict, payload, with_payload)
+
+    def _deferred_call(self, method, *args, **kwargs):
+        """
+        Run a method of this instance without doing any I/O on the socket.
+
+        This is a generator which yields a ``(request, with_payload)`` tuple for each request the method needs,
+        and expects the raw answer ``(received_dict, payload)`` of this request to be sent back.
+        The method is replayed with all the answers gathered so far, so the parameters checking, the answers
+        validation and the construction of the returned objects are the ones of the blocking API.
+        The return value of the generator is the one of the method.
+
+        :param method: a bound method of this instance
+        :type method: callable
+        """
+        answers = []
+        while True:
+            self.__deferred.answers, self.__deferred.index = answers, 0
+            try:
+                return method(*args, **kwargs)
+            except _PendingRequest as pending_request:
+                request, with_payload = pending_request.request, pending_request.with_payload
+            finally:
+                self.__deferred.answers = None
+            answers.append((yield request, with_payload))
+
+    # - Metadata cache
+    def __cached_metadata(self, key, request_function):
+        """
+        Take a metadata from the metadata cache, or request it
+        """
+        if getattr(self.__deferred, 'answers', None) is not None:
+            # The deferred mode isn't bound to this connection
+            return request_function()
+        return self.__metadata_cache.get_or_fetch(key, request_function)
+
+    def __send_n_invalidate(self, kinds, command_type, *parameter_list):
+        """
+        Send a command changing some kinds of metadata, and invalidate them in the metadata cache
+        """
+        try:
+            return self.__send_n_receive(command_type, *parameter_list)
+        finally:
+            self.__metadata_cache.invalidate(*kinds)
+            if MetadataCache.DYNAMIC_FRAMES in kinds and self.__kinematics_cache is not None:
+                # The kinematics cache keys the poses on the name of their frame
+                self.__kinematics_cache.clear()
+
+    # Parameters checker
     def __check_list_belonging(self, value, list_):
         """
         Check if a value belong to a list
@@ -211,13 +736,6 @@ class NiryoRobot(object):
         if value not in list_:
             self.__raise_exception_expected_choice(list_, value)
 
-    def __check_range_belonging(self, value, range_min, range_max):
-        """
-        Check if a value belong to a range
-        """
-        if not range_min <= value <= range_max:
-            self.__raise_exception_expected_range(range_min, range_max, value)
-
     def __check_dict_belonging(self, value, dict_):
         """
         Check if a value belong to a dictionary
@@ -248,24 +766,6 @@ class NiryoRobot(object):
         except ValueError:
             self.__raise_exception_expected_type(type_.__name__, list_)
 
-    def __transform_to_type(self, value, type_):
-        """
-        Try to change value type to another
-        """
-        try:
-            value = type_(value)
-            return value
-        except ValueError:
-            self.__raise_exception_expected_type(type_.__name__, value)
-
-    def __list_to_tuple(self, list_):
-        """
-        Recursively convert lists to tuples.
-        """
-        if not isinstance(list_, list):
-            return list_
-        return tuple(self.__list_to_tuple(item) for item in list_)
-
     # Error Handlers
     def __raise_exception_expected_choice(self, expected_choice, given):
         raise TcpCommandException("Expected one of the following: {}.\nGiven: {}".format(expected_choice, given))
@@ -273,10 +773,6 @@ class NiryoRobot(object):
     def __raise_exception_expected_type(self, expected_type, given):
         raise TcpCommandException("Expected type: {}.\nGiven: {}".format(expected_type, given))
 
-    def __raise_exception_expected_range(self, range_min, range_max, given):
-        raise TcpCommandException("Expected the following condition: {} <= value <= {}\nGiven: {}".format(
-            range_min, range_max, given))
-
     def __raise_exception(self, message):
         raise TcpCommandException("Exception message : {}".format(message))
 
@@ -326,10 +822,12 @@ class NiryoRobot(object):
 
     # - Main purpose
 
-    def __handshake(self):
+    def __handshake(self, channel):
         try:
-            server_info = self.__send_n_receive(Command.HANDSHAKE, __version__)
+            server_info = self.__channel_send_n_receive(channel, SCHEMAS[Command.HANDSHAKE], __version__)
         except NiryoRobotException as exception:
+            if channel.role is not ChannelRole.MOTION:
+                raise exception from None
             if 'Unknown command' in str(exception):
                 self.__logger.info(
                     "This PyNiryo version is meant to be used on a more recent version of the Robot's system. "
@@ -337,9 +835,53 @@ class NiryoRobot(object):
                 return
             else:
                 raise exception from None
-        if 'message' in server_info:
+        if 'message' in server_info and channel.role is ChannelRole.MOTION:
             self.__logger.info(server_info['message'])
             self.__logger.info('To disable the MOTD, use verbose=False')
+        self.__negotiate_protocol(channel, server_info)
+
+    def __negotiate_protocol(self, channel, server_info):
+        # Select the encoding and the framing advertised by the robot with a second handshake.
+        # Its answer is still received with the default framing
+        selection = {}
+        if server_supports_binary(server_info):
+            selection.update(binary_encoding_selection())
+        if server_supports_large_framing(server_info):
+            selection["framing"] = LARGE_FRAMING
+        if not selection:
+            return
+        try:
+            self.__channel_send_n_receive(channel, SCHEMAS[Command.HANDSHAKE], __version__, selection)
+        except NiryoRobotException as exception:
+            self.__logger.info("Protocol selection refused by the robot, the default one is used : {}".format(
+                exception))
+            return
+        if "encoding" in selection:
+            channel.binary_commands = frozenset(command.name for command in BINARY_COMMANDS)
+        if "framing" in selection:
+            channel.packet_size_infos = LARGE_PACKET_SIZE_INFOS
+
+    @property
+    def binary_encoding(self):
+        """
+        ``True`` if the robot supports the binary encoding, which is then used for the joints, poses,
+        trajectories and IOs commands. It is negotiated when connecting, JSON is used otherwise
+
+        :type: bool
+        """
+        channel = self.__channels.get(ChannelRole.MOTION)
+        return channel is not None and bool(channel.binary_commands)
+
+    @property
+    def large_packets(self):
+        """
+        ``True`` if the robot supports packets larger than 65535 bytes, like requests of long trajectories.
+        It is negotiated when connecting
+
+        :type: bool
+        """
+        channel = self.__channels.get(ChannelRole.MOTION)
+        return channel is not None and channel.packet_size_infos is LARGE_PACKET_SIZE_INFOS
 
     def calibrate(self, calibrate_mode):
         """
@@ -350,7 +892,6 @@ class NiryoRobot(object):
         :type calibrate_mode: CalibrateMode
         :rtype: None
         """
-        self.__check_enum_belonging(calibrate_mode, CalibrateMode)
         self.__send_n_receive(Command.CALIBRATE, calibrate_mode)
 
     def calibrate_auto(self):
@@ -386,7 +927,7 @@ class NiryoRobot(object):
         :return: ``True`` if learning mode is on
         :rtype: bool
         """
-        return self.get_learning_mode()
+        return self.__read_state('learning_mode', self.get_learning_mode)
 
     def get_learning_mode(self):
         """
@@ -409,7 +950,6 @@ class NiryoRobot(object):
         :type enabled: bool
         :rtype: None
         """
-        self.__check_type(enabled, bool)
         self.__send_n_receive(Command.SET_LEARNING_MODE, enabled)
 
     def set_arm_max_velocity(self, percentage_speed):
@@ -420,7 +960,6 @@ class NiryoRobot(object):
         :type percentage_speed: int
         :rtype: None
         """
-        self.__check_range_belonging(percentage_speed, 1, 200)
         self.__send_n_receive(Command.SET_ARM_MAX_VELOCITY, percentage_speed)
 
     @contextmanager
@@ -447,7 +986,6 @@ class NiryoRobot(object):
         :type enabled: bool
         :rtype: None
         """
-        self.__check_type(enabled, bool)
         self.__send_n_receive(Command.SET_JOG_CONTROL, enabled)
 
     @staticmethod
@@ -468,7 +1006,8 @@ class NiryoRobot(object):
 
         :type: bool
         """
-        return self.__send_n_receive(Command.GET_COLLISION_DETECTED)
+        return self.__read_state('collision_detected',
+                                 lambda: self.__send_n_receive(Command.GET_COLLISION_DETECTED))
 
     def clear_collision_detected(self):
         """
@@ -485,7 +1024,7 @@ class NiryoRobot(object):
 
         :type: JointsPosition
         """
-        return self.get_joints()
+        return self.__read_state('joints', self.get_joints)
 
     def get_joints(self):
         """
@@ -494,7 +1033,7 @@ class NiryoRobot(object):
         :return: Robot's current joints position
         :rtype: JointsPosition
         """
-        return JointsPosition(*self.__send_n_receive(Command.GET_JOINTS))
+        return self.__send_n_receive(Command.GET_JOINTS)
 
     @property
     def pose(self):
@@ -504,7 +1043,7 @@ class NiryoRobot(object):
 
         :type: PoseObject
         """
-        return self.get_pose()
+        return self.__read_state('pose', self.get_pose)
 
 
     def get_pose(self):
@@ -514,10 +1053,7 @@ class NiryoRobot(object):
 
         :rtype: PoseObject
         """
-        data = self.__send_n_receive(Command.GET_POSE)
-        pose_array = self.__map_list(data, float)
-        pose_object = PoseObject(*pose_array, metadata=PoseMetadata.v1())
-        return pose_object
+        return self.__send_n_receive(Command.GET_POSE)
 
     def get_pose_quat(self):
         """
@@ -526,9 +1062,7 @@ class NiryoRobot(object):
         :return: Position and quaternion coordinates concatenated in a list : [x, y, z, qx, qy, qz, qw]
         :rtype: list[float]
         """
-        data = self.__send_n_receive(Command.GET_POSE_QUAT)
-        pose_array = self.__map_list(data, float)
-        return pose_array
+        return self.__send_n_receive(Command.GET_POSE_QUAT)
 
     @joints.setter
     def joints(self, *args):
@@ -649,6 +1183,30 @@ class NiryoRobot(object):
         robot_position_dict['obj_type'] = self.__differentiate_robot_position(robot_position)
         self.__send_n_receive(Command.MOVE, robot_position_dict, linear)
 
+    def move_async(self, robot_position, linear=False):
+        """
+        Start a :func:`move` in the background and return right away, so that the calling thread can process images
+        or drive the conveyors while the robot moves. The parameters are checked before returning.
+        The motions started in the background are executed one after the other.
+
+        The first motion started in the background opens the query and camera channels if ``multi_channel``
+        didn't, so that the queries and the camera's commands are not queued behind the motion.
+        A :class:`RuntimeWarning` is issued if they can't be opened. See :attr:`channels`
+
+        Example: ::
+
+            handle = robot.move_async(JointsPosition(0.2, 0.1, 0.3, 0.0, 0.5, 0.0))
+            img = robot.get_img_compressed()
+            handle.wait()
+
+        :param robot_position: either a joints position or a pose
+        :type robot_position: Union[PoseObject, JointsPosition]
+        :param linear: do a linear move (works only with a PoseObject)
+        :type linear: bool
+        :rtype: MotionHandle
+        """
+        return self.__start_motion(self.move, robot_position, linear)
+
     def shift_pose(self, axis, shift_value, linear=False):
         """
         Shift robot end effector pose along one axis
@@ -661,8 +1219,6 @@ class NiryoRobot(object):
         :type linear: bool
         :rtype: None
         """
-        self.__check_enum_belonging(axis, RobotAxis)
-        shift_value = self.__transform_to_type(shift_value, float)
         self.__send_n_receive(Command.SHIFT_POSE, axis, shift_value, linear)
 
     @deprecated(f'{get_deprecation_msg("shift_linear_pose", "shift_pose")}')
@@ -744,8 +1300,7 @@ class NiryoRobot(object):
 
         :rtype: JointsPosition
         """
-        home_pose = self.__send_n_receive(Command.GET_HOME_POSE)
-        return JointsPosition(*home_pose)
+        return self.__send_n_receive(Command.GET_HOME_POSE)
 
     def set_home_pose(self, *args):
         """
@@ -797,10 +1352,18 @@ class NiryoRobot(object):
         else:
             joints = JointsPosition(*args)
 
-        data = self.__send_n_receive(Command.FORWARD_KINEMATICS, joints.to_dict())
+        return self.__cached_kinematics(Command.FORWARD_KINEMATICS, joints.to_list(), (), joints.to_dict(), PoseObject)
 
-        pose = PoseObject.from_dict(data)
-        return pose
+    def __get_hardware_version(self):
+        """
+        Hardware version of the robot, requested once per connection
+        """
+        if self.__hardware_version is not None:
+            return self.__hardware_version
+        hardware_version = self.get_hardware_status().hardware_version
+        if getattr(self.__deferred, 'answers', None) is None:
+            self.__hardware_version = hardware_version
+        return hardware_version
 
     def inverse_kinematics(self, *args):
         """
@@ -819,9 +1382,26 @@ class NiryoRobot(object):
         else:
             pose = PoseObject(*args, metadata=PoseMetadata.v1())
 
-        data = self.__send_n_receive(Command.INVERSE_KINEMATICS, pose.to_dict())
-        joints_position = JointsPosition.from_dict(data)
-        return joints_position
+        metadata = (pose.metadata.version, pose.metadata.frame, pose.metadata.length_unit.name)
+        return self.__cached_kinematics(Command.INVERSE_KINEMATICS, pose.to_list(), metadata, pose.to_dict(),
+                                        JointsPosition)
+
+    def __cached_kinematics(self, command, values, metadata, request, answer_type):
+        """
+        Send a kinematics request, or take its answer from the kinematics cache
+        """
+        cache = self.__kinematics_cache
+        if cache is None or getattr(self.__deferred, 'answers', None) is not None:
+            return self.__send_n_receive(command, request)
+        if self.__tcp is None:
+            self.__tcp = self.get_tcp()
+        key = cache.key(command.name, values, self.__tcp, metadata, self.__get_hardware_version())
+        answer = cache.get(key)
+        if answer is not None:
+            return answer_type.from_dict(answer)
+        result = self.__send_n_receive(command, request)
+        cache.put(key, result.to_dict())
+        return result
 
     # - Saved Pose
 
@@ -834,10 +1414,7 @@ class NiryoRobot(object):
         :return: Pose associated to pose_name
         :rtype: PoseObject
         """
-        self.__check_type(pose_name, str)
-
-        pose_list = self.__send_n_receive(Command.GET_POSE_SAVED, pose_name)
-        return PoseObject.from_dict(pose_list)
+        return self.__send_n_receive(Command.GET_POSE_SAVED, pose_name)
 
     def save_pose(self, pose_name, *args):
         """
@@ -854,7 +1431,7 @@ class NiryoRobot(object):
         else:
             pose = PoseObject(*self.__args_pose_to_list(*args), metadata=PoseMetadata.v1())
 
-        self.__send_n_receive(Command.SAVE_POSE, pose_name, pose.to_dict())
+        self.__send_n_invalidate((MetadataCache.POSES, ), Command.SAVE_POSE, pose_name, pose.to_dict())
 
     def delete_pose(self, pose_name):
         """
@@ -863,8 +1440,7 @@ class NiryoRobot(object):
         :type pose_name: str
         :rtype: None
         """
-        self.__check_type(pose_name, str)
-        self.__send_n_receive(Command.DELETE_POSE, pose_name)
+        self.__send_n_invalidate((MetadataCache.POSES, ), Command.DELETE_POSE, pose_name)
 
     def get_saved_pose_list(self):
         """
@@ -872,7 +1448,8 @@ class NiryoRobot(object):
 
         :rtype: list[str]
         """
-        return self.__send_n_receive(Command.GET_SAVED_POSE_LIST)
+        return list(self.__cached_metadata((MetadataCache.POSES, ),
+                                           lambda: self.__send_n_receive(Command.GET_SAVED_POSE_LIST)))
 
     # - Pick/Place
 
@@ -992,10 +1569,7 @@ class NiryoRobot(object):
         :return: Trajectory
         :rtype: list[Joints]
         """
-        self.__check_type(trajectory_name, str)
-        return [
-            JointsPosition.from_dict(d) for d in self.__send_n_receive(Command.GET_TRAJECTORY_SAVED, trajectory_name)
-        ]
+        return self.__send_n_receive(Command.GET_TRAJECTORY_SAVED, trajectory_name)
 
     def get_saved_trajectory_list(self):
         """
@@ -1003,7 +1577,8 @@ class NiryoRobot(object):
 
         :rtype: list[str]
         """
-        return self.__send_n_receive(Command.GET_SAVED_TRAJECTORY_LIST)
+        return list(self.__cached_metadata((MetadataCache.TRAJECTORIES, ),
+                                           lambda: self.__send_n_receive(Command.GET_SAVED_TRAJECTORY_LIST)))
 
     def execute_registered_trajectory(self, trajectory_name):
         """
@@ -1012,7 +1587,6 @@ class NiryoRobot(object):
         :type trajectory_name: str
         :rtype: None
         """
-        self.__check_type(trajectory_name, str)
         self.__send_n_receive(Command.EXECUTE_REGISTERED_TRAJECTORY, trajectory_name)
 
     def execute_trajectory(self, robot_positions, dist_smoothing=0.0):
@@ -1020,18 +1594,36 @@ class NiryoRobot(object):
         Execute trajectory from list of poses and / or joints
 
         :param robot_positions: List of poses or joints
-        :type robot_positions: list[Union[JointsPosition, PoseObject]]
+        :type robot_positions: list[Union[JointsPosition, PoseObject]] | PoseArray | JointsArray
         :param dist_smoothing: Distance from waypoints before smoothing trajectory
         :type dist_smoothing: float
         :rtype: None
         """
-        dict_positions = []
-        for robot_position in robot_positions:
-            position_dict = robot_position.to_dict()
-            position_dict['obj_type'] = self.__differentiate_robot_position(robot_position)
-            dict_positions.append(position_dict)
+        if isinstance(robot_positions, (PoseArray, JointsArray)):
+            obj_type = 'POSE' if isinstance(robot_positions, PoseArray) else 'JOINTS'
+            dict_positions = robot_positions.to_dict()
+            for position_dict in dict_positions:
+                position_dict['obj_type'] = obj_type
+        else:
+            dict_positions = []
+            for robot_position in robot_positions:
+                position_dict = robot_position.to_dict()
+                position_dict['obj_type'] = self.__differentiate_robot_position(robot_position)
+                dict_positions.append(position_dict)
         self.__send_n_receive(Command.EXECUTE_TRAJECTORY, dict_positions, dist_smoothing)
 
+    def execute_trajectory_async(self, robot_positions, dist_smoothing=0.0):
+        """
+        Start an :func:`execute_trajectory` in the background and return right away. See :func:`move_async`
+
+        :param robot_positions: List of poses or joints
+        :type robot_positions: list[Union[JointsPosition, PoseObject]]
+        :param dist_smoothing: Distance from waypoints before smoothing trajectory
+        :type dist_smoothing: float
+        :rtype: MotionHandle
+        """
+        return self.__start_motion(self.execute_trajectory, robot_positions, dist_smoothing)
+
     @deprecated(f'{get_deprecation_msg("execute_trajectory_from_poses", "execute_trajectory")}')
     def execute_trajectory_from_poses(self, list_poses, dist_smoothing=0.0):
         """
@@ -1107,24 +1699,26 @@ class NiryoRobot(object):
         Save trajectory in robot memory
 
         :param trajectory: list of Joints [j1, j2, j3, j4, j5, j6] as waypoints to create the trajectory
-        :type trajectory: list[list[float] | JointsPosition]
+        :type trajectory: list[list[float] | JointsPosition] | JointsArray
         :param trajectory_name: Name you want to give to the trajectory
         :type trajectory_name: str
         :param trajectory_description: Description you want to give to the trajectory
 
         :rtype: None
         """
-        self.__check_type(trajectory_name, str)
-        self.__check_type(trajectory_description, str)
-        self.__check_type(trajectory, list)
-        dict_joints = []
-        for joints in trajectory:
-            if isinstance(joints, JointsPosition):
-                dict_joints.append(joints.to_dict())
-            else:
-                dict_joints.append(JointsPosition(*joints).to_dict())
+        if isinstance(trajectory, JointsArray):
+            dict_joints = trajectory.to_dict()
+        else:
+            self.__check_type(trajectory, list)
+            dict_joints = []
+            for joints in trajectory:
+                if isinstance(joints, JointsPosition):
+                    dict_joints.append(joints.to_dict())
+                else:
+                    dict_joints.append(JointsPosition(*joints).to_dict())
 
-        self.__send_n_receive(Command.SAVE_TRAJECTORY, dict_joints, trajectory_name, trajectory_description)
+        self.__send_n_invalidate((MetadataCache.TRAJECTORIES, ), Command.SAVE_TRAJECTORY, dict_joints, trajectory_name,
+                                 trajectory_description)
 
     def save_last_learned_trajectory(self, name, description):
         """
@@ -1134,9 +1728,8 @@ class NiryoRobot(object):
         :type description: str
         :rtype: None
         """
-        self.__check_type(name, str)
-        self.__check_type(description, str)
-        self.__send_n_receive(Command.SAVE_LAST_LEARNED_TRAJECTORY, name, description)
+        self.__send_n_invalidate((MetadataCache.TRAJECTORIES, ), Command.SAVE_LAST_LEARNED_TRAJECTORY, name,
+                                 description)
 
     def update_trajectory_infos(self, name, new_name, new_description):
         """"
@@ -1150,10 +1743,8 @@ class NiryoRobot(object):
         :type new_description: str
         :rtype: None
         """
-        self.__check_type(name, str)
-        self.__check_type(new_name, str)
-        self.__check_type(new_description, str)
-        self.__send_n_receive(Command.UPDATE_TRAJECTORY_INFOS, name, new_name, new_description)
+        self.__send_n_invalidate((MetadataCache.TRAJECTORIES, ), Command.UPDATE_TRAJECTORY_INFOS, name, new_name,
+                                 new_description)
 
     def delete_trajectory(self, trajectory_name):
         """
@@ -1162,8 +1753,7 @@ class NiryoRobot(object):
         :type trajectory_name: str
         :rtype: None
         """
-        self.__check_type(trajectory_name, str)
-        self.__send_n_receive(Command.DELETE_TRAJECTORY, trajectory_name)
+        self.__send_n_invalidate((MetadataCache.TRAJECTORIES, ), Command.DELETE_TRAJECTORY, trajectory_name)
 
     def clean_trajectory_memory(self):
         """
@@ -1171,7 +1761,7 @@ class NiryoRobot(object):
 
         :rtype: None
         """
-        self.__send_n_receive(Command.CLEAN_TRAJECTORY_MEMORY)
+        self.__send_n_invalidate((MetadataCache.TRAJECTORIES, ), Command.CLEAN_TRAJECTORY_MEMORY)
 
     # -- Tools
 
@@ -1185,8 +1775,7 @@ class NiryoRobot(object):
 
         :rtype: ToolID
         """
-        tool_id = self.__send_n_receive(Command.GET_CURRENT_TOOL_ID)
-        return ToolID[tool_id]
+        return self.__send_n_receive(Command.GET_CURRENT_TOOL_ID)
 
     def get_current_tool_position(self):
         """
@@ -1203,6 +1792,7 @@ class NiryoRobot(object):
         :rtype: None
         """
         self.__send_n_receive(Command.UPDATE_TOOL)
+        self.__tcp = None
 
     def grasp_with_tool(self):
         """
@@ -1241,10 +1831,6 @@ class NiryoRobot(object):
         :type hold_torque_percentage: int
         :rtype: None
         """
-        speed = self.__transform_to_type(speed, int)
-        max_torque_percentage = self.__transform_to_type(max_torque_percentage, int)
-        hold_torque_percentage = self.__transform_to_type(hold_torque_percentage, int)
-
         self.__send_n_receive(Command.OPEN_GRIPPER, speed, max_torque_percentage, hold_torque_percentage)
 
     def close_gripper(self, speed=500, max_torque_percentage=100, hold_torque_percentage=20):
@@ -1259,10 +1845,6 @@ class NiryoRobot(object):
         :type hold_torque_percentage: int
         :rtype: None
         """
-        speed = self.__transform_to_type(speed, int)
-        max_torque_percentage = self.__transform_to_type(max_torque_percentage, int)
-        hold_torque_percentage = self.__transform_to_type(hold_torque_percentage, int)
-
         self.__send_n_receive(Command.CLOSE_GRIPPER, speed, max_torque_percentage, hold_torque_percentage)
 
     def control_gripper(self, position, speed, max_torque, hold_torque):
@@ -1280,11 +1862,6 @@ class NiryoRobot(object):
         A negative value will apply the force in the opposite direction.
         :type hold_torque: int
         """
-        position = self.__transform_to_type(position, int)
-        speed = self.__transform_to_type(speed, int)
-        max_torque = self.__transform_to_type(max_torque, int)
-        hold_torque = self.__transform_to_type(hold_torque, int)
-
         self.__send_n_receive(Command.CONTROL_GRIPPER, position, speed, max_torque, hold_torque)
 
     def get_gripper_specs(self, tool_id=None):
@@ -1300,8 +1877,7 @@ class NiryoRobot(object):
             tool_id = ToolID.NONE
         elif isinstance(tool_id, int):
             tool_id = ToolID(tool_id)
-        specs = self.__send_n_receive(Command.GET_GRIPPER_SPECS, tool_id)
-        return self.__list_to_tuple(specs)
+        return self.__send_n_receive(Command.GET_GRIPPER_SPECS, tool_id)
 
     # - Vacuum
     def pull_air_vacuum_pump(self):
@@ -1329,9 +1905,7 @@ class NiryoRobot(object):
         :type pin_id: PinID or str
         :rtype: None
         """
-        self.__check_instance(pin_id, (PinID, str))
-        pin_id_str = pin_id.value if isinstance(pin_id, PinID) else pin_id
-        self.__send_n_receive(Command.SETUP_ELECTROMAGNET, pin_id_str)
+        self.__send_n_receive(Command.SETUP_ELECTROMAGNET, pin_id)
 
     def activate_electromagnet(self, pin_id):
         """
@@ -1341,9 +1915,7 @@ class NiryoRobot(object):
         :type pin_id: PinID or str
         :rtype: None
         """
-        self.__check_instance(pin_id, (PinID, str))
-        pin_id_str = pin_id.value if isinstance(pin_id, PinID) else pin_id
-        self.__send_n_receive(Command.ACTIVATE_ELECTROMAGNET, pin_id_str)
+        self.__send_n_receive(Command.ACTIVATE_ELECTROMAGNET, pin_id)
 
     def deactivate_electromagnet(self, pin_id):
         """
@@ -1353,9 +1925,7 @@ class NiryoRobot(object):
         :type pin_id: PinID or str
         :rtype: None
         """
-        self.__check_instance(pin_id, (PinID, str))
-        pin_id_str = pin_id.value if isinstance(pin_id, PinID) else pin_id
-        self.__send_n_receive(Command.DEACTIVATE_ELECTROMAGNET, pin_id_str)
+        self.__send_n_receive(Command.DEACTIVATE_ELECTROMAGNET, pin_id)
 
     def enable_tcp(self, enable=True):
         """
@@ -1368,8 +1938,8 @@ class NiryoRobot(object):
         :type enable: Bool
         :rtype: None
         """
-        self.__check_instance(enable, bool)
         self.__send_n_receive(Command.ENABLE_TCP, enable)
+        self.__tcp = None
 
     def set_tcp(self, *args):
         """
@@ -1382,6 +1952,7 @@ class NiryoRobot(object):
         """
         tcp_transform = self.__args_pose_to_list(*args)
         self.__send_n_receive(Command.SET_TCP, *tcp_transform)
+        self.__tcp = None
 
     def reset_tcp(self):
         """
@@ -1391,6 +1962,7 @@ class NiryoRobot(object):
         :rtype: None
         """
         self.__send_n_receive(Command.RESET_TCP)
+        self.__tcp = None
 
     def tool_reboot(self):
         """
@@ -1421,15 +1993,11 @@ class NiryoRobot(object):
         :type pin_mode: PinMode
         :rtype: None
         """
-        self.__check_enum_belonging(pin_mode, PinMode)
-        self.__check_instance(pin_id, (PinID, str))
-        pin_id_str = pin_id.value if isinstance(pin_id, PinID) else pin_id
-
-        self.__send_n_receive(Command.SET_PIN_MODE, pin_id_str, pin_mode)
+        self.__send_n_receive(Command.SET_PIN_MODE, pin_id, pin_mode)
 
     @property
     def digital_io_state(self):
-        return self.get_digital_io_state()
+        return self.__read_state('digital_io_state', self.get_digital_io_state)
 
     def get_digital_io_state(self):
         """
@@ -1443,12 +2011,7 @@ class NiryoRobot(object):
         :return: List of DigitalPinObject instance
         :rtype: list[DigitalPinObject]
         """
-        data = self.__send_n_receive(Command.GET_DIGITAL_IO_STATE)
-        digital_pin_array = []
-        for pin_info in data:
-            name, mode, value = pin_info
-            digital_pin_array.append(DigitalPinObject(PinID(name), name, PinMode(mode), PinState(bool(value))))
-        return digital_pin_array
+        return self.__send_n_receive(Command.GET_DIGITAL_IO_STATE)
 
     def digital_write(self, pin_id, digital_state):
         """
@@ -1460,11 +2023,7 @@ class NiryoRobot(object):
         :type digital_state: PinState
         :rtype: None
         """
-        self.__check_enum_belonging(digital_state, PinState)
-        self.__check_instance(pin_id, (PinID, str))
-        pin_id_str = pin_id.value if isinstance(pin_id, PinID) else pin_id
-
-        self.__send_n_receive(Command.DIGITAL_WRITE, pin_id_str, digital_state)
+        self.__send_n_receive(Command.DIGITAL_WRITE, pin_id, digital_state)
 
     def digital_read(self, pin_id):
         """
@@ -1474,11 +2033,7 @@ class NiryoRobot(object):
         :type pin_id: PinID or str
         :rtype: PinState
         """
-        self.__check_instance(pin_id, (PinID, str))
-        pin_id_str = pin_id.value if isinstance(pin_id, PinID) else pin_id
-
-        state_id = self.__send_n_receive(Command.DIGITAL_READ, pin_id_str)
-        return PinState[state_id]
+        return self.__send_n_receive(Command.DIGITAL_READ, pin_id)
 
     @property
     def analog_io_state(self):
@@ -1497,13 +2052,7 @@ class NiryoRobot(object):
         :return: List of AnalogPinObject instance
         :rtype: list[AnalogPinObject]
         """
-        data = self.__send_n_receive(Command.GET_ANALOG_IO_STATE)
-
-        analog_pin_array = []
-        for pin_info in data:
-            name, mode, value = pin_info
-            analog_pin_array.append(AnalogPinObject(PinID(name), name, PinMode(mode), value))
-        return analog_pin_array
+        return self.__send_n_receive(Command.GET_ANALOG_IO_STATE)
 
     def analog_write(self, pin_id, value):
         """
@@ -1515,9 +2064,6 @@ class NiryoRobot(object):
         :type value: float
         :rtype: None
         """
-        self.__check_instance(pin_id, (PinID, str))
-        self.__check_range_belonging(value, 0, 5)
-
         self.__send_n_receive(Command.ANALOG_WRITE, pin_id, value)
 
     def analog_read(self, pin_id):
@@ -1528,8 +2074,6 @@ class NiryoRobot(object):
         :type pin_id: PinID or str
         :rtype: float
         """
-        self.__check_instance(pin_id, (PinID, str))
-
         return self.__send_n_receive(Command.ANALOG_READ, pin_id)
 
     @property
@@ -1556,33 +2100,7 @@ class NiryoRobot(object):
         :return: Infos contains in a HardwareStatusObject
         :rtype: HardwareStatusObject
         """
-        data = self.__send_n_receive(Command.GET_HARDWARE_STATUS)
-
-        rpi_temperature = float(data[0])
-        hardware_version = data[1]
-        connection_up = data[2]
-        error_message = data[3]
-        calibration_needed = data[4]
-        calibration_in_progress = data[5]
-
-        motor_names = data[6]
-        motor_types = data[7]
-        temperatures = self.__map_list(data[8], float)
-        voltages = self.__map_list(data[9], float)
-        hardware_errors = data[10]
-
-        hardware_status = HardwareStatusObject(rpi_temperature,
-                                               hardware_version,
-                                               connection_up,
-                                               error_message,
-                                               calibration_needed,
-                                               calibration_in_progress,
-                                               motor_names,
-                                               motor_types,
-                                               temperatures,
-                                               voltages,
-                                               hardware_errors)
-        return hardware_status
+        return self.__send_n_receive(Command.GET_HARDWARE_STATUS)
 
     # - Conveyor
 
@@ -1593,8 +2111,7 @@ class NiryoRobot(object):
         :return: New conveyor ID
         :rtype: ConveyorID
         """
-        conveyor_id_str = self.__send_n_receive(Command.SET_CONVEYOR)
-        conveyor_id = ConveyorID[conveyor_id_str]
+        conveyor_id = self.__send_n_receive(Command.SET_CONVEYOR)
 
         # If new conveyor has been found
         if conveyor_id != ConveyorID.NONE:
@@ -1655,11 +2172,6 @@ class NiryoRobot(object):
         :type direction: ConveyorDirection
         :rtype: None
         """
-        self.__check_enum_belonging(conveyor_id, ConveyorID)
-        self.__check_type(control_on, bool)
-        self.__transform_to_type(speed, int)
-        self.__check_enum_belonging(direction, ConveyorDirection)
-
         self.__send_n_receive(Command.CONTROL_CONVEYOR, conveyor_id, control_on, speed, direction)
 
     def get_connected_conveyors_id(self):
@@ -1668,10 +2180,7 @@ class NiryoRobot(object):
         :return: List of the connected conveyors' ID
         :rtype: list[ConveyorID]
         """
-        conveyors_list_str = self.__send_n_receive(Command.GET_CONNECTED_CONVEYORS_ID)
-        conveyors_list = [ConveyorID[conveyor] for conveyor in conveyors_list_str]
-
-        return conveyors_list
+        return self.__send_n_receive(Command.GET_CONNECTED_CONVEYORS_ID)
 
     def get_conveyors_feedback(self):
         """
@@ -1685,13 +2194,7 @@ class NiryoRobot(object):
         :return: List of the conveyors' feedback
         :rtype: list[ConveyorFeedback]
         """
-        conveyors_feedback = self.__send_n_receive(Command.GET_CONVEYORS_FEEDBACK)
-        for i in range(len(conveyors_feedback)):
-            conveyors_feedback[i]['conveyor_id'] = ConveyorID[conveyors_feedback[i]['conveyor_id']]
-            conveyors_feedback[i]['direction'] = ConveyorDirection(conveyors_feedback[i]['direction'])
-            conveyors_feedback[i]['connection_state'] = self.conveyors_feedback[i]['connection_state']
-
-        return conveyors_feedback
+        return self.__send_n_receive(Command.GET_CONVEYORS_FEEDBACK)
 
     # - Vision
     def get_img_compressed(self):
@@ -1700,10 +2203,10 @@ class NiryoRobot(object):
         Use ``uncompress_image`` from the vision package to uncompress it
 
         :return: string containing a JPEG compressed image
-        :rtype: str
+        :rtype: bytes
         """
         _, img = self.__send_n_receive(Command.GET_IMAGE_COMPRESSED, with_payload=True)
-        return img
+        return bytes(img)
 
     def set_brightness(self, brightness_factor):
         """
@@ -1715,8 +2218,6 @@ class NiryoRobot(object):
         :type brightness_factor: float
         :rtype: None
         """
-        self.__transform_to_type(brightness_factor, float)
-        self.__check_range_belonging(brightness_factor, 0.0, np.inf)
         self.__send_n_receive(Command.SET_IMAGE_BRIGHTNESS, brightness_factor)
 
     def set_contrast(self, contrast_factor):
@@ -1728,8 +2229,6 @@ class NiryoRobot(object):
         :type contrast_factor: float
         :rtype: None
         """
-        self.__transform_to_type(contrast_factor, float)
-        self.__check_range_belonging(contrast_factor, 0.0, np.inf)
         self.__send_n_receive(Command.SET_IMAGE_CONTRAST, contrast_factor)
 
     def set_saturation(self, saturation_factor):
@@ -1742,8 +2241,6 @@ class NiryoRobot(object):
         :type saturation_factor: float
         :rtype: None
         """
-        self.__transform_to_type(saturation_factor, float)
-        self.__check_range_belonging(saturation_factor, 0.0, np.inf)
         self.__send_n_receive(Command.SET_IMAGE_SATURATION, saturation_factor)
 
     def get_image_parameters(self):
@@ -1762,8 +2259,7 @@ class NiryoRobot(object):
         :return:  Brightness factor, Contrast factor, Saturation factor
         :rtype: float, float, float
         """
-        brightness_factor, contrast_factor, saturation_factor = self.__send_n_receive(Command.GET_IMAGE_PARAMETERS)
-        return brightness_factor, contrast_factor, saturation_factor
+        return self.__send_n_receive(Command.GET_IMAGE_PARAMETERS)
 
     def get_target_pose_from_rel(self, workspace_name, height_offset, x_rel, y_rel, yaw_rel):
         """
@@ -1787,19 +2283,12 @@ class NiryoRobot(object):
         :return: target_pose
         :rtype: PoseObject
         """
-        self.__check_type(workspace_name, str)
-        self.__check_range_belonging(x_rel, 0.0, 1.0)
-        self.__check_range_belonging(y_rel, 0.0, 1.0)
-
-        height_offset, x_rel, y_rel, yaw_rel = self.__map_list([height_offset, x_rel, y_rel, yaw_rel], float)
-        pose_array = self.__send_n_receive(Command.GET_TARGET_POSE_FROM_REL,
-                                           workspace_name,
-                                           height_offset,
-                                           x_rel,
-                                           y_rel,
-                                           yaw_rel)
-        pose_object = PoseObject(*pose_array)
-        return pose_object
+        return self.__send_n_receive(Command.GET_TARGET_POSE_FROM_REL,
+                                     workspace_name,
+                                     height_offset,
+                                     x_rel,
+                                     y_rel,
+                                     yaw_rel)
 
     def get_target_pose_from_cam(self, workspace_name, height_offset=0.0, shape=ObjectShape.ANY, color=ObjectColor.ANY):
         """
@@ -1817,43 +2306,10 @@ class NiryoRobot(object):
         :return: object_found, object_pose, object_shape, object_color
         :rtype: (bool, PoseObject, ObjectShape, ObjectColor)
         """
-        self.__check_type(workspace_name, str)
-        height_offset = self.__transform_to_type(height_offset, float)
-        self.__check_enum_belonging(shape, ObjectShape)
-        self.__check_enum_belonging(color, ObjectColor)
-
-        data_array = self.__send_n_receive(Command.GET_TARGET_POSE_FROM_CAM,
-                                           workspace_name,
-                                           height_offset,
-                                           shape,
-                                           color)
-        obj_found = data_array[0]
-        if obj_found:
-            pose_object = PoseObject(*data_array[1])
-            shape_ret = data_array[2]
-            color_ret = data_array[3]
-        else:
-            pose_object = PoseObject(0, 0, 0, 0, 0, 0)
-            shape_ret = "ANY"
-            color_ret = 'ANY'
-        return obj_found, pose_object, ObjectShape[shape_ret], ObjectColor[color_ret]
+        return self.__send_n_receive(Command.GET_TARGET_POSE_FROM_CAM, workspace_name, height_offset, shape, color)
 
     def __move_with_vision(self, command, workspace_name, height_offset, shape, color, **kwargs):
-        self.__check_type(workspace_name, str)
-        _height_offset = self.__transform_to_type(height_offset, float)
-        self.__check_enum_belonging(shape, ObjectShape)
-        self.__check_enum_belonging(color, ObjectColor)
-
-        data_array = self.__send_n_receive(command, workspace_name, _height_offset, shape, color, **kwargs)
-
-        obj_found = data_array[0]
-        if obj_found is True:
-            shape_ret = data_array[1]
-            color_ret = data_array[2]
-        else:
-            shape_ret = "ANY"
-            color_ret = 'ANY'
-        return obj_found, ObjectShape[shape_ret], ObjectColor[color_ret]
+        return self.__send_n_receive(command, workspace_name, height_offset, shape, color, **kwargs)
 
     def vision_pick(self,
                     workspace_name,
@@ -1930,35 +2386,19 @@ class NiryoRobot(object):
         :return: object_found, object_rel_pose, object_shape, object_color
         :rtype: (bool, list, str, str)
         """
-        self.__check_type(workspace_name, str)
-        self.__check_enum_belonging(shape, ObjectShape)
-        self.__check_enum_belonging(color, ObjectColor)
-
-        data_array = self.__send_n_receive(Command.DETECT_OBJECT, workspace_name, shape, color)
-        obj_found = data_array[0]
-        if not obj_found:
-            rel_pose_array = 3 * [0.0]
-            shape = "ANY"
-            color = "ANY"
-        else:
-            rel_pose_array = data_array[1:4]
-            shape = data_array[4]
-            color = data_array[5]
-
-        return obj_found, rel_pose_array, ObjectShape[shape], ObjectColor[color]
+        return self.__send_n_receive(Command.DETECT_OBJECT, workspace_name, shape, color)
 
     def get_camera_intrinsics(self):
         """
-        Get calibration object: camera intrinsics, distortions coefficients
+        Get calibration object: camera intrinsics, distortions coefficients.
+        The intrinsics are requested once per connection
 
         :return: camera intrinsics, distortions coefficients
         :rtype: (list[list[float]], list[list[float]])
         """
-        data = self.__send_n_receive(Command.GET_CAMERA_INTRINSICS)
-
-        mtx = np.reshape(data[0], (3, 3))
-        dist = np.expand_dims(data[1], axis=0)
-        return mtx, dist
+        mtx, dist = self.__cached_metadata((MetadataCache.CAMERA_INTRINSICS, ),
+                                           lambda: self.__send_n_receive(Command.GET_CAMERA_INTRINSICS))
+        return mtx.copy(), dist.copy()
 
     # - Workspace
     def save_workspace_from_robot_poses(self, workspace_name, pose_origin, pose_2, pose_3, pose_4):
@@ -1991,7 +2431,7 @@ class NiryoRobot(object):
             else:
                 pose_list = self.__args_pose_to_list(pose)
                 param_list.append(pose_list)
-        self.__send_n_receive(Command.SAVE_WORKSPACE_FROM_POSES, *param_list)
+        self.__send_n_invalidate(_WORKSPACE_METADATA, Command.SAVE_WORKSPACE_FROM_POSES, *param_list)
 
     def save_workspace_from_points(self, workspace_name, point_origin, point_2, point_3, point_4):
         """
@@ -2010,12 +2450,8 @@ class NiryoRobot(object):
         :type point_4: list[float]
         :rtype: None
         """
-        self.__check_type(workspace_name, str)
-
-        param_list = [workspace_name]
-        for point in (point_origin, point_2, point_3, point_4):
-            param_list.append(self.__map_list(point, float))
-        self.__send_n_receive(Command.SAVE_WORKSPACE_FROM_POINTS, *param_list)
+        self.__send_n_invalidate(_WORKSPACE_METADATA, Command.SAVE_WORKSPACE_FROM_POINTS, workspace_name, point_origin,
+                                 point_2, point_3, point_4)
 
     def delete_workspace(self, workspace_name):
         """
@@ -2025,9 +2461,7 @@ class NiryoRobot(object):
         :type workspace_name: str
         :rtype: None
         """
-        self.__check_type(workspace_name, str)
-
-        self.__send_n_receive(Command.DELETE_WORKSPACE, workspace_name)
+        self.__send_n_invalidate(_WORKSPACE_METADATA, Command.DELETE_WORKSPACE, workspace_name)
 
     def get_workspace_poses(self, workspace_name):
         raise NotImplementedError
@@ -2040,8 +2474,8 @@ class NiryoRobot(object):
         :type workspace_name: str
         :rtype: float
         """
-        self.__check_type(workspace_name, str)
-        return self.__send_n_receive(Command.GET_WORKSPACE_RATIO, workspace_name)
+        return self.__cached_metadata((MetadataCache.WORKSPACE_RATIO, workspace_name),
+                                      lambda: self.__send_n_receive(Command.GET_WORKSPACE_RATIO, workspace_name))
 
     def get_workspace_list(self):
         """
@@ -2049,7 +2483,8 @@ class NiryoRobot(object):
 
         :rtype: list[str]
         """
-        return self.__send_n_receive(Command.GET_WORKSPACE_LIST)
+        return list(self.__cached_metadata((MetadataCache.WORKSPACES, ),
+                                           lambda: self.__send_n_receive(Command.GET_WORKSPACE_LIST)))
 
     # Dynamic frames
 
@@ -2066,7 +2501,9 @@ class NiryoRobot(object):
         :return: list of dynamic frames name, list of description of dynamic frames
         :rtype: list[str], list[str]
         """
-        return self.__send_n_receive(Command.GET_SAVED_DYNAMIC_FRAME_LIST)
+        return copy.deepcopy(
+            self.__cached_metadata((MetadataCache.DYNAMIC_FRAMES, ),
+                                   lambda: self.__send_n_receive(Command.GET_SAVED_DYNAMIC_FRAME_LIST)))
 
     def get_saved_dynamic_frame(self, frame_name):
         """
@@ -2081,7 +2518,6 @@ class NiryoRobot(object):
         :return: name, description, position and orientation of a frame
         :rtype: list[str, str, list[float]]
         """
-        self.__check_type(frame_name, str)
         return self.__send_n_receive(Command.GET_SAVED_DYNAMIC_FRAME, frame_name)
 
     def save_dynamic_frame_from_poses(self,
@@ -2131,7 +2567,7 @@ class NiryoRobot(object):
                 pose_list = self.__args_pose_to_list(pose)
                 param_list.append(pose_list)
         param_list.append(belong_to_workspace)
-        self.__send_n_receive(Command.SAVE_DYNAMIC_FRAME_FROM_POSES, *param_list)
+        self.__send_n_invalidate((MetadataCache.DYNAMIC_FRAMES, ), Command.SAVE_DYNAMIC_FRAME_FROM_POSES, *param_list)
 
     def save_dynamic_frame_from_points(self,
                                        frame_name,
@@ -2165,18 +2601,8 @@ class NiryoRobot(object):
         :type belong_to_workspace: boolean
         :return: None
         """
-        self.__check_type(frame_name, str)
-        self.__check_type(description, str)
-        self.__check_type(belong_to_workspace, bool)
-        self.__check_type(point_origin, list)
-        self.__check_type(point_x, list)
-        self.__check_type(point_y, list)
-
-        param_list = [frame_name, description]
-        for point in (point_origin, point_x, point_y):
-            param_list.append(self.__map_list(point, float))
-        param_list.append(belong_to_workspace)
-        self.__send_n_receive(Command.SAVE_DYNAMIC_FRAME_FROM_POINTS, *param_list)
+        self.__send_n_invalidate((MetadataCache.DYNAMIC_FRAMES, ), Command.SAVE_DYNAMIC_FRAME_FROM_POINTS, frame_name,
+                                 description, point_origin, point_x, point_y, belong_to_workspace)
 
     def edit_dynamic_frame(self, frame_name, new_frame_name, new_description):
         """
@@ -2194,12 +2620,8 @@ class NiryoRobot(object):
         :type new_description: str
         :return: None
         """
-        self.__check_type(frame_name, str)
-        self.__check_type(new_frame_name, str)
-        self.__check_type(new_description, str)
-
-        param_list = [frame_name, new_frame_name, new_description]
-        self.__send_n_receive(Command.EDIT_DYNAMIC_FRAME, *param_list)
+        self.__send_n_invalidate((MetadataCache.DYNAMIC_FRAMES, ), Command.EDIT_DYNAMIC_FRAME, frame_name,
+                                 new_frame_name, new_description)
 
     def delete_dynamic_frame(self, frame_name, belong_to_workspace=False):
         """
@@ -2215,9 +2637,8 @@ class NiryoRobot(object):
         :type belong_to_workspace: boolean
         :return: None
         """
-        self.__check_type(frame_name, str)
-        self.__check_type(belong_to_workspace, bool)
-        self.__send_n_receive(Command.DELETE_DYNAMIC_FRAME, frame_name, belong_to_workspace)
+        self.__send_n_invalidate((MetadataCache.DYNAMIC_FRAMES, ), Command.DELETE_DYNAMIC_FRAME, frame_name,
+                                 belong_to_workspace)
 
     @deprecated(f'{get_deprecation_msg("move_relative", "move")}')
     def move_relative(self, offset, frame="world"):
@@ -2281,7 +2702,10 @@ class NiryoRobot(object):
         :return: list of the sounds of the robot
         :rtype: list[string]
         """
-        return self.__send_n_receive(Command.GET_SOUNDS)
+        return list(self.__get_sounds())
+
+    def __get_sounds(self):
+        return self.__cached_metadata((MetadataCache.SOUNDS, ), lambda: self.__send_n_receive(Command.GET_SOUNDS))
 
     def play_sound(self, sound_name, wait_end=True, start_time_sec=0, end_time_sec=0):
         """
@@ -2297,7 +2721,7 @@ class NiryoRobot(object):
         :type end_time_sec: float
         :rtype: None
         """
-        self.__check_list_belonging(sound_name, self.get_sounds())
+        self.__check_list_belonging(sound_name, self.__get_sounds())
         self.__send_n_receive(Command.PLAY_SOUND, sound_name, wait_end, start_time_sec, end_time_sec)
 
     def set_volume(self, sound_volume):
@@ -2308,7 +2732,6 @@ class NiryoRobot(object):
         :type sound_volume: int
         :rtype: None
         """
-        self.__check_range_belonging(sound_volume, 0, 200)
         self.__send_n_receive(Command.SET_VOLUME, sound_volume)
 
     def stop_sound(self):
@@ -2329,7 +2752,7 @@ class NiryoRobot(object):
         :return: sound duration in seconds
         :rtype: float
         """
-        self.__check_list_belonging(sound_name, self.get_sounds())
+        self.__check_list_belonging(sound_name, self.__get_sounds())
         return self.__send_n_receive(Command.GET_SOUND_DURATION, sound_name)
 
     def say(self, text, language=0):
@@ -2661,3 +3084,4 @@ class NiryoRobot(object):
         :type led_colors: list[list[float]]
         """
         self.__send_n_receive(Command.LED_RING_CUSTOM, led_colors)
+
@@ -0,0 +1,224 @@
+"""
+Vectorized conversions between the representations of a rotation, and metrics between poses.
+
+Every function works on a single value or on a batch: the last dimensions hold the value,
+and the leading ones, if any, are broadcast. The conventions are those of the robot:
+
+- euler angles: [roll, pitch, yaw] in radians, rotations about the static x, y then z axes
+- quaternions: [qx, qy, qz, qw]
+- rotation matrices: (3, 3), and homogeneous transforms: (4, 4)
+- poses: [x, y, z, roll, pitch, yaw]. A :class:`~pyniryo.api.objects.PoseArray` can be given as well
+
+Example: ::
+
+    poses = robot_poses.data  # (N, 6)
+    quaternions = euler_to_quaternion(poses[:, 3:])  # (N, 4)
+    far = position_distances(poses, target) > 0.01  # (N,) booleans
+"""
+
+import math
+
+import numpy as np
+
+# Under this value, cos(pitch) is considered null: the roll and the yaw are then not distinguishable
+_GIMBAL_LOCK_EPSILON = 1e-9
+
+
+def _as_floats(values, last_shape):
+    array = np.asarray(values, dtype=np.float64)
+    if array.shape[array.ndim - len(last_shape):] != last_shape:
+        raise ValueError("Expected an array of shape (..., {}), got {}".format(
+            ", ".join(str(size) for size in last_shape), array.shape))
+    return array
+
+
+# --- ROTATIONS --- #
+def _euler_to_quaternion(roll, pitch, yaw, cos, sin):
+    ci, cj, ck = cos(roll / 2.0), cos(pitch / 2.0), cos(yaw / 2.0)
+    si, sj, sk = sin(roll / 2.0), sin(pitch / 2.0), sin(yaw / 2.0)
+    cc = ci * ck
+    cs = ci * sk
+    sc = si * ck
+    ss = si * sk
+    return cj * sc - sj * cs, cj * ss + sj * cc, cj * cs - sj * sc, cj * cc + sj * ss
+
+
+def euler_to_quaternion(euler):
+    """
+    :param euler: euler angles, of shape (..., 3)
+    :return: unit quaternions, of shape (..., 4)
+    :rtype: numpy.ndarray
+    """
+    euler = _as_floats(euler, (3, ))
+    if euler.ndim == 1:
+        # A single rotation is converted faster by the math functions than by NumPy's
+        return np.array(_euler_to_quaternion(*euler.tolist(), math.cos, math.sin))
+    return np.stack(_euler_to_quaternion(*np.moveaxis(euler, -1, 0), np.cos, np.sin), axis=-1)
+
+
+def euler_to_matrix(euler):
+    """
+    :param euler: euler angles, of shape (..., 3)
+    :return: rotation matrices, of shape (..., 3, 3)
+    :rtype: numpy.ndarray
+    """
+    euler = _as_floats(euler, (3, ))
+    ci, cj, ck = np.moveaxis(np.cos(euler), -1, 0)
+    si, sj, sk = np.moveaxis(np.sin(euler), -1, 0)
+    cc = ci * ck
+    cs = ci * sk
+    sc = si * ck
+    ss = si * sk
+    return np.stack([
+        np.stack([cj * ck, sj * sc - cs, sj * cc + ss], axis=-1),
+        np.stack([cj * sk, sj * ss + cc, sj * cs - sc], axis=-1),
+        np.stack([-sj, cj * si, cj * ci], axis=-1),
+    ], axis=-2)
+
+
+def matrix_to_euler(matrix):
+    """
+    At a gimbal lock (pitch of +/- pi/2), the yaw is set to 0
+
+    :param matrix: rotation matrices, of shape (..., 3, 3)
+    :return: euler angles, of shape (..., 3)
+    :rtype: numpy.ndarray
+    """
+    matrix = _as_floats(matrix, (3, 3))
+    cos_pitch = np.hypot(matrix[..., 0, 0], matrix[..., 1, 0])
+    locked = cos_pitch <= _GIMBAL_LOCK_EPSILON
+    roll = np.where(locked,
+                    np.arctan2(-matrix[..., 1, 2], matrix[..., 1, 1]),
+                    np.arctan2(matrix[..., 2, 1], matrix[..., 2, 2]))
+    pitch = np.arctan2(-matrix[..., 2, 0], cos_pitch)
+    yaw = np.where(locked, 0.0, np.arctan2(matrix[..., 1, 0], matrix[..., 0, 0]))
+    return np.stack([roll, pitch, yaw], axis=-1)
+
+
+def quaternion_to_matrix(quaternion):
+    """
+    :param quaternion: quaternions, of shape (..., 4). They don't need to be normalized
+    :return: rotation matrices, of shape (..., 3, 3)
+    :rtype: numpy.ndarray
+    """
+    quaternion = _as_floats(quaternion, (4, ))
+    x, y, z, w = np.moveaxis(quaternion, -1, 0)
+    scale = 2.0 / np.sum(quaternion**2, axis=-1)
+    xx, yy, zz = scale * x * x, scale * y * y, scale * z * z
+    xy, xz, yz = scale * x * y, scale * x * z, scale * y * z
+    xw, yw, zw = scale * x * w, scale * y * w, scale * z * w
+    return np.stack([
+        np.stack([1.0 - yy - zz, xy - zw, xz + yw], axis=-1),
+        np.stack([xy + zw, 1.0 - xx - zz, yz - xw], axis=-1),
+        np.stack([xz - yw, yz + xw, 1.0 - xx - yy], axis=-1),
+    ], axis=-2)
+
+
+def matrix_to_quaternion(matrix):
+    """
+    :param matrix: rotation matrices, of shape (..., 3, 3)
+    :return: unit quaternions, of shape (..., 4), with a positive qw
+    :rtype: numpy.ndarray
+    """
+    matrix = _as_floats(matrix, (3, 3))
+    m00, m01, m02 = matrix[..., 0, 0], matrix[..., 0, 1], matrix[..., 0, 2]
+    m10, m11, m12 = matrix[..., 1, 0], matrix[..., 1, 1], matrix[..., 1, 2]
+    m20, m21, m22 = matrix[..., 2, 0], matrix[..., 2, 1], matrix[..., 2, 2]
+    # Each candidate divides by the component computed from a term of the diagonal.
+    # The one with the largest term is the most accurate
+    terms = np.stack([1.0 + m00 - m11 - m22, 1.0 - m00 + m11 - m22, 1.0 - m00 - m11 + m22, 1.0 + m00 + m11 + m22],
+                     axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scales = 0.5 / np.sqrt(terms)
+        candidates = np.stack([
+            np.stack([0.25 / scales[..., 0], (m01 + m10) * scales[..., 0],
+                      (m02 + m20) * scales[..., 0], (m21 - m12) * scales[..., 0]], axis=-1),
+            np.stack([(m01 + m10) * scales[..., 1], 0.25 / scales[..., 1],
+                      (m12 + m21) * scales[..., 1], (m02 - m20) * scales[..., 1]], axis=-1),
+            np.stack([(m02 + m20) * scales[..., 2], (m12 + m21) * scales[..., 2],
+                      0.25 / scales[..., 2], (m10 - m01) * scales[..., 2]], axis=-1),
+            np.stack([(m21 - m12) * scales[..., 3], (m02 - m20) * scales[..., 3],
+                      (m10 - m01) * scales[..., 3], 0.25 / scales[..., 3]], axis=-1),
+        ], axis=-2)
+    best = np.argmax(terms, axis=-1)[..., np.newaxis, np.newaxis]
+    quaternion = np.take_along_axis(candidates, best, axis=-2)[..., 0, :]
+    quaternion /= np.linalg.norm(quaternion, axis=-1, keepdims=True)
+    return np.where(quaternion[..., 3:] < 0.0, -quaternion, quaternion)
+
+
+def quaternion_to_euler(quaternion):
+    """
+    :param quaternion: quaternions, of shape (..., 4). They don't need to be normalized
+    :return: euler angles, of shape (..., 3)
+    :rtype: numpy.ndarray
+    """
+    return matrix_to_euler(quaternion_to_matrix(quaternion))
+
+
+# --- POSES --- #
+def poses_to_transforms(poses):
+    """
+    :param poses: poses, of shape (..., 6)
+    :return: homogeneous transforms, of shape (..., 4, 4)
+    :rtype: numpy.ndarray
+    """
+    poses = _as_floats(poses, (6, ))
+    transforms = np.zeros(poses.shape[:-1] + (4, 4))
+    transforms[..., :3, :3] = euler_to_matrix(poses[..., 3:])
+    transforms[..., :3, 3] = poses[..., :3]
+    transforms[..., 3, 3] = 1.0
+    return transforms
+
+
+def transforms_to_poses(transforms):
+    """
+    :param transforms: homogeneous transforms, of shape (..., 4, 4)
+    :return: poses, of shape (..., 6)
+    :rtype: numpy.ndarray
+    """
+    transforms = _as_floats(transforms, (4, 4))
+    return np.concatenate([transforms[..., :3, 3], matrix_to_euler(transforms[..., :3, :3])], axis=-1)
+
+
+def position_distances(poses_a, poses_b):
+    """
+    :param poses_a: poses, of shape (..., 6)
+    :param poses_b: poses, of shape (..., 6)
+    :return: euclidean distances between the positions of the poses, of shape (...)
+    :rtype: numpy.ndarray
+    """
+    poses_a = _as_floats(poses_a, (6, ))
+    poses_b = _as_floats(poses_b, (6, ))
+    return np.linalg.norm(poses_a[..., :3] - poses_b[..., :3], axis=-1)
+
+
+def rotation_angles(poses_a, poses_b):
+    """
+    :param poses_a: poses, of shape (..., 6)
+    :param poses_b: poses, of shape (..., 6)
+    :return: angles of the rotations between the orientations of the poses, in [0, pi], of shape (...)
+    :rtype: numpy.ndarray
+    """
+    quaternion_a = euler_to_quaternion(_as_floats(poses_a, (6, ))[..., 3:])
+    quaternion_b = euler_to_quaternion(_as_floats(poses_b, (6, ))[..., 3:])
+    # Rotation from a to b: conjugate(a) * b. Its angle is computed with arctan2, which is accurate for small angles
+    vector_a, w_a = quaternion_a[..., :3], quaternion_a[..., 3:]
+    vector_b, w_b = quaternion_b[..., :3], quaternion_b[..., 3:]
+    w = np.sum(quaternion_a * quaternion_b, axis=-1)
+    vector = w_a * vector_b - w_b * vector_a - np.cross(vector_a, vector_b)
+    return 2.0 * np.arctan2(np.linalg.norm(vector, axis=-1), np.abs(w))
+
+
+def poses_almost_equal(poses_a, poses_b, position_tolerance=1e-3, angle_tolerance=1e-2):
+    """
+    :param poses_a: poses, of shape (..., 6)
+    :param poses_b: poses, of shape (..., 6)
+    :param position_tolerance: maximum distance between the positions, in meters
+    :type position_tolerance: float
+    :param angle_tolerance: maximum angle between the orientations, in radians
+    :type angle_tolerance: float
+    :return: whether the poses are equal within the tolerances, of shape (...)
+    :rtype: numpy.ndarray
+    """
+    return ((position_distances(poses_a, poses_b) <= position_tolerance) &
+            (rotation_angles(poses_a, poses_b) <= angle_tolerance))
@@ -1,2 +1,4 @@
 from .enums import *
 from .image_functions import *
+from .markers_detection import WorkspaceTracker
+from .frame_stream import *
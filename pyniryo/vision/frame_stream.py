@@ -0,0 +1,341 @@
+import collections
+import concurrent.futures
+import threading
+import time
+
+from .image_functions import Undistorter, extract_img_workspace, uncompress_image
+from ..api.tcp_client import NiryoRobot
+
+__all__ = [
+    "Frame",
+    "FrameStream",
+]
+
+
+class Frame(object):
+    """
+    Image of the robot's camera delivered by a :class:`FrameStream`
+    """
+
+    def __init__(self, index, timestamp, img_raw, img, img_workspace):
+        # Number of the frame since the stream has started
+        self.index = index
+        # time.monotonic() value at which the frame has been requested to the robot
+        self.timestamp = timestamp
+        # Decoded image, as sent by the robot
+        self.img_raw = img_raw
+        # Undistorted image if the stream undistorts the images, else the raw image
+        self.img = img
+        # Extracted workspace if the stream extracts it and the markers have been found, else None
+        self.img_workspace = img_workspace
+
+    @property
+    def age(self):
+        """
+        Time elapsed since the frame has been requested to the robot, in seconds
+
+        :type: float
+        """
+        return time.monotonic() - self.timestamp
+
+    def __repr__(self):
+        return "<{} {} shape={} age={:.3f}s>".format(self.__class__.__name__,
+                                                     self.index,
+                                                     None if self.img is None else self.img.shape,
+                                                     self.age)
+
+
+class _StageCounter(object):
+    """
+    Frame rate and latency of a stage of the pipeline, over its last frames
+    """
+
+    def __init__(self, window=30):
+        self.__events = collections.deque(maxlen=window)
+        self.__count = 0
+        self.__lock = threading.Lock()
+
+    def add(self, start, end):
+        with self.__lock:
+            self.__events.append((end, end - start))
+            self.__count += 1
+
+    def to_dict(self):
+        with self.__lock:
+            events = list(self.__events)
+            count = self.__count
+        fps = 0.0
+        if len(events) > 1 and events[-1][0] > events[0][0]:
+            fps = (len(events) - 1) / (events[-1][0] - events[0][0])
+        latency = sum(duration for _, duration in events) / len(events) if events else 0.0
+        return {"count": count, "fps": fps, "latency": latency}
+
+
+class FrameStream(object):
+    """
+    Stream of the robot's camera images, with the network, decoding and image processing stages running in parallel.
+
+    A fetcher thread requests the compressed images on its own connection to the robot,
+    while a pool of workers decodes them, and optionally undistorts them and extracts the workspace.
+    The processed frames are stored in a bounded buffer: when the consumer is too slow, the oldest frames are dropped.
+    An error of the connection or of the processing of a frame stops the stream, and is raised to the consumer
+    once the frames already processed have been consumed.
+
+    Example: ::
+
+        with FrameStream("10.10.10.10", extract_workspace=True) as stream:
+            for frame in stream:
+                show_img("Camera", frame.img)
+                if frame.img_workspace is not None:
+                    show_img("Workspace", frame.img_workspace)
+                print(stream.stats())
+
+    Use :func:`latest` instead of iterating to always get the most recent frame,
+    for instance in a control loop which runs at its own rate.
+    """
+
+    def __init__(self,
+                 ip_address,
+                 buffer_size=4,
+                 nb_workers=2,
+                 undistort=False,
+                 extract_workspace=False,
+                 workspace_ratio=1.0,
+                 verbose=False):
+        """
+        :param ip_address: IP address of the robot
+        :type ip_address: str
+        :param buffer_size: Maximum number of processed frames waiting to be consumed
+        :type buffer_size: int
+        :param nb_workers: Number of threads decoding and processing the images
+        :type nb_workers: int
+        :param undistort: Undistort the images with the camera intrinsics of the robot.
+            Not needed since robot version 5.8.0
+        :type undistort: bool
+        :param extract_workspace: Extract the workspace delimited by the markers from each image
+        :type extract_workspace: bool
+        :param workspace_ratio: Ratio between the width and the height of the workspace
+        :type workspace_ratio: float
+        :param verbose: Enable or disable the information logs of the stream's connection
+        :type verbose: bool
+        """
+        if buffer_size < 1:
+            raise ValueError("The buffer size must be at least 1")
+        if nb_workers < 1:
+            raise ValueError("The number of workers must be at least 1")
+
+        self.__ip_address = ip_address
+        self.__nb_workers = nb_workers
+        self.__undistort = undistort
+        self.__extract_workspace = extract_workspace
+        self.__workspace_ratio = workspace_ratio
+        self.__verbose = verbose
+
+        self.__frames = collections.deque(maxlen=buffer_size)
+        self.__latest_frame = None
+        self.__condition = threading.Condition()
+        self.__nb_dropped = {reason: 0 for reason in ("dropped", "late", "corrupted", "failed")}
+        self.__error = None
+
+        self.__counters = {stage: _StageCounter() for stage in ("fetch", "decode", "total")}
+
+        self.__robot = None
+        self.__undistorter = None
+        self.__executor = None
+        self.__fetcher = None
+        self.__running = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __iter__(self):
+        while True:
+            frame = self.next_frame()
+            if frame is None:
+                return
+            yield frame
+
+    @property
+    def running(self):
+        """
+        ``True`` if the stream is fetching images
+
+        :type: bool
+        """
+        return self.__running
+
+    # -- Life cycle
+    def start(self):
+        """
+        Connect to the robot and start fetching the images
+
+        :rtype: None
+        """
+        if self.__running:
+            return
+        self.__robot = NiryoRobot(self.__ip_address, verbose=self.__verbose)
+        if self.__undistort:
+            self.__undistorter = Undistorter(*self.__robot.get_camera_intrinsics())
+
+        self.__frames.clear()
+        self.__latest_frame = None
+        self.__error = None
+        self.__running = True
+        self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.__nb_workers,
+                                                                thread_name_prefix='FrameStream-worker')
+        self.__fetcher = threading.Thread(target=self.__fetch_loop, name='FrameStream-fetcher', daemon=True)
+        self.__fetcher.start()
+
+    def stop(self):
+        """
+        Stop fetching the images and close the stream's connection.
+        The frames already processed can still be consumed
+
+        :rtype: None
+        """
+        if self.__fetcher is None:
+            return
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify_all()
+        if self.__fetcher is not threading.current_thread():
+            self.__fetcher.join()
+        self.__fetcher = None
+        self.__executor.shutdown(wait=True)
+        self.__executor = None
+        self.__robot.close_connection()
+        self.__robot = None
+        with self.__condition:
+            self.__condition.notify_all()
+
+    # -- Pipeline
+    def __fetch_loop(self):
+        # Bound the number of images being decoded, so that a slow processing doesn't pile images up in memory
+        slots = threading.BoundedSemaphore(2 * self.__nb_workers)
+        index = 0
+        while self.__running:
+            if not slots.acquire(timeout=0.1):
+                continue
+            start = time.monotonic()
+            try:
+                img_compressed = self.__robot.get_img_compressed()
+            except Exception as e:
+                slots.release()
+                with self.__condition:
+                    self.__error = e
+                    self.__running = False
+                    self.__condition.notify_all()
+                return
+            self.__counters["fetch"].add(start, time.monotonic())
+            future = self.__executor.submit(self.__process, index, start, img_compressed)
+            future.add_done_callback(lambda _: slots.release())
+            index += 1
+
+    def __process(self, index, timestamp, img_compressed):
+        start = time.monotonic()
+        try:
+            img_raw = uncompress_image(img_compressed)
+            if img_raw is None:
+                with self.__condition:
+                    self.__nb_dropped["corrupted"] += 1
+                return
+            img = img_raw
+            if self.__undistorter is not None:
+                img = self.__undistorter.undistort(img_raw)
+            img_workspace = None
+            if self.__extract_workspace:
+                img_workspace = extract_img_workspace(img, workspace_ratio=self.__workspace_ratio)
+        except Exception as e:
+            # The exception of a worker would be lost in its future: stop the stream and raise it to the consumer
+            with self.__condition:
+                self.__nb_dropped["failed"] += 1
+                if self.__error is None:
+                    self.__error = e
+                self.__running = False
+                self.__condition.notify_all()
+            return
+        end = time.monotonic()
+        self.__counters["decode"].add(start, end)
+        self.__counters["total"].add(timestamp, end)
+
+        frame = Frame(index, timestamp, img_raw, img, img_workspace)
+        with self.__condition:
+            if self.__latest_frame is not None and self.__latest_frame.index > index:
+                # A more recent frame has been processed faster
+                self.__nb_dropped["late"] += 1
+                return
+            if len(self.__frames) == self.__frames.maxlen:
+                self.__nb_dropped["dropped"] += 1
+            self.__frames.append(frame)
+            self.__latest_frame = frame
+            self.__condition.notify_all()
+
+    # -- Consumption
+    def __wait_for(self, predicate, timeout):
+        # Called with the condition acquired
+        if not self.__condition.wait_for(lambda: predicate() or not self.__running, timeout):
+            raise TimeoutError("No frame received within {}s".format(timeout))
+        if not predicate() and self.__error is not None:
+            raise self.__error
+
+    def next_frame(self, timeout=None):
+        """
+        Get the oldest frame which hasn't been consumed yet, waiting for it if needed
+
+        :param timeout: Maximum time to wait in seconds. None means no limit
+        :type timeout: float
+        :return: the frame, or None if the stream is stopped and all the frames have been consumed
+        :rtype: Frame
+        """
+        with self.__condition:
+            self.__wait_for(lambda: len(self.__frames) > 0, timeout)
+            if not self.__frames:
+                return None
+            return self.__frames.popleft()
+
+    def latest(self, timeout=None):
+        """
+        Get the most recent frame, without consuming the frames of the buffer.
+        Wait for the first frame if none has been received yet
+
+        :param timeout: Maximum time to wait in seconds. None means no limit
+        :type timeout: float
+        :return: the most recent frame, or None if the stream is stopped before the first one
+        :rtype: Frame
+        """
+        with self.__condition:
+            self.__wait_for(lambda: self.__latest_frame is not None, timeout)
+            return self.__latest_frame
+
+    def stats(self):
+        """
+        Frame rate and mean latency in seconds of each stage, over the last frames:
+
+        - ``fetch``: request and reception of the compressed image
+        - ``decode``: decoding and processing of the image
+        - ``total``: from the request to the frame being available
+
+        The frames which never reached the consumer are counted by reason:
+
+        - ``dropped``: removed from the buffer because the consumer was too slow
+        - ``late``: discarded because a more recent frame had already been processed
+        - ``corrupted``: the compressed image couldn't be decoded
+        - ``failed``: their processing raised an exception, which has stopped the stream
+
+        Example: ::
+
+            {"fetch": {"count": 120, "fps": 29.8, "latency": 0.021},
+             "decode": {"count": 117, "fps": 29.9, "latency": 0.012},
+             "total": {"count": 117, "fps": 29.9, "latency": 0.035},
+             "dropped": 3, "late": 1, "corrupted": 1, "failed": 0}
+
+        :rtype: dict
+        """
+        stats = {stage: counter.to_dict() for stage, counter in self.__counters.items()}
+        with self.__condition:
+            stats.update(self.__nb_dropped)
+        return stats
@@ -23,6 +23,7 @@ __all__ = [
     "uncompress_image",
     "add_annotation_to_image",
     "undistort_image",
+    "Undistorter",
     "resize_img",
     "concat_imgs",
     "extract_img_from_ros_msg",
@@ -381,11 +382,11 @@ def uncompress_image(compressed_image):
     Take a compressed img and return an OpenCV image
 
     :param compressed_image: compressed image
-    :type compressed_image: str
+    :type compressed_image: bytes or any object supporting the buffer protocol
     :return: OpenCV image
     :rtype: numpy.array
     """
-    np_arr = np.fromstring(compressed_image, np.uint8)
+    np_arr = np.frombuffer(compressed_image, np.uint8)
     return cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
 
 
@@ -426,6 +427,9 @@ def undistort_image(img, mtx, dist):
     """
     Use camera intrinsics to undistort raw image. Not needed anymore since robot version 5.8.0
 
+    The undistortion maps of the last intrinsics used are kept, so undistorting a video stream
+    only costs a remapping per image. See :class:`Undistorter`
+
     :param img: Raw Image
     :type img: numpy.array
     :param mtx: Camera Intrinsics matrix
@@ -435,7 +439,80 @@ def undistort_image(img, mtx, dist):
     :return: Undistorted image
     :rtype: numpy.array
     """
-    return cv2.undistort(src=img, cameraMatrix=mtx, distCoeffs=dist)
+    return _get_undistorter(mtx, dist).undistort(img)
+
+
+class Undistorter(object):
+    """
+    Undistort images with precomputed undistortion maps.
+
+    Unlike ``cv2.undistort``, which computes the undistortion map of each image it undistorts,
+    the maps are computed once per image size and stored in fixed point format, so each image
+    only needs a ``cv2.remap``.
+
+    Example: ::
+
+        mtx, dist = robot.get_camera_intrinsics()
+        undistorter = Undistorter(mtx, dist)
+        while True:
+            img = uncompress_image(robot.get_img_compressed())
+            img_undistorted = undistorter.undistort(img)
+    """
+
+    def __init__(self, mtx, dist):
+        """
+        :param mtx: Camera Intrinsics matrix
+        :type mtx: list[list[float]]
+        :param dist: Distortion Coefficient
+        :type dist: list[list[float]]
+        """
+        self.__mtx = np.array(mtx, dtype=np.float64).reshape(3, 3)
+        self.__dist = np.array(dist, dtype=np.float64).reshape(1, -1)
+        # Undistortion maps of each image size
+        self.__maps = {}
+
+    def matches(self, mtx, dist):
+        """
+        :return: ``True`` if the undistorter has been built with these intrinsics
+        :rtype: bool
+        """
+        return (np.array_equal(self.__mtx, np.reshape(mtx, (3, 3)))
+                and np.array_equal(self.__dist, np.reshape(dist, (1, -1))))
+
+    def __get_maps(self, width, height):
+        maps = self.__maps.get((width, height))
+        if maps is None:
+            maps = cv2.initUndistortRectifyMap(self.__mtx, self.__dist, None, self.__mtx, (width, height),
+                                               cv2.CV_16SC2)
+            self.__maps[(width, height)] = maps
+        return maps
+
+    def undistort(self, img):
+        """
+        Undistort an image
+
+        :param img: Raw Image
+        :type img: numpy.array
+        :return: Undistorted image
+        :rtype: numpy.array
+        """
+        height, width = img.shape[:2]
+        map_1, map_2 = self.__get_maps(width, height)
+        return cv2.remap(img, map_1, map_2, interpolation=cv2.INTER_LINEAR)
+
+    __call__ = undistort
+
+
+_last_undistorter = None
+
+
+def _get_undistorter(mtx, dist):
+    global _last_undistorter
+    undistorter = _last_undistorter
+    if undistorter is None or not undistorter.matches(mtx, dist):
+        undistorter = Undistorter(mtx, dist)
+        _last_undistorter = undistorter
+    return undistorter
 
 
 def resize_img(img, width=None, height=None, inter=cv2.INTER_AREA):
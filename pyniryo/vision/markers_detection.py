@@ -1,8 +1,11 @@
+import itertools
+
 import numpy as np
 import cv2
-from .math_functions import euclidean_dist_2_pts
 
 IM_EXTRACT_SMALL_SIDE_PIXELS = 200
+# Beyond this number of markers found, the image is considered too cluttered to find the workspace
+MAX_MARKERS_CANDIDATES = 12
 
 
 def extract_img_markers(img, workspace_ratio=1.0):
@@ -13,24 +16,40 @@ def extract_img_markers(img, workspace_ratio=1.0):
     :return: extracted and warped working area image
     """
 
+    list_good_candidates = find_workspace_markers(img, workspace_ratio)
+    if list_good_candidates is None:
+        return None
+
+    im_cut = extract_sub_img(img, list_good_candidates, ratio_w_h=workspace_ratio)
+    return im_cut
+
+
+def threshold_markers(img):
+    """
+    Threshold an image to make the markers' circles appear
+    :param img: OpenCV image
+    :return: thresholded image
+    """
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
-    img_thresh = cv2.adaptiveThreshold(gray, maxValue=255, adaptiveMethod=cv2.ADAPTIVE_THRESH_MEAN_C,
-                                       thresholdType=cv2.THRESH_BINARY, blockSize=15, C=25)
+    return cv2.adaptiveThreshold(gray, maxValue=255, adaptiveMethod=cv2.ADAPTIVE_THRESH_MEAN_C,
+                                 thresholdType=cv2.THRESH_BINARY, blockSize=15, C=25)
 
-    list_good_candidates = find_markers_from_img_thresh(img_thresh)
-    if not list_good_candidates or len(list_good_candidates) > 6:
+
+def find_workspace_markers(img, workspace_ratio=1.0):
+    """
+    Find the 4 markers of a workspace in an image
+    :param img: OpenCV image which contain 4 Niryo's markers
+    :param workspace_ratio: Ratio between the width and the height of the area represented by the markers
+    :return: the 4 markers sorted clockwise from the workspace's origin, or None if they haven't been found
+    """
+    list_good_candidates = find_markers_from_img_thresh(threshold_markers(img))
+    if not list_good_candidates or len(list_good_candidates) > MAX_MARKERS_CANDIDATES:
         return None
 
     if len(list_good_candidates) == 4:
-        list_good_candidates = sort_markers_detection(list_good_candidates)
-    else:
-        list_good_candidates = complicated_sort_markers(list_good_candidates, workspace_ratio=workspace_ratio)
-        if list_good_candidates is None:
-            return None
-
-    im_cut = extract_sub_img(img, list_good_candidates, ratio_w_h=workspace_ratio)
-    return im_cut
+        return sort_markers_detection(list_good_candidates)
+    return complicated_sort_markers(list_good_candidates, workspace_ratio=workspace_ratio)
 
 
 def extract_sub_img(img, list_corners, ratio_w_h=1.0):
@@ -44,6 +63,18 @@ def extract_sub_img(img, list_corners, ratio_w_h=1.0):
     if list_corners is None or len(list_corners) != 4:
         return None
 
+    transfo_matrix, target_size = get_workspace_transform(list_corners, ratio_w_h)
+    area_im = cv2.warpPerspective(img, transfo_matrix, target_size)
+    return area_im
+
+
+def get_workspace_transform(list_corners, ratio_w_h=1.0):
+    """
+    Compute the Perspective Warp which extracts the area delimited by 4 markers
+    :param list_corners: corners list of the area
+    :param ratio_w_h: Width over Height ratio of the area
+    :return: transformation matrix, (width, height) of the extracted image
+    """
     if ratio_w_h >= 1.0:
         target_w_area = int(round(ratio_w_h * IM_EXTRACT_SMALL_SIDE_PIXELS))
         target_h_area = IM_EXTRACT_SMALL_SIDE_PIXELS
@@ -62,8 +93,115 @@ def extract_sub_img(img, list_corners, ratio_w_h=1.0):
          [target_w_area - 1, target_h_area - 1], [0, target_h_area - 1]],
         dtype=np.float32)
     transfo_matrix = cv2.getPerspectiveTransform(points_grid, final_pts)
-    area_im = cv2.warpPerspective(img, transfo_matrix, (target_w_area, target_h_area))
-    return area_im
+    return transfo_matrix, (target_w_area, target_h_area)
+
+
+class WorkspaceTracker:
+    """
+    Extract a workspace from successive images of a camera which doesn't move, or barely.
+
+    The markers found on an image are kept, with the Perspective Warp they define.
+    On the next images, each marker is only searched for around its previous position.
+    If the 4 markers are found there, the kept Perspective Warp is reused,
+    otherwise the markers are searched for in the whole image.
+
+    Example: ::
+
+        tracker = WorkspaceTracker(workspace_ratio=1.0)
+        robot.move(observation_pose)
+        while True:
+            img = uncompress_image(robot.get_img_compressed())
+            img_workspace = tracker.extract(img)
+
+    Call :func:`reset` after moving the camera, so that the markers are searched for in the whole image.
+    """
+
+    def __init__(self, workspace_ratio=1.0, search_margin=10, max_shift=2):
+        """
+        :param workspace_ratio: Ratio between the width and the height of the area represented by the markers
+        :type workspace_ratio: float
+        :param search_margin: Number of pixels around the previous marker's circle in which the marker is searched for
+        :type search_margin: int
+        :param max_shift: Maximum marker's move in pixels for which the Perspective Warp is reused.
+            Beyond, it is computed again from the new markers' positions
+        :type max_shift: int
+        """
+        self.workspace_ratio = workspace_ratio
+        self.search_margin = search_margin
+        self.max_shift = max_shift
+
+        self.__markers = None
+        self.__transfo_matrix = None
+        self.__target_size = None
+
+        # Number of images on which the markers have been searched for in the whole image / around their last position
+        self.nb_detections = 0
+        self.nb_tracked = 0
+
+    def reset(self):
+        """
+        Forget the markers, so that they are searched for in the whole next image
+        """
+        self.__markers = None
+        self.__transfo_matrix = None
+        self.__target_size = None
+
+    def get_markers(self):
+        """
+        :return: The 4 markers of the last image, or None if they haven't been found
+        """
+        return self.__markers
+
+    def extract(self, img):
+        """
+        Extract the workspace from an image
+        :param img: OpenCV image which contain 4 Niryo's markers
+        :return: extracted and warped working area image, or None if the markers haven't been found
+        """
+        if self.__markers is not None:
+            markers = self.__track_markers(img)
+            if markers is not None:
+                self.nb_tracked += 1
+                shift = max(max(abs(new.cx - old.cx), abs(new.cy - old.cy))
+                            for new, old in zip(markers, self.__markers))
+                if shift > self.max_shift:
+                    self.__set_markers(markers)
+                return cv2.warpPerspective(img, self.__transfo_matrix, self.__target_size)
+
+        self.nb_detections += 1
+        markers = find_workspace_markers(img, self.workspace_ratio)
+        if markers is None:
+            self.reset()
+            return None
+        self.__set_markers(markers)
+        return cv2.warpPerspective(img, self.__transfo_matrix, self.__target_size)
+
+    def __set_markers(self, markers):
+        self.__markers = list(markers)
+        self.__transfo_matrix, self.__target_size = get_workspace_transform(markers, self.workspace_ratio)
+
+    def __track_markers(self, img):
+        """
+        Search each marker around its previous position
+        :return: the markers found, in the same order as the previous ones, or None if one of them is missing
+        """
+        height, width = img.shape[:2]
+        tracked_markers = []
+        for previous_marker in self.__markers:
+            half_size = previous_marker.get_radius() + self.search_margin
+            x_min = max(previous_marker.cx - half_size, 0)
+            y_min = max(previous_marker.cy - half_size, 0)
+            x_max = min(previous_marker.cx + half_size + 1, width)
+            y_max = min(previous_marker.cy + half_size + 1, height)
+            roi_thresh = threshold_markers(img[y_min:y_max, x_min:x_max])
+
+            candidates = find_markers_from_img_thresh(roi_thresh)
+            if len(candidates) != 1 or candidates[0].identifiant != previous_marker.identifiant:
+                return None
+            marker = candidates[0]
+            marker.translate(x_min, y_min)
+            tracked_markers.append(marker)
+        return tracked_markers
 
 
 def draw_markers(img, workspace_ratio=1.0):
@@ -80,7 +218,7 @@ def draw_markers(img, workspace_ratio=1.0):
         cx, cy = marker.get_center()
         radius = marker.get_radius()
         cv2.circle(im_draw, (cx, cy), radius, (0, 0, 255), 2)
-    if len(list_good_candidates) > 6:
+    if len(list_good_candidates) > MAX_MARKERS_CANDIDATES:
         return False, im_draw
 
     if len(list_good_candidates) == 4:
@@ -127,6 +265,9 @@ class Marker:
         self.list_contours = [potential_marker.contour]
         self.cx = self.list_centers[0][0]
         self.cy = self.list_centers[0][1]
+        # Running sums of the centers, to update the mean center in constant time
+        self.sum_x = self.cx
+        self.sum_y = self.cy
         self.radius = potential_marker.radius
         self.identifiant = None
         self.value_for_id = None
@@ -142,10 +283,23 @@ class Marker:
         self.list_radius.append(obj_potential_marker.radius)
         obj_potential_marker.is_merged = True
 
-        (x, y) = np.mean(self.list_centers, axis=0)
-        self.cx, self.cy = int(round(x)), int(round(y))
+        x, y = obj_potential_marker.get_center()
+        self.sum_x += x
+        self.sum_y += y
+        nb_circles = len(self.list_centers)
+        self.cx, self.cy = int(round(self.sum_x / nb_circles)), int(round(self.sum_y / nb_circles))
 
-        self.radius = int(round(max(self.list_radius)))
+        self.radius = max(self.radius, int(round(obj_potential_marker.radius)))
+
+    def translate(self, dx, dy):
+        """
+        Move the marker, when it has been found in a sub image
+        """
+        self.list_centers = [(x + dx, y + dy) for x, y in self.list_centers]
+        self.sum_x += dx * len(self.list_centers)
+        self.sum_y += dy * len(self.list_centers)
+        self.cx += dx
+        self.cy += dy
 
     def nb_circles(self):
         return len(self.list_centers)
@@ -204,9 +358,18 @@ def sort_markers_detection(list_markers):
     return list_corners_sorted
 
 
-def complicated_sort_markers(list_markers, workspace_ratio):
-    import itertools
-
+def complicated_sort_markers(list_markers, workspace_ratio, max_ratio_error=2.0):
+    """
+    Find the 4 markers of the workspace among more than 4 markers.
+    All the quadrilaterals made of 3 markers of the most common type and 1 marker of the other type
+    are evaluated at once. The ones which are not convex, or whose sides are too far from the workspace's ratio,
+    are discarded. Among the remaining ones, the quadrilateral chosen is the closest to a rectangle of the
+    workspace's ratio, and whose Perspective Warp to the workspace has a determinant closest to 1
+    :param list_markers: markers found in the image
+    :param workspace_ratio: Ratio between the width and the height of the area represented by the markers
+    :param max_ratio_error: Maximum factor between the ratio of the quadrilateral's sides and the expected one
+    :return: the 4 markers sorted clockwise from the workspace's origin, or None if they haven't been found
+    """
     if workspace_ratio >= 1.0:
         target_w_area = int(round(workspace_ratio * 200))
         target_h_area = 200
@@ -225,72 +388,209 @@ def complicated_sort_markers(list_markers, workspace_ratio):
     else:
         id_first_marker = "B"
         id_second_marker = "A"
-    list_combinaisons = []
-    list_marker_1 = [marker for marker in list_markers if marker.identifiant == id_first_marker]
-    list_marker_2 = [marker for marker in list_markers if marker.identifiant == id_second_marker]
-    if list_marker_1:
-        list_combinaisons_marker_2 = itertools.combinations(list_marker_2, 3)
-        for marker1 in list_marker_1:
-            for combi_markers2 in list_combinaisons_marker_2:
-                combin = [marker1] + list(combi_markers2)
-
-                list_combinaisons.append(sort_markers_detection(combin))
+    list_index_1 = [i for i, marker_id in enumerate(list_id) if marker_id == id_first_marker]
+    list_index_2 = [i for i, marker_id in enumerate(list_id) if marker_id == id_second_marker]
+    if list_index_1:
+        combinations = [(index_1, ) + combi_index_2 for index_1 in list_index_1
+                        for combi_index_2 in itertools.combinations(list_index_2, 3)]
     else:
-        for combinaison in itertools.combinations(list_marker_2, 4):
-            list_combinaisons.append(combinaison)
-    if not list_combinaisons:
+        combinations = list(itertools.combinations(list_index_2, 4))
+    if not combinations:
+        return None
+
+    centers = np.array([[marker.cx, marker.cy] for marker in list_markers], dtype=np.float64)
+    combinations = sort_quadrilaterals(np.array(combinations), centers, with_origin=bool(list_index_1))
+    points_grid = centers[combinations]
+
+    valid = is_quadrilateral_plausible(points_grid, workspace_ratio, max_ratio_error)
+    if not np.any(valid):
         return None
+    combinations, points_grid = combinations[valid], points_grid[valid]
 
     final_pts = np.array(
         [[0, 0], [target_w_area - 1, 0],
          [target_w_area - 1, target_h_area - 1], [0, target_h_area - 1]],
-        dtype=np.float32)
-    list_det_transfo_matrix = []
-    for combin in list_combinaisons:
-        points_grid = np.array([[mark.cx, mark.cy] for mark in combin], dtype=np.float32)
+        dtype=np.float64)
+    list_det_transfo_matrix = np.linalg.det(get_perspective_transforms(points_grid, final_pts))
+    # A negative determinant means the quadrilateral would be mirrored
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale_cost = np.where(list_det_transfo_matrix > 0, np.abs(np.log(list_det_transfo_matrix)), np.inf)
+    scores = get_quadrilaterals_shape_cost(points_grid, workspace_ratio) + scale_cost
+    if not np.isfinite(scores).any():
+        return None
+
+    best_combin_ind = np.argmin(scores)
+    return [list_markers[i] for i in combinations[best_combin_ind]]
+
+
+def sort_quadrilaterals(combinations, centers, with_origin):
+    """
+    Vectorized version of sort_markers_detection: sort the corners of quadrilaterals clockwise from the top left one.
+    If with_origin, the corners are then rotated so that the first marker of each combination comes first
+    :param combinations: (N, 4) indexes of the markers of each quadrilateral
+    :param centers: (M, 2) centers of the markers
+    :param with_origin: whether the first marker of each combination is the workspace's origin
+    :return: (N, 4) sorted indexes
+    """
+    rows = np.arange(len(combinations))[:, None]
+    points = centers[combinations]
+    order_y = np.argsort(points[:, :, 1], axis=1, kind='stable')
+    top, bottom = order_y[:, :2], order_y[:, 2:]
+    top_x, bottom_x = points[rows, top, 0], points[rows, bottom, 0]
+    # Same tie breaking as sort_markers_detection: on equal x, the second one is on the left
+    top_left_first = top_x[:, 0] < top_x[:, 1]
+    bottom_left_first = bottom_x[:, 0] < bottom_x[:, 1]
+    top_left = np.where(top_left_first, top[:, 0], top[:, 1])
+    top_right = np.where(top_left_first, top[:, 1], top[:, 0])
+    bottom_left = np.where(bottom_left_first, bottom[:, 0], bottom[:, 1])
+    bottom_right = np.where(bottom_left_first, bottom[:, 1], bottom[:, 0])
+    order = np.stack([top_left, top_right, bottom_right, bottom_left], axis=1)
+
+    if with_origin:
+        shift = np.argmax(order == 0, axis=1)
+        order = order[rows, (np.arange(4) + shift[:, None]) % 4]
+    return combinations[rows, order]
+
+
+def is_quadrilateral_plausible(points_grid, workspace_ratio, max_ratio_error=2.0):
+    """
+    Check which quadrilaterals can be the image of the workspace:
+    they have to be convex, and their sides' ratio has to be close enough to the workspace's one
+    :param points_grid: (N, 4, 2) corners of the quadrilaterals, sorted
+    :param workspace_ratio: Ratio between the width and the height of the workspace
+    :param max_ratio_error: Maximum factor between the ratios of the quadrilaterals and the expected ones
+    :return: (N, ) boolean array
+    """
+    edges = np.roll(points_grid, -1, axis=1) - points_grid
+    next_edges = np.roll(edges, -1, axis=1)
+    cross = edges[:, :, 0] * next_edges[:, :, 1] - edges[:, :, 1] * next_edges[:, :, 0]
+    convex = np.all(cross > 0, axis=1) | np.all(cross < 0, axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sides = np.hypot(edges[:, :, 0], edges[:, :, 1])
+        ratios = np.stack([
+            (sides[:, 0] + sides[:, 2]) / (sides[:, 1] + sides[:, 3]) / workspace_ratio,
+            # Perspective makes opposite sides different, but not too much
+            sides[:, 0] / sides[:, 2],
+            sides[:, 1] / sides[:, 3],
+        ], axis=1)
+        ratios_ok = np.all((ratios <= max_ratio_error) & (ratios >= 1.0 / max_ratio_error), axis=1)
+    return convex & ratios_ok
+
+
+def get_quadrilaterals_shape_cost(points_grid, workspace_ratio):
+    """
+    Measure how far quadrilaterals are from a rectangle of the workspace's ratio.
+    The cost is 0 for such a rectangle, and adds up the cosines of the corners' angles
+    and the log ratios between the sides
+    :param points_grid: (N, 4, 2) corners of the quadrilaterals, sorted
+    :param workspace_ratio: Ratio between the width and the height of the workspace
+    :return: (N, ) costs
+    """
+    edges = np.roll(points_grid, -1, axis=1) - points_grid
+    next_edges = np.roll(edges, -1, axis=1)
+    sides = np.hypot(edges[:, :, 0], edges[:, :, 1])
+    cosines = np.abs(np.sum(edges * next_edges, axis=2)) / (sides * np.roll(sides, -1, axis=1))
+    return (np.sum(cosines, axis=1)
+            + np.abs(np.log((sides[:, 0] + sides[:, 2]) / (sides[:, 1] + sides[:, 3]) / workspace_ratio))
+            + np.abs(np.log(sides[:, 0] / sides[:, 2])) + np.abs(np.log(sides[:, 1] / sides[:, 3])))
 
-        transfo_matrix = cv2.getPerspectiveTransform(points_grid, final_pts)
-        list_det_transfo_matrix.append(np.linalg.det(transfo_matrix))
 
-    best_combin_ind = np.argmin(abs(np.array(list_det_transfo_matrix) - 1))
-    best_markers = list_combinaisons[best_combin_ind]
-    return best_markers
+def get_perspective_transforms(points_grid, final_pts):
+    """
+    Vectorized version of cv2.getPerspectiveTransform
+    :param points_grid: (N, 4, 2) source points of each transformation
+    :param final_pts: (4, 2) destination points
+    :return: (N, 3, 3) transformation matrices
+    """
+    nb_transforms = len(points_grid)
+    x, y = points_grid[:, :, 0], points_grid[:, :, 1]
+    u, v = np.broadcast_to(final_pts[:, 0], x.shape), np.broadcast_to(final_pts[:, 1], y.shape)
+    zeros, ones = np.zeros_like(x), np.ones_like(x)
+    rows_u = np.stack([x, y, ones, zeros, zeros, zeros, -x * u, -y * u], axis=2)
+    rows_v = np.stack([zeros, zeros, zeros, x, y, ones, -x * v, -y * v], axis=2)
+    system = np.concatenate([rows_u, rows_v], axis=1)
+    solution = np.linalg.solve(system, np.concatenate([u, v], axis=1)[:, :, None])[:, :, 0]
+    return np.concatenate([solution, np.ones((nb_transforms, 1))], axis=1).reshape(nb_transforms, 3, 3)
 
 
 def find_markers_from_img_thresh(img_thresh, max_dist_between_centers=3, min_radius_circle=4,
                                  max_radius_circle=35, min_radius_marker=7):
     contours = cv2.findContours(img_thresh, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)[-2]
-    list_potential_markers = []
-    for cnt in contours:
-        (x, y), radius = cv2.minEnclosingCircle(cnt)
-        if not min_radius_circle < radius < max_radius_circle:
-            continue
-        center = (int(round(x)), int(round(y)))
-        radius = int(radius)
-        list_potential_markers.append(PotentialMarker(center, radius, cnt))
+    centers_x, centers_y, radii, indexes = find_circles_from_contours(contours, min_radius_circle, max_radius_circle)
 
-    list_potential_markers = sorted(list_potential_markers, key=lambda m: m.x)
-    list_good_candidates = []
+    # Sort the circles from left to right, then merge the concentric ones.
+    # Only the circles close to the current center along x can be merged, they are found by a sweep on the sorted x
+    order = np.argsort(centers_x, kind='stable')
+    centers_x, centers_y = centers_x[order].tolist(), centers_y[order].tolist()
+    radii, indexes = radii[order].tolist(), indexes[order].tolist()
+    nb_circles = len(centers_x)
+    is_merged = [False] * nb_circles
 
-    for i, potential_marker in enumerate(list_potential_markers):
-        if potential_marker.is_merged:
+    list_good_candidates = []
+    for i in range(nb_circles):
+        if is_merged[i]:
             continue
-        marker1 = Marker(potential_marker)
-        center_marker = marker1.get_center()
-
-        for potential_marker2 in list_potential_markers[i + 1:]:
-            if potential_marker.is_merged:
-                continue
-            center_potential = potential_marker2.get_center()
-            if center_potential[0] - center_marker[0] > max_dist_between_centers:
+        sum_x, sum_y = cx, cy = centers_x[i], centers_y[i]
+        members = [i]
+
+        for j in range(i + 1, nb_circles):
+            x, y = centers_x[j], centers_y[j]
+            if x - cx > max_dist_between_centers:
                 break
-            dist = euclidean_dist_2_pts(center_marker, center_potential)
-            if dist <= max_dist_between_centers:
+            dx, dy = x - cx, y - cy
+            if dx * dx + dy * dy <= max_dist_between_centers * max_dist_between_centers:
+                members.append(j)
+                is_merged[j] = True
+                sum_x += x
+                sum_y += y
+                cx, cy = int(round(sum_x / len(members))), int(round(sum_y / len(members)))
+
+        if len(members) > 2 and max(radii[j] for j in members) >= min_radius_marker:
+            potential_markers = [
+                PotentialMarker((centers_x[j], centers_y[j]), radii[j], contours[indexes[j]]) for j in members
+            ]
+            marker1 = Marker(potential_markers[0])
+            for potential_marker2 in potential_markers[1:]:
                 marker1.add_circle(potential_marker2)
-                center_marker = marker1.get_center()
-
-        if marker1.nb_circles() > 2 and marker1.radius >= min_radius_marker:
             list_good_candidates.append(marker1)
             marker1.get_id_from_slice(img_thresh)
 
     return list_good_candidates
+
+
+def find_circles_from_contours(contours, min_radius_circle=4, max_radius_circle=35):
+    """
+    Compute the enclosing circle of the contours whose radius is in a range
+    :param contours: contours given by cv2.findContours
+    :param min_radius_circle: exclusive minimum radius
+    :param max_radius_circle: exclusive maximum radius
+    :return: centers' x, centers' y, radii, and index of the contour of each circle
+    :rtype: (numpy.array, numpy.array, numpy.array, numpy.array)
+    """
+    if not contours:
+        empty = np.empty(0, dtype=int)
+        return empty, empty, empty, empty
+
+    # The diameter of the enclosing circle is between the largest side and the diagonal of the bounding box,
+    # which are computed for all the contours at once to discard most of them without calling cv2.minEnclosingCircle
+    lengths = np.fromiter((len(cnt) for cnt in contours), dtype=np.intp, count=len(contours))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    points = np.concatenate(contours).reshape(-1, 2)
+    width = np.maximum.reduceat(points[:, 0], starts) - np.minimum.reduceat(points[:, 0], starts)
+    height = np.maximum.reduceat(points[:, 1], starts) - np.minimum.reduceat(points[:, 1], starts)
+    # A one pixel margin keeps the contours for which the computed radius could be slightly different
+    may_fit = ((np.hypot(width, height) / 2 > min_radius_circle - 1)
+               & (np.maximum(width, height) / 2 < max_radius_circle + 1))
+
+    centers_x, centers_y, radii, indexes = [], [], [], []
+    for index in np.flatnonzero(may_fit).tolist():
+        (x, y), radius = cv2.minEnclosingCircle(contours[index])
+        if not min_radius_circle < radius < max_radius_circle:
+            continue
+        centers_x.append(int(round(x)))
+        centers_y.append(int(round(y)))
+        radii.append(int(radius))
+        indexes.append(index)
+    return (np.array(centers_x, dtype=int), np.array(centers_y, dtype=int), np.array(radii, dtype=int),
+            np.array(indexes, dtype=int))
@@ -1,8 +1,16 @@
 import os
+import threading
 import unittest
 from sys import version_info
 
-from pyniryo import CalibrateMode, TcpCommandException, PinID, ConveyorID, NiryoRobot
+from pyniryo import (CalibrateMode,
+                     ChannelRole,
+                     TcpCommandException,
+                     PinID,
+                     ConveyorID,
+                     JointsPosition,
+                     NiryoRobot,
+                     RobotState)
 from pyniryo.api.exceptions import ClientNotConnectedException
 
 from .src.base_test import BaseTestTcpApi
@@ -109,5 +117,90 @@ class Test04SetArmVelocity(BaseTestTcpApi):
             self.niryo_robot.set_arm_max_velocity(101)
 
 
+class Test05StateStreaming(BaseTestTcpApi):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass(needs_move=True)
+
+    def tearDown(self):
+        self.niryo_robot.stop_state_streaming()
+
+    def test_010_get_state(self):
+        state = self.niryo_robot.get_state()
+        self.assertIsInstance(state, RobotState)
+        self.assertAlmostEqualJoints(state.joints, self.niryo_robot.get_joints())
+        self.assertEqual(state.learning_mode, self.niryo_robot.get_learning_mode())
+        self.assertFalse(state.collision_detected)
+
+    def test_020_streaming(self):
+        self.niryo_robot.start_state_streaming(rate=20.0, max_age=0.5)
+        self.assertTrue(self.niryo_robot.state_streaming)
+        self.assertLessEqual(self.niryo_robot.state.age, 0.5)
+        self.assertAlmostEqualJoints(self.niryo_robot.joints, self.niryo_robot.get_joints())
+        self.assertAlmostEqualPose(self.niryo_robot.pose, self.niryo_robot.get_pose())
+        self.niryo_robot.stop_state_streaming()
+        self.assertFalse(self.niryo_robot.state_streaming)
+
+    def test_030_read_after_move(self):
+        # A slow refresh and a large max_age: only the invalidation can refresh the snapshot
+        self.niryo_robot.start_state_streaming(rate=0.1, max_age=60.0)
+        state = self.niryo_robot.state
+        self.assertIs(self.niryo_robot.state, state)
+        self.niryo_robot.get_joints()
+        self.assertIs(self.niryo_robot.state, state)
+
+        target = JointsPosition(0.3, 0.0, 0.0, 0.0, 0.0, 0.0)
+        self.niryo_robot.move(target)
+        self.assertAlmostEqualJoints(self.niryo_robot.joints, target)
+        self.assertLess(self.niryo_robot.state.age, 1.0)
+        self.niryo_robot.move_to_home_pose()
+        self.assertAlmostEqualJoints(self.niryo_robot.joints, self.niryo_robot.get_home_pose())
+
+    def test_040_wrong_param(self):
+        with self.assertRaises(TcpCommandException):
+            self.niryo_robot.start_state_streaming(rate=0)
+        with self.assertRaises(TcpCommandException):
+            self.niryo_robot.start_state_streaming(rate=10.0, max_age=-1)
+        self.assertFalse(self.niryo_robot.state_streaming)
+
+
+class Test06MultiChannel(BaseTestTcpApi):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass(needs_move=True)
+        robot_ip_address = os.environ.get('ROBOT_IP_ADDRESS', '127.0.0.1')
+        cls.multi_channel_robot = NiryoRobot(robot_ip_address, verbose=False, multi_channel=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.multi_channel_robot.close_connection()
+        super().tearDownClass()
+
+    def test_010_channels(self):
+        self.assertEqual(self.niryo_robot.channels, [ChannelRole.MOTION])
+        self.assertEqual(self.multi_channel_robot.channels,
+                         [ChannelRole.MOTION, ChannelRole.QUERY, ChannelRole.VISION])
+
+    def test_020_query_during_motion(self):
+        motion = threading.Thread(target=self.multi_channel_robot.move,
+                                  args=(JointsPosition(0.5, 0.0, 0.0, 0.0, 0.0, 0.0), ))
+        motion.start()
+        joints = self.multi_channel_robot.get_joints()
+        self.assertTrue(motion.is_alive())
+        motion.join()
+        self.assertIsInstance(joints, JointsPosition)
+        self.multi_channel_robot.move_to_home_pose()
+
+    def test_030_close_connection(self):
+        robot_ip_address = os.environ.get('ROBOT_IP_ADDRESS', '127.0.0.1')
+        robot = NiryoRobot(robot_ip_address, verbose=False, multi_channel=True)
+        robot.close_connection()
+        self.assertEqual(robot.channels, [])
+        with self.assertRaises(ClientNotConnectedException):
+            robot.get_joints()
+
+
 if __name__ == '__main__':
     unittest.main()
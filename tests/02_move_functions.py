@@ -41,6 +41,21 @@ class Test01Joints(BaseTestTcpApi):
         with self.assertRaises(AttributeError):
             self.niryo_robot.move(self.joints[0].to_list())
 
+    def test_051_move_async(self):
+        handles = [self.niryo_robot.move_async(joints_position) for joints_position in self.joints]
+        callback_handles = []
+        handles[-1].add_done_callback(callback_handles.append)
+        self.assertTrue(handles[-1].wait(timeout=60))
+        self.assertTrue(all(handle.done() for handle in handles))
+        self.assertEqual(callback_handles, [handles[-1]])
+        for handle in handles:
+            self.assertIsNone(handle.result())
+        self.assertAlmostEqualJoints(self.niryo_robot.get_joints(), self.joints[-1])
+
+    def test_052_move_async_wrong_params(self):
+        with self.assertRaises(TypeError):
+            self.niryo_robot.move_async(0.54, 0.964, 0.34, "a", "m", ConveyorID.ID_1)
+
     def test_060_joints_setter(self):
         for joints_position in self.joints:
             self.niryo_robot.joints = joints_position
@@ -1,7 +1,10 @@
 import unittest
 from collections.abc import Iterable
 
-from pyniryo import JointsPosition, PoseObject
+import numpy as np
+
+from pyniryo import JointsArray, JointsPosition, NiryoRobot, PoseArray, PoseMetadata, PoseObject
+from pyniryo.api.mock_server import MockRobotServer
 
 
 class Test01JointsPosition(unittest.TestCase):
@@ -60,5 +63,79 @@ class Test02PoseObject(unittest.TestCase):
         self.assertEqual(self.pose_object.to_list(), list(self.pose_list))
 
 
+class Test03PoseArray(unittest.TestCase):
+
+    def setUp(self):
+        self.poses = [PoseObject(0.1 * i, 0.0, 0.3, 0.0, 1.57, float(i)) for i in range(5)]
+        self.pose_array = PoseArray.from_poses(self.poses)
+
+    def test_010_views(self):
+        self.assertEqual(len(self.pose_array), len(self.poses))
+        self.assertEqual(list(self.pose_array), self.poses)
+        self.assertEqual(self.pose_array[-1].yaw, 4.0)
+        self.assertEqual(self.pose_array[2].to_pose(), self.poses[2])
+
+    def test_020_shared_data(self):
+        data = np.zeros((4, 6))
+        pose_array = PoseArray(data)
+        self.assertIs(pose_array.data, data)
+        pose_array[1:][0].z = 0.5
+        pose_array[2][0] = 0.25
+        self.assertEqual(data[1, 2], 0.5)
+        self.assertEqual(data[2, 0], 0.25)
+
+    def test_030_dict(self):
+        pose_dicts = self.pose_array.to_dict()
+        self.assertEqual(pose_dicts, [pose.to_dict() for pose in self.poses])
+        self.assertEqual(PoseArray.from_dict(pose_dicts), self.pose_array)
+        self.assertEqual(PoseArray.from_dict([]).data.shape, (0, 6))
+
+    def test_040_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            PoseArray(np.zeros((3, 7)))
+        self.assertEqual(PoseArray(np.zeros((3, 6)), PoseMetadata.v1())[0].metadata, PoseMetadata.v1())
+
+
+class Test04JointsArray(unittest.TestCase):
+
+    def setUp(self):
+        self.joints = [JointsPosition(0.1 * i, 0.0, -0.5, 0.0, 0.0, float(i)) for i in range(5)]
+        self.joints_array = JointsArray.from_joints(self.joints)
+
+    def test_010_views(self):
+        self.assertEqual(list(self.joints_array), self.joints)
+        self.assertEqual(self.joints_array[::2].to_joints(), self.joints[::2])
+        self.assertEqual(self.joints_array[3][1:3], [0.0, -0.5])
+
+    def test_020_dict(self):
+        joints_dicts = self.joints_array.to_dict()
+        self.assertEqual(joints_dicts, [joints.to_dict() for joints in self.joints])
+        self.assertEqual(JointsArray.from_dict(joints_dicts), self.joints_array)
+
+
+class Test05Trajectories(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False)
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+    def test_010_save_trajectory(self):
+        joints_array = JointsArray(np.linspace(0.0, 0.5, 60).reshape(10, 6))
+        self.robot.save_trajectory(joints_array, "array", "")
+        self.assertEqual(self.robot.get_trajectory_saved("array"), joints_array.to_joints())
+
+    def test_020_execute_trajectory(self):
+        joints_array = JointsArray(np.linspace(0.0, 0.5, 60).reshape(10, 6))
+        self.robot.execute_trajectory(joints_array)
+        self.assertEqual(self.robot.get_joints(), joints_array[-1])
+        pose_array = PoseArray.from_poses([self.robot.get_pose()])
+        self.robot.execute_trajectory(pose_array)
+
+
 if __name__ == '__main__':
     unittest.main()
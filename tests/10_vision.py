@@ -1,8 +1,23 @@
 #!/usr/bin/env python
+import os
+import unittest
+from unittest import mock
+
 import numpy as np
 import cv2
 
-from pyniryo import ObjectShape, ObjectColor, TcpCommandException, PoseObject, JointsPosition
+from pyniryo import (ObjectShape,
+                     ObjectColor,
+                     TcpCommandException,
+                     PoseObject,
+                     JointsPosition,
+                     FrameStream,
+                     Undistorter,
+                     WorkspaceTracker,
+                     extract_img_workspace,
+                     undistort_image)
+
+from pyniryo.vision.markers_detection import Marker, PotentialMarker, complicated_sort_markers, find_workspace_markers
 
 from .src.base_test import BaseTestTcpApi, BaseTestWithWorkspace
 
@@ -57,6 +72,170 @@ class Test01Camera(BaseTestTcpApi):
         self.assertIsInstance(saturation, float)
 
 
+class Test01bFrameStream(BaseTestTcpApi):
+
+    def setUp(self):
+        super().setUp()
+        self.stream = FrameStream(os.environ.get('ROBOT_IP_ADDRESS', '127.0.0.1'), buffer_size=2, undistort=True)
+        self.addCleanup(self.stream.stop)
+
+    def test_010_iterate(self):
+        self.stream.start()
+        indexes = []
+        for frame in self.stream:
+            self.assertIsInstance(frame.img, np.ndarray)
+            self.assertEqual(frame.img.shape, frame.img_raw.shape)
+            indexes.append(frame.index)
+            if len(indexes) == 5:
+                break
+        self.assertEqual(indexes, sorted(indexes))
+
+    def test_020_latest(self):
+        self.stream.start()
+        frame = self.stream.latest(timeout=5)
+        self.assertIsInstance(frame.img, np.ndarray)
+        stats = self.stream.stats()
+        self.assertGreaterEqual(stats["fetch"]["count"], 1)
+        self.assertGreaterEqual(stats["total"]["count"], 1)
+
+    def test_030_stop(self):
+        self.stream.start()
+        self.stream.latest(timeout=5)
+        self.stream.stop()
+        self.assertFalse(self.stream.running)
+        while self.stream.next_frame() is not None:
+            pass
+
+    def test_040_processing_error(self):
+        stream = FrameStream(os.environ.get('ROBOT_IP_ADDRESS', '127.0.0.1'), extract_workspace=True)
+        self.addCleanup(stream.stop)
+        error = cv2.error("Invalid workspace")
+        with mock.patch('pyniryo.vision.frame_stream.extract_img_workspace', side_effect=error):
+            stream.start()
+            with self.assertRaises(cv2.error) as context:
+                stream.next_frame(timeout=5)
+        self.assertIs(context.exception, error)
+        self.assertFalse(stream.running)
+        stats = stream.stats()
+        self.assertGreaterEqual(stats["failed"], 1)
+        self.assertEqual(stats["total"]["count"], 0)
+
+    def test_050_drop_reasons(self):
+        self.stream.start()
+        self.stream.latest(timeout=5)
+        stats = self.stream.stats()
+        for reason in ("dropped", "late", "corrupted", "failed"):
+            self.assertIsInstance(stats[reason], int)
+        self.assertEqual(stats["failed"], 0)
+
+
+class Test01cUndistorter(unittest.TestCase):
+
+    def setUp(self):
+        self.mtx = np.array([[520.0, 0.0, 320.0], [0.0, 520.0, 240.0], [0.0, 0.0, 1.0]])
+        self.dist = np.array([[0.12, -0.25, 0.001, -0.002, 0.08]])
+        self.img = (np.random.RandomState(0).rand(480, 640, 3) * 255).astype(np.uint8)
+
+    def test_010_same_as_cv2_undistort(self):
+        expected = cv2.undistort(self.img, self.mtx, self.dist)
+        np.testing.assert_array_equal(Undistorter(self.mtx, self.dist).undistort(self.img), expected)
+        np.testing.assert_array_equal(undistort_image(self.img, self.mtx, self.dist), expected)
+
+    def test_020_several_sizes(self):
+        undistorter = Undistorter(self.mtx, self.dist)
+        small_img = cv2.resize(self.img, (320, 240))
+        self.assertEqual(undistorter.undistort(small_img).shape, small_img.shape)
+        self.assertEqual(undistorter.undistort(self.img).shape, self.img.shape)
+
+    def test_030_matches(self):
+        undistorter = Undistorter(self.mtx.tolist(), self.dist.tolist())
+        self.assertTrue(undistorter.matches(self.mtx, self.dist))
+        self.assertFalse(undistorter.matches(self.mtx, self.dist * 2))
+
+
+class Test01dWorkspaceTracker(unittest.TestCase):
+
+    def setUp(self):
+        img_path = os.path.join(os.path.dirname(__file__), '..', 'docs', 'vision', 'images', 'img_illustration.jpg')
+        self.img = cv2.imread(img_path)
+        self.tracker = WorkspaceTracker()
+
+    def test_010_same_as_extract_img_workspace(self):
+        expected = extract_img_workspace(self.img)
+        np.testing.assert_array_equal(self.tracker.extract(self.img), expected)
+        np.testing.assert_array_equal(self.tracker.extract(self.img), expected)
+        self.assertEqual(self.tracker.nb_detections, 1)
+        self.assertEqual(self.tracker.nb_tracked, 1)
+
+    def test_020_markers_moved(self):
+        self.tracker.extract(self.img)
+        centers = [marker.get_center() for marker in self.tracker.get_markers()]
+        shifted_img = np.roll(self.img, (4, 3), axis=(0, 1))
+        self.assertIsNotNone(self.tracker.extract(shifted_img))
+        self.assertEqual(self.tracker.nb_tracked, 1)
+        shifted_centers = [marker.get_center() for marker in self.tracker.get_markers()]
+        for (x, y), (shifted_x, shifted_y) in zip(centers, shifted_centers):
+            self.assertAlmostEqual(shifted_x, x + 3, delta=1)
+            self.assertAlmostEqual(shifted_y, y + 4, delta=1)
+
+    def test_030_markers_found(self):
+        markers = find_workspace_markers(self.img)
+        self.assertEqual([marker.get_center() for marker in markers], [(333, 133), (657, 136), (654, 461), (332, 460)])
+        for marker in markers:
+            self.assertGreater(marker.nb_circles(), 2)
+            self.assertEqual(marker.get_center(), tuple(int(round(c)) for c in np.mean(marker.list_centers, axis=0)))
+
+    def test_040_markers_lost(self):
+        self.tracker.extract(self.img)
+        self.assertIsNone(self.tracker.extract(np.zeros_like(self.img)))
+        self.assertIsNone(self.tracker.get_markers())
+        self.assertEqual(self.tracker.nb_detections, 2)
+        self.assertIsNotNone(self.tracker.extract(self.img))
+
+
+class Test01eMarkersSelection(unittest.TestCase):
+
+    @staticmethod
+    def make_marker(cx, cy, identifiant):
+        marker = Marker(PotentialMarker((cx, cy), 10, None))
+        marker.identifiant = identifiant
+        return marker
+
+    def setUp(self):
+        self.workspace = [
+            self.make_marker(220, 140, "A"),
+            self.make_marker(425, 135, "B"),
+            self.make_marker(430, 345, "B"),
+            self.make_marker(215, 340, "B"),
+        ]
+
+    def test_010_distractors(self):
+        distractors = [
+            self.make_marker(100, 60, "B"),
+            self.make_marker(560, 420, "B"),
+            self.make_marker(330, 250, "A"),
+            self.make_marker(600, 100, "B"),
+        ]
+        markers = distractors[:2] + self.workspace[2:] + distractors[2:] + self.workspace[:2]
+        self.assertEqual(complicated_sort_markers(markers, workspace_ratio=1.0), self.workspace)
+
+    def test_020_several_origins(self):
+        # The combinations of every origin candidate are evaluated
+        markers = [self.make_marker(600, 450, "A")] + self.workspace + [self.make_marker(50, 50, "B")]
+        self.assertEqual(complicated_sort_markers(markers, workspace_ratio=1.0), self.workspace)
+
+    def test_030_rotated(self):
+        rotated = self.workspace[1:] + self.workspace[:1]
+        rotated[0], rotated[-1] = self.make_marker(425, 135, "A"), self.make_marker(220, 140, "B")
+        markers = rotated + [self.make_marker(100, 400, "B")]
+        self.assertEqual([marker.get_center() for marker in complicated_sort_markers(markers, 1.0)],
+                         [(425, 135), (430, 345), (215, 340), (220, 140)])
+
+    def test_040_no_workspace(self):
+        markers = [self.make_marker(x, 100, "B") for x in range(100, 600, 100)]
+        self.assertIsNone(complicated_sort_markers(markers, workspace_ratio=1.0))
+
+
 class Test02Detection(BaseTestWithWorkspace):
 
     def test_010_detect_object(self):
@@ -0,0 +1,225 @@
+import json
+import socket
+import threading
+import unittest
+
+from pyniryo.api.binary_encoding import (BINARY_MAGIC,
+                                         binary_encoding_selection,
+                                         decode,
+                                         encode,
+                                         server_supports_binary)
+from pyniryo.api.channels import QUERY_COMMANDS, VISION_COMMANDS, command_channel_role
+from pyniryo.api.communication_functions import (build_command_dict,
+                                                 dict_to_binary_packet,
+                                                 dict_to_packet,
+                                                 iter_json,
+                                                 receive_data,
+                                                 receive_dict,
+                                                 receive_dict_w_payload,
+                                                 receive_exactly,
+                                                 request_to_packet,
+                                                 request_to_packet_chunks,
+                                                 server_supports_large_framing)
+from pyniryo.api.enums_communication import (ChannelRole,
+                                             Command,
+                                             DEFAULT_PACKET_SIZE_INFOS,
+                                             LARGE_PACKET_SIZE_INFOS,
+                                             READ_SIZE)
+from pyniryo.api.exceptions import TcpCommandException
+
+
+class Test01Reception(unittest.TestCase):
+
+    def setUp(self):
+        self.client_socket, self.server_socket = socket.socketpair()
+
+    def tearDown(self):
+        self.client_socket.close()
+        self.server_socket.close()
+
+    def send_in_background(self, *chunks):
+        thread = threading.Thread(target=lambda: [self.server_socket.sendall(chunk) for chunk in chunks])
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def test_010_receive_exactly(self):
+        data = bytes(range(256)) * 10
+        self.send_in_background(data[:100], data[100:])
+        received = receive_exactly(self.client_socket, len(data))
+        self.assertIsInstance(received, memoryview)
+        self.assertEqual(received, data)
+
+    def test_020_receive_exactly_connection_closed(self):
+        self.server_socket.sendall(b'abc')
+        self.server_socket.shutdown(socket.SHUT_WR)
+        self.assertIsNone(receive_exactly(self.client_socket, 10))
+
+    def test_030_receive_data(self):
+        self.send_in_background(dict_to_packet({"status": "OK"}))
+        self.assertEqual(receive_data(self.client_socket, DEFAULT_PACKET_SIZE_INFOS, READ_SIZE), '{"status": "OK"}')
+
+    def test_040_receive_dict(self):
+        answer = {"status": "OK", "list_ret_param": [0.1, 0.2, 0.3]}
+        self.send_in_background(dict_to_packet(answer))
+        self.assertEqual(receive_dict(self.client_socket), answer)
+
+    def test_050_receive_dict_w_payload(self):
+        payload = b'\x00\xff' * 100000
+        answer = {"status": "OK", "payload_size": len(payload)}
+        self.send_in_background(dict_to_packet(answer), payload)
+        received_dict, received_payload = receive_dict_w_payload(self.client_socket)
+        self.assertEqual(received_dict, answer)
+        self.assertEqual(received_payload, payload)
+
+    def test_060_receive_dict_w_payload_truncated(self):
+        answer = {"status": "OK", "payload_size": 100}
+        self.server_socket.sendall(dict_to_packet(answer) + b'\x00' * 50)
+        self.server_socket.shutdown(socket.SHUT_WR)
+        received_dict, received_payload = receive_dict_w_payload(self.client_socket)
+        self.assertEqual(received_dict, answer)
+        self.assertIsNone(received_payload)
+
+
+class Test02BinaryEncoding(unittest.TestCase):
+
+    def test_010_round_trip(self):
+        values = [
+            None,
+            True,
+            False,
+            0,
+            -2**63,
+            2**63 - 1,
+            0.1,
+            "",
+            "Niryo é",
+            [],
+            [0.1, 0.2, 0.3],
+            [1, 0.5, "a", None, [True]],
+            {},
+            {"command": "MOVE", "param_list": [[0.1, 0.2, 0.3, 0.0, 1.57, 0.0], "JOINTS"], "nested": {"a": 1}},
+        ]
+        for value in values:
+            encoded = encode(value)
+            self.assertEqual(encoded[:1], BINARY_MAGIC)
+            decoded = decode(encoded)
+            self.assertEqual(decoded, value)
+            self.assertIs(type(decoded), type(value))
+
+    def test_020_tuple_and_numpy_values(self):
+        import numpy as np
+
+        self.assertEqual(decode(encode((0.1, 0.2))), [0.1, 0.2])
+        self.assertEqual(decode(encode(np.array([0.1, 0.2]))), [0.1, 0.2])
+        self.assertEqual(decode(encode(np.int64(3))), 3)
+
+    def test_030_packed_floats(self):
+        trajectory = [[i / 7.0] * 6 for i in range(1000)]
+        request = {"command": "EXECUTE_TRAJECTORY", "param_list": [trajectory]}
+        encoded = encode(request)
+        self.assertLess(len(encoded), len(json.dumps(request)) / 2)
+        self.assertEqual(decode(encoded), request)
+
+    def test_040_invalid_data(self):
+        with self.assertRaises(ValueError):
+            decode(b'{"status": "OK"}')
+        with self.assertRaises(ValueError):
+            decode(encode(1) + b'\x00')
+        with self.assertRaises(TypeError):
+            encode({1: "a"})
+        with self.assertRaises(TypeError):
+            encode(object())
+
+    def test_050_request_to_packet(self):
+        request = build_command_dict(Command.GET_JOINTS)
+        self.assertEqual(request_to_packet(request), dict_to_packet(request))
+        self.assertEqual(request_to_packet(request, {"GET_JOINTS"}), dict_to_binary_packet(request))
+        self.assertEqual(request_to_packet(request, {"GET_POSE"}), dict_to_packet(request))
+
+    def test_060_receive_binary_dict(self):
+        client_socket, server_socket = socket.socketpair()
+        self.addCleanup(client_socket.close)
+        self.addCleanup(server_socket.close)
+        answer = {"status": "OK", "list_ret_param": [[0.1, 0.2, 0.3, 0.4, 0.5, 0.6]]}
+        server_socket.sendall(dict_to_binary_packet(answer) + dict_to_packet(answer))
+        self.assertEqual(receive_dict(client_socket), answer)
+        self.assertEqual(receive_dict(client_socket), answer)
+
+    def test_070_negotiation(self):
+        self.assertFalse(server_supports_binary({"message": "hello"}))
+        self.assertFalse(server_supports_binary(None))
+        self.assertTrue(server_supports_binary({"encodings": ["json", "binary-v1"]}))
+        selection = binary_encoding_selection()
+        self.assertEqual(selection["encoding"], "binary-v1")
+        self.assertIn("GET_JOINTS", selection["binary_commands"])
+
+
+class Test03Framing(unittest.TestCase):
+
+    @staticmethod
+    def trajectory_request(nb_waypoints):
+        waypoints = [{
+            "joints": [i / 7.0] * 6, "metadata": {
+                "version": 1, "frame": "é"
+            }, "obj_type": "JOINTS"
+        } for i in range(nb_waypoints)]
+        return build_command_dict(Command.EXECUTE_TRAJECTORY, waypoints, 0.01)
+
+    def test_010_iter_json(self):
+        values = [self.trajectory_request(3), [], {}, [[[[1, 2]]]], {"a": (1, 2), "b": {"c": None}}, "é", 0.5]
+        for value in values:
+            self.assertEqual("".join(iter_json(value)), json.dumps(value))
+        self.assertEqual("".join(iter_json(list(range(600)), depth=1)), json.dumps(list(range(600))))
+        self.assertEqual("".join(iter_json([], depth=1)), "[]")
+
+    def test_020_too_large_packet(self):
+        request = self.trajectory_request(2000)
+        with self.assertRaises(TcpCommandException):
+            dict_to_packet(request)
+        with self.assertRaises(TcpCommandException):
+            request_to_packet_chunks(request)
+
+    def test_030_large_framing(self):
+        request = self.trajectory_request(2000)
+        packet = dict_to_packet(request, LARGE_PACKET_SIZE_INFOS)
+        chunks = list(request_to_packet_chunks(request, packet_size_infos=LARGE_PACKET_SIZE_INFOS))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), packet)
+
+        client_socket, server_socket = socket.socketpair()
+        self.addCleanup(client_socket.close)
+        self.addCleanup(server_socket.close)
+        thread = threading.Thread(target=lambda: [server_socket.sendall(chunk) for chunk in chunks])
+        thread.start()
+        self.addCleanup(thread.join)
+        self.assertEqual(receive_dict(client_socket, LARGE_PACKET_SIZE_INFOS), request)
+
+    def test_040_single_chunk(self):
+        request = build_command_dict(Command.GET_JOINTS)
+        self.assertEqual(list(request_to_packet_chunks(request)), [dict_to_packet(request)])
+        request = self.trajectory_request(10)
+        self.assertEqual(list(request_to_packet_chunks(request, {"EXECUTE_TRAJECTORY"})),
+                         [dict_to_binary_packet(request)])
+
+    def test_050_negotiation(self):
+        self.assertFalse(server_supports_large_framing({"message": "hello"}))
+        self.assertTrue(server_supports_large_framing({"framings": ["u32-v1"]}))
+
+
+class Test04ChannelRouting(unittest.TestCase):
+
+    def test_010_command_channel_role(self):
+        self.assertIs(command_channel_role(Command.GET_JOINTS.name), ChannelRole.QUERY)
+        self.assertIs(command_channel_role(Command.GET_HARDWARE_STATUS.name), ChannelRole.QUERY)
+        self.assertIs(command_channel_role(Command.GET_IMAGE_COMPRESSED.name), ChannelRole.VISION)
+        self.assertIs(command_channel_role(Command.MOVE.name), ChannelRole.MOTION)
+        self.assertIs(command_channel_role(Command.VISION_PICK.name), ChannelRole.MOTION)
+        self.assertIs(command_channel_role(Command.DIGITAL_WRITE.name), ChannelRole.MOTION)
+
+    def test_020_known_commands(self):
+        self.assertLessEqual(QUERY_COMMANDS | VISION_COMMANDS, set(Command.__members__))
+        self.assertFalse(QUERY_COMMANDS & VISION_COMMANDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import time
+import unittest
+
+from pyniryo import JointsPosition, NiryoRobot, PoseObject
+from pyniryo.api.enums_communication import Command, ObjectColor, ObjectShape
+from pyniryo.api.exceptions import HostNotReachableException, NiryoRobotException
+from pyniryo.api.mock_server import MockFault, MockRobotServer
+from pyniryo.vision import extract_img_workspace, uncompress_image
+
+
+class BaseTestMockServer(unittest.TestCase):
+    server_kwargs = {}
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False, **self.server_kwargs)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False)
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+
+class Test01MockCommands(BaseTestMockServer):
+
+    def test_010_every_command_handled(self):
+        for command in Command:
+            self.assertTrue(MockRobotServer.handles(command), command)
+
+    def test_020_move(self):
+        joints = JointsPosition(0.2, 0.1, -0.3, 0.0, 0.5, 0.0)
+        self.robot.move(joints)
+        self.assertEqual(self.robot.get_joints().to_list(), joints.to_list())
+        self.robot.move(PoseObject(0.3, 0.0, 0.2, 0.0, 1.57, 0.0))
+        self.assertEqual(self.robot.get_pose().to_list(), [0.3, 0.0, 0.2, 0.0, 1.57, 0.0])
+        self.assertEqual(len(self.robot.get_pose_quat()), 7)
+
+    def test_030_saved_items(self):
+        pose = PoseObject(0.3, 0.0, 0.2, 0.0, 1.57, 0.0)
+        self.robot.save_pose("pose", pose)
+        self.assertEqual(self.robot.get_pose_saved("pose"), pose)
+        self.assertEqual(self.robot.get_saved_pose_list(), ["pose"])
+        self.robot.delete_pose("pose")
+        with self.assertRaises(NiryoRobotException):
+            self.robot.get_pose_saved("pose")
+
+        trajectory = [JointsPosition(0.1 * index, 0.0, 0.0, 0.0, 0.0, 0.0) for index in range(3)]
+        self.robot.save_trajectory(trajectory, "trajectory", "description")
+        self.assertEqual(self.robot.get_trajectory_saved("trajectory"), trajectory)
+        self.robot.execute_registered_trajectory("trajectory")
+        self.assertEqual(self.robot.get_joints(), trajectory[-1])
+
+    def test_040_ios_and_conveyors(self):
+        self.assertEqual(len(self.robot.get_digital_io_state()), 9)
+        self.assertEqual(len(self.robot.get_analog_io_state()), 4)
+        self.assertEqual(len(self.robot.get_hardware_status().motors_temperature), 6)
+        conveyor_id = self.robot.set_conveyor()
+        self.robot.run_conveyor(conveyor_id, speed=70)
+        feedback, = self.robot.get_conveyors_feedback()
+        self.assertEqual(feedback["conveyor_id"], conveyor_id)
+        self.assertTrue(feedback["running"])
+        self.assertEqual(feedback["speed"], 70)
+
+    def test_050_vision(self):
+        with self.assertRaises(NiryoRobotException):
+            self.robot.detect_object("workspace")
+        self.robot.save_workspace_from_points("workspace", [0.3, 0.1, 0.0], [0.3, -0.1, 0.0], [0.1, -0.1, 0.0],
+                                              [0.1, 0.1, 0.0])
+        self.assertAlmostEqual(self.robot.get_workspace_ratio("workspace"), 1.0)
+        found, _, shape, color = self.robot.detect_object("workspace", ObjectShape.CIRCLE)
+        self.assertTrue(found)
+        self.assertEqual((shape, color), (ObjectShape.CIRCLE, ObjectColor.RED))
+        found, _, _ = self.robot.vision_pick("workspace", color=ObjectColor.GREEN)
+        self.assertFalse(found)
+
+        img = uncompress_image(self.robot.get_img_compressed())
+        self.assertEqual(img.shape, (480, 640, 3))
+        self.assertIsNotNone(extract_img_workspace(img, workspace_ratio=1.0))
+
+
+class Test02MockProtocol(BaseTestMockServer):
+    server_kwargs = {"binary_encoding": True, "large_framing": True}
+
+    def test_010_negotiation(self):
+        # The second handshake selects the binary encoding and the 4 bytes framing
+        self.assertEqual(self.server.request_counts()[Command.HANDSHAKE.name], 2)
+        self.assertEqual(self.robot.get_joints().to_list(), self.server.state.joints)
+
+    def test_020_large_trajectory(self):
+        # Longer than the 65535 bytes allowed by the default framing
+        self.robot.execute_trajectory([JointsPosition(0.1, 0.0, 0.0, 0.0, 0.0, 0.0)] * 2000)
+        self.assertEqual(self.robot.get_joints().to_list(), [0.1, 0.0, 0.0, 0.0, 0.0, 0.0])
+
+
+class Test03MockFaults(BaseTestMockServer):
+
+    def test_010_ko(self):
+        self.server.inject_fault(MockFault.KO, Command.GET_POSE, count=2)
+        self.robot.get_joints()
+        for _ in range(2):
+            with self.assertRaises(NiryoRobotException):
+                self.robot.get_pose()
+        self.robot.get_pose()
+
+    def test_020_disconnect(self):
+        self.server.inject_fault(MockFault.DISCONNECT)
+        with self.assertRaises(HostNotReachableException):
+            self.robot.get_joints()
+
+    def test_030_truncate(self):
+        self.server.inject_fault(MockFault.TRUNCATE, Command.GET_JOINTS)
+        with self.assertRaises(HostNotReachableException):
+            self.robot.get_joints()
+
+
+class Test04MockTiming(unittest.TestCase):
+
+    def test_010_motion_duration(self):
+        with MockRobotServer(joint_speed=2.0, verbose=False) as server:
+            robot = NiryoRobot("127.0.0.1", verbose=False)
+            joints = list(server.state.joints)
+            joints[0] += 0.4
+            start = time.time()
+            robot.move(JointsPosition(*joints))
+            self.assertGreaterEqual(time.time() - start, 0.2)
+            robot.close_connection()
+
+    def test_020_latency(self):
+        with MockRobotServer(latency=0.02, jitter=0.01, seed=0, verbose=False) as server:
+            robot = NiryoRobot("127.0.0.1", verbose=False)
+            start = time.time()
+            for _ in range(5):
+                robot.get_joints()
+            self.assertGreaterEqual(time.time() - start, 0.1)
+            self.assertEqual(server.request_counts()[Command.GET_JOINTS.name], 5)
+            robot.close_connection()
+
+
+if __name__ == '__main__':
+    unittest.main()
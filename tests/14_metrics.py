@@ -0,0 +1,105 @@
+import json
+import random
+import unittest
+
+import numpy as np
+
+from pyniryo import NiryoRobot
+from pyniryo.api.enums_communication import Command
+from pyniryo.api.exceptions import HostNotReachableException, NiryoRobotException
+from pyniryo.api.metrics import LatencyHistogram, RobotMetrics
+from pyniryo.api.mock_server import MockFault, MockRobotServer
+
+
+class Test01LatencyHistogram(unittest.TestCase):
+
+    def test_010_empty(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.quantile(0.5))
+        self.assertEqual(histogram.to_dict()["count"], 0)
+
+    def test_020_quantiles(self):
+        rng = random.Random(0)
+        durations = [rng.lognormvariate(-6, 1) for _ in range(10000)]
+        histogram = LatencyHistogram()
+        for duration in durations:
+            histogram.record(duration)
+        for q in (0.5, 0.95, 0.99):
+            expected = np.quantile(durations, q)
+            self.assertLess(abs(histogram.quantile(q) - expected) / expected, 0.19)
+        self.assertEqual(histogram.quantile(1.0), max(durations))
+        self.assertAlmostEqual(histogram.sum, sum(durations))
+
+    def test_030_cumulative_counts(self):
+        histogram = LatencyHistogram()
+        for duration in (0.00005, 0.0001, 0.0003, 1000.0):
+            histogram.record(duration)
+        self.assertEqual(histogram.cumulative_counts([0.0001, 0.0004]), [2, 3])
+
+
+class Test02RobotMetrics(unittest.TestCase):
+
+    def test_010_snapshot(self):
+        metrics = RobotMetrics()
+        metrics.record("GET_JOINTS", 0.002, 45, 110)
+        metrics.record("GET_JOINTS", 0.004, 45, 110, error=True)
+        metrics.record_failure("GET_JOINTS")
+        snapshot = metrics.snapshot()["GET_JOINTS"]
+        self.assertEqual((snapshot["calls"], snapshot["errors"]), (3, 2))
+        self.assertEqual((snapshot["bytes_sent"], snapshot["bytes_received"]), (90, 220))
+        self.assertEqual(snapshot["latency"]["count"], 2)
+        self.assertEqual(json.loads(metrics.to_json()), metrics.snapshot())
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_020_prometheus(self):
+        metrics = RobotMetrics()
+        metrics.record("GET_POSE", 0.003, 43, 100)
+        text = metrics.to_prometheus(labels={"robot": "ned2"})
+        self.assertIn('pyniryo_requests_total{command="GET_POSE",robot="ned2"} 1\n', text)
+        self.assertIn('pyniryo_request_duration_seconds_bucket{command="GET_POSE",robot="ned2",le="0.0016"} 0\n',
+                      text)
+        self.assertIn('pyniryo_request_duration_seconds_bucket{command="GET_POSE",robot="ned2",le="0.0032"} 1\n',
+                      text)
+        self.assertIn('pyniryo_request_duration_seconds_count{command="GET_POSE",robot="ned2"} 1\n', text)
+
+
+class Test03RobotInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False)
+        self.robot.metrics.reset()
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+    def test_010_requests(self):
+        for _ in range(10):
+            self.robot.get_joints()
+        image = self.robot.get_img_compressed()
+        with self.robot.batch() as batch:
+            batch.get_pose()
+            batch.get_joints()
+        snapshot = self.robot.metrics.snapshot()
+        self.assertEqual(snapshot["GET_JOINTS"]["calls"], 11)
+        self.assertEqual(snapshot["GET_POSE"]["latency"]["count"], 1)
+        self.assertGreater(snapshot["GET_IMAGE_COMPRESSED"]["bytes_received"], len(image))
+
+    def test_020_errors(self):
+        self.server.inject_fault(MockFault.KO, Command.GET_POSE)
+        with self.assertRaises(NiryoRobotException):
+            self.robot.get_pose()
+        self.server.inject_fault(MockFault.DISCONNECT, Command.GET_JOINTS)
+        with self.assertRaises(HostNotReachableException):
+            self.robot.get_joints()
+        snapshot = self.robot.metrics.snapshot()
+        self.assertEqual(snapshot["GET_POSE"]["errors"], 1)
+        self.assertEqual(snapshot["GET_JOINTS"]["errors"], 1)
+        self.assertEqual(snapshot["GET_JOINTS"]["latency"]["count"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
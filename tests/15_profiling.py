@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+import warnings
+from unittest import mock
+
+from pyniryo import JointsPosition, NiryoRobot
+from pyniryo.api.enums_communication import Command
+from pyniryo.api.mock_server import MockRobotServer
+from pyniryo.api.profiling import PHASES, Profiler, active_call
+from pyniryo.api.schemas import SCHEMAS
+
+
+class Test01Profiling(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False)
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+    def test_010_phases(self):
+        with self.robot.profile() as profiler:
+            for _ in range(10):
+                self.robot.get_joints()
+        self.assertIsNone(active_call())
+        calls = profiler.calls
+        self.assertEqual(len(calls), 10)
+        for call in calls:
+            self.assertEqual((call.name, call.nb_requests, call.error), ("GET_JOINTS", 1, False))
+            self.assertEqual(set(call.phases), set(PHASES))
+            self.assertAlmostEqual(sum(call.phases.values()), call.total)
+            self.assertGreater(call.phases["wait"], 0.0)
+        self.assertEqual(profiler.summary()["GET_JOINTS"]["calls"], 10)
+        self.assertIn("GET_JOINTS", profiler.report())
+
+    def test_020_not_profiled(self):
+        self.robot.get_joints()
+        with self.robot.profile() as profiler:
+            with self.robot.batch() as batch:
+                batch.get_pose()
+                batch.get_joints()
+        self.robot.get_pose()
+        self.assertEqual(profiler.calls, [])
+
+    def test_030_named_after_commands(self):
+        trajectory = [JointsPosition(0.1 * index, 0.0, 0.0, 0.0, 0.0, 0.0) for index in range(3)]
+        self.robot.save_trajectory(trajectory, "trajectory", "description")
+        recorded = []
+        with self.robot.profile(Profiler(on_call=recorded.append)) as profiler:
+            self.robot.move(trajectory[1])
+            self.robot.get_trajectory_saved("trajectory")
+        self.assertEqual([call.name for call in profiler.calls], ["MOVE", "GET_TRAJECTORY_SAVED"])
+        self.assertEqual(recorded, profiler.calls)
+
+    def test_040_errors(self):
+        with self.robot.profile() as profiler:
+            with self.assertRaises(Exception):
+                self.robot.get_pose_saved("unknown")
+        call, = profiler.calls
+        self.assertTrue(call.error)
+
+    def test_050_deprecated_warning(self):
+        with self.robot.profile():
+            with warnings.catch_warnings(record=True) as caught_warnings:
+                warnings.simplefilter("always")
+                self.robot.move_joints(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        self.assertEqual(caught_warnings[0].category, DeprecationWarning)
+        self.assertEqual(caught_warnings[0].filename, __file__)
+
+    def test_060_only_this_robot(self):
+        other_robot = NiryoRobot("127.0.0.1", verbose=False)
+        get_joints = self.robot.get_joints
+        try:
+            with self.robot.profile() as profiler:
+                get_joints()
+                other_robot.get_joints()
+                thread = threading.Thread(target=self.robot.get_pose)
+                thread.start()
+                thread.join()
+        finally:
+            other_robot.close_connection()
+        self.assertEqual(sorted(call.name for call in profiler.calls), ["GET_JOINTS", "GET_POSE"])
+        self.assertFalse(hasattr(NiryoRobot.get_joints, "__wrapped__"))
+
+    def test_070_validation_and_result(self):
+        # The converters are timed as the validation and the construction of the PoseObject as the result
+        schema = SCHEMAS[Command.GET_POSE]
+        check, decode = schema.check, schema.decode
+        slow_check = lambda *parameter_list: time.sleep(0.01) or check(*parameter_list)  # noqa: E731
+        slow_decode = lambda list_ret_param: time.sleep(0.01) or decode(list_ret_param)  # noqa: E731
+        with mock.patch.object(schema, "check", slow_check), mock.patch.object(schema, "decode", slow_decode):
+            with self.robot.profile() as profiler:
+                self.robot.get_pose()
+        phases = profiler.calls[0].phases
+        self.assertGreaterEqual(phases["validation"], 0.01)
+        self.assertGreaterEqual(phases["result"], 0.01)
+        self.assertLess(phases["build"] + phases["decode"], 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyniryo import JointsPosition, NiryoRobot
+from pyniryo.api.exceptions import HostNotReachableException, ReplayMismatchException
+from pyniryo.api.mock_server import MockRobotServer
+from pyniryo.api.recording import RecordKind, SessionRecorder, SessionReplayer, read_records
+
+
+class Test01Recording(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, "session.rec")
+        cls.trajectory = [JointsPosition(0.1, 0.0, 0.0, 0.0, 0.0, 0.0)] * 2000
+        with MockRobotServer(time_scale=0.0, large_framing=True, verbose=False):
+            # A small initial size to grow the file several times
+            with SessionRecorder(cls.path, initial_size=4096) as recorder:
+                robot = NiryoRobot("127.0.0.1", verbose=False, multi_channel=True, recorder=recorder)
+                cls.joints = robot.get_joints()
+                cls.image = bytes(robot.get_img_compressed())
+                robot.execute_trajectory(cls.trajectory)
+                robot.close_connection()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_010_records(self):
+        records = list(read_records(self.path))
+        self.assertEqual([record.data for record in records if record.kind == RecordKind.OPEN],
+                         [b"MOTION", b"QUERY", b"VISION"])
+        self.assertEqual(sum(record.kind == RecordKind.CLOSE for record in records), 3)
+        received = sum(len(record.data) for record in records if record.kind == RecordKind.RECEIVED)
+        self.assertGreater(received, len(self.image))
+        timestamps = [record.timestamp for record in records]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_020_replay(self):
+        replayer = SessionReplayer(self.path)
+        for _ in range(2):
+            replayer.rewind()
+            robot = NiryoRobot("127.0.0.1", verbose=False, multi_channel=True, connector=replayer.create_connection)
+            self.assertEqual([role.name for role in robot.channels], replayer.labels)
+            self.assertEqual(robot.get_joints(), self.joints)
+            self.assertEqual(bytes(robot.get_img_compressed()), self.image)
+            robot.execute_trajectory(self.trajectory)
+            robot.close_connection()
+            self.assertEqual(replayer.nb_connections, 3)
+
+    def test_030_mismatch(self):
+        replayer = SessionReplayer(self.path)
+        robot = NiryoRobot("127.0.0.1", verbose=False, multi_channel=True, connector=replayer.create_connection)
+        with self.assertRaises(ReplayMismatchException):
+            robot.get_pose()
+        robot.close_connection()
+
+        # Without checking the requests, the answers are served until the end of the recording
+        replayer = SessionReplayer(self.path, check_requests=False)
+        robot = NiryoRobot("127.0.0.1", verbose=False, multi_channel=True, connector=replayer.create_connection)
+        self.assertEqual(robot.get_pose().to_list(), self.joints.to_list())
+        with self.assertRaises(HostNotReachableException):
+            robot.get_pose()
+        robot.close_connection()
+
+    def test_040_interrupted_recording(self):
+        # The file of a killed recording is preallocated, its end is marked by a null kind
+        path = os.path.join(self.directory, "interrupted.rec")
+        recorder = SessionRecorder(path)
+        recorder.append(RecordKind.SENT, 0, b"request")
+        recorder.flush()
+        with open(path, "rb") as log_file:
+            log_content = log_file.read()
+        recorder.close()
+        with open(path, "wb") as log_file:
+            log_file.write(log_content)
+        record, = read_records(path)
+        self.assertEqual((record.kind, record.data), (RecordKind.SENT, b"request"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+import unittest
+
+import pyniryo
+import pyniryo.api
+import pyniryo.vision
+
+
+class Test01LazyImports(unittest.TestCase):
+
+    def test_010_vision_not_imported(self):
+        code = ("import sys; from pyniryo import NiryoRobot, PoseObject; "
+                "print('cv2' in sys.modules, 'pyniryo.vision' in sys.modules)")
+        self.assertEqual(subprocess.check_output([sys.executable, "-c", code]).split(), [b"False", b"False"])
+
+    def test_020_namespace(self):
+        vision_names = {name for name in dir(pyniryo.vision) if not name.startswith('_')}
+        api_names = {name for name in dir(pyniryo.api) if not name.startswith('_')}
+        self.assertEqual(pyniryo._VISION_NAMES, vision_names - api_names)
+        self.assertTrue(set(pyniryo.__all__) >= vision_names | {'NiryoRobot', 'PoseObject', 'vision'})
+        self.assertIs(pyniryo.uncompress_image, pyniryo.vision.uncompress_image)
+        with self.assertRaises(AttributeError):
+            pyniryo.unknown_name
+
+
+if __name__ == '__main__':
+    unittest.main()
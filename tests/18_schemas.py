@@ -0,0 +1,112 @@
+import json
+import unittest
+
+import numpy as np
+
+from pyniryo import NiryoRobot
+from pyniryo.api.communication_functions import build_command_dict, dict_to_packet, request_to_packet
+from pyniryo.api.enums_communication import Command, ConveyorDirection, ConveyorID, PinID, PinState, ToolID
+from pyniryo.api.exceptions import TcpCommandException
+from pyniryo.api.mock_server import MockRobotServer
+from pyniryo.api.objects import DigitalPinObject
+from pyniryo.api.schemas import SCHEMAS, SCHEMAS_BY_NAME, number
+
+
+class Test01CommandSchemas(unittest.TestCase):
+
+    def test_010_every_command(self):
+        self.assertEqual(set(SCHEMAS), set(Command))
+        self.assertIs(SCHEMAS_BY_NAME["GET_JOINTS"], SCHEMAS[Command.GET_JOINTS])
+
+    def test_020_build(self):
+        self.assertEqual(SCHEMAS[Command.DIGITAL_WRITE].build(PinID.DO1, PinState.HIGH), {
+            "command": "DIGITAL_WRITE", "param_list": ["DO1", "HIGH"]
+        })
+        self.assertEqual(SCHEMAS[Command.SET_ARM_MAX_VELOCITY].build(50)["param_list"], [50])
+        self.assertEqual(SCHEMAS[Command.MOVE_JOINTS].build(0.1, 0.2, None)["param_list"], [0.1, 0.2, "None"])
+
+    def test_030_same_packets(self):
+        for command, parameters in ((Command.GET_JOINTS, ()),
+                                    (Command.DIGITAL_WRITE, (PinID.DO1, PinState.HIGH)),
+                                    (Command.UPDATE_TOOL, ()),
+                                    (Command.SAY, ("Hello \"world\" é", 1))):
+            request = SCHEMAS[command].build(*parameters)
+            self.assertEqual(json.loads(SCHEMAS[command].to_json(request["param_list"])), request)
+            self.assertEqual(request_to_packet(request), dict_to_packet(build_command_dict(command, *parameters)))
+
+    def test_040_invalid_parameters(self):
+        with self.assertRaises(TcpCommandException):
+            SCHEMAS[Command.CALIBRATE].build(1)
+        with self.assertRaises(TcpCommandException):
+            SCHEMAS[Command.SET_ARM_MAX_VELOCITY].build(201)
+        with self.assertRaises(TcpCommandException):
+            SCHEMAS[Command.SET_ARM_MAX_VELOCITY].build(0)
+        with self.assertRaises(TcpCommandException):
+            SCHEMAS[Command.GET_JOINTS].build(1)
+        with self.assertRaises(TcpCommandException):
+            SCHEMAS[Command.DIGITAL_WRITE].build(PinID.DO1)
+        with self.assertRaises(TcpCommandException):
+            number(0, 1, int)("a")
+
+    def test_050_decode(self):
+        self.assertIs(SCHEMAS[Command.DIGITAL_READ].decode("HIGH"), PinState.HIGH)
+        self.assertIs(SCHEMAS[Command.GET_CURRENT_TOOL_ID].decode("GRIPPER_1"), ToolID.GRIPPER_1)
+        self.assertEqual(list(SCHEMAS[Command.GET_JOINTS].decode([0.0, 0.5, -1.25, 0.0, 0.0, 0.0])),
+                         [0.0, 0.5, -1.25, 0.0, 0.0, 0.0])
+
+    def test_060_points(self):
+        points = ([0.3, 0.1, 0.0], (0.3, -0.1, 0.0), np.array([0.1, -0.1, 0.0]), np.array([0.1, 0.1, 0.0]))
+        param_list = SCHEMAS[Command.SAVE_WORKSPACE_FROM_POINTS].build("workspace", *points)["param_list"]
+        self.assertEqual(param_list[1:], [[0.3, 0.1, 0.0], [0.3, -0.1, 0.0], [0.1, -0.1, 0.0], [0.1, 0.1, 0.0]])
+        self.assertTrue(all(type(value) is float for point in param_list[1:] for value in point))
+        with self.assertRaises(TcpCommandException):
+            SCHEMAS[Command.SAVE_WORKSPACE_FROM_POINTS].build("workspace", *points[:3], [0.1, "a", 0.0])
+        # The dynamic frames only accept lists, like before the schemas
+        with self.assertRaises(TcpCommandException):
+            SCHEMAS[Command.SAVE_DYNAMIC_FRAME_FROM_POINTS].build("frame", "", *points[1:], False)
+
+    def test_070_sent_as_given(self):
+        schema = SCHEMAS[Command.CONTROL_CONVEYOR]
+        self.assertEqual(schema.build(ConveyorID.ID_1, True, 50.7, ConveyorDirection.FORWARD)["param_list"][2], 50.7)
+        with self.assertRaises(TcpCommandException):
+            schema.build(ConveyorID.ID_1, True, "fast", ConveyorDirection.FORWARD)
+        for command in (Command.SET_IMAGE_BRIGHTNESS, Command.SET_IMAGE_CONTRAST, Command.SET_IMAGE_SATURATION):
+            self.assertIs(type(SCHEMAS[command].build(2)["param_list"][0]), int)
+            for invalid_factor in (-1.0, "a", "2"):
+                with self.assertRaises(TcpCommandException):
+                    SCHEMAS[command].build(invalid_factor)
+
+
+class Test02RobotSchemas(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False)
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+    def test_010_invalid_parameters(self):
+        with self.assertRaises(TcpCommandException):
+            self.robot.digital_read(5)
+        with self.assertRaises(TcpCommandException):
+            self.robot.set_arm_max_velocity(201)
+        self.assertEqual(self.robot.metrics.snapshot().get("DIGITAL_READ", {}).get("calls", 0), 0)
+
+    def test_020_decoded_answers(self):
+        self.robot.digital_write(PinID.DO1, PinState.HIGH)
+        self.assertIs(self.robot.digital_read(PinID.DO1), PinState.HIGH)
+        digital_pins = self.robot.get_digital_io_state()
+        self.assertTrue(all(isinstance(pin, DigitalPinObject) for pin in digital_pins))
+        self.assertEqual(len(self.robot.get_joints()), 6)
+
+    def test_030_points(self):
+        points = ((0.3, 0.1, 0.0), (0.3, -0.1, 0.0), np.array([0.1, -0.1, 0.0]), np.array([0.1, 0.1, 0.0]))
+        self.robot.save_workspace_from_points("tuple_workspace", *points)
+        self.assertIn("tuple_workspace", self.robot.get_workspace_list())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import math
+import unittest
+
+import numpy as np
+
+from pyniryo import PoseArray, PoseObject
+from pyniryo.api import transforms
+
+
+class Test01Rotations(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.euler = rng.uniform([-math.pi, -math.pi / 2, -math.pi], [math.pi, math.pi / 2, math.pi], (500, 3))
+
+    def test_010_round_trips(self):
+        quaternions = transforms.euler_to_quaternion(self.euler)
+        matrices = transforms.euler_to_matrix(self.euler)
+        self.assertEqual(quaternions.shape, (500, 4))
+        np.testing.assert_allclose(transforms.quaternion_to_matrix(quaternions), matrices, atol=1e-12)
+        np.testing.assert_allclose(transforms.matrix_to_euler(matrices), self.euler, atol=1e-12)
+        np.testing.assert_allclose(transforms.quaternion_to_euler(quaternions), self.euler, atol=1e-12)
+        # q and -q are the same rotation
+        products = np.sum(transforms.matrix_to_quaternion(matrices) * quaternions, axis=-1)
+        np.testing.assert_allclose(np.abs(products), 1.0, atol=1e-12)
+
+    def test_020_half_turns(self):
+        for axis in ([1.0, -1.0, 0.0], [0.0, 1.0, -1.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]):
+            quaternion = np.append(np.array(axis) / np.linalg.norm(axis), 0.0)
+            matrix = transforms.quaternion_to_matrix(quaternion)
+            self.assertAlmostEqual(abs(np.dot(transforms.matrix_to_quaternion(matrix), quaternion)), 1.0)
+
+    def test_030_gimbal_lock(self):
+        for pitch in (math.pi / 2, -math.pi / 2):
+            matrix = transforms.euler_to_matrix([0.3, pitch, 0.2])
+            euler = transforms.matrix_to_euler(matrix)
+            self.assertEqual(euler[2], 0.0)
+            np.testing.assert_allclose(transforms.euler_to_matrix(euler), matrix, atol=1e-12)
+
+    def test_040_single_pose(self):
+        pose = PoseObject(0.2, 0.0, 0.3, 0.1, 0.2, 0.3)
+        self.assertIsInstance(pose.quaternion(), list)
+        np.testing.assert_allclose(pose.quaternion(), transforms.euler_to_quaternion([0.1, 0.2, 0.3]))
+
+    def test_050_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            transforms.euler_to_quaternion(np.zeros((3, 4)))
+
+
+class Test02Poses(unittest.TestCase):
+
+    def test_010_transforms(self):
+        poses = PoseArray([[0.2, 0.1, 0.3, 0.1, -0.5, 1.0], [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]])
+        matrices = transforms.poses_to_transforms(poses)
+        self.assertEqual(matrices.shape, (2, 4, 4))
+        np.testing.assert_allclose(matrices[1], np.eye(4))
+        np.testing.assert_allclose(transforms.transforms_to_poses(matrices), poses.data, atol=1e-12)
+
+    def test_020_metrics(self):
+        poses = np.zeros((3, 6))
+        targets = np.array([[0.3, 0.4, 0.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0, 0.0, 1e-6],
+                            [0.0, 0.0, 0.0, 0.0, 0.0, -3.0]])
+        np.testing.assert_allclose(transforms.position_distances(poses, targets), [0.5, 0.0, 0.0])
+        np.testing.assert_allclose(transforms.rotation_angles(poses, targets), [0.0, 1e-6, 3.0], rtol=1e-9)
+        np.testing.assert_allclose(transforms.rotation_angles(targets[2], -targets[2]), 2 * math.pi - 6.0)
+        self.assertEqual(transforms.poses_almost_equal(poses, targets).tolist(), [False, True, False])
+        self.assertEqual(transforms.poses_almost_equal(poses, poses[0]).shape, (3, ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+
+from pyniryo import JointsArray, NiryoRobot
+from pyniryo.api import transforms
+from pyniryo.api.kinematics import KinematicChain, compare_with_robot
+from pyniryo.api.mock_server import MockRobotServer
+
+# Arm whose joints all rotate about the vertical axis: its forward kinematics are those of a planar arm
+PLANAR_CHAIN = KinematicChain("planar",
+                              joint_origins=[[0.0, 0.0, 0.1, 0.0, 0.0, 0.0]] + [[0.2, 0.0, 0.0, 0.0, 0.0, 0.0]] * 5,
+                              tool_origin=[0.05, 0.0, 0.0, 0.0, 0.0, 0.0])
+
+# Arbitrary arm with tilted joints
+TILTED_CHAIN = KinematicChain("tilted",
+                              joint_origins=[
+                                  [0.0, 0.0, 0.1, 0.0, 0.0, 0.0],
+                                  [0.0, 0.0, 0.07, np.pi / 2, -np.pi / 2, 0.0],
+                                  [0.2, 0.0, 0.0, 0.0, 0.0, -np.pi / 2],
+                                  [0.03, 0.01, 0.0, 0.0, np.pi / 2, 0.0],
+                                  [0.0, 0.0, 0.2, 0.0, -np.pi / 2, 0.0],
+                                  [0.0, -0.02, 0.0, 0.3, np.pi / 2, 0.0],
+                              ],
+                              tool_origin=[0.0, 0.0, 0.02, -np.pi / 2, -np.pi / 2, 0.0])
+
+
+class Test01KinematicChain(unittest.TestCase):
+
+    def test_010_vectorized(self):
+        joints = np.random.default_rng(0).uniform(-2.0, 2.0, (4, 5, 6))
+        for chain in (PLANAR_CHAIN, TILTED_CHAIN):
+            poses = chain.forward_kinematics(joints)
+            self.assertEqual(poses.shape, (4, 5, 6))
+            np.testing.assert_allclose(chain.forward_kinematics(joints[1, 2]), poses[1, 2], atol=1e-12)
+            np.testing.assert_allclose(chain.forward_kinematics(JointsArray(joints[0])), poses[0], atol=1e-12)
+
+    def test_020_planar(self):
+        joints = np.random.default_rng(1).uniform(-2.0, 2.0, (10, 6))
+        angles = np.cumsum(joints, axis=1)
+        lengths = [0.2] * 5 + [0.05]
+        poses = PLANAR_CHAIN.forward_kinematics(joints)
+        np.testing.assert_allclose(poses[:, 0], np.sum(lengths * np.cos(angles), axis=1), atol=1e-12)
+        np.testing.assert_allclose(poses[:, 1], np.sum(lengths * np.sin(angles), axis=1), atol=1e-12)
+        np.testing.assert_allclose(poses[:, 2], 0.1, atol=1e-12)
+        np.testing.assert_allclose(poses[:, 3:5], 0.0, atol=1e-12)
+        np.testing.assert_allclose(np.cos(poses[:, 5]), np.cos(angles[:, -1]), atol=1e-12)
+        np.testing.assert_allclose(np.sin(poses[:, 5]), np.sin(angles[:, -1]), atol=1e-12)
+
+    def test_030_same_as_matrix_product(self):
+        joints = np.random.default_rng(2).uniform(-2.0, 2.0, 6)
+        expected = np.eye(4)
+        for origin, joint in zip(TILTED_CHAIN.joint_origins, joints):
+            expected = expected @ origin @ transforms.poses_to_transforms([0.0, 0.0, 0.0, 0.0, 0.0, joint])
+        expected = expected @ TILTED_CHAIN.tool_origin
+        np.testing.assert_allclose(TILTED_CHAIN.forward_transforms(joints), expected, atol=1e-12)
+
+    def test_040_tcp(self):
+        joints = [0.2, 0.1, -0.5, 0.3, -0.4, 0.1]
+        tool_link = TILTED_CHAIN.forward_transforms(joints)
+        tcp = TILTED_CHAIN.forward_transforms(joints, tcp=[0.1, 0.0, 0.0, 0.0, 0.0, 0.0])
+        np.testing.assert_allclose(tcp[:3, 3], tool_link[:3, 3] + 0.1 * tool_link[:3, 0], atol=1e-12)
+
+    def test_050_errors(self):
+        with self.assertRaises(ValueError):
+            TILTED_CHAIN.forward_kinematics([0.0] * 5)
+
+
+class Test02RobotKinematics(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False)
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+    def test_010_compare_with_robot(self):
+        # The mock server answers the pose of its state, whatever the joints: the gaps are measured to that pose
+        joints = np.random.default_rng(0).uniform(-1.0, 1.0, (20, 6))
+        robot_pose = self.robot.get_pose().to_list()
+        distances, angles = compare_with_robot(self.robot, joints, TILTED_CHAIN)
+        self.assertEqual(self.server.request_counts()["FORWARD_KINEMATICS"], 20)
+        local_poses = TILTED_CHAIN.forward_kinematics(joints)
+        np.testing.assert_allclose(distances, transforms.position_distances(local_poses, [robot_pose] * 20))
+        np.testing.assert_allclose(angles, transforms.rotation_angles(local_poses, [robot_pose] * 20))
+
+if __name__ == '__main__':
+    unittest.main()
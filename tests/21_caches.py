@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import unittest
+
+from pyniryo import JointsPosition, NiryoRobot, PoseMetadata, PoseObject
+from pyniryo.api.caches import KinematicsCache
+from pyniryo.api.mock_server import MockRobotServer
+
+
+class Test01KinematicsCache(unittest.TestCase):
+
+    def test_010_quantized_keys(self):
+        cache = KinematicsCache(resolution=1e-3)
+        tcp = [False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        key = cache.key("FORWARD_KINEMATICS", [0.1, 0.2, 0, 0.0, 0.0, 0.0], tcp)
+        self.assertEqual(key, cache.key("FORWARD_KINEMATICS", [0.1002, 0.2, 0.0, 0.0, 0.0, 0.0], tcp))
+        self.assertNotEqual(key, cache.key("FORWARD_KINEMATICS", [0.102, 0.2, 0.0, 0.0, 0.0, 0.0], tcp))
+        self.assertNotEqual(key, cache.key("INVERSE_KINEMATICS", [0.1, 0.2, 0.0, 0.0, 0.0, 0.0], tcp))
+        self.assertNotEqual(key, cache.key("FORWARD_KINEMATICS", [0.1, 0.2, 0.0, 0.0, 0.0, 0.0], [True] + tcp[1:]))
+        self.assertNotEqual(key, cache.key("FORWARD_KINEMATICS", [0.1, 0.2, 0.0, 0.0, 0.0, 0.0], tcp, (), "ned"))
+
+    def test_011_nested_tcp(self):
+        cache = KinematicsCache(resolution=1e-3)
+        joints = [0.1, 0.2, 0.0, 0.0, 0.0, 0.0]
+        tcp = {"position": [0.05, 0.0, 0.0], "rpy": [0.0, 0.0, 0.0], "enabled": True}
+        key = cache.key("FORWARD_KINEMATICS", joints, tcp)
+        hash(key)
+        self.assertEqual(key, cache.key("FORWARD_KINEMATICS", joints, dict(reversed(list(tcp.items())))))
+        self.assertEqual(key, cache.key("FORWARD_KINEMATICS", joints, dict(tcp, position=[0.0502, 0.0, 0.0])))
+        self.assertNotEqual(key, cache.key("FORWARD_KINEMATICS", joints, dict(tcp, position=[0.06, 0.0, 0.0])))
+        self.assertNotEqual(key, cache.key("FORWARD_KINEMATICS", joints, dict(tcp, rpy=[0.0, 0.1, 0.0])))
+        nested_key = cache.key("FORWARD_KINEMATICS", joints, [True, [0.05, 0.0, 0.0], [0.0, 0.0, 0.0]])
+        hash(nested_key)
+        self.assertNotEqual(nested_key, cache.key("FORWARD_KINEMATICS", joints, [True, [0.06, 0.0, 0.0], [0.0] * 3]))
+
+    def test_020_lru(self):
+        cache = KinematicsCache(max_size=2)
+        cache.put(("a", ), 1)
+        cache.put(("b", ), 2)
+        self.assertEqual(cache.get(("a", )), 1)
+        cache.put(("c", ), 3)
+        self.assertIsNone(cache.get(("b", )))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_030_save_and_load(self):
+        cache = KinematicsCache(resolution=1e-3)
+        tcp = {"enabled": True, "position": [0.05, 0.0, 0.0], "rpy": [0.0, 0.0, 0.0]}
+        key = cache.key("INVERSE_KINEMATICS", [0.2, 0.0, 0.2, 0.0, 1.57, 0.0], tcp, (2, "", "METERS"), "ned2")
+        cache.put(key, JointsPosition(0.1, 0.2, 0.3, 0.4, 0.5, 0.6).to_dict())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "kinematics.json")
+            cache.save(path)
+            loaded = KinematicsCache.load(path)
+        self.assertEqual(loaded.resolution, 1e-3)
+        self.assertEqual(loaded.get(key), cache.get(key))
+
+    def test_040_load_other_version(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "kinematics.json")
+            with open(path, "w") as cache_file:
+                json.dump({"version": 1, "resolution": 1e-4, "entries": []}, cache_file)
+            with self.assertRaises(ValueError):
+                KinematicsCache.load(path)
+
+
+class Test02RobotKinematicsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False, kinematics_cache=KinematicsCache())
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+    def test_010_hits(self):
+        joints = JointsPosition(0.1, 0.2, -0.3, 0.0, 0.5, 0.0)
+        pose = self.robot.forward_kinematics(joints)
+        self.assertEqual(self.robot.forward_kinematics(joints), pose)
+        pose_v1 = PoseObject(*pose.to_list(), metadata=PoseMetadata.v1())
+        self.assertEqual(self.robot.inverse_kinematics(pose_v1), self.robot.inverse_kinematics(*pose_v1))
+        self.robot.inverse_kinematics(pose)
+        counts = self.server.request_counts()
+        self.assertEqual((counts["FORWARD_KINEMATICS"], counts["INVERSE_KINEMATICS"], counts["GET_TCP"]), (1, 2, 1))
+        self.assertEqual(counts["GET_HARDWARE_STATUS"], 1)
+        self.assertEqual(self.robot.kinematics_cache.stats()["hits"], 2)
+
+    def test_020_tcp_change(self):
+        joints = JointsPosition(0.1, 0.2, -0.3, 0.0, 0.5, 0.0)
+        pose = self.robot.forward_kinematics(joints)
+        self.robot.set_tcp(0.05, 0.0, 0.0, 0.0, 0.0, 0.0)
+        # The mock server doesn't apply the TCP: the new request shows in the counts
+        self.robot.forward_kinematics(joints)
+        self.robot.reset_tcp()
+        self.robot.enable_tcp(False)
+        self.assertEqual(self.robot.forward_kinematics(joints), pose)
+        self.assertEqual(self.server.request_counts()["FORWARD_KINEMATICS"], 2)
+
+    def test_025_other_arm(self):
+        joints = JointsPosition(0.1, 0.2, -0.3, 0.0, 0.5, 0.0)
+        self.robot.forward_kinematics(joints)
+        self.robot.close_connection()
+        self.server.state.hardware_version = "ned"
+        self.robot.connect("127.0.0.1")
+        self.robot.forward_kinematics(joints)
+        self.assertEqual(self.server.request_counts()["FORWARD_KINEMATICS"], 2)
+        self.assertEqual(len(self.robot.kinematics_cache), 2)
+
+    def test_030_disabled(self):
+        self.robot.kinematics_cache = None
+        for _ in range(2):
+            self.robot.forward_kinematics(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        self.assertEqual(self.server.request_counts()["FORWARD_KINEMATICS"], 2)
+        self.assertNotIn("GET_TCP", self.server.request_counts())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import threading
+import unittest
+
+from pyniryo import NiryoRobot
+from pyniryo.api.caches import KinematicsCache, MetadataCache
+from pyniryo.api.exceptions import TcpCommandException
+from pyniryo.api.mock_server import MockRobotServer
+
+
+class Test01MetadataCache(unittest.TestCase):
+
+    def test_010_get_or_fetch(self):
+        cache = MetadataCache()
+        fetches = []
+        fetch = lambda: fetches.append(None) or ["a.wav"]  # noqa: E731
+        self.assertEqual(cache.get_or_fetch((MetadataCache.SOUNDS, ), fetch), ["a.wav"])
+        self.assertEqual(cache.get_or_fetch((MetadataCache.SOUNDS, ), fetch), ["a.wav"])
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_020_invalidate(self):
+        cache = MetadataCache()
+        cache.get_or_fetch((MetadataCache.WORKSPACE_RATIO, "workspace_1"), lambda: 1.0)
+        cache.get_or_fetch((MetadataCache.WORKSPACE_RATIO, "workspace_2"), lambda: 2.0)
+        cache.get_or_fetch((MetadataCache.POSES, ), lambda: ["pose_1"])
+        cache.invalidate(MetadataCache.WORKSPACE_RATIO)
+        self.assertEqual(len(cache), 1)
+        cache.refresh()
+        self.assertEqual(len(cache), 0)
+
+    def test_030_invalidated_while_fetching(self):
+        cache = MetadataCache()
+        fetching, invalidated = threading.Event(), threading.Event()
+
+        def fetch():
+            fetching.set()
+            invalidated.wait(1.0)
+            return ["stale_pose"]
+
+        thread = threading.Thread(target=cache.get_or_fetch, args=((MetadataCache.POSES, ), fetch))
+        thread.start()
+        fetching.wait(1.0)
+        cache.invalidate(MetadataCache.POSES)
+        invalidated.set()
+        thread.join()
+        self.assertEqual(cache.get_or_fetch((MetadataCache.POSES, ), lambda: ["pose_1"]), ["pose_1"])
+
+    def test_040_disabled(self):
+        cache = MetadataCache(enabled=False)
+        for _ in range(2):
+            cache.get_or_fetch((MetadataCache.SOUNDS, ), lambda: ["a.wav"])
+        self.assertEqual(cache.stats()["misses"], 2)
+        self.assertEqual(len(cache), 0)
+
+
+class Test02RobotMetadataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False)
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+    def test_010_play_sound(self):
+        sound_name = self.robot.get_sounds()[0]
+        for _ in range(3):
+            self.robot.play_sound(sound_name, wait_end=False)
+        with self.assertRaises(TcpCommandException):
+            self.robot.play_sound("unknown_sound.wav")
+        self.assertEqual(self.server.request_counts()["GET_SOUNDS"], 1)
+
+    def test_020_invalidated_by_commands(self):
+        self.assertNotIn("cached_pose", self.robot.get_saved_pose_list())
+        self.robot.save_pose("cached_pose", [0.2, 0.0, 0.2, 0.0, 1.57, 0.0])
+        self.assertIn("cached_pose", self.robot.get_saved_pose_list())
+        self.robot.get_saved_pose_list().clear()
+        self.robot.delete_pose("cached_pose")
+        self.assertNotIn("cached_pose", self.robot.get_saved_pose_list())
+        self.assertEqual(self.server.request_counts()["GET_SAVED_POSE_LIST"], 3)
+
+        self.robot.save_trajectory([[0.0] * 6, [0.1] * 6], "cached_trajectory", "")
+        self.assertIn("cached_trajectory", self.robot.get_saved_trajectory_list())
+        self.robot.update_trajectory_infos("cached_trajectory", "renamed_trajectory", "")
+        self.assertEqual(self.robot.get_saved_trajectory_list(), ["renamed_trajectory"])
+
+    def test_030_workspaces_and_frames(self):
+        points = [[0.3, 0.1, 0.0], [0.3, -0.1, 0.0], [0.1, -0.1, 0.0], [0.1, 0.1, 0.0]]
+        self.robot.kinematics_cache = KinematicsCache()
+        self.robot.save_workspace_from_points("cached_workspace", *points)
+        self.assertIn("cached_workspace", self.robot.get_workspace_list())
+        ratio = self.robot.get_workspace_ratio("cached_workspace")
+        self.assertEqual(self.robot.get_workspace_ratio("cached_workspace"), ratio)
+        self.assertEqual(self.server.request_counts()["GET_WORKSPACE_RATIO"], 1)
+
+        frames, _ = self.robot.get_saved_dynamic_frame_list()
+        self.robot.kinematics_cache.put(("INVERSE_KINEMATICS", ), {})
+        self.robot.save_dynamic_frame_from_points("cached_frame", "", *points[:3])
+        self.assertEqual(len(self.robot.kinematics_cache), 0)
+        self.assertIn("cached_frame", self.robot.get_saved_dynamic_frame_list()[0])
+        self.robot.edit_dynamic_frame("cached_frame", "renamed_frame", "")
+        self.assertIn("renamed_frame", self.robot.get_saved_dynamic_frame_list()[0])
+        self.robot.delete_dynamic_frame("renamed_frame")
+        self.assertEqual(self.robot.get_saved_dynamic_frame_list()[0], frames)
+
+    def test_040_refresh(self):
+        self.robot.get_sounds()
+        self.robot.get_camera_intrinsics()
+        self.robot.metadata_cache.refresh()
+        self.robot.get_sounds()
+        self.robot.get_camera_intrinsics()
+        self.robot.close_connection()
+        self.robot.connect("127.0.0.1")
+        self.robot.get_sounds()
+        counts = self.server.request_counts()
+        self.assertEqual((counts["GET_SOUNDS"], counts["GET_CAMERA_INTRINSICS"]), (3, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+
+from pyniryo import JointsPosition, NiryoRobot
+from pyniryo.api.async_tcp_client import AsyncNiryoRobot, _COROUTINE_METHODS
+from pyniryo.api.exceptions import ClientNotConnectedException, NiryoRobotException, TcpCommandException
+from pyniryo.api.mock_server import MockRobotServer
+
+
+class Test01AsyncMethods(unittest.TestCase):
+
+    def test_010_coroutines(self):
+        for name in _COROUTINE_METHODS:
+            self.assertTrue(callable(getattr(NiryoRobot, name)), name)
+            self.assertTrue(asyncio.iscoroutinefunction(getattr(AsyncNiryoRobot, name)), name)
+
+    def test_020_blocking_only(self):
+        for name in ('profile', 'batch', 'start_state_streaming', 'get_state', 'move_async', 'execute_trajectory_async',
+                     'get_workspace_poses'):
+            self.assertFalse(hasattr(AsyncNiryoRobot, name), name)
+
+
+class Test02AsyncRobot(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_with_robot(self, coroutine_function):
+
+        async def main():
+            async with AsyncNiryoRobot(verbose=False) as robot:
+                await robot.connect("127.0.0.1")
+                return await coroutine_function(robot)
+
+        return asyncio.run(main())
+
+    def test_010_concurrent_calls(self):
+
+        async def scenario(robot):
+            await robot.move(JointsPosition(0.2, 0.0, 0.0, 0.0, 0.0, 0.0))
+            return await asyncio.gather(*(robot.call("get_joints") for _ in range(10)), robot.get_learning_mode(),
+                                        robot.call("collision_detected"))
+
+        results = self.run_with_robot(scenario)
+        self.assertTrue(all(joints == results[0] for joints in results[:10]))
+        self.assertAlmostEqual(results[0][0], 0.2)
+        self.assertIsInstance(results[10], bool)
+        self.assertFalse(results[11])
+        self.assertEqual(self.server.request_counts()["GET_JOINTS"], 10)
+
+    def test_020_errors(self):
+
+        async def scenario(robot):
+            with self.assertRaises(TcpCommandException):
+                await robot.set_arm_max_velocity(201)
+            with self.assertRaises(NiryoRobotException):
+                await robot.get_pose_saved("unknown_pose")
+            # The connection is still usable after an error
+            return await robot.get_joints()
+
+        self.assertEqual(len(self.run_with_robot(scenario)), 6)
+        self.assertNotIn("SET_ARM_MAX_VELOCITY", self.server.request_counts())
+
+    def test_030_close(self):
+
+        async def scenario(robot):
+            await robot.close_connection()
+            with self.assertRaises(ClientNotConnectedException):
+                await robot.get_joints()
+            await robot.connect("127.0.0.1")
+            return await robot.get_joints()
+
+        self.assertEqual(len(self.run_with_robot(scenario)), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
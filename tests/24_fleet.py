@@ -0,0 +1,64 @@
+import unittest
+
+from pyniryo import JointsPosition
+from pyniryo.api.exceptions import ClientNotConnectedException, NiryoRobotException
+from pyniryo.api.fleet import NiryoFleet
+from pyniryo.api.mock_server import MockRobotServer
+
+FAST_ROBOT = "127.0.0.1"
+SLOW_ROBOT = "127.0.0.2"
+# No server listens on this address
+ABSENT_ROBOT = "127.0.0.3"
+
+
+class Test01Fleet(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {
+            FAST_ROBOT: MockRobotServer(host=FAST_ROBOT, time_scale=0.0, verbose=False),
+            SLOW_ROBOT: MockRobotServer(host=SLOW_ROBOT, latency=0.5, time_scale=0.0, verbose=False),
+        }
+        for server in self.servers.values():
+            server.start()
+        self.fleet = NiryoFleet([FAST_ROBOT, SLOW_ROBOT], verbose=False)
+
+    def tearDown(self):
+        self.fleet.close_connection()
+        self.fleet.shutdown()
+        for server in self.servers.values():
+            server.stop()
+
+    def test_010_broadcast(self):
+        results = self.fleet.move(JointsPosition(0.2, 0.0, 0.0, 0.0, 0.0, 0.0))
+        self.assertEqual(results, {FAST_ROBOT: None, SLOW_ROBOT: None})
+        joints = self.fleet.joints
+        self.assertEqual(list(joints), [FAST_ROBOT, SLOW_ROBOT])
+        self.assertTrue(all(abs(robot_joints[0] - 0.2) < 1e-6 for robot_joints in joints.values()))
+
+    def test_020_call_each(self):
+        results = self.fleet.call_each("get_pose_saved", {FAST_ROBOT: ("unknown_pose", )})
+        self.assertEqual(list(results), [FAST_ROBOT])
+        self.assertIsInstance(results[FAST_ROBOT], NiryoRobotException)
+        self.assertNotIn("GET_POSE_SAVED", self.servers[SLOW_ROBOT].request_counts())
+
+    def test_030_unknown_robot(self):
+        with self.assertRaises(NiryoRobotException):
+            self.fleet.call_each("get_joints", {FAST_ROBOT: (), ABSENT_ROBOT: ()})
+        self.assertNotIn("GET_JOINTS", self.servers[FAST_ROBOT].request_counts())
+
+    def test_040_timeout(self):
+        results = self.fleet.broadcast("get_joints", timeout=0.2)
+        self.assertEqual(len(results[FAST_ROBOT]), 6)
+        self.assertIsInstance(results[SLOW_ROBOT], TimeoutError)
+        # The late call of the slow robot ends before its next one
+        self.assertEqual(len(self.fleet.broadcast("get_joints")[SLOW_ROBOT]), 6)
+
+    def test_050_connection_error(self):
+        with NiryoFleet([FAST_ROBOT, ABSENT_ROBOT], verbose=False) as fleet:
+            results = fleet.get_joints()
+        self.assertEqual(len(results[FAST_ROBOT]), 6)
+        self.assertIsInstance(results[ABSENT_ROBOT], ClientNotConnectedException)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from pyniryo import JointsPosition, NiryoRobot
+from pyniryo.api.exceptions import NiryoRobotException, TcpCommandException
+from pyniryo.api.mock_server import MockRobotServer
+
+
+class Test01Batch(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False)
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+    def test_010_ordered_answers(self):
+        self.robot.save_pose("batch_pose", [0.2, 0.0, 0.2, 0.0, 1.57, 0.0])
+        with self.robot.batch() as batch:
+            move = batch.move(JointsPosition(0.3, 0.0, 0.0, 0.0, 0.0, 0.0))
+            joints = batch.get_joints()
+            saved_pose = batch.get_pose_saved("batch_pose")
+            learning_mode = batch.learning_mode
+            self.assertEqual(len(batch), 4)
+        self.assertIsNone(move.result())
+        self.assertAlmostEqual(joints.result()[0], 0.3)
+        self.assertAlmostEqual(saved_pose.result().x, 0.2)
+        self.assertIsInstance(learning_mode.result(), bool)
+
+    def test_020_error_in_the_middle(self):
+        with self.robot.batch() as batch:
+            first = batch.get_joints()
+            failing = batch.get_pose_saved("unknown_pose")
+            last = batch.get_hardware_status()
+        self.assertIsNone(first.exception())
+        self.assertIsInstance(failing.exception(), NiryoRobotException)
+        with self.assertRaises(NiryoRobotException):
+            failing.result()
+        self.assertIsNone(last.exception())
+        self.assertEqual(last.result().hardware_version, "ned2")
+
+    def test_030_follow_up_requests(self):
+        sound_name = self.robot.get_sounds()[0]
+        with self.robot.batch() as batch:
+            played = batch.play_sound(sound_name, wait_end=False)
+            joints = batch.get_joints()
+        self.assertIsNone(played.result())
+        self.assertEqual(len(joints.result()), 6)
+        counts = self.server.request_counts()
+        # The deferred mode bypasses the metadata cache: the sounds are checked against a new list
+        self.assertEqual((counts["GET_SOUNDS"], counts["PLAY_SOUND"]), (2, 1))
+
+    def test_040_result_before_execution(self):
+        with self.robot.batch() as batch:
+            joints = batch.get_joints()
+            self.assertFalse(joints.done())
+            with self.assertRaises(NiryoRobotException):
+                joints.result()
+            with self.assertRaises(NiryoRobotException):
+                joints.exception()
+        self.assertTrue(joints.done())
+
+    def test_050_nothing_sent_on_error(self):
+        with self.assertRaises(TcpCommandException):
+            with self.robot.batch() as batch:
+                batch.get_joints()
+                batch.set_arm_max_velocity(201)
+        self.assertNotIn("GET_JOINTS", self.server.request_counts())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import socket
+import time
+import unittest
+import warnings
+
+from pyniryo import ChannelRole, JointsPosition, NiryoRobot
+from pyniryo.api.mock_server import MockRobotServer
+
+
+class Test01ChannelsHandshake(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRobotServer(time_scale=0.0, verbose=False)
+        self.server.start()
+        # Accepts the connections, thanks to its backlog, but never answers
+        self.silent_listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.silent_listener.bind(("127.0.0.1", 0))
+        self.silent_listener.listen(4)
+        self.sockets = []
+
+    def tearDown(self):
+        for client_socket in self.sockets:
+            client_socket.close()
+        self.silent_listener.close()
+        self.server.stop()
+
+    def connector(self, address, timeout):
+        if not self.sockets:
+            client_socket = socket.create_connection(address, timeout)
+        else:
+            client_socket = socket.create_connection(self.silent_listener.getsockname(), 0.2)
+        self.sockets.append(client_socket)
+        return client_socket
+
+    def test_010_silent_secondary_channels(self):
+        start = time.monotonic()
+        robot = NiryoRobot("127.0.0.1", verbose=False, multi_channel=True, connector=self.connector)
+        try:
+            self.assertLess(time.monotonic() - start, 3.0)
+            self.assertEqual(robot.channels, [ChannelRole.MOTION])
+            self.assertEqual(len(robot.get_joints()), 6)
+            # The timeout is cleared once the handshake succeeded, for the long motions
+            self.assertIsNone(self.sockets[0].gettimeout())
+        finally:
+            robot.close_connection()
+
+    def test_020_silent_channels_for_motions(self):
+        robot = NiryoRobot("127.0.0.1", verbose=False, connector=self.connector)
+        try:
+            with self.assertWarns(RuntimeWarning):
+                handle = robot.move_async(JointsPosition(0.1, 0.0, 0.0, 0.0, 0.0, 0.0))
+            self.assertTrue(handle.wait(timeout=5))
+            self.assertEqual(robot.channels, [ChannelRole.MOTION])
+        finally:
+            robot.close_connection()
+
+
+class Test02AsyncMotionChannels(unittest.TestCase):
+
+    def setUp(self):
+        # A motion of 1 rad lasts 1 s
+        self.server = MockRobotServer(joint_speed=1.0, verbose=False)
+        self.server.start()
+        self.robot = NiryoRobot("127.0.0.1", verbose=False)
+
+    def tearDown(self):
+        self.robot.close_connection()
+        self.server.stop()
+
+    def test_010_queries_during_motion(self):
+        self.assertEqual(self.robot.channels, [ChannelRole.MOTION])
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            handle = self.robot.move_async(JointsPosition(1.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+        self.assertEqual(set(self.robot.channels), {ChannelRole.MOTION, ChannelRole.QUERY, ChannelRole.VISION})
+        start = time.monotonic()
+        self.assertEqual(len(self.robot.get_joints()), 6)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertFalse(handle.done())
+        self.assertTrue(handle.wait(timeout=5))
+
+
+if __name__ == '__main__':
+    unittest.main()
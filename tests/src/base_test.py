@@ -4,6 +4,7 @@ import numpy as np
 from uuid import uuid4
 
 from pyniryo import NiryoRobot, PoseObject, PoseMetadata, JointsPosition
+from pyniryo.api import transforms
 from pyniryo.api.exceptions import ClientNotConnectedException
 
 
@@ -46,7 +47,7 @@ class BaseTestTcpApi(unittest.TestCase):
 
     def assertAlmostEqualPose(self, a, b, decimal=1):
         """
-        Ensure the poses are compatible, then convert the euler angles to quaternions
+        Ensure the poses are compatible, then compare the angle between their orientations
         """
         if isinstance(a, list):
             a = PoseObject(*a, metadata=PoseMetadata.v1())
@@ -56,10 +57,9 @@ class BaseTestTcpApi(unittest.TestCase):
         # Compare the position
         self.assertAlmostEqualVector([a.x, a.y, a.z], [b.x, b.y, b.z], decimal)
 
-        # Compare the orientation
-        product = np.dot(a.quaternion(), b.quaternion())
-        threshold = 1 - 10**-decimal
-        self.assertGreater(np.abs(product), threshold)
+        # Compare the orientation. The threshold was on the dot product of the quaternions: 1 - 10**-decimal
+        angle = transforms.rotation_angles(a.to_list(), b.to_list())
+        self.assertLess(angle, 2 * np.arccos(1 - 10**-decimal))
 
     def assertWarnsDeprecated(self):
         return self.assertWarns(DeprecationWarning)